@@ -0,0 +1,224 @@
+"""
+Management command for loading the statute CSVs into the Offence table and
+materializing every rule output into the OffenceGridResult table.
+"""
+import hashlib
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from apps.data_processing.models import Offence, OffenceGridResult
+
+# Add src to Python path for importing tools
+src_path = Path(__file__).resolve().parents[4] / 'src'
+sys.path.append(str(src_path))
+
+from tools.export import OFFENCE_COLUMNS, flatten_record
+from tools.main import STATUTE_DIRS, parse_rows
+from tools.registry import StatuteRegistry, statute_code
+from tools.rule_versions import rule_versions
+from tools.section_ids import canonical_section
+from tools.snapshot import RULE_MODULES, TOOLS_DIR, source_hash
+
+DEFAULT_BATCH_SIZE = 500
+
+# The quantum fields of an Offence, by their column in the statute CSVs
+OFFENCE_FIELDS = (
+    ('minimum_indictable', 2),
+    ('maximum_indictable', 3),
+    ('minimum_summary', 4),
+    ('maximum_summary', 5),
+)
+
+
+def offence_key(row: List[str]) -> Tuple[str, str]:
+    """Return the canonical section and the name an offence row is stored under."""
+    return canonical_section(row[0]) or row[0], row[1]
+
+
+def rules_hash(version) -> str:
+    """Hash the rule modules a rule version evaluates offences with."""
+    modules = set(RULE_MODULES)
+    for module in (version.rules, version.collateral_consequences):
+        modules.add(str(Path(module.__file__).resolve().relative_to(TOOLS_DIR)))
+    return source_hash([], modules=sorted(modules))
+
+
+def row_hash(row: List[str], rules: str) -> str:
+    """Hash an offence row together with the rules it is evaluated with."""
+    return hashlib.sha256(json.dumps([rules, row]).encode()).hexdigest()
+
+
+def grid_result_fields(parsed_offence: dict) -> Dict[str, object]:
+    """Split the rule outputs of a parsed row into availability and the other outputs."""
+    record = flatten_record(parsed_offence)
+    available = {}
+    outputs = {}
+    for column, value in record.items():
+        if column in OFFENCE_COLUMNS:
+            continue
+        if column.endswith('.available'):
+            available[column[:-len('.available')]] = value
+        else:
+            outputs[column] = value
+    return {'mode': record['mode'], 'available': available, 'outputs': outputs}
+
+
+class Command(BaseCommand):
+    help = 'Load the statute CSVs into the Offence table and store every rule output'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--statutes',
+            nargs='+',
+            type=str,
+            help='Statute codes to load, e.g. cc cdsa (default: all)',
+        )
+        parser.add_argument(
+            '--rule-versions',
+            nargs='+',
+            type=str,
+            default=['current'],
+            help='Rule versions to evaluate, by name or offence date (default: current)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Re-evaluate every offence, not only those whose row or rules changed',
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete offences of the loaded statutes that are no longer in their CSVs',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows written per query (default: {DEFAULT_BATCH_SIZE})',
+        )
+
+    def _read_rows(self, statutes) -> Tuple[List[str], List[List[str]]]:
+        """
+        Read the rows of the chosen statutes, the first per canonical section
+        and name, and return them with the statute codes.
+        """
+        registry = StatuteRegistry(STATUTE_DIRS)
+        codes = list(registry) if not statutes else [code.strip().lower() for code in statutes]
+        unknown = [code for code in codes if code not in registry.sources]
+        if unknown:
+            raise CommandError(f'Unknown statutes: {unknown}. Available: {list(registry)}')
+
+        rows = {}
+        for code in codes:
+            for row in registry.statute(code).rows:
+                rows.setdefault(offence_key(row), row)
+        return codes, list(rows.values())
+
+    def _load_offences(self, rows, batch_size) -> Dict[Tuple[str, str], int]:
+        """Upsert the offences, and return their IDs by canonical section and name."""
+        now = timezone.now()
+        keys = [offence_key(row) for row in rows]
+        Offence.objects.bulk_create(
+            [
+                Offence(
+                    section=section,
+                    offence_name=offence_name,
+                    **{field: row[column] for field, column in OFFENCE_FIELDS},
+                    created_at=now,
+                    updated_at=now,
+                )
+                for (section, offence_name), row in zip(keys, rows)
+            ],
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['section', 'offence_name'],
+            update_fields=[field for field, _ in OFFENCE_FIELDS] + ['updated_at'],
+        )
+        stored = {
+            (section, offence_name): offence_id
+            for section, offence_name, offence_id in Offence.objects.filter(
+                section__in={section for section, _ in keys}
+            ).values_list('section', 'offence_name', 'id')
+        }
+        return {key: stored[key] for key in keys}
+
+    def _load_grid_results(self, rows, offence_ids, version, force, batch_size) -> int:
+        """Evaluate and upsert the grid results of the rows whose source hash changed."""
+        rules = rules_hash(version)
+        stored = dict(
+            OffenceGridResult.objects.filter(
+                rule_version=version.name,
+                offence_id__in=offence_ids.values(),
+            ).values_list('offence_id', 'source_hash')
+        )
+
+        changed = []
+        for row in rows:
+            offence_id = offence_ids[offence_key(row)]
+            digest = row_hash(row, rules)
+            if force or stored.get(offence_id) != digest:
+                changed.append((row, offence_id, digest))
+
+        now = timezone.now()
+        parsed_rows = parse_rows([row for row, _, _ in changed], True, True, True, True, version)
+        results = [
+            OffenceGridResult(
+                offence_id=offence_id,
+                rule_version=version.name,
+                source_hash=digest,
+                **grid_result_fields(parsed_offence),
+                created_at=now,
+                updated_at=now,
+            )
+            for (_, offence_id, digest), parsed_offence in zip(changed, parsed_rows)
+        ]
+
+        OffenceGridResult.objects.bulk_create(
+            results,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['offence', 'rule_version'],
+            update_fields=['source_hash', 'mode', 'available', 'outputs', 'updated_at'],
+        )
+        return len(results)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError(f"Invalid batch size: {options['batch_size']}. Must be at least 1")
+        try:
+            versions = [rule_versions.get(name) for name in options['rule_versions']]
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        codes, rows = self._read_rows(options['statutes'])
+
+        with transaction.atomic():
+            offence_ids = self._load_offences(rows, options['batch_size'])
+            self.stdout.write(f'Loaded {len(rows)} offences')
+
+            if options['prune']:
+                removed = [
+                    offence_id
+                    for offence_id, section in Offence.objects.exclude(
+                        id__in=offence_ids.values()
+                    ).values_list('id', 'section')
+                    if statute_code(section) in codes
+                ]
+                Offence.objects.filter(id__in=removed).delete()
+                self.stdout.write(f'Deleted {len(removed)} offences no longer in the CSVs')
+
+            for version in versions:
+                evaluated = self._load_grid_results(
+                    rows, offence_ids, version, options['force'], options['batch_size']
+                )
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f'Evaluated {evaluated} of {len(rows)} offences under {version.name} rules'
+                    )
+                )
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.7 on 2026-10-17 12:00
+
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('data_processing', '0006_alter_casemetadata_categories_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offence',
+            name='section',
+            field=models.CharField(max_length=50),
+        ),
+        migrations.AddConstraint(
+            model_name='offence',
+            constraint=models.UniqueConstraint(fields=('section', 'offence_name'), name='unique_offence_section_name'),
+        ),
+        migrations.CreateModel(
+            name='OffenceGridResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rule_version', models.CharField(max_length=50)),
+                ('source_hash', models.CharField(max_length=64)),
+                ('mode', models.CharField(max_length=20)),
+                ('available', models.JSONField(default=dict)),
+                ('outputs', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('offence', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='grid_results', to='data_processing.offence')),
+            ],
+            options={
+                'ordering': ['offence__section', 'rule_version'],
+                'indexes': [models.Index(fields=['rule_version', 'mode'], name='grid_result_version_mode_idx'), django.contrib.postgres.indexes.GinIndex(fields=['available'], name='grid_result_available_gin')],
+                'constraints': [models.UniqueConstraint(fields=('offence', 'rule_version'), name='unique_offence_grid_result')],
+            },
+        ),
+    ]
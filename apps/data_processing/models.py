@@ -2,6 +2,7 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
 
 # Create your models here.
 class CaseMetadata(models.Model):
@@ -83,7 +84,9 @@ class SentencingRange(models.Model):
         return f"SentencingRange ({self.uid})"
 
 class Offence(models.Model):
-    section = models.CharField(max_length=50, unique=True)
+    # A section can have several offences, e.g. a first and a subsequent
+    # offence, so an offence is keyed by its section and name
+    section = models.CharField(max_length=50)
     offence_name = models.CharField(max_length=255)
 
     minimum_summary = models.TextField()
@@ -95,6 +98,42 @@ class Offence(models.Model):
 
     class Meta:
         ordering = ['section']
+        constraints = [
+            models.UniqueConstraint(fields=['section', 'offence_name'], name='unique_offence_section_name'),
+        ]
 
     def __str__(self):
         return f"{self.section}: {self.offence_name}"
+
+class OffenceGridResult(models.Model):
+    """
+    Every rule output of an offence under one rule version, as evaluated by
+    the load_offences command.
+    """
+    offence = models.ForeignKey(Offence, on_delete=models.CASCADE, related_name='grid_results')
+    rule_version = models.CharField(max_length=50)
+    # A hash of the offence's CSV row and the rule modules it was evaluated
+    # with; the result is only re-evaluated when it changes
+    source_hash = models.CharField(max_length=64)
+    mode = models.CharField(max_length=20)
+    # Whether each rule's option is available, by rule, e.g.
+    # {"sentencing.cso_available": false}
+    available = models.JSONField(default=dict)
+    # The status notes, sections and explanation of each rule output, as
+    # columns of the exported grid
+    outputs = models.JSONField(default=dict)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['offence__section', 'rule_version']
+        constraints = [
+            models.UniqueConstraint(fields=['offence', 'rule_version'], name='unique_offence_grid_result'),
+        ]
+        indexes = [
+            models.Index(fields=['rule_version', 'mode'], name='grid_result_version_mode_idx'),
+            GinIndex(fields=['available'], name='grid_result_available_gin'),
+        ]
+
+    def __str__(self):
+        return f"OffenceGridResult ({self.offence.section}, {self.rule_version})"
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import CaseMetadata, FactPattern, SentencingRange, Offence
+from .models import CaseMetadata, FactPattern, SentencingRange, Offence, OffenceGridResult
 
 class CaseMetadataSerializer(serializers.ModelSerializer):
     class Meta:
@@ -20,3 +20,11 @@ class OffenceSerializer(serializers.ModelSerializer):
     class Meta:
         model = Offence
         fields = '__all__'
+
+class OffenceGridResultSerializer(serializers.ModelSerializer):
+    section = serializers.CharField(source='offence.section', read_only=True)
+    offence_name = serializers.CharField(source='offence.offence_name', read_only=True)
+
+    class Meta:
+        model = OffenceGridResult
+        fields = '__all__'
@@ -33,7 +33,7 @@ class DataProcessingTests(TestCase):
         )
         
         self.offence = Offence.objects.create(
-            section='cc266',
+            section='cc_266',
             offence_name='Assault',
             minimum_summary='None',
             maximum_summary='6 months imprisonment',
@@ -83,10 +83,10 @@ class DataProcessingTests(TestCase):
         self.assertEqual(len(response.data['results']), 1)
         
         # Test filtering
-        response = self.client.get(f"{url}?section=cc266")
+        response = self.client.get(f"{url}?section=cc_266")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['section'], 'cc266')
+        self.assertEqual(response.data['results'][0]['section'], 'cc_266')
 
     def test_authentication_required(self):
         """Test that authentication is required for API access"""
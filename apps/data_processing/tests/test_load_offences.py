@@ -0,0 +1,60 @@
+"""
+Tests for the load_offences management command.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from apps.data_processing.models import Offence, OffenceGridResult
+
+# The CDSA CSV has 25 offences, two of them under s. 4(3)
+CDSA_OFFENCES = 25
+
+
+class LoadOffencesCommandTests(TestCase):
+    def load(self, *args):
+        out = StringIO()
+        call_command('load_offences', '--statutes', 'cdsa', *args, stdout=out)
+        return out.getvalue()
+
+    def test_load(self):
+        """Test that offences are stored under their canonical sections with their rule outputs"""
+        output = self.load()
+        self.assertIn(f'Evaluated {CDSA_OFFENCES} of {CDSA_OFFENCES} offences under current rules', output)
+        self.assertEqual(Offence.objects.count(), CDSA_OFFENCES)
+        self.assertEqual(Offence.objects.filter(section='cdsa4(3)').count(), 2)
+        self.assertFalse(Offence.objects.filter(section__startswith='cdsa_').exists())
+        self.assertEqual(OffenceGridResult.objects.filter(rule_version='current').count(), CDSA_OFFENCES)
+
+    def test_rerun_changed_hashes_only(self):
+        """Test that a rerun only re-evaluates the offences whose source hash changed"""
+        self.load()
+        self.assertIn(f'Evaluated 0 of {CDSA_OFFENCES} offences', self.load())
+
+        OffenceGridResult.objects.filter(offence__section='cdsa4(3)').update(source_hash='0' * 64)
+        self.assertIn(f'Evaluated 2 of {CDSA_OFFENCES} offences', self.load())
+        self.assertIn(f'Evaluated 0 of {CDSA_OFFENCES} offences', self.load())
+
+        self.assertIn(f'Evaluated {CDSA_OFFENCES} of {CDSA_OFFENCES} offences', self.load('--force'))
+        self.assertEqual(Offence.objects.count(), CDSA_OFFENCES)
+
+    def test_prune(self):
+        """Test that offences no longer in the CSVs are deleted"""
+        self.load()
+        Offence.objects.create(
+            section='cdsa99',
+            offence_name='repealed offence',
+            minimum_summary='',
+            maximum_summary='',
+            minimum_indictable='',
+            maximum_indictable='',
+        )
+        self.assertIn('Deleted 1 offences', self.load('--prune'))
+        self.assertFalse(Offence.objects.filter(section='cdsa99').exists())
+
+    def test_unknown_statute(self):
+        """Test that an unknown statute is rejected"""
+        with self.assertRaises(CommandError):
+            call_command('load_offences', '--statutes', 'unknown', stdout=StringIO())
@@ -0,0 +1,71 @@
+"""
+Tests for filtering the offence and grid result APIs by section and by rule
+output.
+"""
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.data_processing.models import Offence, OffenceGridResult
+
+
+class OffenceFilterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.offence = Offence.objects.create(
+            section='cc_266',
+            offence_name='Assault',
+            minimum_summary='None',
+            maximum_summary='6 months imprisonment',
+            minimum_indictable='None',
+            maximum_indictable='5 years imprisonment'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_section_spellings(self):
+        """Test that offences are filtered by any spelling of the section"""
+        url = reverse('offence-list')
+        for section in ('cc_266', 'cc266', 'CC_266', ' cc_266 '):
+            with self.subTest(section=section):
+                response = self.client.get(url, {'section': section})
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(len(response.data['results']), 1)
+                self.assertEqual(response.data['results'][0]['section'], 'cc_266')
+
+        response = self.client.get(url, {'section': 'cc_267'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 0)
+
+    def test_offence_rule_filter(self):
+        """Test filtering offences and grid results by a stored rule output"""
+        OffenceGridResult.objects.create(
+            offence=self.offence,
+            rule_version='current',
+            source_hash='0' * 64,
+            mode='hybrid',
+            available={'sentencing.cso_available': True, 'sentencing.discharge_available': True},
+        )
+        url = reverse('offence-list')
+
+        response = self.client.get(url, {'rule': 'sentencing.cso_available'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+        response = self.client.get(url, {'rule': 'sentencing.cso_available', 'available': 'false'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 0)
+
+        response = self.client.get(url, {'rule': 'sentencing.cso_available', 'rule_version': '2024-09-01'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 0)
+
+        response = self.client.get(reverse('offencegridresult-list'), {'offence__section': 'cc266'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['section'], 'cc_266')
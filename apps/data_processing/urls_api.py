@@ -5,6 +5,7 @@ from apps.data_processing.views import (
     FactPatternViewSet,
     SentencingRangeViewSet,
     OffenceViewSet,
+    OffenceGridResultViewSet,
 )
 
 # API router for REST endpoints
@@ -13,6 +14,7 @@ router.register(r'cases', CaseMetadataViewSet, basename='casemetadata')
 router.register(r'fact-patterns', FactPatternViewSet, basename='factpattern')
 router.register(r'sentencing-ranges', SentencingRangeViewSet, basename='sentencingrange')
 router.register(r'offences', OffenceViewSet, basename='offence')
+router.register(r'offence-grid-results', OffenceGridResultViewSet, basename='offencegridresult')
 
 # API URL patterns
 urlpatterns = [
@@ -4,12 +4,13 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
-from apps.data_processing.models import CaseMetadata, FactPattern, SentencingRange, Offence
+from apps.data_processing.models import CaseMetadata, FactPattern, SentencingRange, Offence, OffenceGridResult
 from apps.data_processing.serializers import (
     CaseMetadataSerializer,
     FactPatternSerializer,
     SentencingRangeSerializer,
-    OffenceSerializer
+    OffenceSerializer,
+    OffenceGridResultSerializer
 )
 from apps.data_processing.ingestion.case_metadata import (
     CaseMetadataIngester,
@@ -21,6 +22,14 @@ from apps.data_processing.ingestion.case_metadata import (
 from django.db.models import Count
 from django.db.models.functions import Cast, JSONObject
 from django.contrib.postgres.aggregates import ArrayAgg
+import sys
+from pathlib import Path
+
+# Add src to Python path for importing tools
+src_path = Path(__file__).resolve().parent.parent.parent / 'src'
+sys.path.append(str(src_path))
+
+from tools.section_ids import canonical_section
 
 # Create your views here.
 
@@ -140,11 +149,54 @@ class SentencingRangeViewSet(viewsets.ModelViewSet):
     search_fields = ['conditions']
     ordering_fields = ['date']
 
+def filter_by_rule(queryset, params, prefix=''):
+    """
+    Filter grid results (or, with prefix 'grid_results__', offences) by a rule
+    output, e.g. ?rule=sentencing.cso_available&available=false. The rule
+    version defaults to current. The availability test is a JSON containment
+    query on the indexed available column.
+    """
+    rule = params.get('rule')
+    if not rule:
+        return queryset
+    available = params.get('available', 'true').lower() in ('true', '1', 'yes')
+    return queryset.filter(**{
+        f'{prefix}rule_version': params.get('rule_version', 'current'),
+        f'{prefix}available__contains': {rule: available},
+    })
+
+def filter_by_section(queryset, params, field='section'):
+    """
+    Filter offences by ?section= (or, with field 'offence__section', grid
+    results by ?offence__section=) in any spelling of the section, e.g.
+    ?section=cc266. Sections are stored in their canonical form, as
+    load_offences writes them.
+    """
+    section = params.get(field, '').strip().lower()
+    if not section:
+        return queryset
+    return queryset.filter(**{field: canonical_section(section) or section})
+
 class OffenceViewSet(viewsets.ModelViewSet):
     queryset = Offence.objects.all()
     serializer_class = OffenceSerializer
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_fields = ['section']
     search_fields = ['offence_name']
     ordering_fields = ['section']
+
+    def get_queryset(self):
+        queryset = filter_by_section(super().get_queryset(), self.request.query_params)
+        return filter_by_rule(queryset, self.request.query_params, 'grid_results__')
+
+class OffenceGridResultViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = OffenceGridResult.objects.select_related('offence')
+    serializer_class = OffenceGridResultSerializer
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_fields = ['rule_version', 'mode']
+    ordering_fields = ['offence__section', 'rule_version']
+
+    def get_queryset(self):
+        queryset = filter_by_section(super().get_queryset(), self.request.query_params, 'offence__section')
+        return filter_by_rule(queryset, self.request.query_params)
@@ -1,3 +1,225 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from apps.offence_grid import views
+
+
+class OffenceDataStatusTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.url = reverse('offence_grid:status')
+
+    def test_authentication_required(self):
+        """Test that the reload status is not served without authentication"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertNotIn('sources', response.data)
+
+    def test_status(self):
+        """Test that an authenticated user gets the data version and reload metrics"""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('version', response.data)
+        self.assertIn('last_error', response.data)
+
+
+class OffenceGridAPITests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            password='testpass123'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('offence_grid:api-grid')
+
+    def test_grid(self):
+        """Test that each section is evaluated, with an error for unknown sections"""
+        response = self.client.get(self.url, {'sections': 'cc_266,cc_9999', 'mode': 'indictable'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['mode'], 'indictable')
+        self.assertEqual(response.data['results']['cc_266'][0]['offence_data']['section'], 'cc_266')
+        self.assertIn('cc_9999', response.data['errors'])
+
+    def test_one_batch(self):
+        """Test that the rows of every section are evaluated in one batch"""
+        with mock.patch('apps.offence_grid.views.parse_rows', wraps=views.parse_rows) as parse_rows:
+            response = self.client.get(
+                self.url,
+                {'sections': ['cc_266,cdsa_4(3)', 'cc_320.14(1)', 'cc_266', 'cc_9999']},
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        parse_rows.assert_called_once()
+        self.assertEqual(len(parse_rows.call_args[0][0]), 1 + 2 + 5)
+
+        results = response.data['results']
+        self.assertEqual(list(results), ['cc_266', 'cdsa_4(3)', 'cc_320.14(1)'])
+        self.assertEqual(
+            [offence['offence_data']['section'] for offence in results['cdsa_4(3)']],
+            ['cdsa4(3)', 'cdsa4(3)'],
+        )
+        self.assertEqual(len(results['cc_320.14(1)']), 5)
+        self.assertIn('sentencing', results['cc_266'][0])
+        self.assertEqual(list(response.data['errors']), ['cc_9999'])
+
+    def test_etag(self):
+        """Test that sending the ETag back gives a 304 until the request or the data changes"""
+        params = {'sections': 'cc_266'}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('"'))
+
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertFalse(response.content)
+
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=f'"other", {etag}')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Another mode, or other sections, is another response
+        response = self.client.get(self.url, {**params, 'mode': 'indictable'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        response = self.client.get(self.url, {'sections': 'cc_266,cc_267(a)'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Reloaded offence data changes the ETag
+        with mock.patch('apps.offence_grid.views.data_version', return_value='reloaded'):
+            response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_invalid_requests(self):
+        """Test that a request without sections, with too many or with an invalid mode is rejected"""
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'sections': ','.join(['cc_266'] * 201)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(self.url, {'sections': 'cc_266', 'mode': 'hybrid'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_authentication_required(self):
+        """Test that the grid API requires authentication"""
+        response = APIClient().get(self.url, {'sections': 'cc_266'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class OffenceAutocompleteTests(TestCase):
+    def setUp(self):
+        self.url = reverse('offence_grid:autocomplete')
+
+    def test_matches(self):
+        """Test that matching offences are returned best first, with display labels"""
+        response = self.client.get(self.url, {'q': 'sexual asault'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['query'], 'sexual asault')
+        self.assertEqual(data['results'][0]['section'], 'cc_271#a')
+        self.assertEqual(data['results'][0]['label'], '§ 271#a - sexual assault')
+        scores = [match['score'] for match in data['results']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_empty_query(self):
+        """Test that an empty query has no results"""
+        response = self.client.get(self.url, {'q': '  '})
+        self.assertEqual(response.json(), {'query': '', 'results': []})
+
+    def test_limit(self):
+        """Test that the limit is clamped, and defaults when it is not a number"""
+        # More than 50 offence names match "possession"
+        def count(limit):
+            return len(self.client.get(self.url, {'q': 'possession', 'limit': limit}).json()['results'])
+
+        self.assertEqual(count('3'), 3)
+        self.assertEqual(count('0'), 1)
+        self.assertEqual(count('-5'), 1)
+        self.assertEqual(count('1000'), 50)
+        self.assertEqual(count('many'), 10)
+
+    def test_get_only(self):
+        """Test that only GET is allowed"""
+        self.assertEqual(self.client.post(self.url, {'q': 'assault'}).status_code, 405)
+
+
+class OffenceGridPageTests(TestCase):
+    def setUp(self):
+        self.url = reverse('offence_grid:index')
+        patcher = mock.patch.object(views, '_offences', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_load_offences_cached(self):
+        """Test that the offences are built once per registry, and again after a reload"""
+        offences, choices = views.load_offences()
+        self.assertEqual(offences['cc_266'][1], 'assault')
+        self.assertIn(('cc_266', '§ 266 - assault'), choices)
+        again, again_choices = views.load_offences()
+        self.assertIs(again, offences)
+        self.assertIs(again_choices, choices)
+
+        reloaded = mock.Mock()
+        reloaded.statute.return_value.rows = [
+            ['cc_266', 'assault — reloaded', '', '', '', ''],
+            ['cc_266', 'assault — second row', '', '', '', ''],
+        ]
+        with mock.patch('apps.offence_grid.views.get_registry', return_value=reloaded):
+            reloaded_offences, reloaded_choices = views.load_offences()
+        reloaded.statute.assert_called_once_with(views.GRID_STATUTE)
+        # The first row of a section is the one listed
+        self.assertEqual(list(reloaded_offences), ['cc_266'])
+        self.assertEqual(reloaded_choices, [('cc_266', '§ 266 - assault — reloaded')])
+
+        # Back on the current registry, the offences are rebuilt from it
+        current, _ = views.load_offences()
+        self.assertIsNot(current, reloaded_offences)
+        self.assertEqual(current, offences)
+
+    def test_selected_offences(self):
+        """Test that the consequences of each selected offence are shown, and unknown ones ignored"""
+        response = self.client.get(self.url, {'offences': ['cc_266', 'cc_9999']})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['selected_offences'], ['cc_266', 'cc_9999'])
+        self.assertEqual(list(response.context['results']), ['§ 266 - assault'])
+        self.assertEqual(
+            response.context['results']['§ 266 - assault'],
+            views.get_collateral_consequences('cc_266'),
+        )
+
+    def test_no_selection(self):
+        """Test that the page lists the offences without results or a query"""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['results'], {})
+        self.assertEqual(response.context['query_results'], [])
+        self.assertIsNone(response.context['query_error'])
+        self.assertIn(('cc_266', '§ 266 - assault'), response.context['offences'])
+
+    def test_query(self):
+        """Test that a grid query lists the matching offences"""
+        response = self.client.get(self.url, {'query': ' section == cc266 '})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['query'], 'section == cc266')
+        self.assertEqual(response.context['query_results'], [('cc_266', '§ 266 - assault')])
+        self.assertIsNone(response.context['query_error'])
 
-# Create your tests here.
+    def test_invalid_query(self):
+        """Test that an invalid or oversized query shows an error instead of failing"""
+        for query in ('cso_available and', 'unknown_rule', '(' * 2000):
+            with self.subTest(query=query[:20]):
+                response = self.client.get(self.url, {'query': query})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.context['query_results'], [])
+                self.assertTrue(response.context['query_error'])
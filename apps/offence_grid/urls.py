@@ -5,4 +5,7 @@ app_name = 'offence_grid'
 
 urlpatterns = [
     path('', views.offence_grid, name='index'),
+    path('autocomplete/', views.offence_autocomplete, name='autocomplete'),
+    path('status/', views.OffenceDataStatusAPIView.as_view(), name='status'),
+    path('api/grid/', views.OffenceGridAPIView.as_view(), name='api-grid'),
 ]
@@ -1,5 +1,13 @@
+from django.http import JsonResponse
 from django.shortcuts import render
-import pandas as pd
+from django.utils.http import parse_etags, quote_etag
+from django.views.decorators.http import require_GET
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+import hashlib
+import json
 import sys
 import re
 from pathlib import Path
@@ -8,7 +16,30 @@ from pathlib import Path
 src_path = Path(__file__).resolve().parent.parent.parent / 'src'
 sys.path.append(str(src_path))
 
-from tools import ca_collateral_consequences
+from tools.main import (
+    VALID_MODES,
+    data_version,
+    get_registry,
+    initialize,
+    lookup_consequences,
+    parse_rows,
+    query_grid,
+    reload_metrics,
+    search_offences,
+)
+from tools.rule_versions import CURRENT_RULE_VERSION
+
+AUTOCOMPLETE_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+GRID_API_MAX_SECTIONS = 200
+
+# The statute whose offences the grid lists
+GRID_STATUTE = 'cc'
+
+# The grid's offences by section and their (section, label) choices, with the
+# registry they were built from. Built once per worker, and again after the
+# offence data is reloaded
+_offences = None
 
 def format_section(section):
     """Format section numbers for display by replacing prefix with § symbol."""
@@ -18,64 +49,58 @@ def format_section(section):
     return re.sub(r'^[a-z]+_', '§ ', section)
 
 def load_offences():
-    """Load offences from the CSV file."""
-    csv_path = src_path / 'data/offence/cc-offences-2024-09-16.csv'
-    df = pd.read_csv(csv_path)
-    return [(row['section'], format_section(row['section']), row['offence_name'], 
-             row['maximum_indictable'], row['maximum_sc']) 
-            for _, row in df.iterrows()]
-
-def parse_maximum(max_value):
-    """Parse maximum sentence value to extract years."""
-    if pd.isna(max_value) or not max_value:
-        return 0
-    if isinstance(max_value, str) and max_value.endswith('y'):
-        return int(max_value.rstrip('y'))
-    return 0
-
-def get_collateral_consequences(section, max_indictable, max_sc):
-    """Get collateral consequences for an offence."""
-    # Parse the maximum sentence
-    max_years = parse_maximum(max_indictable)
-    
-    # Determine mode based on maximum sentences
-    mode = "summary" if pd.isna(max_indictable) and not pd.isna(max_sc) else "indictable"
-    if not pd.isna(max_indictable) and not pd.isna(max_sc):
-        mode = "hybrid"
-    
-    # Call the check_inadmissibility function
-    results = ca_collateral_consequences.check_inadmissibility(
-        section=section,
-        mode=mode,
-        indictable_maximum=max_years
-    )
-    
-    # Process results into a more usable format
-    if not results:
+    """Return the grid's offence rows by section, and their (section, label) choices."""
+    global _offences
+    registry = get_registry()
+    cached = _offences
+    if cached is None or cached[0] is not registry:
+        offences = {}
+        for row in registry.statute(GRID_STATUTE).rows:
+            offences.setdefault(row[0], row)
+        choices = [
+            (section, f"{format_section(section)} - {row[1]}")
+            for section, row in offences.items()
+        ]
+        cached = _offences = (registry, offences, choices)
+    return cached[1], cached[2]
+
+def get_collateral_consequences(section):
+    """Get the collateral consequences of an offence in every jurisdiction."""
+    try:
+        section_consequences = lookup_consequences(section)
+    except KeyError:
+        section_consequences = ()
+
+    # Collect the consequences that apply, from every row, jurisdiction and
+    # rule of the section
+    all_sections = []
+    all_reasons = []
+    for consequences in section_consequences:
+        for jurisdiction_consequences in consequences.values():
+            for outputs in jurisdiction_consequences.values():
+                for result in outputs if isinstance(outputs, list) else [outputs]:
+                    if not result['status']['available']:
+                        continue
+                    all_sections.extend(format_section(s) for s in result.get('sections') or [])
+                    if result.get('notes'):
+                        all_reasons.append(result['notes'])
+
+    if not all_sections and not all_reasons:
         return {
             'available': False,
             'sections': [],
-            'reason': 'No immigration consequences identified'
+            'reason': 'No collateral consequences identified'
         }
-    
-    # Combine all results into a single response
-    all_sections = []
-    all_reasons = []
-    for result in results:
-        if result.get('sections'):
-            all_sections.extend([format_section(s) for s in result['sections']])
-        if result.get('notes'):
-            all_reasons.append(result['notes'])
-    
+
     return {
         'available': True,
-        'sections': list(set(all_sections)),  # Remove duplicates
-        'reason': ' | '.join(set(all_reasons))  # Join unique reasons
+        'sections': list(dict.fromkeys(all_sections)),  # Remove duplicates
+        'reason': ' | '.join(dict.fromkeys(all_reasons))  # Join unique reasons
     }
 
 def offence_grid(request):
     """Landing page for the offence grid tool."""
-    offences = load_offences()
+    offences, choices = load_offences()
     
     # Get list of selected offences (might be empty)
     selected_offences = request.GET.getlist('offences')
@@ -83,24 +108,150 @@ def offence_grid(request):
     
     # Process each selected offence
     for selected_offence in selected_offences:
-        offence_details = next(
-            (o for o in offences if o[0] == selected_offence), 
-            None
-        )
-        
-        if offence_details:
-            section, formatted_section, name, max_indictable, max_sc = offence_details
+        row = offences.get(selected_offence)
+        if row is not None:
             # Store results with formatted section name as key
-            results[f"{formatted_section} - {name}"] = get_collateral_consequences(
-                section, max_indictable, max_sc
-            )
-    
-    # Prepare offence data for the template
-    formatted_offences = [(o[0], f"{o[1]} - {o[2]}") for o in offences]
+            results[f"{format_section(row[0])} - {row[1]}"] = get_collateral_consequences(row[0])
     
+    # Answer a boolean query over the grid, e.g.
+    # ?query=mode == hybrid and cso_available and discharge_available
+    query = request.GET.get('query', '').strip()
+    query_results = []
+    query_error = None
+    if query:
+        try:
+            query_results = [
+                (match['section'], f"{format_section(match['section'])} - {match['description']}")
+                for match in query_grid(query)
+            ]
+        except ValueError as e:
+            query_error = str(e)
+
     return render(request, 'offence_grid/index.html', {
         'title': 'Offence Grid',
-        'offences': formatted_offences,
+        'offences': choices,
         'selected_offences': selected_offences,
         'results': results,
+        'query': query,
+        'query_results': query_results,
+        'query_error': query_error,
     })
+
+@require_GET
+def offence_autocomplete(request):
+    """Suggest offences whose names match the `q` parameter, best first."""
+    query = request.GET.get('q', '').strip()
+    try:
+        limit = int(request.GET.get('limit', AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    limit = max(1, min(limit, AUTOCOMPLETE_MAX_LIMIT))
+
+    matches = search_offences(query, limit) if query else []
+    return JsonResponse({
+        'query': query,
+        'results': [
+            {
+                'section': match['section'],
+                'label': f"{format_section(match['section'])} - {match['description']}",
+                'score': match['score'],
+            }
+            for match in matches
+        ],
+    })
+
+class OffenceDataStatusAPIView(APIView):
+    """
+    The loaded offence data version and its reload metrics, including the
+    source files and the last reload error, for authenticated users only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        metrics = reload_metrics()
+        if metrics is None:
+            initialize()
+            metrics = reload_metrics()
+        if not metrics:
+            return Response({}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        return Response(metrics)
+
+def grid_etag(sections, mode):
+    """
+    Return the strong ETag of a grid response: a hash of the offence data,
+    the rule version and the request.
+    """
+    key = json.dumps([data_version(), CURRENT_RULE_VERSION.name, mode, sections])
+    return quote_etag(hashlib.sha256(key.encode()).hexdigest())
+
+class OffenceGridAPIView(APIView):
+    """
+    The evaluated grid for a list of sections, as JSON, e.g.
+    GET /offence-grid/api/grid/?sections=cc_266,cc_267(a)&mode=indictable
+
+    Every section is resolved to its rows through the registry, and the rows
+    of all of them are evaluated in one batch, with every group of details.
+    The response carries a strong ETag, so a client that sends it back in
+    If-None-Match gets a 304 until the offence data or the rules change.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        # Sections can be repeated or comma-separated
+        sections = [
+            section.strip()
+            for value in request.query_params.getlist('sections')
+            for section in value.split(',')
+            if section.strip()
+        ]
+        mode = request.query_params.get('mode', 'summary')
+
+        if not sections:
+            return Response({'error': 'No sections given'}, status=status.HTTP_400_BAD_REQUEST)
+        if len(sections) > GRID_API_MAX_SECTIONS:
+            return Response(
+                {'error': f'Too many sections: {len(sections)}. At most {GRID_API_MAX_SECTIONS} are allowed'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if mode not in VALID_MODES:
+            return Response(
+                {'error': f'Invalid mode: {mode}. Must be one of {VALID_MODES}'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        etag = grid_etag(sections, mode)
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+
+        registry = get_registry()
+        resolved = {}
+        errors = {}
+        for section in dict.fromkeys(sections):
+            try:
+                resolved[section] = registry.lookup(section)
+            except (KeyError, ValueError) as e:
+                errors[section] = e.args[0] if e.args else str(e)
+
+        evaluated = iter(parse_rows(
+            [row for rows in resolved.values() for row in rows],
+            procedure=True,
+            sentencing=True,
+            ancillary_orders=True,
+            collateral_consequences=True,
+        ))
+        results = {
+            section: [next(evaluated) for _ in rows]
+            for section, rows in resolved.items()
+        }
+
+        response = Response({
+            'rule_version': CURRENT_RULE_VERSION.name,
+            'mode': mode,
+            'results': results,
+            'errors': errors,
+        })
+        response['ETag'] = etag
+        return response
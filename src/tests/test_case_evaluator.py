@@ -0,0 +1,143 @@
+"""
+Tests for combining the consequences of the counts of a case.
+"""
+import unittest
+
+from tools.case_evaluator import CaseEvaluator, Charge, global_sentence, term_days
+
+
+class GlobalSentenceTests(unittest.TestCase):
+    def test_term_days(self):
+        """Test that reported terms are read in days"""
+        self.assertEqual(term_days("790d"), 790)
+        self.assertEqual(term_days("5y6m"), 2005)
+        self.assertEqual(term_days("1y&6m"), 545)
+        self.assertIsNone(term_days("indeterminate"))
+
+    def test_consecutive_and_concurrent(self):
+        """Test that consecutive terms add up and concurrent terms overlap"""
+        charges = [
+            Charge("cc_266", jail="1y", sentence_mode="jail-concurrent"),
+            Charge("cc_334(b)", jail="6m", sentence_mode="jail-concurrent"),
+            Charge("cc_430(4)", jail="3m", sentence_mode="jail-consecutive"),
+            Charge("cc_430(4)", jail="4m", sentence_mode="jail-consecutive"),
+        ]
+        self.assertEqual(global_sentence(charges), {"jail": 365})
+        self.assertEqual(global_sentence(charges[2:]), {"jail": 210})
+
+    def test_kinds(self):
+        """Test that each kind of sentence is totalled separately"""
+        charges = [
+            Charge("cc_266", jail="6m", sentence_mode="jail-consecutive"),
+            Charge("cc_334(b)", jail="1y", sentence_mode="cso-consecutive"),
+            Charge("cc_430(4)", jail="12m", sentence_mode="12m-probation"),
+            Charge("cc_430(4)", jail="life", sentence_mode="jail-consecutive"),
+            Charge("cc_430(4)", jail="1y"),
+        ]
+        self.assertEqual(global_sentence(charges), {"jail": 180, "cso": 365, "12m": 360})
+
+
+class CaseEvaluatorTests(unittest.TestCase):
+    def setUp(self):
+        self.evaluator = CaseEvaluator()
+
+    def test_soira_single_order(self):
+        """Test that one designated count gives its own duration"""
+        result = self.evaluator.evaluate([
+            Charge("cc_266", "summary"),
+            Charge("cc_163.1(4)", "indictable"),
+        ])
+        soira = result["soira"]
+        self.assertEqual(soira["status"], {"available": True, "notes": None})
+        self.assertEqual(soira["duration"], {"amount": 20, "unit": "years"})
+        self.assertEqual(soira["counts"], [2])
+
+    def test_soira_possible_life_order(self):
+        """Test that two counts requiring an order note a possible order for life"""
+        soira = self.evaluator.evaluate([
+            Charge("cc_163.1(4)", "indictable"),
+            Charge("cc_163.1(2)", "indictable"),
+        ])["soira"]
+        self.assertTrue(soira["status"]["available"])
+        self.assertIn("possible order for life", soira["status"]["notes"])
+        self.assertIn("cc490.013(2.1)", soira["sections"])
+        # The court decides whether to make the order for life
+        self.assertEqual(soira["duration"], {"amount": 20, "unit": "years"})
+        self.assertEqual(soira["counts"], [1, 2])
+
+    def test_soira_discretionary_counts(self):
+        """Test that a count whose order is discretionary does not make a life order possible"""
+        soira = self.evaluator.evaluate([
+            Charge("cc_163.1(4)", "indictable"),
+            Charge("cc_348(1)(e)", "indictable"),
+        ])["soira"]
+        self.assertEqual(soira["status"], {"available": True, "notes": None})
+        self.assertNotIn("cc490.013(2.1)", soira["sections"])
+        self.assertEqual(soira["counts"], [1, 2])
+
+    def test_soira_not_designated(self):
+        """Test that no order is available if no count is designated"""
+        soira = self.evaluator.evaluate([Charge("cc_266", "summary")])["soira"]
+        self.assertFalse(soira["status"]["available"])
+        self.assertEqual(soira["sections"], ["cc490.011"])
+        self.assertEqual(soira["counts"], [])
+
+    def test_strictest_sentencing_options(self):
+        """Test that CSO and discharge are unavailable if any count excludes them"""
+        sentencing = self.evaluator.evaluate([
+            Charge("cc_266", "summary"),
+            Charge("cc_163.1(4)", "indictable"),
+        ])["sentencing"]
+        for option in ("cso_available", "discharge_available"):
+            with self.subTest(option=option):
+                self.assertFalse(sentencing[option]["status"]["available"])
+                self.assertTrue(sentencing[option]["status"]["notes"].startswith("count 2: "))
+                self.assertEqual(sentencing[option]["counts"], [2])
+
+        sentencing = self.evaluator.evaluate([
+            Charge("cc_266", "summary"),
+            Charge("cc_334(b)", "summary"),
+        ])["sentencing"]
+        self.assertTrue(sentencing["cso_available"]["status"]["available"])
+        self.assertTrue(sentencing["discharge_available"]["status"]["available"])
+
+    def test_cso_global_term(self):
+        """Test that a CSO needs a global term of imprisonment under two years"""
+        long_term = self.evaluator.evaluate([
+            Charge("cc_266", "summary", jail="6m", sentence_mode="jail-consecutive"),
+            Charge("cc_334(b)", "summary", jail="20m", sentence_mode="cso-consecutive"),
+        ])
+        self.assertEqual(long_term["global_sentence"], {"jail": 180, "cso": 600})
+        self.assertEqual(
+            long_term["sentencing"]["cso_available"]["status"],
+            {"available": False, "notes": "global term of imprisonment of 2 years or more"},
+        )
+
+        # Probation is not a term of imprisonment
+        with_probation = self.evaluator.evaluate([
+            Charge("cc_266", "summary", jail="6m", sentence_mode="jail-consecutive"),
+            Charge("cc_334(b)", "summary", jail="1y", sentence_mode="cso-consecutive"),
+            Charge("cc_430(4)", "summary", jail="12m", sentence_mode="12m-probation"),
+        ])
+        self.assertEqual(with_probation["global_sentence"], {"jail": 180, "cso": 365, "12m": 360})
+        self.assertTrue(with_probation["sentencing"]["cso_available"]["status"]["available"])
+
+    def test_errors(self):
+        """Test that counts that cannot be evaluated are reported and left out"""
+        result = self.evaluator.evaluate([
+            Charge("cc_266", "summary"),
+            Charge("cc_9999", "summary"),
+            Charge("cc_266", "summary", youth=True),
+        ])
+        self.assertEqual([count["count"] for count in result["counts"]], [1])
+        self.assertEqual([error["count"] for error in result["errors"]], [2, 3])
+
+    def test_results_are_cached(self):
+        """Test that every spelling of a count shares one cached result"""
+        first = self.evaluator.charge_results(Charge("cc_266", "summary"))
+        self.assertIs(self.evaluator.charge_results(Charge(" CC_266 ", "summary")), first)
+        self.assertIsNot(self.evaluator.charge_results(Charge("cc_266", "indictable")), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
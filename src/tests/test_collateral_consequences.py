@@ -0,0 +1,115 @@
+"""
+Tests for registering collateral consequence rules and the table of their
+outputs by section.
+"""
+import unittest
+
+from tools.collateral_consequences import (
+    _CONSEQUENCES,
+    CollateralConsequence,
+    ConsequenceTable,
+    collateral_consequence,
+    registered_consequences,
+)
+from tools.context import OffenceContext
+from tools.main import STATUTE_DIRS
+from tools.registry import StatuteRegistry
+from tools.sk_collateral_consequences import check_firearms_act
+
+
+class RegistrationTests(unittest.TestCase):
+    def register(self, jurisdiction, name, check):
+        self.addCleanup(_CONSEQUENCES.pop, (jurisdiction, name), None)
+        return collateral_consequence(jurisdiction, name)(check)
+
+    def test_registered(self):
+        """Test that each jurisdiction's module registers its rules"""
+        self.assertEqual(
+            sorted((consequence.jurisdiction, consequence.name) for consequence in registered_consequences()),
+            [("ca", "inadmissibility"), ("sk", "firearms_act_suspension")],
+        )
+
+    def test_duplicate_registration(self):
+        """Test that a second rule under a registered name is rejected"""
+        def check(context):
+            return None
+
+        def other(context):
+            return None
+
+        self.assertIs(self.register("sk", "test_duplicate", check), check)
+        # Registering the same function again, e.g. on reload, is allowed
+        self.assertIs(self.register("sk", "test_duplicate", check), check)
+        with self.assertRaises(ValueError):
+            self.register("sk", "test_duplicate", other)
+        self.assertIs(_CONSEQUENCES[("sk", "test_duplicate")].check, check)
+
+        # The same name in another jurisdiction is a different rule
+        self.assertIs(self.register("ca", "test_duplicate", other), other)
+
+    def test_unknown_jurisdiction(self):
+        """Test that a rule for an unknown jurisdiction is rejected"""
+        with self.assertRaises(ValueError):
+            collateral_consequence("on", "firearms_act_suspension")
+        self.assertNotIn(("on", "firearms_act_suspension"), _CONSEQUENCES)
+
+
+class ConsequenceTableTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        statutes = StatuteRegistry(STATUTE_DIRS)
+        cls.rows = [row for code in statutes for row in statutes.statute(code).rows]
+        cls.table = ConsequenceTable(cls.rows)
+
+    def test_section_contents(self):
+        """Test that each section holds the output of every rule for each of its rows"""
+        by_section = {}
+        for row in self.rows:
+            context = OffenceContext(row)
+            expected = {}
+            for consequence in self.table.consequences:
+                output = consequence.check(context)
+                if output is not None:
+                    expected.setdefault(consequence.jurisdiction, {})[consequence.name] = output
+            by_section.setdefault(row[0], []).append(expected)
+
+        self.assertEqual(len(self.table), len(by_section))
+        for section, expected in by_section.items():
+            with self.subTest(section=section):
+                self.assertEqual(self.table.lookup(section), tuple(expected))
+
+    def test_firearms_act_suspension(self):
+        """Test that the Saskatchewan suspension applies to listed offences only"""
+        listed, = self.table.lookup("cc_96")
+        self.assertEqual(listed["sk"]["firearms_act_suspension"], check_firearms_act("cc_96"))
+        self.assertTrue(listed["sk"]["firearms_act_suspension"]["status"]["available"])
+
+        unlisted, = self.table.lookup("cc_266")
+        self.assertFalse(unlisted["sk"]["firearms_act_suspension"]["status"]["available"])
+        self.assertNotIn("commercial_vehicle_drivers_record_keeping", unlisted["sk"])
+
+    def test_spellings(self):
+        """Test that a section is found in any spelling"""
+        self.assertIn("cc96", self.table)
+        self.assertIs(self.table.lookup(" CC96"), self.table.lookup("cc_96"))
+        self.assertNotIn("cc_9999", self.table)
+        with self.assertRaises(KeyError):
+            self.table.lookup("cc_9999")
+
+    def test_rules_without_output(self):
+        """Test that a rule returning None is left out, and jurisdictions come from the rules"""
+        rows = [row for row in self.rows if row[0] in ("cc_96", "cc_266")]
+        table = ConsequenceTable(rows, [
+            CollateralConsequence(
+                "sk",
+                "listed",
+                lambda context: {"section": context.section} if context.section == "cc_96" else None,
+            ),
+        ])
+        self.assertEqual(table.lookup("cc_96"), ({"sk": {"listed": {"section": "cc_96"}}},))
+        self.assertEqual(table.lookup("cc_266"), ({},))
+        self.assertEqual(table.jurisdictions(), ["sk"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""
+Tests for decision tables: the first-match scalar evaluation and the batch
+evaluation must agree.
+"""
+import unittest
+
+import numpy as np
+
+from tools.context import OffenceContext
+from tools.decision_table import DecisionTable, RuleFacts, invert, one_of
+from tools.grid import SentencingGrid
+from tools.main import STATUTE_DIRS
+from tools.registry import StatuteRegistry
+from tools.rule_versions import RULE_VERSIONS
+from tools.utils import standard_output
+
+# Two overlapping conditions: the first that holds decides
+TABLE = DecisionTable(
+    "example",
+    [
+        (lambda f: one_of(f.mode, ["summary"]), (False, None, ["cc787(1)"], "summary")),
+        (lambda f: invert(f.mode_code == 0) & (f.mode_code >= 0), (True, None, ["cc743"], "not summary")),
+        (lambda f: f.mode_code >= 0, (True, None, [], "unreachable")),
+    ],
+    default=(False, None, [], "no mode"),
+)
+
+
+class _Columns:
+    def __init__(self, modes):
+        facts = [RuleFacts(mode=mode) for mode in modes]
+        self.mode = np.array([fact.mode for fact in facts], dtype=object)
+        self.mode_code = np.array([fact.mode_code for fact in facts], dtype=np.int8)
+
+    def __len__(self):
+        return len(self.mode)
+
+
+class DecisionTableTests(unittest.TestCase):
+    def test_first_match(self):
+        """Test that the first condition that holds decides, and the default applies otherwise"""
+        modes = ["summary", "indictable", "hybrid", None]
+        self.assertEqual([TABLE.code(RuleFacts(mode=mode)) for mode in modes], [0, 1, 1, 3])
+        self.assertEqual(TABLE.codes(_Columns(modes)).tolist(), [0, 1, 1, 3])
+
+    def test_build(self):
+        """Test that results are built with the output function, as new objects"""
+        self.assertEqual(
+            TABLE.evaluate(RuleFacts(mode="summary")),
+            standard_output(False, None, ["cc787(1)"], "summary"),
+        )
+        first, second = TABLE.build(0), TABLE.build(0)
+        self.assertIsNot(first, second)
+        self.assertEqual(TABLE.available, (False, True, True, False))
+        self.assertIsNone(DecisionTable("none", []).evaluate(RuleFacts()))
+
+    def test_empty_table(self):
+        """Test that a table without conditions gives the default for every row"""
+        table = DecisionTable("empty", [], default=(True, None, [], None))
+        self.assertEqual(table.codes(_Columns(["summary", None])).tolist(), [0, 0])
+
+    def test_sentencing_tables(self):
+        """Test that every sentencing table gives the same outcome per row and in a batch"""
+        statutes = StatuteRegistry(STATUTE_DIRS)
+        rows = [row for code in statutes for row in statutes.statute(code).rows]
+        contexts = [OffenceContext(row) for row in rows]
+        for version in RULE_VERSIONS:
+            grid = SentencingGrid(rows, version.rules.SENTENCING_TABLES)
+            for rule, table in grid.tables.items():
+                with self.subTest(version=version.name, rule=rule):
+                    self.assertEqual(
+                        grid.outcomes[rule].tolist(),
+                        [table.code(context) for context in contexts],
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
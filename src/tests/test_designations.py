@@ -0,0 +1,69 @@
+"""
+Tests for the compiled designation lists: every listed section must reach the
+offence rows it names.
+"""
+import unittest
+
+from tools.designations import (
+    DNA_PRIMARY,
+    DNA_SECONDARY,
+    SOIRA_DESIGNATED,
+    SOIRA_PRIMARY,
+    SOIRA_SECONDARY,
+    compile_designations,
+    designation_profile,
+    is_designated,
+    unmatched_designations,
+)
+from tools.main import STATUTE_DIRS, parse_offence
+from tools.registry import StatuteRegistry
+
+
+class DesignationTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        statutes = StatuteRegistry(STATUTE_DIRS)
+        cls.sections = [row[0] for code in statutes for row in statutes.statute(code).rows]
+
+    def test_every_listed_section_matches(self):
+        """Test that every listed section covers at least one offence row"""
+        self.assertEqual(unmatched_designations(self.sections), {})
+
+    def test_unmatched_sections(self):
+        """Test that a misspelled section is reported with its list"""
+        self.assertEqual(
+            unmatched_designations(["cc_266"])["soira_primary"][:2],
+            ["cc_151", "cc_152"],
+        )
+
+    def test_prefixes(self):
+        """Test that a listed section applies to every offence below it"""
+        for section in ("cc_271#a", "cc_271#b", "cc_153(1)(a)", "cc_163.1(4.1)"):
+            with self.subTest(section=section):
+                self.assertTrue(is_designated(section, DNA_PRIMARY))
+                self.assertTrue(is_designated(section, SOIRA_PRIMARY))
+        self.assertEqual(designation_profile("cc_264.1(1)(a)") & DNA_SECONDARY, DNA_SECONDARY)
+        self.assertTrue(is_designated("cc_279(1.1)(b)", SOIRA_SECONDARY))
+        # A prefix does not take the bits of the offences below it
+        self.assertFalse(is_designated("cc_279", SOIRA_DESIGNATED))
+        self.assertEqual(designation_profile("cc_9999"), 0)
+        self.assertEqual(designation_profile("not a section"), 0)
+
+    def test_invalid_section(self):
+        """Test that a list entry that is not in section syntax is rejected"""
+        with self.assertRaises(ValueError):
+            compile_designations({DNA_PRIMARY: ["cc_266", "cc 98,1"]})
+
+    def test_sexual_assault(self):
+        """Test that sexual assault is a primary designated offence for DNA and SOIRA orders"""
+        for offence in parse_offence("cc_271", "indictable", ancillary_orders=True):
+            with self.subTest(section=offence["offence_data"]["section"]):
+                orders = offence["ancillary_orders"]
+                self.assertEqual(orders["dna_designation"]["notes"], "primary designated offence")
+                soira, = orders["soira"]
+                self.assertTrue(soira["status"]["available"])
+                self.assertEqual(soira["notes"], "primary designated offence")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for exporting the evaluated offence grid.
+"""
+import csv
+import io
+import json
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from pathlib import Path
+
+from tools.export import OFFENCE_COLUMNS, OUTPUT_FIELDS, export_grid, flatten_record, main
+from tools.main import STATUTE_DIRS, parse_rows
+from tools.registry import StatuteRegistry
+from tools.rule_versions import rule_versions
+
+
+class ExportGridTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rows = StatuteRegistry(STATUTE_DIRS).statute("cdsa").rows
+        cls.records = [flatten_record(parsed) for parsed in parse_rows(cls.rows, True, True, True, True)]
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def read_jsonl(self, path):
+        with open(path, encoding="utf-8") as jsonl_file:
+            return [json.loads(line) for line in jsonl_file]
+
+    def test_flatten_record(self):
+        """Test that a record holds the offence data, then four columns per rule output"""
+        record = self.records[0]
+        self.assertEqual(list(record)[:len(OFFENCE_COLUMNS)], list(OFFENCE_COLUMNS))
+        self.assertEqual(record["section"], self.rows[0][0])
+        self.assertEqual(record["indictable_maximum"], self.rows[0][3])
+        outputs = list(record)[len(OFFENCE_COLUMNS):]
+        self.assertEqual(len(outputs) % len(OUTPUT_FIELDS), 0)
+        self.assertIn("sentencing.cso_available.available", outputs)
+
+    def test_jsonl(self):
+        """Test that every row of the chosen statutes is written, in order, in chunks"""
+        path = self.directory / "grid.jsonl"
+        summary = export_grid(path, statutes=["cdsa"], chunk_size=7)
+        self.assertEqual((summary["rows"], summary["rule_version"]), (len(self.rows), "current"))
+        self.assertEqual(summary["columns"], len(self.records[0]))
+        self.assertEqual(self.read_jsonl(path), self.records)
+
+    def test_csv(self):
+        """Test that the CSV has a header and one line per row, with the same columns"""
+        path = self.directory / "grid.csv"
+        export_grid(path, statutes=["cdsa"])
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            rows = list(csv.DictReader(csv_file))
+        self.assertEqual(len(rows), len(self.rows))
+        self.assertEqual(list(rows[0]), list(self.records[0]))
+        self.assertEqual([row["section"] for row in rows], [record["section"] for record in self.records])
+
+    def test_jobs(self):
+        """Test that evaluating in worker processes writes the same file"""
+        serial = self.directory / "serial.jsonl"
+        parallel = self.directory / "parallel.jsonl"
+        export_grid(serial, statutes=["cdsa", "cannabis"], chunk_size=5)
+        export_grid(parallel, statutes=["cdsa", "cannabis"], chunk_size=5, jobs=2)
+        self.assertEqual(parallel.read_text(encoding="utf-8"), serial.read_text(encoding="utf-8"))
+
+    def test_rule_version(self):
+        """Test that a rule version can be given by an offence date"""
+        path = self.directory / "grid.jsonl"
+        summary = export_grid(path, statutes=["cdsa"], rule_version="2024-09-05")
+        self.assertEqual(summary["rule_version"], "2024-09-01")
+        version = rule_versions.get("2024-09-01")
+        expected = [flatten_record(parsed) for parsed in parse_rows(self.rows, True, True, True, True, version)]
+        self.assertEqual(self.read_jsonl(path), expected)
+
+    def test_invalid_arguments(self):
+        """Test that an unknown format, statute or rule version, or an empty chunk, is rejected"""
+        for kwargs in (
+            {"output": self.directory / "grid.xlsx"},
+            {"output": self.directory / "grid.csv", "statutes": ["unknown"]},
+            {"output": self.directory / "grid.csv", "rule_version": "2000-01-01"},
+            {"output": self.directory / "grid.csv", "chunk_size": 0},
+        ):
+            with self.subTest(**{key: str(value) for key, value in kwargs.items()}):
+                with self.assertRaises(ValueError):
+                    export_grid(**kwargs)
+
+    def test_parquet_without_pyarrow(self):
+        """Test that Parquet output without pyarrow fails with an install hint"""
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            pass
+        else:
+            self.skipTest("pyarrow is installed")
+        with self.assertRaisesRegex(RuntimeError, "pip install pyarrow"):
+            export_grid(self.directory / "grid.parquet", statutes=["cdsa"])
+
+    def test_command_line(self):
+        """Test that the command writes the file, and exits with an error for bad arguments"""
+        path = self.directory / "grid.out"
+        with redirect_stderr(io.StringIO()) as stderr:
+            main([str(path), "--format", "jsonl", "--statutes", "CDSA, cannabis"])
+        self.assertIn("Wrote", stderr.getvalue())
+        cannabis_rows = StatuteRegistry(STATUTE_DIRS).statute("cannabis").rows
+        self.assertEqual(len(self.read_jsonl(path)), len(self.rows) + len(cannabis_rows))
+
+        with redirect_stderr(io.StringIO()), self.assertRaises(SystemExit) as exit:
+            main([str(path), "--statutes", "unknown"])
+        self.assertEqual(exit.exception.code, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for selecting the tier of a graduated offence from prior convictions.
+"""
+import unittest
+
+from tools.graduated import GraduatedTable, PriorConviction
+from tools.main import CSV_FILE_PATH, parse_offence
+from tools.registry import OffenceRegistry
+
+
+class GraduatedTierTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = OffenceRegistry.from_csv(CSV_FILE_PATH)
+        cls.table = GraduatedTable(cls.registry.rows)
+
+    def tier(self, base, priors):
+        counts = self.table.prior_counts([priors])
+        group_id = self.table.select(self.table.base_ids([base]), counts)[0]
+        return [self.registry.rows[row_number][0] for row_number in self.table.groups[group_id]]
+
+    def test_no_priors(self):
+        """Test that a first offender gets the first offence tier"""
+        self.assertEqual(
+            self.tier("cc_320.14(1)", []),
+            ["cc_320.14(1)#1#a", "cc_320.14(1)#1#b", "cc_320.14(1)#1#c"],
+        )
+        self.assertEqual(self.tier("cc_344(1)(a)", []), ["cc_344(1)(a)#1"])
+
+    def test_one_impaired_prior(self):
+        """Test that one prior impaired operation conviction gives the second offence tier"""
+        self.assertEqual(self.tier("cc_320.14(1)", ["cc_253(1)(a)"]), ["cc_320.14(1)#2"])
+        self.assertEqual(self.tier("cc_320.14(1)", [" CC_320.15(1) "]), ["cc_320.14(1)#2"])
+
+    def test_two_priors(self):
+        """Test that two prior convictions give the subsequent offence tier"""
+        self.assertEqual(
+            self.tier("cc_320.14(1)", ["cc_253(1)(a)", "cc_320.14(1)"]),
+            ["cc_320.14(1)#s"],
+        )
+
+    def test_firearm_prior(self):
+        """Test that a prior firearm conviction makes a firearm offence a subsequent offence"""
+        for prior in ["cc_95(1)", "cc_117.01", "cc_236(a)", "cc_272(2)(a.1)", "cc_346(1.1)(a.1)"]:
+            with self.subTest(prior=prior):
+                self.assertEqual(self.tier("cc_344(1)(a)", [prior]), ["cc_344(1)(a)#s"])
+
+    def test_unrelated_prior(self):
+        """Test that a prior conviction in another category does not count"""
+        self.assertEqual(
+            self.tier("cc_320.14(1)", ["cc_266"]),
+            ["cc_320.14(1)#1#a", "cc_320.14(1)#1#b", "cc_320.14(1)#1#c"],
+        )
+        self.assertEqual(self.tier("cc_344(1)(a)", ["cc_253(1)(a)"]), ["cc_344(1)(a)#1"])
+
+    def test_conveyance_flag(self):
+        """Test that manslaughter counts towards impaired operation only by means of a conveyance"""
+        for prior in ["cc_236(b)", "cc_221", "cc_220(b)"]:
+            with self.subTest(prior=prior):
+                self.assertEqual(
+                    self.tier("cc_320.14(1)", [prior]),
+                    ["cc_320.14(1)#1#a", "cc_320.14(1)#1#b", "cc_320.14(1)#1#c"],
+                )
+                self.assertEqual(
+                    self.tier("cc_320.14(1)", [PriorConviction(prior, by_conveyance=True)]),
+                    ["cc_320.14(1)#2"],
+                )
+        # The flag does not make the conviction a firearm offence
+        self.assertEqual(
+            self.tier("cc_344(1)(a)", [PriorConviction("cc_236(b)", by_conveyance=True)]),
+            ["cc_344(1)(a)#1"],
+        )
+
+    def test_firearm_flag(self):
+        """Test that the s. 84(5)(c) offences count towards firearm offences only if a firearm was used"""
+        for prior in ["cc_236(b)", "cc_272(2)(a)#1", "cc_279(1.1)(b)", "cc_344(1)(b)"]:
+            with self.subTest(prior=prior):
+                self.assertEqual(self.tier("cc_344(1)(a)", [prior]), ["cc_344(1)(a)#1"])
+                self.assertEqual(
+                    self.tier("cc_344(1)(a)", [PriorConviction(prior, with_firearm=True)]),
+                    ["cc_344(1)(a)#s"],
+                )
+        # Offences outside s. 84(5) do not count with the flag either
+        self.assertEqual(
+            self.tier("cc_344(1)(a)", [PriorConviction("cc_266", with_firearm=True)]),
+            ["cc_344(1)(a)#1"],
+        )
+
+    def test_parse_offence_priors(self):
+        """Test that parse_offence returns the tier its priors select"""
+        cases = [
+            ([], ["cc_320.14(1)#1#a", "cc_320.14(1)#1#b", "cc_320.14(1)#1#c"]),
+            (["cc_253(1)(a)"], ["cc_320.14(1)#2"]),
+            (["cc_253(1)(a)", "cc_320.14(1)"], ["cc_320.14(1)#s"]),
+            (["cc_236(b)"], ["cc_320.14(1)#1#a", "cc_320.14(1)#1#b", "cc_320.14(1)#1#c"]),
+            ([PriorConviction("cc_236(b)", by_conveyance=True)], ["cc_320.14(1)#2"]),
+            (["cc_266"], ["cc_320.14(1)#1#a", "cc_320.14(1)#1#b", "cc_320.14(1)#1#c"]),
+        ]
+        for priors, sections in cases:
+            with self.subTest(priors=priors):
+                self.assertEqual(
+                    [
+                        offence["offence_data"]["section"]
+                        for offence in parse_offence("cc_320.14(1)", priors=priors)
+                    ],
+                    sections,
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
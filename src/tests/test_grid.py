@@ -0,0 +1,45 @@
+"""
+Tests for the vectorized sentencing grid: batch results must match the
+scalar engine row for row.
+"""
+import unittest
+
+from tools.grid import SentencingGrid
+from tools.main import STATUTE_DIRS, parse_row, parse_rows
+from tools.registry import StatuteRegistry
+from tools.rule_versions import RULE_VERSIONS
+from tools.utils import flatten_output
+
+
+class SentencingGridTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        statutes = StatuteRegistry(STATUTE_DIRS)
+        cls.rows = [row for code in statutes for row in statutes.statute(code).rows]
+
+    def test_parse_rows_matches_parse_row(self):
+        """Test that every row parses the same in a batch, under every rule version"""
+        for version in RULE_VERSIONS:
+            batch = parse_rows(self.rows, True, True, True, True, version)
+            for row, parsed_offence in zip(self.rows, batch):
+                with self.subTest(version=version.name, section=row[0]):
+                    self.assertEqual(parsed_offence, parse_row(row, True, True, True, True, version))
+
+    def test_available_masks(self):
+        """Test that each availability mask matches the scalar outputs, with no output as unavailable"""
+        grid = SentencingGrid(self.rows)
+        for rule in grid.tables:
+            expected = [
+                flatten_output(parse_row(row, sentencing=True)["sentencing"][rule])[0] is True
+                for row in self.rows
+            ]
+            self.assertEqual(grid.available(rule).tolist(), expected, rule)
+
+    def test_without_sentencing(self):
+        """Test that a batch without sentencing details holds only the requested groups"""
+        batch = parse_rows(self.rows[:3], procedure=True)
+        self.assertEqual([list(parsed_offence) for parsed_offence in batch], [["offence_data", "procedure"]] * 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
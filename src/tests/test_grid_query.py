@@ -0,0 +1,246 @@
+"""
+Tests for boolean queries over the offence grid: the bitmap answers must
+match the rule outputs they were built from.
+"""
+import unittest
+
+import numpy as np
+
+from tools.grid_query import (
+    COMPARISON_CACHE_SIZE,
+    MAX_QUERY_DEPTH,
+    GridIndex,
+    row_ids,
+    to_bitmap,
+    tokenize,
+)
+from tools.main import STATUTE_DIRS, parse_rows, query_grid
+from tools.registry import StatuteRegistry
+from tools.utils import LIST_SEPARATOR, flatten_output, parse_quantum
+
+
+class TokenizeTests(unittest.TestCase):
+    def test_tokens(self):
+        """Test that words, operators, strings, parentheses and keywords are split"""
+        self.assertEqual(
+            tokenize('NOT (mode==hybrid OR soira != "primary designated offence")'),
+            [
+                ("keyword", "not"),
+                ("paren", "("),
+                ("word", "mode"),
+                ("operator", "=="),
+                ("word", "hybrid"),
+                ("keyword", "or"),
+                ("word", "soira"),
+                ("operator", "!="),
+                ("string", "primary designated offence"),
+                ("paren", ")"),
+            ],
+        )
+
+    def test_invalid_character(self):
+        """Test that a character that cannot start a token is rejected"""
+        for expression in ('soira == "primary', "cso_available ! discharge_available"):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    tokenize(expression)
+
+    def test_bitmaps(self):
+        """Test that a mask packs into a bitmap whose set bits are the row IDs"""
+        mask = np.zeros(20, dtype=bool)
+        mask[[0, 9, 19]] = True
+        self.assertEqual(list(row_ids(to_bitmap(mask))), [0, 9, 19])
+        self.assertEqual(list(row_ids(0)), [])
+
+
+class GridIndexTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        statutes = StatuteRegistry(STATUTE_DIRS)
+        cls.rows = [row for code in statutes for row in statutes.statute(code).rows]
+        cls.results = parse_rows(cls.rows, True, True, True, True)
+        cls.index = GridIndex(cls.rows, cls.results)
+
+    def matching(self, predicate):
+        return [row_id for row_id, result in enumerate(self.results) if predicate(result)]
+
+    def query(self, expression):
+        return list(row_ids(self.index.bitmap(expression)))
+
+    def output(self, result, rule):
+        group, name = rule.split(".", 1)
+        return flatten_output(result[group][name])
+
+    def test_available(self):
+        """Test that a rule term matches the rows where the option is available"""
+        for rule in self.index.rules():
+            with self.subTest(rule=rule):
+                self.assertEqual(
+                    self.query(rule),
+                    self.matching(lambda result: bool(self.output(result, rule)[0])),
+                )
+
+    def test_notes(self):
+        """Test that a notes term matches the rows whose notes include the text"""
+        rule = "ancillary_orders.dna_designation"
+        for note in self.index.notes("dna_designation"):
+            with self.subTest(note=note):
+                expected = self.matching(
+                    lambda result: any(
+                        note in (text or "").split(LIST_SEPARATOR)
+                        for text in (self.output(result, rule)[1], self.output(result, rule)[3])
+                    )
+                )
+                self.assertTrue(expected)
+                self.assertEqual(self.query(f'dna_designation == "{note}"'), expected)
+                self.assertEqual(
+                    self.query(f'dna_designation != "{note}"'),
+                    sorted(set(range(len(self.rows))) - set(expected)),
+                )
+
+    def test_mode_and_statute(self):
+        """Test that mode and statute terms match the offence data"""
+        self.assertEqual(
+            self.query("mode == HYBRID"),
+            self.matching(lambda result: result["offence_data"]["mode"] == "hybrid"),
+        )
+        self.assertEqual(
+            [self.rows[row_id][0] for row_id in self.query("statute == cdsa")],
+            [row[0] for row in self.rows if row[0].startswith("cdsa")],
+        )
+        self.assertEqual(self.query("mode == unknown"), [])
+
+    def test_quanta(self):
+        """Test that quantum terms compare terms in days and fines in dollars"""
+        ten_years = parse_quantum("10y").jail_days
+        self.assertEqual(
+            self.query("indictable_maximum >= 10y"),
+            [
+                row_id for row_id, row in enumerate(self.rows)
+                if parse_quantum(row[3]).has_jail and parse_quantum(row[3]).jail_days >= ten_years
+            ],
+        )
+        self.assertEqual(
+            self.query("summary_minimum > 0"),
+            [
+                row_id for row_id, row in enumerate(self.rows)
+                if parse_quantum(row[4]).has_jail and parse_quantum(row[4]).jail_days > 0
+            ],
+        )
+        self.assertEqual(
+            self.query("summary_minimum >= 1000$"),
+            [
+                row_id for row_id, row in enumerate(self.rows)
+                if parse_quantum(row[4]).has_fine and parse_quantum(row[4]).fine_dollars >= 1000
+            ],
+        )
+
+    def test_missing_quanta(self):
+        """Test that offences without a quantum match no comparison with it"""
+        summary_only = self.query("mode == summary")
+        self.assertTrue(summary_only)
+        for expression in (
+            "indictable_maximum < 1y",
+            "indictable_maximum == 0",
+            "indictable_maximum != 10y",
+            "indictable_maximum <= 1000000$",
+        ):
+            with self.subTest(expression=expression):
+                self.assertFalse(set(self.query(expression)) & set(summary_only))
+        self.assertEqual(
+            self.query("indictable_maximum < 1y"),
+            [
+                row_id for row_id, row in enumerate(self.rows)
+                if parse_quantum(row[3]).has_jail and parse_quantum(row[3]).jail_days < 365
+            ],
+        )
+
+    def test_combinations(self):
+        """Test that and, or, not and parentheses combine terms with the usual precedence"""
+        cso = set(self.query("cso_available"))
+        discharge = set(self.query("discharge_available"))
+        hybrid = set(self.query("mode == hybrid"))
+        everything = set(range(len(self.rows)))
+        self.assertEqual(set(self.query("cso_available and not discharge_available")), cso - discharge)
+        self.assertEqual(
+            set(self.query("mode == hybrid and cso_available or discharge_available")),
+            (hybrid & cso) | discharge,
+        )
+        self.assertEqual(
+            set(self.query("mode == hybrid and (cso_available or discharge_available)")),
+            hybrid & (cso | discharge),
+        )
+        self.assertEqual(set(self.query("not not cso_available")), cso)
+        self.assertEqual(set(self.query("cso_available or not cso_available")), everything)
+        self.assertEqual(self.index.count("cso_available"), len(cso))
+
+    def test_invalid_queries(self):
+        """Test that malformed queries and unknown names are rejected"""
+        for expression in (
+            "",
+            "cso_available and",
+            "(cso_available",
+            "cso_available)",
+            "cso_available discharge_available",
+            "unknown_rule",
+            "mode < hybrid",
+            "indictable_maximum >= ten",
+            "mode ==",
+            "== hybrid",
+        ):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    self.index.bitmap(expression)
+
+    def test_limits(self):
+        """Test that overlong and deeply nested queries are rejected"""
+        for expression in (
+            "(" * 2000,
+            "(" * (MAX_QUERY_DEPTH + 1) + "cso_available" + ")" * (MAX_QUERY_DEPTH + 1),
+            "not " * (MAX_QUERY_DEPTH + 1) + "cso_available",
+            " or ".join(["cso_available"] * 100),
+        ):
+            with self.subTest(expression=expression[:20]):
+                with self.assertRaises(ValueError):
+                    self.index.bitmap(expression)
+
+        cso = self.query("cso_available")
+        self.assertEqual(
+            self.query("(" * MAX_QUERY_DEPTH + "cso_available" + ")" * MAX_QUERY_DEPTH),
+            cso,
+        )
+        # Siblings do not add to the depth
+        self.assertEqual(
+            self.query(" and ".join(["(not (cso_available))"] * MAX_QUERY_DEPTH)),
+            sorted(set(range(len(self.rows))) - set(cso)),
+        )
+
+    def test_comparison_cache(self):
+        """Test that the quantum comparisons kept are bounded"""
+        index = GridIndex(self.rows, self.results)
+        for days in range(COMPARISON_CACHE_SIZE + 10):
+            index.bitmap(f"indictable_maximum >= {days}d")
+        self.assertEqual(len(index._comparisons), COMPARISON_CACHE_SIZE)
+        self.assertEqual(
+            index.bitmap("indictable_maximum >= 10y"),
+            self.index.bitmap("indictable_maximum >= 10y"),
+        )
+
+    def test_query(self):
+        """Test that a query returns the section and description of each row"""
+        results = self.index.query("section == cc_266")
+        self.assertEqual(results, [{"section": "cc_266", "description": "assault"}])
+
+    def test_section(self):
+        """Test that a section term matches any spelling of the section"""
+        def sections(expression):
+            return [offence["section"] for offence in query_grid(expression)]
+
+        self.assertEqual(sections("section == cc266"), ["cc_266"])
+        self.assertEqual(sections('section == "cdsa_4(3)"'), ["cdsa4(3)", "cdsa4(3)"])
+        self.assertEqual(sections("section == cc_9999"), [])
+        self.assertNotIn("cc_266", sections("section != cc_266"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for the offence name search: the ranking, the similarity threshold and
+the result limit.
+"""
+import unittest
+
+from tools.main import search_offences
+from tools.offence_search import OffenceSearchIndex, normalize, trigram_positions, trigrams
+
+ENTRIES = [
+    ("a", "assault"),
+    ("b", "assault causing bodily harm"),
+    ("c", "aggravated assault"),
+    ("d", "sexual assault"),
+    ("e", "theft"),
+    ("a", "assault"),
+]
+
+
+def dice(first, second):
+    return 2 * len(first & second) / (len(first) + len(second))
+
+
+class OffenceSearchIndexTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.index = OffenceSearchIndex(ENTRIES)
+
+    def sections(self, query, **kwargs):
+        return [match["section"] for match in self.index.search(query, **kwargs)]
+
+    def test_trigrams(self):
+        """Test that text is normalized to words and padded per word"""
+        self.assertEqual(normalize("Break-and-Enter  (Dwelling)"), "break and enter dwelling")
+        self.assertEqual(trigrams("ab"), {"  a", " ab", "ab "})
+
+    def test_repeated_entries(self):
+        """Test that a repeated entry is indexed once"""
+        self.assertEqual(len(self.index), 5)
+
+    def test_scores(self):
+        """Test that a score is the Dice similarity with the name, or with its start if higher"""
+        query = "asault"
+        for match in self.index.search(query, threshold=0):
+            name = match["description"]
+            # The start of the name: its trigrams that begin within the query's length
+            start = {
+                trigram for trigram, position in trigram_positions(name).items()
+                if position <= len(normalize(query))
+            }
+            expected = max(dice(trigrams(query), trigrams(name)), dice(trigrams(query), start))
+            self.assertAlmostEqual(match["score"], expected, places=3, msg=name)
+
+    def test_ranking(self):
+        """Test that the best match comes first, with ties going to names the query starts"""
+        self.assertEqual(self.sections("assault"), ["a", "b", "d", "c"])
+        self.assertEqual(self.sections("assault caus")[0], "b")
+        self.assertEqual(self.sections("sexual asault")[0], "d")
+        self.assertEqual(self.sections("theft"), ["e"])
+
+    def test_threshold(self):
+        """Test that matches below the threshold are left out"""
+        self.assertEqual(self.sections("xyz"), [])
+        self.assertEqual(self.sections(""), [])
+        self.assertEqual(self.sections("assault", threshold=0.9), ["a", "b"])
+        self.assertTrue(all(match["score"] >= 0.3 for match in self.index.search("asault")))
+
+    def test_limit(self):
+        """Test that at most limit matches are returned"""
+        self.assertEqual(self.sections("assault", limit=2), ["a", "b"])
+        self.assertEqual(self.sections("assault", limit=0), [])
+
+    def test_registry(self):
+        """Test that the offences of every statute are searched, tolerating typos"""
+        matches = search_offences("sexual asault", 3)
+        self.assertEqual(matches[0]["section"], "cc_271#a")
+        self.assertEqual(len(matches), 3)
+        self.assertTrue(search_offences("possesion of substance"))
+
+
+if __name__ == "__main__":
+    unittest.main()
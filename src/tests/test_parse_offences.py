@@ -0,0 +1,69 @@
+"""
+Tests for the streaming parse_offences batch API.
+"""
+import unittest
+
+from tools.main import parse_offence, parse_offences
+from tools.parsed_offence import ParsedOffence
+
+
+class ParseOffencesTests(unittest.TestCase):
+    def test_input_order(self):
+        """Test that results are yielded in input order, with per-item modes"""
+        offences = ["cc_266", ("cc_267(a)", "indictable"), "cc_271", "cc_266"]
+        results = list(parse_offences(offences, full=True))
+        self.assertEqual(len(results), 4)
+        self.assertEqual(
+            [result[0]["offence_data"]["section"] for result in results],
+            ["cc_266", "cc_267(a)", "cc_271#a", "cc_266"],
+        )
+        self.assertEqual(
+            [offence.to_dict() for offence in results[1]],
+            [offence.to_dict() for offence in parse_offence("cc_267(a)", "indictable", full=True)],
+        )
+
+    def test_repeats_share_results(self):
+        """Test that repeated requests in a window are parsed once"""
+        first, second, other = parse_offences(["cc_266", " CC_266", ("cc_266", "indictable")])
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_results_are_bounded(self):
+        """Test that only a window's worth of distinct results is kept"""
+        offences = ["cc_266", "cc_271", "cc_266", "cc_267(a)", "cc_264.1", "cc_272", "cc_266"]
+        results = list(parse_offences(offences, window=2))
+        # Kept from the first window for the second, dropped by the third
+        self.assertIs(results[0], results[2])
+        self.assertIsNot(results[2], results[6])
+        self.assertEqual(results[2][0].to_dict(), results[6][0].to_dict())
+
+    def test_errors(self):
+        """Test that an unknown offence raises, or is returned in its place"""
+        with self.assertRaises(KeyError):
+            list(parse_offences(["cc_266", "cc_9999"]))
+
+        results = list(parse_offences(["cc_9999", "cc_266"], errors="return"))
+        self.assertIsInstance(results[0], KeyError)
+        self.assertEqual(results[1][0]["offence_data"]["section"], "cc_266")
+
+        with self.assertRaises(ValueError):
+            list(parse_offences(["cc_266"], errors="ignore"))
+        with self.assertRaises(ValueError):
+            list(parse_offences(["cc_266"], window=0))
+
+    def test_workers(self):
+        """Test that results from worker processes match serial results"""
+        offences = ["cc_266", "cc_271", "cc_9999", "cc_266"]
+        serial = list(parse_offences(offences, full=True, errors="return"))
+        parallel = list(parse_offences(offences, full=True, errors="return", jobs=2))
+        self.assertIsInstance(parallel[2], KeyError)
+        for serial_result, parallel_result in zip(serial[:2] + serial[3:], parallel[:2] + parallel[3:]):
+            self.assertTrue(all(isinstance(offence, ParsedOffence) for offence in parallel_result))
+            self.assertEqual(
+                [offence.to_dict() for offence in parallel_result],
+                [offence.to_dict() for offence in serial_result],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
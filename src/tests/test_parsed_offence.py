@@ -0,0 +1,45 @@
+"""
+Tests for lazy ParsedOffence results and their serialization.
+"""
+import io
+import json
+import pickle
+import unittest
+
+from tools.main import parse_offence, report
+
+
+class ParsedOffenceTests(unittest.TestCase):
+    def test_groups_are_computed_when_read(self):
+        """Test that each group is computed on first read"""
+        offence = parse_offence("cc_266", full=True)[0]
+        self.assertFalse(offence.computed("sentencing"))
+        self.assertEqual(offence["offence_data"]["section"], "cc_266")
+        self.assertFalse(offence.computed("sentencing"))
+        self.assertIs(offence.sentencing, offence["sentencing"])
+
+    def test_json(self):
+        """Test that to_dict() serializes, and that the result itself does not"""
+        offence = parse_offence("cc_266", full=True)[0]
+        with self.assertRaises(TypeError):
+            json.dumps(offence)
+        self.assertEqual(json.loads(json.dumps(offence.to_dict()))["offence_data"]["section"], "cc_266")
+
+    def test_jsonl_report(self):
+        """Test that the jsonl report writes each result's plain dictionary"""
+        sink = io.StringIO()
+        count = report("cc_266", sink=sink, format="jsonl")
+        self.assertEqual(count, 1)
+        self.assertEqual(
+            json.loads(sink.getvalue()),
+            json.loads(json.dumps(parse_offence("cc_266", full=True)[0].to_dict())),
+        )
+
+    def test_pickle(self):
+        """Test that a pickled result carries its groups"""
+        offence = parse_offence("cc_266", full=True)[0]
+        self.assertEqual(pickle.loads(pickle.dumps(offence)).to_dict(), offence.to_dict())
+
+
+if __name__ == "__main__":
+    unittest.main()
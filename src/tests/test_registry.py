@@ -0,0 +1,58 @@
+"""
+Tests for resolving offence codes through the offence registry.
+"""
+import unittest
+
+from tools.main import CSV_FILE_PATH
+from tools.registry import OffenceRegistry
+
+
+class OffenceRegistryTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.registry = OffenceRegistry.from_csv(CSV_FILE_PATH)
+
+    def sections(self, offence):
+        return [row[0] for row in self.registry.lookup(offence)]
+
+    def test_subsection_prefix(self):
+        """Test that a subsection resolves to the offences below it only"""
+        self.assertEqual(
+            self.sections("cc_320.14(1)"),
+            [
+                "cc_320.14(1)#1#a",
+                "cc_320.14(1)#1#b",
+                "cc_320.14(1)#1#c",
+                "cc_320.14(1)#2",
+                "cc_320.14(1)#s",
+            ],
+        )
+
+    def test_misspelled_map_keys(self):
+        """Test that the old s. 286 keys still resolve to s. 286.1"""
+        self.assertEqual(
+            self.sections("cc_286(1)(a)(i)"),
+            ["cc_286.1(1)(a)(i)#1", "cc_286.1(1)(a)(i)#s"],
+        )
+        self.assertEqual(
+            self.sections("cc_286(1)(a)(ii)"),
+            ["cc_286.1(1)(a)(ii)#1", "cc_286.1(1)(a)(ii)#s"],
+        )
+
+    def test_section_spellings(self):
+        """Test that any spelling of a section resolves to that section only"""
+        for offence in ("cc266", "CC_266", "cc_266"):
+            self.assertEqual(self.sections(offence), ["cc_266"])
+        # cc_123 is also the parent of cc_123(1) and cc_123(2)
+        self.assertEqual(self.sections("cc123"), ["cc_123"])
+        self.assertEqual(self.sections("cc_239(1)(a)-1"), ["cc_239(1)(a)#1"])
+        self.assertIn("cc266", self.registry)
+
+    def test_unknown_offence(self):
+        """Test that a section that is not in the data raises a KeyError"""
+        with self.assertRaises(KeyError):
+            self.registry.lookup("cc_334(1)(a)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""
+Tests for hot reloading of the offence data.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from tools.main import CSV_FILE_PATH
+from tools.reloading import ReloadingRegistry
+
+# The CSV does not end with a newline
+NEW_ROW = "\ncc_999,test offence,,2y,,\n"
+
+
+class ReloadingRegistryTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.csv = self.directory / CSV_FILE_PATH.name
+        shutil.copyfile(CSV_FILE_PATH, self.csv)
+        self.swapped = []
+        self.reloader = ReloadingRegistry([self.directory], on_swap=self.swapped.append)
+
+    def modify(self, contents: bytes):
+        # Move the modification time on, in case the file system's clock is coarse
+        mtime = self.csv.stat().st_mtime_ns
+        self.csv.write_bytes(contents)
+        os.utime(self.csv, ns=(mtime + 10**9, mtime + 10**9))
+
+    def test_unchanged(self):
+        """Test that a check without changes does not rebuild"""
+        self.assertFalse(self.reloader.check(wait=True))
+        self.assertEqual(self.reloader.current.number, 1)
+        self.assertEqual(self.reloader.metrics()["rebuilds"], 0)
+
+    def test_swap(self):
+        """Test that a changed CSV is rebuilt and swapped in, leaving the old version intact"""
+        old = self.reloader.current
+        self.assertNotIn("cc_999", old.statutes)
+
+        self.modify(CSV_FILE_PATH.read_bytes() + NEW_ROW.encode())
+        self.assertTrue(self.reloader.check(wait=True))
+
+        new = self.reloader.current
+        self.assertEqual(new.number, 2)
+        self.assertNotEqual(new.source_hash, old.source_hash)
+        self.assertEqual(self.reloader.statutes.lookup("cc_999")[0][1], "test offence")
+        self.assertNotIn("cc_999", old.statutes)
+        self.assertEqual(self.swapped, [new])
+
+        metrics = self.reloader.metrics()
+        self.assertEqual((metrics["version"], metrics["rebuilds"]), (2, 1))
+        self.assertIsNotNone(metrics["last_reload_seconds"])
+        self.assertFalse(metrics["rebuilding"])
+
+    def test_touch(self):
+        """Test that a file whose contents did not change is not rebuilt"""
+        self.modify(CSV_FILE_PATH.read_bytes())
+        self.assertTrue(self.reloader.check(wait=True))
+        self.assertEqual(self.reloader.current.number, 1)
+        self.assertEqual(self.swapped, [])
+        # The new modification time is recorded, so the next check is clean
+        self.assertFalse(self.reloader.check(wait=True))
+
+    def test_failed_rebuild(self):
+        """Test that a failed rebuild keeps the current version and is not retried until the files change"""
+        old = self.reloader.current
+        self.modify(b"\xff\xfe not a CSV")
+        with self.assertLogs("tools.reloading", level="ERROR"):
+            self.assertTrue(self.reloader.check(wait=True))
+
+        self.assertIs(self.reloader.current, old)
+        metrics = self.reloader.metrics()
+        self.assertEqual((metrics["failed_rebuilds"], metrics["rebuilds"]), (1, 0))
+        self.assertIn("UnicodeDecodeError", metrics["last_error"])
+
+        # The same files are not rebuilt again
+        self.assertTrue(self.reloader.check(wait=True))
+        self.assertEqual(self.reloader.metrics()["failed_rebuilds"], 1)
+
+        # Fixing the file is picked up, and clears the error
+        self.modify(CSV_FILE_PATH.read_bytes() + NEW_ROW.encode())
+        self.assertTrue(self.reloader.check(wait=True))
+        self.assertEqual(self.reloader.current.number, 2)
+        self.assertIsNone(self.reloader.metrics()["last_error"])
+
+    def test_maybe_check(self):
+        """Test that maybe_check waits for the check interval"""
+        reloader = ReloadingRegistry([self.directory], check_interval=3600)
+        self.modify(CSV_FILE_PATH.read_bytes() + NEW_ROW.encode())
+        self.assertFalse(reloader.maybe_check())
+        self.assertEqual(reloader.current.number, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Tests for the report renderers: each format's layout is compared with its
+expected output for one offence.
+"""
+import io
+import unittest
+
+from tools.main import parse_offence
+from tools.report import REPORT_FORMATS, format_quantum, render_reports
+from tools.utils import parse_quantum, standard_output
+
+OFFENCE = {
+    "offence_data": {
+        "section": "cc_266",
+        "description": "assault",
+        "mode": "hybrid",
+        "summary_minimum": parse_quantum(""),
+        "summary_maximum": parse_quantum("2y"),
+        "indictable_minimum": parse_quantum(""),
+        "indictable_maximum": parse_quantum("5y"),
+    },
+    "sentencing": {
+        "cso_available": standard_output(True, None, ["cc742.1"], "no mandatory minimum"),
+        "discharge_available": standard_output(False, None, ["cc730(1)"], None),
+    },
+}
+
+RULE = "=" * 80
+SECTION_RULE = "-" * 50
+
+TEXT = f"""
+{RULE}
+Criminal Code s. 266 — Assault
+{RULE}
+
+BASIC INFORMATION
+{SECTION_RULE}
+Mode of Proceeding: Hybrid
+
+SENTENCING RANGES
+{SECTION_RULE}
+
+Summary Proceedings:
+  Minimum: None
+  Maximum: 2 years
+
+Indictable Proceedings:
+  Minimum: None
+  Maximum: 5 years
+
+SENTENCING OPTIONS
+{SECTION_RULE}
+Conditional Sentence: Available
+  Reason: no mandatory minimum
+Discharge: Not Available
+
+{RULE}
+
+"""
+
+MARKDOWN = """## Criminal Code s. 266 — Assault
+
+### BASIC INFORMATION
+
+- **Mode of Proceeding:** Hybrid
+
+### SENTENCING RANGES
+
+- **Summary Proceedings**
+  - Minimum: None
+  - Maximum: 2 years
+- **Indictable Proceedings**
+  - Minimum: None
+  - Maximum: 5 years
+
+### SENTENCING OPTIONS
+
+- **Conditional Sentence:** Available
+  - Reason: no mandatory minimum
+- **Discharge:** Not Available
+
+"""
+
+HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Offence Report</title>
+</head>
+<body>
+<article id="cc_266">
+<h2>Criminal Code s. 266 — Assault</h2>
+<h3>BASIC INFORMATION</h3>
+<p><strong>Mode of Proceeding:</strong> Hybrid</p>
+<h3>SENTENCING RANGES</h3>
+<p><strong>Summary Proceedings</strong></p>
+<p class="detail">Minimum: None</p>
+<p class="detail">Maximum: 2 years</p>
+<p><strong>Indictable Proceedings</strong></p>
+<p class="detail">Minimum: None</p>
+<p class="detail">Maximum: 5 years</p>
+<h3>SENTENCING OPTIONS</h3>
+<p><strong>Conditional Sentence:</strong> Available</p>
+<p class="detail">Reason: no mandatory minimum</p>
+<p><strong>Discharge:</strong> Not Available</p>
+</article>
+</body>
+</html>
+"""
+
+
+def render(offences, format):
+    sink = io.StringIO()
+    count = render_reports(offences, sink, format)
+    return count, sink.getvalue()
+
+
+class RenderReportsTests(unittest.TestCase):
+    def test_text(self):
+        """Test the plain text layout"""
+        self.assertEqual(render([OFFENCE], "text"), (1, TEXT))
+
+    def test_markdown(self):
+        """Test the Markdown layout"""
+        self.assertEqual(render([OFFENCE], "markdown"), (1, MARKDOWN))
+
+    def test_html(self):
+        """Test the HTML layout"""
+        self.assertEqual(render([OFFENCE], "html"), (1, HTML))
+
+    def test_html_escaping(self):
+        """Test that every value written into HTML is escaped"""
+        offence = dict(OFFENCE)
+        offence["offence_data"] = dict(OFFENCE["offence_data"], section='cc_"1"', description="<b>a & b</b>")
+        offence["sentencing"] = {"cso_available": standard_output(True, None, [], "<script>alert(1)</script>")}
+        _, output = render([offence], "html")
+        self.assertIn('<article id="cc_&quot;1&quot;">', output)
+        self.assertIn("&lt;B&gt;A &amp; B&lt;/B&gt;", output)
+        self.assertIn("Reason: &lt;script&gt;alert(1)&lt;/script&gt;", output)
+        self.assertNotIn("<script>", output)
+        self.assertNotIn("<b>", output.lower())
+
+    def test_streaming(self):
+        """Test that several offences are written in one document, in order"""
+        count, output = render(iter([OFFENCE, OFFENCE]), "html")
+        self.assertEqual(count, 2)
+        self.assertEqual(output.count("<article"), 2)
+        self.assertEqual(output.count("<!DOCTYPE html>"), 1)
+        self.assertEqual(render([], "markdown"), (0, ""))
+
+    def test_every_format(self):
+        """Test that a full parse result renders in every format"""
+        offences = parse_offence("cc_266", full=True)
+        for format in REPORT_FORMATS:
+            with self.subTest(format=format):
+                count, output = render(offences, format)
+                self.assertEqual(count, 1)
+                self.assertIn("266", output)
+
+    def test_invalid_format(self):
+        """Test that an unknown format is rejected"""
+        with self.assertRaises(ValueError):
+            render([OFFENCE], "pdf")
+
+    def test_format_quantum(self):
+        """Test that quanta are described with their fine, term or life"""
+        self.assertEqual(format_quantum(parse_quantum("5000$&2y")), "$5000 dollars and 2 years")
+        self.assertEqual(format_quantum(parse_quantum("255y")), "life")
+        self.assertEqual(format_quantum(parse_quantum("")), "None")
+        self.assertEqual(format_quantum(None), "None")
+
+
+if __name__ == "__main__":
+    unittest.main()
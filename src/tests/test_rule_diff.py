@@ -0,0 +1,61 @@
+"""
+Tests for comparing rule versions.
+"""
+import io
+import json
+import unittest
+
+from tools.rule_diff import diff_outcomes, diff_rule_versions, normalize_output, offence_rows, write_diff
+from tools.utils import standard_output
+
+
+class RuleDiffTests(unittest.TestCase):
+    def test_output_shapes(self):
+        """Test that the same outcome in the old and new output shapes is not a change"""
+        old = {"ancillary_orders": {"soira": {"status": "primary", "section": "cc490.011", "notes": None}}}
+        new = {"ancillary_orders": {"soira": standard_output(True, "primary", ["cc490.011"], None)}}
+        self.assertEqual(diff_outcomes(old, new, ["available", "status_notes", "sections"]), {})
+
+    def test_changed_fields_only(self):
+        """Test that only the fields that differ are reported"""
+        old = {"sentencing": {"cso_available": standard_output(True, None, ["cc742.1"], "a")}}
+        new = {"sentencing": {"cso_available": standard_output(False, None, ["cc742.1"], "b")}}
+        self.assertEqual(
+            diff_outcomes(old, new),
+            {"sentencing.cso_available": {"available": [True, False]}},
+        )
+        self.assertEqual(
+            diff_outcomes(old, new, ["sections", "notes"]),
+            {"sentencing.cso_available": {"notes": ["a", "b"]}},
+        )
+
+    def test_missing_rule(self):
+        """Test that a rule missing from one version compares as not available"""
+        self.assertEqual(normalize_output(None)["available"], False)
+        new = {"sentencing": {"fine_alone": standard_output(True, None, [], None)}}
+        self.assertEqual(
+            diff_outcomes({"sentencing": {}}, new),
+            {"sentencing.fine_alone": {"available": [False, True]}},
+        )
+
+    def test_same_version(self):
+        """Test that a version compared with itself has no changes"""
+        diff = diff_rule_versions("current", "current", rows=offence_rows()[:50], jobs=1)
+        self.assertEqual((diff["rows"], diff["changed_rows"]), (50, 0))
+
+    def test_unknown_field(self):
+        """Test that an unknown field is rejected"""
+        with self.assertRaises(ValueError):
+            diff_rule_versions("current", "current", rows=[], jobs=1, fields=["outcome"])
+
+    def test_compact_output(self):
+        """Test that the compact output is valid JSON with one changed row per line"""
+        diff = diff_rule_versions("2024-09-01", "current", rows=offence_rows()[:20], jobs=1)
+        output = io.StringIO()
+        write_diff(diff, output)
+        self.assertEqual(json.loads(output.getvalue()), diff)
+        self.assertEqual(len(output.getvalue().splitlines()), diff["changed_rows"] + 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for selecting the rule version in force on an offence date.
+"""
+import unittest
+from datetime import date, datetime
+
+from tools.rule_versions import (
+    CURRENT_RULE_VERSION,
+    RuleVersion,
+    RuleVersionRegistry,
+    UnsupportedOffenceDate,
+    parse_offence_date,
+    rule_version,
+    rule_versions,
+)
+
+
+class RuleVersionRegistryTests(unittest.TestCase):
+    def name(self, offence_date):
+        return rule_versions.resolve(offence_date).name
+
+    def test_boundaries(self):
+        """Test that each version applies from its first to its last day inclusive"""
+        self.assertEqual(self.name("2024-09-01"), "2024-09-01")
+        self.assertEqual(self.name("2024-09-17"), "2024-09-01")
+        self.assertEqual(self.name("2024-09-18"), "current")
+        self.assertEqual(self.name(date(2030, 1, 1)), "current")
+        self.assertEqual(self.name(datetime(2024, 9, 17, 23, 59)), "2024-09-01")
+
+    def test_ranges(self):
+        """Test that a date range resolves to the version in force on its first day"""
+        self.assertEqual(self.name("2024-09-10&2024-10-01"), "2024-09-01")
+        self.assertEqual(self.name(" 2024-09-18 & 2025-01-01 "), "current")
+
+    def test_unsupported_dates(self):
+        """Test that a date before the earliest version is rejected as unsupported"""
+        for offence_date in ("2024-08-31", "2015-01-01&2024-09-05", date(1990, 1, 1)):
+            with self.subTest(offence_date=offence_date):
+                with self.assertRaisesRegex(UnsupportedOffenceDate, "before 2024-09-01 are not supported"):
+                    rule_versions.resolve(offence_date)
+        with self.assertRaises(UnsupportedOffenceDate):
+            rule_versions.get("2024-08-31")
+
+    def test_invalid_dates(self):
+        """Test that malformed dates and reversed ranges are rejected"""
+        for offence_date in ("2024-13-01", "09/18/2024", "2024-09-18&2024-09-01", "a&b&c"):
+            with self.subTest(offence_date=offence_date):
+                with self.assertRaises(ValueError):
+                    parse_offence_date(offence_date)
+
+    def test_get(self):
+        """Test that a version is found by name or by date"""
+        self.assertIs(rule_versions.get("current"), CURRENT_RULE_VERSION)
+        self.assertEqual(rule_versions.get("2024-09-05").name, "2024-09-01")
+        self.assertIs(rule_version(), CURRENT_RULE_VERSION)
+
+    def test_gap(self):
+        """Test that a date between two versions is not covered"""
+        registry = RuleVersionRegistry([
+            RuleVersion("old", "cc_rules_current", date(2020, 1, 1), date(2020, 12, 31)),
+            RuleVersion("new", "cc_rules_current", date(2022, 1, 1)),
+        ])
+        with self.assertRaisesRegex(ValueError, "No rule version is in force"):
+            registry.resolve("2021-06-01")
+        self.assertEqual(registry.resolve("2022-01-01").name, "new")
+
+    def test_overlap(self):
+        """Test that overlapping versions are rejected"""
+        with self.assertRaises(ValueError):
+            RuleVersionRegistry([
+                RuleVersion("old", "cc_rules_current", date(2020, 1, 1)),
+                RuleVersion("new", "cc_rules_current", date(2022, 1, 1)),
+            ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for canonical section spellings and section IDs.
+"""
+import unittest
+
+from tools.section_ids import (
+    NO_ID,
+    SPELLING_CACHE_SIZE,
+    SectionIds,
+    canonical_section,
+    normalize_key,
+)
+
+
+class CanonicalSectionTests(unittest.TestCase):
+    def test_canonical_section(self):
+        """Test that every spelling of a section maps to its CSV spelling"""
+        self.assertEqual(canonical_section("cc_99(2)-1"), "cc_99(2)#1")
+        self.assertEqual(canonical_section("cc742.1"), "cc_742.1")
+        self.assertEqual(canonical_section("cdsa_5(2)"), "cdsa5(2)")
+        self.assertEqual(canonical_section("cdsa4(3)"), "cdsa4(3)")
+        self.assertIsNone(canonical_section("not a section"))
+
+    def test_normalize_key(self):
+        """Test that reported sentence keys are cleaned up"""
+        self.assertEqual(normalize_key("145(5)"), ("cc_145(5)", False))
+        self.assertEqual(normalize_key("cc_266_ycja"), ("cc_266", True))
+        self.assertEqual(normalize_key("cc_320.15(1)#1)"), ("cc_320.15(1)#1", False))
+        self.assertIsNone(normalize_key("unknown"))
+
+
+class SectionIdsTests(unittest.TestCase):
+    def test_intern(self):
+        """Test that IDs are dense and shared by every spelling of a section"""
+        ids = SectionIds(["cc_266", "cdsa4(3)"])
+        self.assertEqual(ids.intern("cc266"), 0)
+        self.assertEqual(ids.intern("cdsa_4(3)"), 1)
+        self.assertEqual(ids.intern("cc_267(a)"), 2)
+        self.assertEqual(list(ids), ["cc_266", "cdsa4(3)", "cc_267(a)"])
+        self.assertEqual(ids.section(2), "cc_267(a)")
+        with self.assertRaises(ValueError):
+            ids.intern("not a section")
+        with self.assertRaises(IndexError):
+            ids.section(NO_ID)
+
+    def test_get(self):
+        """Test that a section that is not in the table has no ID"""
+        ids = SectionIds(["cc_266"])
+        self.assertEqual(ids.get("cc266"), 0)
+        self.assertEqual(ids.get("cc_267"), NO_ID)
+        self.assertEqual(ids.get("not a section"), NO_ID)
+        self.assertEqual(ids.ids(["cc266", "cc_267"]).tolist(), [0, NO_ID])
+        self.assertEqual(len(ids), 1)
+
+    def test_normalize(self):
+        """Test that keys are normalized in bulk, with youth sentences flagged"""
+        ids = SectionIds(["cc_266", "cc_145(5)"])
+        normalized = ids.normalize(["cc_266_ycja", "145(5)", "cc_267", "unknown"])
+        self.assertEqual(normalized.sections, ["cc_266", "cc_145(5)", "cc_267", None])
+        self.assertEqual(normalized.ids.tolist(), [0, 1, NO_ID, NO_ID])
+        self.assertEqual(normalized.youth.tolist(), [True, False, False, False])
+
+
+    def test_misses_are_not_remembered(self):
+        """Test that a miss is not cached, so a section interned later is found"""
+        ids = SectionIds(["cc_266"])
+        self.assertEqual(ids.get("cc267"), NO_ID)
+        self.assertEqual(ids.get("not a section"), NO_ID)
+        ids.normalize(["unknown", "cc_9999)"])
+        self.assertNotIn("cc267", ids._spellings)
+        self.assertNotIn("not a section", ids._spellings)
+        self.assertNotIn("unknown", ids._keys)
+
+        ids.intern("cc_267")
+        self.assertEqual(ids.get("cc267"), 1)
+
+    def test_spellings_are_bounded(self):
+        """Test that only the most recently used spellings are remembered"""
+        ids = SectionIds(["cc_266"])
+        for number in range(SPELLING_CACHE_SIZE + 10):
+            ids.intern(f"cc_{number}.1")
+            ids.get(f" cc_{number}.1")
+            ids.normalize([f"{number}.1"])
+        self.assertEqual(len(ids._spellings), SPELLING_CACHE_SIZE)
+        self.assertEqual(len(ids._keys), SPELLING_CACHE_SIZE)
+        # Evicted spellings are canonicalized again
+        self.assertEqual(ids.get("cc_266"), 0)
+        self.assertEqual(ids.normalize(["0.1"]).ids.tolist(), [1])
+        self.assertEqual(len(ids), SPELLING_CACHE_SIZE + 11)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""
+Tests for the grid snapshot: a lookup must give the same results with or
+without a snapshot.
+"""
+import tempfile
+import unittest
+from pathlib import Path
+
+from tools import main
+from tools.snapshot import GridSnapshot
+
+# Keys spelled differently from the data, which resolve through their section
+# IDs or the section trie
+LENIENT_KEYS = [
+    "cc266",
+    "cc123",
+    "CC_266 ",
+    "cdsa_4(3)",
+    "cc_239(1)(a)-1",
+    "cc_320.14",
+]
+
+
+class SnapshotParityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        path = Path(cls.directory.name) / "offence-grid.snapshot"
+        main.build_snapshot(path)
+        cls.grid_snapshot = GridSnapshot(path)
+        main.load_registry()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.grid_snapshot.close()
+        cls.directory.cleanup()
+
+    def setUp(self):
+        self.addCleanup(setattr, main, "snapshot", main.snapshot)
+
+    def parse(self, offence, use_snapshot):
+        main.snapshot = self.grid_snapshot if use_snapshot else None
+        try:
+            return [result.to_dict() for result in main.parse_offence(offence, full=True)]
+        except KeyError as e:
+            return e.args
+
+    def assertParity(self, offence):
+        self.assertEqual(self.parse(offence, True), self.parse(offence, False), offence)
+
+    def test_lenient_spellings(self):
+        """Test that keys spelled differently from the data resolve the same way"""
+        for offence in LENIENT_KEYS:
+            with self.subTest(offence=offence):
+                self.assertTrue(self.parse(offence, True))
+                self.assertParity(offence)
+
+    def test_keys(self):
+        """Test that the snapshot holds every key the registry accepts"""
+        statutes = main.get_registry()
+        keys = {key for code in statutes for key in statutes.statute(code).keys()}
+        self.assertEqual(set(self.grid_snapshot.keys()), keys)
+
+    def test_every_key(self):
+        """Test that every key the registry accepts resolves the same way"""
+        statutes = main.get_registry()
+        for code in statutes:
+            for offence in statutes.statute(code).keys():
+                with self.subTest(offence=offence):
+                    self.assertParity(offence)
+
+    def test_unknown_offence(self):
+        """Test that an unknown offence raises a KeyError either way"""
+        for use_snapshot in (True, False):
+            main.snapshot = self.grid_snapshot if use_snapshot else None
+            with self.assertRaises(KeyError):
+                main.parse_offence("cc_9999")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for parsing quanta and flattening rule outputs.
+"""
+import copy
+import pickle
+import unittest
+
+from tools.utils import (
+    FrozenDict,
+    Quantum,
+    convert_quantum_to_days,
+    flatten_output,
+    parse_quantum,
+    standard_output,
+)
+
+
+class ParseQuantumTests(unittest.TestCase):
+    def test_formats(self):
+        """Test that each quantum format is parsed into its fine and jail parts"""
+        self.assertEqual(parse_quantum("5y").as_dict(), {
+            "fine": {"amount": 0, "unit": "dollars"},
+            "jail": {"amount": "5", "unit": "years"},
+        })
+        self.assertEqual(parse_quantum("5000$&90d").as_dict(), {
+            "fine": {"amount": "5000", "unit": "dollars"},
+            "jail": {"amount": "90", "unit": "days"},
+        })
+        self.assertEqual((parse_quantum("18m").jail_days, parse_quantum("18m").fine_dollars), (540, 0))
+        self.assertEqual((parse_quantum("1000$").fine_dollars, parse_quantum("1000$").has_jail), (1000, False))
+        self.assertEqual((parse_quantum("sc").jail_days, parse_quantum("sc").fine_dollars), (729, 5000))
+
+    def test_empty(self):
+        """Test that an empty quantum has neither a jail term nor a fine"""
+        for raw in ("", "None"):
+            quantum = parse_quantum(raw)
+            self.assertEqual((quantum.has_jail, quantum.has_fine, quantum.jail_days), (False, False, 0))
+
+    def test_invalid(self):
+        """Test that a malformed combined quantum is rejected"""
+        with self.assertRaises(ValueError):
+            parse_quantum("5000$&90d&1y")
+
+    def test_interned(self):
+        """Test that the same string gives the same immutable instance"""
+        quantum = parse_quantum("2y")
+        self.assertIs(parse_quantum("2y"), quantum)
+        with self.assertRaises(TypeError):
+            quantum["jail"]["amount"] = 3
+        with self.assertRaises(TypeError):
+            quantum.jail_days = 3
+
+
+class QuantumCopyTests(unittest.TestCase):
+    def test_parsed_round_trip(self):
+        """Test that a parsed quantum pickles back to the interned instance"""
+        quantum = parse_quantum("5000$&2y")
+        self.assertIs(pickle.loads(pickle.dumps(quantum)), quantum)
+        self.assertIs(copy.deepcopy(quantum), quantum)
+
+    def test_from_parsed_round_trip(self):
+        """Test that a quantum built from a dictionary keeps its values through pickle and deepcopy"""
+        quantum = Quantum.from_parsed({
+            "fine": {"amount": 5000, "unit": "dollars"},
+            "jail": {"amount": 2, "unit": "years"},
+        })
+        self.assertEqual(quantum.raw, "")
+        for restored in (pickle.loads(pickle.dumps(quantum)), copy.deepcopy(quantum)):
+            self.assertIsInstance(restored, Quantum)
+            self.assertEqual(restored, quantum)
+            self.assertEqual((restored.fine_dollars, restored.jail_days), (5000, 730))
+
+    def test_from_parsed(self):
+        """Test that a quantum is returned unchanged, and a dictionary converted"""
+        quantum = parse_quantum("90d")
+        self.assertIs(Quantum.from_parsed(quantum), quantum)
+        self.assertEqual(Quantum.from_parsed(quantum.as_dict()).jail_days, 90)
+
+    def test_frozen_dict(self):
+        """Test that a frozen dict pickles as a frozen dict"""
+        restored = pickle.loads(pickle.dumps(FrozenDict(a=1)))
+        self.assertIsInstance(restored, FrozenDict)
+        self.assertEqual(restored, {"a": 1})
+
+
+class ConvertQuantumTests(unittest.TestCase):
+    def test_convert(self):
+        """Test that terms are converted to days without modifying the quantum"""
+        quantum = parse_quantum("2m")
+        self.assertEqual(convert_quantum_to_days(quantum)["jail"], {"amount": 60, "unit": "days"})
+        self.assertEqual(quantum["jail"]["unit"], "months")
+        self.assertIsNone(convert_quantum_to_days({"jail": {"amount": 1, "unit": "weeks"}, "fine": {}}))
+
+
+class FlattenOutputTests(unittest.TestCase):
+    def test_shapes(self):
+        """Test that every output shape flattens to the same four fields"""
+        self.assertEqual(
+            flatten_output(standard_output(True, "primary", ["cc490.011"], "note")),
+            (True, "primary", "cc490.011", "note"),
+        )
+        self.assertEqual(
+            flatten_output({"status": ({"available": False, "notes": None},), "section": "cc731", "notes": None}),
+            (False, None, "cc731", None),
+        )
+        self.assertEqual(flatten_output(None), (None, None, None, None))
+        self.assertEqual(flatten_output(True), (True, None, None, None))
+        self.assertEqual(flatten_output({"status": "unavailable"})[0], False)
+        self.assertEqual(flatten_output({"status": "primary"})[:2], (True, "primary"))
+
+    def test_lists(self):
+        """Test that a list is available if any result is, with its fields joined"""
+        self.assertEqual(
+            flatten_output([
+                standard_output(False, None, ["a"], "x"),
+                standard_output(True, None, ["b", "a"], "y"),
+            ]),
+            (True, None, "a; b", "x; y"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,7 +11,7 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from typing import Dict, List, Optional, Union
-from utils import parse_quantum, convert_quantum_to_days, ParsedQuantum
+from .utils import parse_quantum, convert_quantum_to_days, ParsedQuantum
 
 class SentenceAnalyzer:
     def __init__(self, data_dir: str):
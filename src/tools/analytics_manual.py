@@ -3,7 +3,7 @@
 from pathlib import Path
 import pandas as pd
 
-from utils import parse_quantum, convert_quantum_to_days
+from .utils import parse_quantum, convert_quantum_to_days
 
 # Create a new dataframe that contains the data from all the CSV files in the sentencing-data folder
 sentencing_data = pd.concat([
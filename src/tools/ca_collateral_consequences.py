@@ -4,6 +4,10 @@
 ##                         ##
 #############################
 
+from .collateral_consequences import (
+    collateral_consequence,
+)
+
 from .constants import (
     TERRORISM_OFFENCES,
 )
@@ -84,3 +88,10 @@ def check_inadmissibility(section, mode, indictable_maximum):
         )
 
     return inadmissibilty_list
+
+
+@collateral_consequence("ca", "inadmissibility")
+def _inadmissibility(context):
+    return check_inadmissibility(
+        context.section, context.mode, context.indictable_maximum["jail"]["amount"]
+    )
@@ -0,0 +1,474 @@
+"""
+Multi-count case evaluation.
+
+parse_offence answers for one count at a time, but an accused is sentenced
+for every count of a proceeding together, and some consequences depend on
+the combination:
+
+    ancillary orders    an order is available if any count supports it
+    SOIRA               the longest duration of any designated count; an order
+                        for life is possible if two or more counts require
+                        an order (s. 490.013(2.1))
+    CSO, discharge      available only if available on every count; a
+                        conditional sentence also requires the global term
+                        of imprisonment to be under two years (s. 742.1)
+    global sentence     consecutive terms add up, concurrent terms overlap
+
+The per-count results come from parse_offence and are cached on the offence,
+the mode and the rule version, so a count that appears in many cases is only
+evaluated once:
+
+    evaluator = CaseEvaluator()
+    evaluator.evaluate([Charge("cc_271#b", "indictable"), Charge("cc_163.1(4)", "indictable")])
+
+sentencing_range_cases reads the reported sentences in
+data/case/sentencing-range as cases, so every multi-count case can be
+evaluated in one pass:
+
+    python -m tools.case_evaluator --output cases.jsonl
+"""
+
+import argparse
+import csv
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+from .main import (
+    DATA_DIR,
+    parse_offence,
+)
+
+from .rule_versions import (
+    CURRENT_RULE_VERSION,
+    OffenceDate,
+    rule_versions,
+)
+
+from .section_ids import (
+    SectionIds,
+)
+
+from .utils import (
+    JAIL_UNIT_DAYS,
+    LIST_SEPARATOR,
+    UNIT_MAPPINGS,
+    flatten_output,
+)
+
+# Constants
+SENTENCING_RANGE_DIR = DATA_DIR / "case" / "sentencing-range"
+CSO_MAXIMUM_DAYS = 729
+SOIRA_DURATION_RANK = {10: 1, 20: 2, "life": 3}
+
+# An order is mandatory on a primary designated offence; on any other
+# designated offence it is made on application
+SOIRA_MANDATORY_NOTES = "primary designated offence"
+
+# The kinds of sentence that are terms of imprisonment. A conditional
+# sentence is served in the community but is one (s. 742.1); probation is
+# not, and youth custody is not evaluated
+CUSTODIAL_SENTENCE_KINDS = ("jail", "cso")
+
+# Reported terms are written as one or more amounts, e.g. "790d", "1.5y",
+# "5y6m3d" or "5y&6m&3d"
+_TERM_PARTS = re.compile(r"(\d+(?:\.\d+)?)([ymd])")
+
+# The sentencing options whose combined availability is the strictest of the
+# counts'
+STRICTEST_SENTENCING_OPTIONS = ("cso_available", "discharge_available")
+
+# Normalizes the offence keys of the reported sentences, each spelling once
+_OFFENCE_KEYS = SectionIds()
+
+
+class Charge(NamedTuple):
+    """
+    One count against an accused.
+
+    Attributes:
+        offence (str): The offence code, as for parse_offence
+        mode (str): The mode of proceeding ("summary" or "indictable")
+        date (Optional[OffenceDate]): The offence date, as for parse_offence's
+            as_of
+        jail (str): The custodial term imposed on the count, as a quantum
+            (e.g. "790d"), if known
+        sentence_mode (str): How the term runs, as in the reported sentences
+            (e.g. "jail-consecutive" or "cso-concurrent"), if known
+        youth (bool): Whether the count was sentenced as a youth under the
+            YCJA, whose sentences the rules do not cover
+    """
+
+    offence: str
+    mode: str = "summary"
+    date: Optional[OffenceDate] = None
+    jail: str = ""
+    sentence_mode: str = ""
+    youth: bool = False
+
+
+class Case(NamedTuple):
+    case_id: str
+    charges: Tuple[Charge, ...]
+
+
+def _available(output) -> Optional[bool]:
+    return flatten_output(output)[0]
+
+
+def _sections(outputs: Iterable) -> List[str]:
+    sections = []
+    for output in outputs:
+        joined = flatten_output(output)[2]
+        if joined:
+            sections.extend(joined.split(LIST_SEPARATOR))
+    return list(dict.fromkeys(sections))
+
+
+def term_days(term: str) -> Optional[int]:
+    """
+    Return the length of a reported term in days, e.g. 2005 for "5y6m", or
+    None if it has no fixed length (e.g. "indeterminate").
+    """
+    parts = _TERM_PARTS.findall(term)
+    if not parts:
+        return None
+    return round(sum(
+        float(amount) * JAIL_UNIT_DAYS[UNIT_MAPPINGS[unit]] for amount, unit in parts
+    ))
+
+
+def global_sentence(charges: Sequence[Charge]) -> Dict[str, int]:
+    """
+    Total the terms imposed on each count, by kind of sentence.
+
+    The kind is the first part of the sentence mode (e.g. "jail" in
+    "jail-consecutive"). Consecutive terms are added together; a concurrent
+    term only counts where it outlasts them. Terms without a fixed length
+    are left out.
+
+    Returns:
+        Dict[str, int]: The total days of each kind of sentence
+    """
+    consecutive: Dict[str, int] = {}
+    concurrent: Dict[str, int] = {}
+    for charge in charges:
+        days = term_days(charge.jail)
+        if days is None or not charge.sentence_mode:
+            continue
+        kind, _, arrangement = charge.sentence_mode.partition("-")
+        if "consecutive" in arrangement:
+            consecutive[kind] = consecutive.get(kind, 0) + days
+        else:
+            concurrent[kind] = max(concurrent.get(kind, 0), days)
+    return {
+        kind: max(consecutive.get(kind, 0), concurrent.get(kind, 0))
+        for kind in dict.fromkeys([*consecutive, *concurrent])
+    }
+
+
+class CaseEvaluator:
+    """
+    Evaluates cases of several counts, caching the result of each count.
+
+    The cache is keyed on the section ID of the offence code, so that every
+    spelling of a section shares one entry, the mode and the rule version in
+    force on the offence date. It holds the ancillary orders and sentencing
+    details of every row the offence code resolves to.
+    """
+
+    def __init__(self):
+        self._section_ids = SectionIds()
+        self._results: Dict[Tuple[int, str, str], List[dict]] = {}
+
+    def charge_results(self, charge: Charge) -> List[dict]:
+        """
+        Return the ancillary orders and sentencing details of each row a
+        charge resolves to, parsing the offence on first use.
+
+        Raises:
+            KeyError: If the offence code is not found
+            ValueError: If the offence code is not a section, the mode is
+                invalid, no rule version is in force on the offence date, or
+                the count is a youth sentence
+        """
+        if charge.youth:
+            raise ValueError("Youth sentences under the YCJA are not evaluated")
+        version = CURRENT_RULE_VERSION if charge.date is None else rule_versions.resolve(charge.date)
+        key = (self._section_ids.intern(charge.offence.strip().lower()), charge.mode, version.name)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+
+        results = self._results[key] = [
+            {
+                "section": result["offence_data"]["section"],
+                "ancillary_orders": result["ancillary_orders"],
+                "sentencing": result["sentencing"],
+            }
+            for result in parse_offence(
+                charge.offence,
+                charge.mode,
+                ancillary_orders=True,
+                sentencing=True,
+                as_of=charge.date,
+            )
+        ]
+        return results
+
+    def evaluate(self, charges: Iterable[Charge]) -> dict:
+        """
+        Combine the consequences of every count against one accused.
+
+        Args:
+            charges (Iterable[Charge]): The counts
+
+        Returns:
+            dict: The combined consequences:
+                - counts: The offence code and sections of each count
+                - ancillary_orders: Each order, available if any count
+                  supports it, with the counts that do
+                - soira: Whether an order is available, the longest
+                  duration of the designated counts and the counts. Where
+                  an order for life is possible, the notes say so
+                - sentencing: CSO and discharge availability, the
+                  strictest of the counts'
+                - global_sentence: The total days of each kind of sentence.
+                  Only the custodial kinds count towards the CSO limit
+                - errors: The counts that could not be evaluated, and why
+        """
+        charges = list(charges)
+        counts = []
+        evaluated = []
+        errors = []
+        for number, charge in enumerate(charges, 1):
+            try:
+                results = self.charge_results(charge)
+            except (KeyError, ValueError) as e:
+                errors.append({"count": number, "offence": charge.offence, "error": str(e)})
+                continue
+            counts.append({
+                "count": number,
+                "offence": charge.offence,
+                "sections": [result["section"] for result in results],
+            })
+            evaluated.append((number, results))
+
+        sentence = global_sentence(charges)
+        return {
+            "counts": counts,
+            "ancillary_orders": self._ancillary_orders(evaluated),
+            "soira": self._soira(evaluated),
+            "sentencing": self._sentencing(evaluated, sentence),
+            "global_sentence": sentence,
+            "errors": errors,
+        }
+
+    @staticmethod
+    def _ancillary_orders(evaluated: List[Tuple[int, List[dict]]]) -> Dict[str, dict]:
+        orders: Dict[str, List[Tuple[int, object]]] = {}
+        for number, results in evaluated:
+            for result in results:
+                for order, output in result["ancillary_orders"].items():
+                    if order != "soira":
+                        orders.setdefault(order, []).append((number, output))
+
+        combined = {}
+        for order, outputs in orders.items():
+            supporting = [(number, output) for number, output in outputs if _available(output)]
+            combined[order] = {
+                "status": {"available": bool(supporting), "notes": None},
+                "sections": _sections(output for _, output in supporting or outputs),
+                "counts": list(dict.fromkeys(number for number, _ in supporting)),
+            }
+        return combined
+
+    @staticmethod
+    def _soira(evaluated: List[Tuple[int, List[dict]]]) -> dict:
+        designated = []
+        mandatory = []
+        duration = None
+        sections = []
+        for number, results in evaluated:
+            for result in results:
+                for output in result["ancillary_orders"].get("soira") or ():
+                    if not output["status"]["available"]:
+                        continue
+                    if number not in designated:
+                        designated.append(number)
+                    if output.get("notes") == SOIRA_MANDATORY_NOTES and number not in mandatory:
+                        mandatory.append(number)
+                    sections.extend(output["sections"])
+                    amount = output.get("duration", {}).get("amount")
+                    if SOIRA_DURATION_RANK.get(amount, 0) > SOIRA_DURATION_RANK.get(duration, 0):
+                        duration = amount
+
+        notes = None
+        if len(mandatory) > 1:
+            # The court may make the order for life if the offences show a
+            # pattern of behaviour, which the counts alone cannot tell
+            sections.append("cc490.013(2.1)")
+            notes = (
+                "possible order for life: counts "
+                + ", ".join(str(number) for number in mandatory)
+                + " require an order in the same proceeding"
+            )
+
+        return {
+            "status": {"available": bool(designated), "notes": notes},
+            "sections": list(dict.fromkeys(sections)) or ["cc490.011"],
+            "duration": {
+                "amount": duration,
+                "unit": "years" if isinstance(duration, int) else None,
+            },
+            "counts": designated,
+        }
+
+    @staticmethod
+    def _sentencing(evaluated: List[Tuple[int, List[dict]]], sentence: Dict[str, int]) -> Dict[str, dict]:
+        combined = {}
+        for option in STRICTEST_SENTENCING_OPTIONS:
+            outputs = [
+                (number, result["sentencing"].get(option))
+                for number, results in evaluated
+                for result in results
+            ]
+            excluded = [(number, output) for number, output in outputs if _available(output) is False]
+            notes = None
+            if excluded:
+                number, output = excluded[0]
+                notes = f"count {number}: {flatten_output(output)[3]}"
+            combined[option] = {
+                "status": {"available": bool(outputs) and not excluded, "notes": notes},
+                "sections": _sections(output for _, output in outputs),
+                "counts": list(dict.fromkeys(number for number, _ in excluded)),
+            }
+
+        total_days = sum(sentence.get(kind, 0) for kind in CUSTODIAL_SENTENCE_KINDS)
+        cso = combined["cso_available"]
+        if cso["status"]["available"] and total_days > CSO_MAXIMUM_DAYS:
+            cso["status"] = {"available": False, "notes": "global term of imprisonment of 2 years or more"}
+        return combined
+
+
+def group_cases(
+    sentences: Iterable[Mapping],
+    mode: str = "indictable",
+    offence_dates: bool = False,
+) -> Iterator[Case]:
+    """
+    Group reported sentences into cases, one per decision and docket.
+
+    Each sentence's uid is the decision, the docket and the count number, e.g.
+    "2024skpc16_991174471_2". A sentence is a mapping with the uid, the
+    offence (as "offence" in the CSVs, or "section" as in
+    SentencingRange.objects.values()), the date, the jail term and the
+    sentence mode. Offences are normalized to their canonical sections (see
+    section_ids), and those marked "_ycja" are flagged as youth sentences.
+
+    Args:
+        sentences (Iterable[Mapping]): The reported sentences
+        mode (str): The mode of proceeding, which reported sentences do not
+            record
+        offence_dates (bool): If True, each count is evaluated under the
+            rules in force on its offence date. Most reported offences predate
+            the earliest rule version, so by default the current rules apply
+
+    Yields:
+        Case: Each case and its counts, in the order first seen
+    """
+    counts = [
+        (sentence, offence)
+        for sentence in sentences
+        for offence in [sentence.get("offence") or sentence.get("section")]
+        if sentence.get("uid") and offence
+    ]
+    normalized = _OFFENCE_KEYS.normalize(offence for _, offence in counts)
+
+    cases: Dict[str, List[Charge]] = {}
+    for (sentence, offence), section, youth in zip(counts, normalized.sections, normalized.youth):
+        cases.setdefault(sentence["uid"].rsplit("_", 1)[0], []).append(Charge(
+            offence if section is None else section,
+            mode,
+            (sentence.get("date") or None) if offence_dates else None,
+            sentence.get("jail") or "",
+            sentence.get("mode") or "",
+            bool(youth),
+        ))
+    for case_id, charges in cases.items():
+        yield Case(case_id, tuple(charges))
+
+
+def sentencing_range_cases(
+    directory: Path = SENTENCING_RANGE_DIR,
+    mode: str = "indictable",
+    offence_dates: bool = False,
+) -> Iterator[Case]:
+    """
+    Read the reported sentence CSVs as cases, one file at a time.
+
+    Args:
+        directory (Path): The directory of reported sentence CSVs
+        mode, offence_dates: As for group_cases
+
+    Yields:
+        Case: Each case and its counts
+    """
+    for path in sorted(Path(directory).glob("*.csv")):
+        with open(path, newline="", encoding="utf-8") as csvfile:
+            yield from group_cases(csv.DictReader(csvfile), mode, offence_dates)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Evaluate the combined consequences of every multi-count reported sentence"
+    )
+    parser.add_argument(
+        "--directory",
+        type=Path,
+        default=SENTENCING_RANGE_DIR,
+        help="the directory of reported sentence CSVs",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["summary", "indictable"],
+        default="indictable",
+        help="the mode of proceeding to assume (default: indictable)",
+    )
+    parser.add_argument(
+        "--offence-dates",
+        action="store_true",
+        help="apply the rules in force on each offence date instead of the current rules",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="write the results as JSON Lines")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    evaluator = CaseEvaluator()
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+    evaluated = 0
+    try:
+        for case in sentencing_range_cases(args.directory, args.mode, args.offence_dates):
+            if len(case.charges) < 2:
+                continue
+            result = evaluator.evaluate(case.charges)
+            evaluated += 1
+            if output is not None:
+                output.write(json.dumps({"case": case.case_id, **result}, ensure_ascii=False) + "\n")
+    finally:
+        if output is not None:
+            output.close()
+
+    print(
+        f"Evaluated {evaluated} multi-count cases in {time.perf_counter() - started:.3f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,55 @@
 """
 Criminal Code of Canada rules for creating a sentencing grid. The rules are 
 current to October 2, 2024.
+
+Rules that pick one result from an ordered list of conditions are written as
+decision tables (see decision_table.py). Each check_* function evaluates its
+table for a single offence; main.py and grid.py evaluate the same tables
+directly, one offence at a time or over every offence at once. To amend a
+rule, edit its table.
 """
 
-from constants import (
-    PRIMARY_DESIGNATED_DNA_OFFENCES,
-    SECONDARY_DESIGNATED_DNA_OFFENCES,
-    EXCLUDED_CSO_OFFENCES,
-    TERRORISM_OFFENCES,
-    CRIMINAL_ORGANIZATION_OFFENCES,
-    SECTION_469_OFFENCES,
-    PRIMARY_SOIRA_OFFENCES_CURRENT,
-    SECONDARY_SOIRA_OFFENCES,
-    SOIRA_OFFENCES_ATTEMPTS,
-    SOIRA_OFFENCES_CONSPIRACY,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CRIMINAL_ORGANIZATION,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CANNABIS,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_HUMAN_TRAFFICKING,
-    ABSOLUTE_JURISDICITON_OFFENCES_FRAUD,
-    ABSOLUTE_JURISDICITON_OFFENCES_ATTEMPTS_CONSPIRACIES,
-    ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES,
-    ABSOLUTE_JURISDICITON_OFFENCES_FALSE_PRETENCES,
-    ABSOLUTE_JURISDICITON_OFFENCES_PPOBC,
-    ABSOLUTE_JURISDICITON_OFFENCES_THEFT,
-    ABSOLUTE_JURISDICTION_OFFENCES_MISCHIEF,
-    SECTION_161_FORFEITURE_ORDER_OFFENCES,
-    VIOLENCE_USED_THREATENED_ATTEMPTED_OFFENCES,
+from .decision_table import (
+    MODE_SUMMARY,
+    MODE_INDICTABLE,
+    MODE_HYBRID,
+    TIME_UNITS,
+    DecisionTable,
+    RuleFacts,
+    flag,
+    one_of,
+    status_output,
+)
+
+from .designations import (
+    DNA_PRIMARY,
+    DNA_SECONDARY,
+    SOIRA_PRIMARY,
+    SOIRA_SECONDARY,
+    SOIRA_ATTEMPT,
+    SOIRA_CONSPIRACY,
+    SOIRA_DESIGNATED,
+    CSO_EXCLUDED,
+    TERRORISM,
+    CRIMINAL_ORGANIZATION,
+    SECTION_469,
+    ABSOLUTE_JURISDICTION_THEFT,
+    ABSOLUTE_JURISDICTION_FALSE_PRETENCES,
+    ABSOLUTE_JURISDICTION_PPOBC,
+    ABSOLUTE_JURISDICTION_FRAUD,
+    ABSOLUTE_JURISDICTION_MISCHIEF,
+    ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES,
+    ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES,
+    PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION,
+    PROCEEDS_OF_CRIME_CDSA,
+    PROCEEDS_OF_CRIME_CANNABIS,
+    PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING,
+    SECTION_164_FORFEITURE,
+    designation_profile,
 )
 
-from utils import (
-    convert_quantum_to_days,
+from .utils import (
+    parse_quantum,
     standard_output,
 )
 
@@ -68,6 +87,18 @@ def check_offence_type(offence: List[str]) -> str:
 
 
 # Procedure
+PRELIM_TABLE = DecisionTable(
+    "prelim_available",
+    [
+        (
+            lambda f: one_of(f.indictable_maximum.raw, ("14y", "255y")),
+            (True, None, ["cc535"], "maximum term of 14y or greater"),
+        ),
+    ],
+    default=(False, None, ["cc535"], "maximum of less than 14y"),
+)
+
+
 def check_prelim_available(
     indictable_maximum: str,
 ) -> Dict[str, Union[bool, None, List[str], str]]:
@@ -90,23 +121,27 @@ def check_prelim_available(
     if not isinstance(indictable_maximum, str):
         raise TypeError("indictable_maximum must be a string")
 
-    if indictable_maximum == "14y" or indictable_maximum == "255y":
-        prelim_available = standard_output(
-            True, None, ["cc535"], "maximum term of 14y or greater"
-        )
-        return prelim_available
-
-    else:
-        prelim_available = standard_output(
-            False, None, ["cc535"], "maximum of less than 14y"
-        )
-        return prelim_available
+    return PRELIM_TABLE.evaluate(
+        RuleFacts(indictable_maximum=parse_quantum(indictable_maximum))
+    )
 
 
 def reverse_onus():
     pass
 
 
+SECTION_469_TABLE = DecisionTable(
+    "section_469_offence",
+    [
+        (
+            lambda f: flag(f.designations, SECTION_469),
+            (True, None, ["cc469"], "listed offence"),
+        ),
+    ],
+    default=(False, None, ["cc469"], "not a listed offence"),
+)
+
+
 def check_section_469_offence(
     section: str,
 ) -> Dict[str, Union[bool, None, List[str], str]]:
@@ -125,11 +160,7 @@ def check_section_469_offence(
             - explanation (str): Explanation of the determination
     """
 
-    if section in SECTION_469_OFFENCES:
-        return standard_output(True, None, ["cc469"], "listed offence")
-
-    else:
-        return standard_output(False, None, ["cc469"], "not a listed offence")
+    return SECTION_469_TABLE.evaluate(RuleFacts(section))
 
 
 def check_absolute_jurisdiction_offence(
@@ -150,8 +181,9 @@ def check_absolute_jurisdiction_offence(
     """
 
     absolute_jurisdiction_list = []
+    designations = designation_profile(section)
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_THEFT:
+    if designations & ABSOLUTE_JURISDICTION_THEFT:
         absolute_jurisdiction_list.append(
             standard_output(
                 True,
@@ -161,12 +193,12 @@ def check_absolute_jurisdiction_offence(
             )
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_FALSE_PRETENCES:
+    if designations & ABSOLUTE_JURISDICTION_FALSE_PRETENCES:
         absolute_jurisdiction_list.append(
             standard_output(True, None, ["cc553(a)(ii)"], "false pretences")
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_PPOBC:
+    if designations & ABSOLUTE_JURISDICTION_PPOBC:
         absolute_jurisdiction_list.append(
             standard_output(
                 True,
@@ -176,17 +208,17 @@ def check_absolute_jurisdiction_offence(
             )
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_FRAUD:
+    if designations & ABSOLUTE_JURISDICTION_FRAUD:
         absolute_jurisdiction_list.append(
             standard_output(True, None, ["cc553(a)(iv)"], "fraud")
         )
 
-    if section in ABSOLUTE_JURISDICTION_OFFENCES_MISCHIEF:
+    if designations & ABSOLUTE_JURISDICTION_MISCHIEF:
         absolute_jurisdiction_list.append(
             standard_output(True, None, ["cc553(a)(v)"], "mischief")
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_ATTEMPTS_CONSPIRACIES:
+    if designations & ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES:
         absolute_jurisdiction_list.append(
             standard_output(
                 True,
@@ -196,7 +228,7 @@ def check_absolute_jurisdiction_offence(
             )
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES:
+    if designations & ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES:
         absolute_jurisdiction_list.append(
             standard_output(
                 True,
@@ -223,6 +255,25 @@ def check_absolute_jurisdiction_offence(
 ########################
 
 
+# Quanta are passed to the sentencing rules as parsed Quantum objects, whose
+# precomputed values (has_jail, jail_amount, jail_days, ...) the tables read.
+# Amounts that cannot be converted (e.g. empty values) count as 0.
+DISCHARGE_TABLE = DecisionTable(
+    "discharge_available",
+    [
+        (
+            lambda f: f.summary_minimum.has_jail | f.indictable_minimum.has_jail,
+            (False, None, ["cc730(1)"], "mandatory minimum sentence"),
+        ),
+        (
+            lambda f: f.indictable_maximum.jail_amount >= 14,
+            (False, None, ["cc730(1)"], "punishable by 14y or greater"),
+        ),
+    ],
+    default=(True, None, ["cc730(1)"], "no mandatory minimum, punishable by less than 14y"),
+)
+
+
 def check_discharge_available(
     summary_minimum: Dict[str, Dict[str, Union[int, str]]],
     indictable_minimum: Dict[str, Dict[str, Union[int, str]]],
@@ -245,15 +296,62 @@ def check_discharge_available(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
-    if summary_minimum["jail"]["amount"] or indictable_minimum["jail"]["amount"]:
-        return standard_output(False, None, ["cc730(1)"], "mandatory minimum sentence")
-
-    elif indictable_maximum["jail"]["amount"] >= 14:
-        return standard_output(
-            False, None, ["cc730(1)"], "punishable by 14y or greater"
+    return DISCHARGE_TABLE.evaluate(
+        RuleFacts(
+            summary_minimum=summary_minimum,
+            indictable_minimum=indictable_minimum,
+            indictable_maximum=indictable_maximum,
         )
+    )
 
-    return standard_output(True, None, ["cc730(1)"], "no mandatory minimum, punishable by less than 14y")
+
+def _serious(f):
+    """Punishable by 10y or more on indictment."""
+    return f.indictable_maximum.jail_amount >= 10
+
+
+CSO_TABLE = DecisionTable(
+    "cso_available",
+    [
+        (
+            lambda f: f.summary_minimum.has_jail & one_of(f.summary_minimum.jail_unit, TIME_UNITS),
+            (False, None, ["cc742.1(b)"], "mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: f.summary_minimum.has_jail,
+            (True, None, ["cc742.1"], "no mandatory minimum"),
+        ),
+        (
+            lambda f: f.indictable_minimum.has_jail & one_of(f.indictable_minimum.jail_unit, TIME_UNITS),
+            (False, None, ["cc742.1(b)"], "mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: f.indictable_minimum.has_jail,
+            (True, None, ["cc742.1"], None),
+        ),
+        (
+            lambda f: flag(f.designations, CSO_EXCLUDED),
+            (False, None, ["cc742.1(c)"], "enumerated excluded offence"),
+        ),
+        (
+            lambda f: flag(f.designations, TERRORISM) & _serious(f) & (f.mode_code == MODE_INDICTABLE),
+            (False, None, ["cc742.1(d)"], "serious indictable terrorism offence"),
+        ),
+        (
+            lambda f: flag(f.designations, TERRORISM) & _serious(f) & (f.mode_code == MODE_HYBRID),
+            (True, "summary conviction only", ["cc742.1(d)"], "serious indictable terrorism offence"),
+        ),
+        (
+            lambda f: flag(f.designations, CRIMINAL_ORGANIZATION) & _serious(f) & (f.mode_code == MODE_INDICTABLE),
+            (False, "summary conviction only", ["cc742.1(d)"], "serious indictable criminal organization offence"),
+        ),
+        (
+            lambda f: flag(f.designations, CRIMINAL_ORGANIZATION) & _serious(f) & (f.mode_code == MODE_HYBRID),
+            (True, "summary conviction only", ["cc742.1(d)"], "serious indictable criminal organization offence"),
+        ),
+    ],
+    default=(True, None, ["cc742.1"], None),
+)
 
 
 def check_cso_availablity(
@@ -288,96 +386,31 @@ def check_cso_availablity(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
-
-    # Convert None values to a comparable integer
-    # Confirm whether this is necessary since the v0.0.5 updates to the program
-    try:
-        indictable_maximum["jail"]["amount"] = int(indictable_maximum["jail"]["amount"])
-    except:
-        indictable_maximum["jail"]["amount"] = 0
-
-    cso_available = {}
-
-    if summary_minimum["jail"]["amount"]:
-
-        if (
-            summary_minimum["jail"]["unit"] == "days"
-            or summary_minimum["jail"]["unit"] == "months"
-            or summary_minimum["jail"]["unit"] == "years"
-        ):
-            return standard_output(
-                False, None, ["cc742.1(b)"], "mandatory minimum term of imprisonment"
-            )
-
-        else:
-            return standard_output(True, None, ["cc742.1"], "no mandatory minimum")
-
-    elif indictable_minimum["jail"]["amount"]:
-
-        if (
-            indictable_minimum["jail"]["unit"] == "days"
-            or indictable_minimum["jail"]["unit"] == "months"
-            or indictable_minimum["jail"]["unit"] == "years"
-        ):
-            return standard_output(
-                False, None, ["cc742.1(b)"], "mandatory minimum term of imprisonment"
-            )
-
-        else:
-            return standard_output(True, None, ["cc742.1"], None)
-
-    elif section in EXCLUDED_CSO_OFFENCES:
-        return standard_output(
-            False, None, ["cc742.1(c)"], "enumerated excluded offence"
-        )
-
-    elif (
-        section in TERRORISM_OFFENCES
-        and int(indictable_maximum["jail"]["amount"]) >= 10
-        and mode == "indictable"
-    ):
-        return standard_output(
-            False, None, ["cc742.1(d)"], "serious indictable terrorism offence"
-        )
-
-    elif (
-        section in TERRORISM_OFFENCES
-        and int(indictable_maximum["jail"]["amount"]) >= 10
-        and mode == "hybrid"
-    ):
-        return standard_output(
-            True,
-            "summary conviction only",
-            ["cc742.1(d)"],
-            "serious indictable terrorism offence",
-        )
-
-    elif (
-        section in CRIMINAL_ORGANIZATION_OFFENCES
-        and int(indictable_maximum["jail"]["amount"]) >= 10
-        and mode == "indictable"
-    ):
-        return standard_output(
-            False,
-            "summary conviction only",
-            ["cc742.1(d)"],
-            "serious indictable criminal organization offence",
+    return CSO_TABLE.evaluate(
+        RuleFacts(
+            section,
+            mode,
+            summary_minimum=summary_minimum,
+            indictable_minimum=indictable_minimum,
+            indictable_maximum=indictable_maximum,
         )
+    )
 
-    elif (
-        section in CRIMINAL_ORGANIZATION_OFFENCES
-        and int(indictable_maximum["jail"]["amount"]) >= 10
-        and mode == "hybrid"
-    ):
-        return standard_output(
-            True,
-            "summary conviction only",
-            ["cc742.1(d)"],
-            "serious indictable criminal organization offence",
-        )
 
-    else:
-        return standard_output(True, None, ["cc742.1"], None)
+INTERMITTENT_TABLE = DecisionTable(
+    "intermittent_available",
+    [
+        (
+            lambda f: (f.summary_minimum.jail_days == 0) & (f.indictable_minimum.jail_days == 0),
+            (True, None, ["cc732(1)"], "no minimum term of imprisonment"),
+        ),
+        (
+            lambda f: (f.summary_minimum.jail_days <= 90) & (f.indictable_minimum.jail_days <= 90),
+            (True, None, ["cc732(1)"], "minimum does not exceed 90 days"),
+        ),
+    ],
+    default=(False, None, ["cc732"], "mandatory minimum term of imprisonment exceeds 90 days"),
+)
 
 
 def check_intermittent_available(
@@ -401,41 +434,25 @@ def check_intermittent_available(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
-    # Convert minimums to days for comparison
-    summary_days = 0
-    indictable_days = 0
-
-    if summary_minimum["jail"]["amount"]:
-        if summary_minimum["jail"]["unit"] == "years":
-            summary_days = int(summary_minimum["jail"]["amount"]) * 365
-        elif summary_minimum["jail"]["unit"] == "months":
-            summary_days = int(summary_minimum["jail"]["amount"]) * 30
-        else:  # days
-            summary_days = int(summary_minimum["jail"]["amount"])
-
-    if indictable_minimum["jail"]["amount"]:
-        if indictable_minimum["jail"]["unit"] == "years":
-            indictable_days = int(indictable_minimum["jail"]["amount"]) * 365
-        elif indictable_minimum["jail"]["unit"] == "months":
-            indictable_days = int(indictable_minimum["jail"]["amount"]) * 30
-        else:  # days
-            indictable_days = int(indictable_minimum["jail"]["amount"])
-
-    if summary_days == 0 and indictable_days == 0:
-        return standard_output(
-            True, None, ["cc732(1)"], "no minimum term of imprisonment"
-        )
-    elif summary_days <= 90 and indictable_days <= 90:
-        return standard_output(
-            True, None, ["cc732(1)"], "minimum does not exceed 90 days"
-        )
-    else:
-        return standard_output(
-            False,
-            None,
-            ["cc732"],
-            "mandatory minimum term of imprisonment exceeds 90 days",
-        )
+    return INTERMITTENT_TABLE.evaluate(
+        RuleFacts(summary_minimum=summary_minimum, indictable_minimum=indictable_minimum)
+    )
+
+
+SUSPENDED_SENTENCE_TABLE = DecisionTable(
+    "suspended_sentence_available",
+    [
+        (
+            lambda f: f.summary_minimum.has_jail | f.summary_minimum.has_fine,
+            (False, None, ["cc731(1)"], "mandatory minimum sentence"),
+        ),
+        (
+            lambda f: f.indictable_minimum.has_jail | f.indictable_minimum.has_fine,
+            (False, None, ["cc731(1)"], "mandatory minimum sentence"),
+        ),
+    ],
+    default=(True, None, ["cc731(1)"], "no mandatory minimum sentence"),
+)
 
 
 def check_suspended_sentence_available(
@@ -459,17 +476,32 @@ def check_suspended_sentence_available(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
+    return SUSPENDED_SENTENCE_TABLE.evaluate(
+        RuleFacts(summary_minimum=summary_minimum, indictable_minimum=indictable_minimum)
+    )
 
-    if summary_minimum["jail"]["amount"] or summary_minimum["fine"]["amount"]:
-        return standard_output(False, None, ["cc731(1)"], "mandatory minimum sentence")
-
-    elif indictable_minimum["jail"]["amount"] or indictable_minimum["fine"]["amount"]:
-        return standard_output(False, None, ["cc731(1)"], "mandatory minimum sentence")
 
-    else:
-        return standard_output(
-            True, None, ["cc731(1)"], "no mandatory minimum sentence"
-        )
+# The minimum is compared in its own unit, as it always has been. Parsed jail
+# amounts are never None, so the old "no minimum term of imprisonment" branch
+# is not carried over.
+PRISON_AND_PROBATION_TABLE = DecisionTable(
+    "prison_and_probation_available",
+    [
+        (
+            lambda f: f.mode_code == MODE_SUMMARY,
+            (True, None, "cc732(1)(b)", None),
+        ),
+        (
+            lambda f: one_of(f.mode_code, (MODE_HYBRID, MODE_INDICTABLE)) & (f.indictable_minimum.jail_amount < 730),
+            (True, None, "cc732(1)", None),
+        ),
+        (
+            lambda f: one_of(f.mode_code, (MODE_HYBRID, MODE_INDICTABLE)),
+            (False, None, "cc732(1)", "mandatory minimum term of imprisonment exceeds two years"),
+        ),
+    ],
+    output=status_output,
+)
 
 
 def check_prison_and_probation(
@@ -493,87 +525,27 @@ def check_prison_and_probation(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
+    return PRISON_AND_PROBATION_TABLE.evaluate(
+        RuleFacts(mode=mode, indictable_minimum=indictable_minimum)
+    )
 
-    prison_and_probation_available = {}
-
-    # Convert the quantum of the offence to days if it is not already in that
-    # format
-
-    if indictable_minimum["jail"]["amount"] == None:
-        prison_and_probation_available["status"] = (
-            {
-                "available": True,
-                "notes": None,
-            },
-        )
-        prison_and_probation_available["section"] = "cc732(1)"
-        prison_and_probation_available["notes"] = "no minimum term of imprisonment"
-
-        return prison_and_probation_available
-
-    if mode == "summary":
-        prison_and_probation_available["status"] = (
-            {
-                "available": True,
-                "notes": None,
-            },
-        )
-        prison_and_probation_available["section"] = "cc732(1)(b)"
-        prison_and_probation_available["notes"] = None
-
-        return prison_and_probation_available
-
-    elif mode == "hybrid":
-        if int(indictable_minimum["jail"]["amount"]) < 730:
-            prison_and_probation_available["status"] = (
-                {
-                    "available": True,
-                    "notes": None,
-                },
-            )
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = None
-
-            return prison_and_probation_available
-        else:
-            prison_and_probation_available["status"] = (
-                {
-                    "available": False,
-                    "notes": None,
-                },
-            )
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = (
-                "mandatory minimum term of imprisonment exceeds two years"
-            )
-
-            return prison_and_probation_available
 
-    elif mode == "indictable":
-        if int(indictable_minimum["jail"]["amount"]) < 730:
-            prison_and_probation_available["status"] = (
-                {
-                    "available": True,
-                    "notes": None,
-                },
-            )
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = None
-
-            return prison_and_probation_available
-        else:
-            prison_and_probation_available["status"] = (
-                {
-                    "available": False,
-                    "notes": None,
-                },
-            )
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = (
-                "mandatory minimum term of imprisonment exceeds two years"
-            )
-
-            return prison_and_probation_available
+# As above, the "no mandatory minimum term of imprisonment" branch depended on
+# jail amounts of None, so the rule returns None when there is no minimum.
+FINE_ALONE_TABLE = DecisionTable(
+    "fine_alone",
+    [
+        (
+            lambda f: f.summary_minimum.has_jail,
+            (False, None, "cc734(1)", "mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: f.indictable_minimum.has_jail,
+            (False, None, "cc734(1)", "mandatory minimum term of imprisonment"),
+        ),
+    ],
+    output=status_output,
+)
 
 
 def check_fine_alone(
@@ -595,47 +567,25 @@ def check_fine_alone(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
+    return FINE_ALONE_TABLE.evaluate(
+        RuleFacts(summary_minimum=summary_minimum, indictable_minimum=indictable_minimum)
+    )
 
-    fine_alone_available = {}
-
-    if (
-        summary_minimum["jail"]["amount"] == None
-        or indictable_minimum["jail"]["amount"] == None
-    ):
-        fine_alone_available["status"] = (
-            {
-                "available": True,
-                "notes": None,
-            },
-        )
-        fine_alone_available["section"] = "cc734(1)"
-        fine_alone_available["notes"] = "no mandatory minimum term of imprisonment"
-
-        return fine_alone_available
-
-    if summary_minimum["jail"]["amount"]:
-        fine_alone_available["status"] = (
-            {
-                "available": False,
-                "notes": None,
-            },
-        )
-        fine_alone_available["section"] = "cc734(1)"
-        fine_alone_available["notes"] = "mandatory minimum term of imprisonment"
-
-        return fine_alone_available
-
-    elif indictable_minimum["jail"]["amount"]:
-        fine_alone_available["status"] = (
-            {
-                "available": False,
-                "notes": None,
-            },
-        )
-        fine_alone_available["section"] = "cc734(1)"
-        fine_alone_available["notes"] = "mandatory minimum term of imprisonment"
 
-        return fine_alone_available
+FINE_AND_PROBATION_TABLE = DecisionTable(
+    "fine_and_probation",
+    [
+        (
+            lambda f: f.indictable_minimum.jail_days == 0,
+            (True, None, ["cc732(1)"], "no minimum term of imprisonment"),
+        ),
+        (
+            lambda f: f.indictable_minimum.jail_days < 730,
+            (True, None, ["cc732(1)"], None),
+        ),
+    ],
+    default=(False, None, ["cc732"], "mandatory minimum term of imprisonment exceeds two years"),
+)
 
 
 def check_fine_and_probation(
@@ -659,32 +609,7 @@ def check_fine_and_probation(
             - sections (List[str]]: Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
-    # Convert minimum to days for comparison with 2 years (730 days)
-    indictable_days = 0
-
-    if indictable_minimum["jail"]["amount"]:
-        if indictable_minimum["jail"]["unit"] == "years":
-            indictable_days = int(indictable_minimum["jail"]["amount"]) * 365
-        elif indictable_minimum["jail"]["unit"] == "months":
-            indictable_days = int(indictable_minimum["jail"]["amount"]) * 30
-        else:  # days
-            indictable_days = int(indictable_minimum["jail"]["amount"])
-
-    if indictable_days == 0:
-        return standard_output(
-            True, None, ["cc732(1)"], "no minimum term of imprisonment"
-        )
-
-    if indictable_days < 730:  # Less than 2 years
-        return standard_output(True, None, ["cc732(1)"], None)
-
-    else:
-        return standard_output(
-            False,
-            None,
-            ["cc732"],
-            "mandatory minimum term of imprisonment exceeds two years",
-        )
+    return FINE_AND_PROBATION_TABLE.evaluate(RuleFacts(indictable_minimum=indictable_minimum))
 
 
 def check_fine_probation_intermittent(
@@ -716,6 +641,28 @@ def check_fine_probation_intermittent(
 
 
 # Ancillary orders
+DNA_DESIGNATION_TABLE = DecisionTable(
+    "dna_designation",
+    [
+        (
+            lambda f: flag(f.designations, DNA_PRIMARY),
+            (True, None, ["cc487.04"], "primary designated offence"),
+        ),
+        (
+            lambda f: flag(f.designations, DNA_SECONDARY),
+            (True, None, ["cc487.04"], "secondary designated offence"),
+        ),
+        (
+            lambda f: one_of(f.mode_code, (MODE_INDICTABLE, MODE_HYBRID))
+            & (f.indictable_maximum.jail_unit == "years")
+            & (f.indictable_maximum.jail_amount >= 5),
+            (True, None, ["cc487.04"], "secondary designated offence"),
+        ),
+    ],
+    default=(False, None, ["cc487.04"], "not a designated offence"),
+)
+
+
 def check_dna_designation(
     offence: List[str], mode: str, quantum: Dict[str, Dict[str, Union[int, str]]]
 ) -> Dict[str, Union[bool, None, List[str], str]]:
@@ -734,22 +681,9 @@ def check_dna_designation(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
-
-    if offence[0] in PRIMARY_DESIGNATED_DNA_OFFENCES:
-        return standard_output(True, None, ["cc487.04"], "primary designated offence")
-
-    elif offence[0] in SECONDARY_DESIGNATED_DNA_OFFENCES:
-        return standard_output(True, None, ["cc487.04"], "secondary designated offence")
-
-    elif (
-        (mode == "indictable" or mode == "hybrid")
-        and quantum["jail"]["unit"] == "years"
-        and int(quantum["jail"]["amount"]) >= 5
-    ):
-        return standard_output(True, None, ["cc487.04"], "secondary designated offence")
-
-    else:
-        return standard_output(False, None, ["cc487.04"], "not a designated offence")
+    return DNA_DESIGNATION_TABLE.evaluate(
+        RuleFacts(offence[0], mode, indictable_maximum=quantum)
+    )
 
 
 def check_soira(
@@ -778,8 +712,9 @@ def check_soira(
             - explanation (str): Explanation of the determination
     """
     # Check to see whether the offence is a designated SOIRA offence
-    if section not in (PRIMARY_SOIRA_OFFENCES_CURRENT + SECONDARY_SOIRA_OFFENCES + 
-                      SOIRA_OFFENCES_ATTEMPTS + SOIRA_OFFENCES_CONSPIRACY):
+    designations = designation_profile(section)
+
+    if not designations & SOIRA_DESIGNATED:
         return [standard_output(
             False,
             None,
@@ -825,19 +760,19 @@ def check_soira(
             }
 
     # Add specific designation type to notes
-    if section in PRIMARY_SOIRA_OFFENCES_CURRENT:
+    if designations & SOIRA_PRIMARY:
         soira_list[0]["notes"] = "primary designated offence"
         soira_list[0]["sections"].append("cc490.011[primary offence](a)")
-    elif section in SECONDARY_SOIRA_OFFENCES:
+    elif designations & SOIRA_SECONDARY:
         soira_list[0]["notes"] = "secondary designated offence"
         soira_list[0]["sections"].append("cc490.011[secondary offence](a)")
-    elif section in SOIRA_OFFENCES_ATTEMPTS:
+    elif designations & SOIRA_ATTEMPT:
         soira_list[0]["notes"] = "attempted designated offence"
         soira_list[0]["sections"].extend([
             "cc490.011[primary offence](f)",
             "cc490.011[secondary offence](b)"
         ])
-    elif section in SOIRA_OFFENCES_CONSPIRACY:
+    elif designations & SOIRA_CONSPIRACY:
         soira_list[0]["notes"] = "conspiracy to commit designated offence"
         soira_list[0]["sections"].extend([
             "cc490.011[primary offence](f)",
@@ -847,6 +782,55 @@ def check_soira(
     return soira_list
 
 
+PROCEEDS_OF_CRIME_TABLE = DecisionTable(
+    "proceeds_of_crime_forfeiture",
+    [
+        (
+            lambda f: f.mode_code == MODE_SUMMARY,
+            (
+                False,
+                None,
+                ["cc462.3[designated offence]", "cc462.37(1)"],
+                "strictly summary conviction offence",
+            ),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION),
+            (
+                True,
+                None,
+                ["cc462.37(2.02)(a)"],
+                "particular circumstances — criminal organization offence",
+            ),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_CDSA),
+            (True, None, ["cc462.37(2.02)(b)"], "particular circumstances — CDSA offence"),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_CANNABIS),
+            (True, None, ["cc462.37(2.02)(c)"], "particular circumstances — cannabis offence"),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING),
+            (
+                True,
+                None,
+                ["cc462.37(2.02)(d)"],
+                "particular circumstances — human trafficking offence",
+            ),
+        ),
+    ],
+    default=(
+        False,
+        None,
+        ["cc462.3[designated offence]", "cc462.37(1)"],
+        "offence prosecutable by indictment",
+    ),
+    output=lambda *outcome: [standard_output(*outcome)],
+)
+
+
 def check_proceeds_of_crime_forfeiture(
     section: str, mode: str
 ) -> List[Dict[str, Union[bool, None, List[str], str]]]:
@@ -864,78 +848,18 @@ def check_proceeds_of_crime_forfeiture(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
+    return PROCEEDS_OF_CRIME_TABLE.evaluate(RuleFacts(section, mode))
 
-    proceeds_list = []
-
-    if mode == "summary":
-        proceeds_list.append(
-            standard_output(
-                False,
-                None,
-                [
-                    "cc462.3[designated offence]",
-                    "cc462.37(1)",
-                ],
-                "strictly summary conviction offence",
-            )
-        )
-
-        return proceeds_list
-
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CRIMINAL_ORGANIZATION:
-        proceeds_list.append(
-            standard_output(
-                True,
-                None,
-                ["cc462.37(2.02)(a)"],
-                "particular circumstances — criminal organization offence",
-            )
-        )
-
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA:
-        proceeds_list.append(
-            standard_output(
-                True,
-                None,
-                ["cc462.37(2.02)(b)"],
-                "particular circumstances — CDSA offence",
-            )
-        )
-
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CANNABIS:
-        proceeds_list.append(
-            standard_output(
-                True,
-                None,
-                ["cc462.37(2.02)(c)"],
-                "particular circumstances — cannabis offence",
-            )
-        )
-
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_HUMAN_TRAFFICKING:
-        proceeds_list.append(
-            standard_output(
-                True,
-                None,
-                ["cc462.37(2.02)(d)"],
-                "particular circumstances — human trafficking offence",
-            )
-        )
 
-    else:
-        proceeds_list.append(
-            standard_output(
-                False,
-                None,
-                [
-                    "cc462.3[designated offence]",
-                    "cc462.37(1)",
-                ],
-                "offence prosecutable by indictment",
-            )
-        )
-
-    return proceeds_list
+SECTION_164_FORFEITURE_TABLE = DecisionTable(
+    "section_164.2_forfeiture_order",
+    [
+        (
+            lambda f: flag(f.designations, SECTION_164_FORFEITURE),
+            (True, None, ["cc164.2"], "enumerated offence"),
+        ),
+    ],
+)
 
 
 def check_section_164_forfeiture_order(
@@ -955,9 +879,7 @@ def check_section_164_forfeiture_order(
             - sections (List[str]): Relevant Criminal Code sections
             - explanation (str): Explanation of the determination
     """
-
-    if section in SECTION_161_FORFEITURE_ORDER_OFFENCES:
-        return standard_output(True, None, ["cc164.2"], "enumerated offence")
+    return SECTION_164_FORFEITURE_TABLE.evaluate(RuleFacts(section))
 
 
 def check_section_109_weapons_prohibition(
@@ -988,3 +910,27 @@ def check_section_109_weapons_prohibition(
 
 def check_section_515_mandatory_weapons_prohibition(section: str):
     pass
+
+
+# Tables evaluated for each offence, keyed by the name of their output, in the
+# order main.py reports them
+PROCEDURE_TABLES = {
+    "prelim_available": PRELIM_TABLE,
+    "section_469_offence": SECTION_469_TABLE,
+}
+
+SENTENCING_TABLES = {
+    "cso_available": CSO_TABLE,
+    "intermittent_available": INTERMITTENT_TABLE,
+    "suspended_sentence_available": SUSPENDED_SENTENCE_TABLE,
+    "discharge_available": DISCHARGE_TABLE,
+    "prison_and_probation_available": PRISON_AND_PROBATION_TABLE,
+    "fine_alone": FINE_ALONE_TABLE,
+    "fine_and_probation": FINE_AND_PROBATION_TABLE,
+}
+
+ANCILLARY_ORDER_TABLES = {
+    "dna_designation": DNA_DESIGNATION_TABLE,
+    "proceeds_of_crime_forfeiture": PROCEEDS_OF_CRIME_TABLE,
+    "section_164.2_forfeiture_order": SECTION_164_FORFEITURE_TABLE,
+}
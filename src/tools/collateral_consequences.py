@@ -1,4 +1,174 @@
-""" 
+"""
 A tool to collate statutory data relating to collateral consequences
+
+Each jurisdiction's consequences live in their own module (e.g.
+ca_collateral_consequences.py for federal law, sk_collateral_consequences.py
+for Saskatchewan), which registers its rules when it is imported:
+
+    @collateral_consequence("sk", "firearms_act_suspension")
+    def _firearms_act_suspension(context):
+        return check_firearms_act(context.section)
+
+A rule takes the OffenceContext of an offence row and returns an output (or
+a list of outputs), or None if it does not apply. Adding a jurisdiction means
+adding its module to CONSEQUENCE_MODULES.
+
+Every rule is evaluated for every offence once, when a ConsequenceTable is
+built, into a table of sections by jurisdiction. Looking up the consequences
+of a charge is then a single dict lookup, whatever the number of
+jurisdictions:
+
+    table = ConsequenceTable(rows)
+    table.lookup("cc_96")
+    # ({"ca": {"inadmissibility": [...]},
+    #   "sk": {"firearms_act_suspension": {...}}},)
+
+The table applies the current rules. Offences assessed under an earlier rule
+version get their federal consequences from that version (see main.py).
 """
 
+import importlib
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from .context import (
+    OffenceContext,
+)
+
+from .section_ids import (
+    canonical_section,
+)
+
+# The modules that register each jurisdiction's rules
+CONSEQUENCE_MODULES = (
+    "ca_collateral_consequences",
+    "sk_collateral_consequences",
+)
+
+JURISDICTIONS = {
+    "ca": "Canada",
+    "sk": "Saskatchewan",
+}
+
+# Type definitions
+Row = List[str]
+Consequences = Dict[str, Dict[str, Any]]
+Check = Callable[[OffenceContext], Any]
+
+
+class CollateralConsequence(NamedTuple):
+    """
+    A registered collateral consequence rule.
+
+    Attributes:
+        jurisdiction (str): The jurisdiction code, e.g. "ca" or "sk"
+        name (str): The name of the consequence, unique in the jurisdiction
+        check (Check): Returns the rule's output for an offence, or None if
+            it does not apply
+    """
+
+    jurisdiction: str
+    name: str
+    check: Check
+
+
+_CONSEQUENCES: Dict[Tuple[str, str], CollateralConsequence] = {}
+
+
+def collateral_consequence(jurisdiction: str, name: str) -> Callable[[Check], Check]:
+    """
+    Register a function as the rule for a jurisdiction's consequence.
+
+    Raises:
+        ValueError: If the jurisdiction is unknown, or the consequence is
+            already registered
+    """
+    if jurisdiction not in JURISDICTIONS:
+        raise ValueError(
+            f"Invalid jurisdiction: {jurisdiction}. Must be one of {list(JURISDICTIONS)}"
+        )
+
+    def register(check: Check) -> Check:
+        key = (jurisdiction, name)
+        if key in _CONSEQUENCES and _CONSEQUENCES[key].check is not check:
+            raise ValueError(f"Collateral consequence already registered: {jurisdiction}.{name}")
+        _CONSEQUENCES[key] = CollateralConsequence(jurisdiction, name, check)
+        return check
+
+    return register
+
+
+def registered_consequences() -> List[CollateralConsequence]:
+    """Import every jurisdiction's module and return the rules they register."""
+    for module in CONSEQUENCE_MODULES:
+        importlib.import_module(f".{module}", __package__)
+    return list(_CONSEQUENCES.values())
+
+
+class ConsequenceTable:
+    """
+    The collateral consequences of every offence in a set of rows.
+
+    Args:
+        rows (Sequence[Row]): The offence rows, e.g. an OffenceRegistry's
+        consequences (Optional[Sequence[CollateralConsequence]]): The rules
+            to evaluate. Defaults to every registered rule
+    """
+
+    def __init__(
+        self,
+        rows: Sequence[Row],
+        consequences: Optional[Sequence[CollateralConsequence]] = None,
+    ):
+        if consequences is None:
+            consequences = registered_consequences()
+        self.consequences = tuple(consequences)
+
+        table: Dict[str, List[Consequences]] = {}
+        for row in rows:
+            context = OffenceContext(row)
+            row_consequences: Consequences = {}
+            for consequence in self.consequences:
+                output = consequence.check(context)
+                if output is not None:
+                    row_consequences.setdefault(consequence.jurisdiction, {})[consequence.name] = output
+            table.setdefault(row[0], []).append(row_consequences)
+
+        # A section can have several rows (e.g. one per CDSA schedule)
+        self._table: Dict[str, Tuple[Consequences, ...]] = {
+            section: tuple(section_consequences) for section, section_consequences in table.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+    def __contains__(self, section: str) -> bool:
+        return section in self._table or canonical_section(section) in self._table
+
+    def lookup(self, section: str) -> Tuple[Consequences, ...]:
+        """
+        Return the consequences of a section in every jurisdiction.
+
+        Args:
+            section (str): The section in any spelling, e.g. "cc_96" or
+                "cdsa_4(3)"
+
+        Returns:
+            Tuple[Consequences, ...]: For each of the section's rows, in row
+                order, the outputs of each consequence by jurisdiction and
+                name
+
+        Raises:
+            KeyError: If the section is not in the table
+        """
+        try:
+            return self._table[section]
+        except KeyError:
+            pass
+        canonical = canonical_section(section)
+        if canonical is None or canonical not in self._table:
+            raise KeyError(f"Offence code '{section}' not found")
+        return self._table[canonical]
+
+    def jurisdictions(self) -> List[str]:
+        """Return the jurisdictions with at least one registered rule."""
+        return list(dict.fromkeys(consequence.jurisdiction for consequence in self.consequences))
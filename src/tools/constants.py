@@ -77,7 +77,7 @@ PRIMARY_DESIGNATED_DNA_OFFENCES = [
     "cc_239(1)(a)#s",
     "cc_239(1)(a.1)",
     "cc_239(1)(b)",
-    "cc_244(2)(a)#1,",
+    "cc_244(2)(a)#1",
     "cc_244(2)(a)#s",
     "cc_244(2)(b)",
     "cc_244.1",
@@ -91,10 +91,10 @@ PRIMARY_DESIGNATED_DNA_OFFENCES = [
     "cc_269",
     "cc_270.01",
     "cc_270.02",
-    "cc_271(a)",
-    "cc_271(b)",
+    "cc_271",
     "cc_272(2)(a)#1",
-    "cc_272(2)(a)#s" "cc_272(2)(a.1)",
+    "cc_272(2)(a)#s",
+    "cc_272(2)(a.1)",
     "cc_272(2)(a.2)",
     "cc_272(2)(b)",
     "cc_273(2)(a)#1",
@@ -165,7 +165,7 @@ PRIMARY_DESIGNATED_DNA_OFFENCES = [
     "cc_423.1",
     "cc_431",
     "cc_431.1",
-    "cc_431.2,",
+    "cc_431.2",
     "cc_462.31(2.1)",
     "cc_467.11",
     "cc_467.111(a)",
@@ -210,9 +210,9 @@ SECONDARY_DESIGNATED_DNA_OFFENCES = [
     "cc_247(3)",
     "cc_262",
     "cc_264",
-    "cc_264.1(a)",
-    "cc_264.1(b)",
-    "cc_264.1(c)",
+    "cc_264.1(1)(a)",
+    "cc_264.1(1)(b)",
+    "cc_264.1(1)(c)",
     "cc_266",
     "cc_270",
     "cc_280",
@@ -288,7 +288,7 @@ VIOLENCE_USED_THREATENED_ATTEMPTED_OFFENCES = [
     "cc_83.27",
     "cc_87",
     "cc_88",
-    "98,1",
+    "cc_98.1",
     "cc_151",
     "cc_153",
     "cc_153.1",
@@ -392,8 +392,7 @@ PRIMARY_SOIRA_OFFENCES_CURRENT = [
     "cc_172.1",
     "cc_172.2",
     "cc_173(2)",
-    "cc_271(a)",
-    "cc_271(b)",
+    "cc_271",
     "cc_272(2)(a)#1",
     "cc_272(2)(a)#s",
     "cc_272(2)(a.1)",
@@ -431,8 +430,8 @@ SECONDARY_SOIRA_OFFENCES = [
     "cc_279(1.1)(a)#1",
     "cc_279(1.1)(a)#s",
     "cc_279(1.1)(a.1)",
-    "cc_279.1(1.1)(a.2)",
-    "cc_279.1(1.1)(b)",
+    "cc_279(1.1)(a.2)",
+    "cc_279(1.1)(b)",
     "cc_279.01(1)(a)",
     "cc_279.01(1)(b)",
     "cc_279.02(1)",
@@ -504,7 +503,7 @@ PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA = [
     "cdsa6(3)(a)",
     "cdsa6(3)(b)",
     "cdsa6(3)(c)",
-    "cdsa7(1",
+    "cdsa7(1)",
     "cdsa7(2)",
     "cdsa7(3)",
     "cdsa7.1(2)(a)",
@@ -659,7 +658,7 @@ ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES = [
     "cc_393(2)",
     "cc_490.031",
     "cc_490.0311",
-    "cc_811)",
+    "cc_811",
     "cc_733.1",
     "cdsa4(4)",
 ]
@@ -705,6 +704,80 @@ ATTORNEY_GENERAL_CONSENT_OFFENCES = [
     "cc_83.27",
 ]
 
+# Prior convictions that make an impaired operation offence a second or
+# subsequent offence (s. 320.2), including the offences replaced in 2018
+IMPAIRED_OPERATION_PRIOR_OFFENCES = [
+    "cc_249",
+    "cc_249.1",
+    "cc_249.2",
+    "cc_249.3",
+    "cc_249.4",
+    "cc_252",
+    "cc_253",
+    "cc_254",
+    "cc_255",
+    "cc_320.13",
+    "cc_320.14",
+    "cc_320.15",
+    "cc_320.16",
+    "cc_320.17",
+    "cc_320.18",
+]
+
+# Prior convictions that count towards an impaired operation offence only if
+# they were committed by means of a conveyance (s. 320.2)
+CONVEYANCE_PRIOR_OFFENCES = [
+    "cc_220",
+    "cc_221",
+    "cc_236",
+]
+
+# Prior convictions that make a firearm offence a second or subsequent
+# offence (s. 84(5)(a) and (b)), and the paragraphs of the offences in
+# s. 84(5)(c) that are always committed with a firearm
+FIREARM_PRIOR_OFFENCES = [
+    "cc_85",
+    "cc_95",
+    "cc_96",
+    "cc_98",
+    "cc_98.1",
+    "cc_99",
+    "cc_100",
+    "cc_102",
+    "cc_103",
+    # s. 117.01(1); the data does not divide the section
+    "cc_117.01",
+    "cc_244",
+    "cc_244.2",
+    "cc_220(a)",
+    "cc_236(a)",
+    "cc_239(1)(a)",
+    "cc_239(1)(a.1)",
+    "cc_272(2)(a.1)",
+    "cc_273(2)(a.1)",
+    "cc_279(1.1)(a.1)",
+    "cc_279.1(2)(a.1)",
+    "cc_344(1)(a.1)",
+    "cc_346(1.1)(a.1)",
+]
+
+# Prior convictions that count towards a firearm offence only if a firearm
+# was used in committing them (s. 84(5)(c)). The "restricted or prohibited
+# firearm or criminal organization" paragraphs are among them, as they can
+# be committed without a firearm
+FIREARM_USE_PRIOR_OFFENCES = [
+    "cc_220",
+    "cc_236",
+    "cc_239",
+    "cc_272",
+    "cc_273",
+    "cc_279(1)",
+    "cc_279(1.1)",
+    "cc_279.1",
+    "cc_344",
+    "cc_346",
+]
+
 STATUTE_CODES = {
     "cc": {
         "name": "Criminal Code",
@@ -722,6 +795,10 @@ STATUTE_CODES = {
         "name": "Cannabis Act",
         "citation": "SC 2018, c 16"
     },
+    "nbmva": {
+        "name": "Motor Vehicle Act",
+        "citation": "RSNB 1973, c M-17"
+    },
 }
 
 SK_FIREARMS_ACT_SUSPENSION_OFFENCES = [
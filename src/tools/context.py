@@ -0,0 +1,92 @@
+"""
+Per-row evaluation context for the offence parser.
+
+Each group of details in main.py (basic details, procedure, sentencing,
+ancillary orders and collateral consequences) needs the same derived values
+for a row: its mode of proceeding and its four parsed quanta. The context
+computes them once per row so the groups can share them. It is also the
+object the decision tables in cc_rules_current.py are evaluated against.
+"""
+
+from typing import List
+
+from .cc_rules_current import (
+    check_offence_type,
+)
+
+from .decision_table import (
+    MODE_CODES,
+)
+
+from .designations import (
+    designation_profile,
+)
+
+from .utils import (
+    parse_quantum,
+)
+
+
+class OffenceContext:
+    """
+    The values every rule needs for a single offence row, computed once.
+
+    Attributes:
+        row (List[str]): The CSV row the context was built from
+        section (str): Statutory code and section number
+        description (str): Offence title
+        mode (str): "summary", "indictable" or "hybrid"
+        mode_code (int): The mode as one of the decision_table MODE_* codes
+        designations (int): The section's designation bitmask
+        indictable_minimum, indictable_maximum, summary_minimum,
+        summary_maximum (Quantum): The parsed quanta for the row
+        *_days (int): Each quantum's jail term in days
+        *_dollars (int): Each quantum's fine in dollars
+    """
+
+    __slots__ = (
+        "row",
+        "section",
+        "description",
+        "mode",
+        "mode_code",
+        "designations",
+        "indictable_minimum",
+        "indictable_maximum",
+        "summary_minimum",
+        "summary_maximum",
+        "indictable_minimum_days",
+        "indictable_maximum_days",
+        "summary_minimum_days",
+        "summary_maximum_days",
+        "indictable_minimum_dollars",
+        "indictable_maximum_dollars",
+        "summary_minimum_dollars",
+        "summary_maximum_dollars",
+    )
+
+    def __init__(self, row: List[str]):
+        self.row = row
+        self.section = row[0]
+        self.description = row[1]
+        self.mode = check_offence_type(row)
+        self.mode_code = MODE_CODES[self.mode]
+        self.designations = designation_profile(self.section)
+
+        self.indictable_minimum = parse_quantum(row[2])
+        self.indictable_maximum = parse_quantum(row[3])
+        self.summary_minimum = parse_quantum(row[4])
+        self.summary_maximum = parse_quantum(row[5])
+
+        self.indictable_minimum_days = self.indictable_minimum.jail_days
+        self.indictable_maximum_days = self.indictable_maximum.jail_days
+        self.summary_minimum_days = self.summary_minimum.jail_days
+        self.summary_maximum_days = self.summary_maximum.jail_days
+
+        self.indictable_minimum_dollars = self.indictable_minimum.fine_dollars
+        self.indictable_maximum_dollars = self.indictable_maximum.fine_dollars
+        self.summary_minimum_dollars = self.summary_minimum.fine_dollars
+        self.summary_maximum_dollars = self.summary_maximum.fine_dollars
+
+    def __repr__(self) -> str:
+        return f"OffenceContext({self.section!r}, mode={self.mode!r})"
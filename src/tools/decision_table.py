@@ -0,0 +1,224 @@
+"""
+Decision tables for the offence rules.
+
+Most rules are an ordered list of conditions, each with a fixed result: the
+first condition that holds decides the outcome, and a default applies when
+none do. A DecisionTable stores a rule in exactly that form, as data:
+
+    DecisionTable(
+        "suspended_sentence_available",
+        [
+            (lambda f: f.summary_minimum.has_jail | f.summary_minimum.has_fine,
+             (False, None, ["cc731(1)"], "mandatory minimum sentence")),
+        ],
+        default=(True, None, ["cc731(1)"], "no mandatory minimum sentence"),
+    )
+
+Each outcome is an (available, notes, sections, explanation) tuple, passed to
+the table's output function (standard_output by default) when a result is
+built.
+
+The same table is evaluated in two ways. For a single offence, the conditions
+are tried in order and evaluation stops at the first match. For a batch, the
+conditions are evaluated once over NumPy columns and combined with np.select,
+which has the same first-match semantics (see grid.py).
+
+Conditions therefore have to work on both scalar and array values. They are
+written with the bitwise operators (&, |, ^) instead of and/or/not, with
+comparisons in parentheses, and with the helpers below for membership and
+negation.
+"""
+
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .designations import (
+    designation_profile,
+)
+
+from .utils import (
+    Quantum,
+    standard_output,
+)
+
+# Mode codes
+MODE_SUMMARY = 0
+MODE_INDICTABLE = 1
+MODE_HYBRID = 2
+
+MODE_CODES = {
+    "summary": MODE_SUMMARY,
+    "indictable": MODE_INDICTABLE,
+    "hybrid": MODE_HYBRID,
+}
+
+TIME_UNITS = ("days", "months", "years")
+
+# Type definitions
+Outcome = Tuple[bool, Optional[str], Any, Optional[str]]
+Predicate = Callable[[Any], Any]
+
+
+# Condition helpers
+def one_of(value, options: Sequence):
+    """Membership test that works on a scalar or on a column of values."""
+    if hasattr(value, "shape"):
+        return np.isin(value, list(options))
+    return value in options
+
+
+def invert(condition):
+    """Negate a scalar or column condition."""
+    return condition ^ True
+
+
+def flag(designations, mask: int):
+    """Check a scalar or column of designation bitmasks for any bit of mask."""
+    return (designations & mask) != 0
+
+
+class RuleFacts:
+    """
+    The facts a decision table reads for one offence, for callers that hold
+    the individual values rather than an OffenceContext.
+
+    Quanta may be given as Quantum objects or as ParsedQuantum dictionaries;
+    dictionaries are converted.
+    """
+
+    __slots__ = (
+        "section",
+        "mode",
+        "mode_code",
+        "designations",
+        "indictable_minimum",
+        "indictable_maximum",
+        "summary_minimum",
+        "summary_maximum",
+    )
+
+    def __init__(
+        self,
+        section: str = "",
+        mode: Optional[str] = None,
+        indictable_minimum=None,
+        indictable_maximum=None,
+        summary_minimum=None,
+        summary_maximum=None,
+    ):
+        self.section = section
+        self.mode = mode
+        self.mode_code = MODE_CODES.get(mode, -1)
+        self.designations = designation_profile(section)
+        self.indictable_minimum = self._quantum(indictable_minimum)
+        self.indictable_maximum = self._quantum(indictable_maximum)
+        self.summary_minimum = self._quantum(summary_minimum)
+        self.summary_maximum = self._quantum(summary_maximum)
+
+    @staticmethod
+    def _quantum(quantum) -> Optional[Quantum]:
+        if quantum is None:
+            return None
+        return Quantum.from_parsed(quantum)
+
+
+class DecisionTable:
+    """
+    An ordered rule: the outcome of the first row whose predicate holds, or
+    the default.
+
+    Args:
+        name (str): The key the rule's result is stored under
+        rows (List[Tuple[Predicate, Outcome]]): Conditions and their outcomes,
+            in the order they are tried
+        default (Optional[Outcome]): The outcome when no condition holds. None
+            makes the rule return None
+        output (Callable): Builds a result from an outcome's four fields
+
+    Attributes:
+        outcomes (Tuple[Optional[Outcome], ...]): The outcome of each row, then
+            the default. An outcome code indexes into this tuple
+        available (Tuple[bool, ...]): Whether each outcome makes the option
+            available
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rows: List[Tuple[Predicate, Outcome]],
+        default: Optional[Outcome] = None,
+        output: Callable[..., Any] = standard_output,
+    ):
+        self.name = name
+        self.predicates: Tuple[Predicate, ...] = tuple(predicate for predicate, _ in rows)
+        self.outcomes: Tuple[Optional[Outcome], ...] = tuple(
+            outcome for _, outcome in rows
+        ) + (default,)
+        self.output = output
+        self.available: Tuple[bool, ...] = tuple(
+            outcome is not None and bool(outcome[0]) for outcome in self.outcomes
+        )
+        self._rows = tuple(enumerate(self.predicates))
+        self._default_code = len(self.predicates)
+
+    def __repr__(self) -> str:
+        return f"DecisionTable({self.name!r}, {len(self.predicates)} rows)"
+
+    def code(self, facts) -> int:
+        """Return the outcome code for one offence, stopping at the first match."""
+        for code, predicate in self._rows:
+            if predicate(facts):
+                return code
+        return self._default_code
+
+    def codes(self, columns):
+        """
+        Return the outcome code of every row in a batch.
+
+        Args:
+            columns: An object exposing the same attributes as an
+                OffenceContext, as NumPy columns (see grid.SentencingGrid)
+
+        Returns:
+            np.ndarray[int8]: One outcome code per row
+        """
+        size = len(columns)
+        conditions = [
+            np.broadcast_to(np.asarray(predicate(columns), dtype=bool), (size,))
+            for predicate in self.predicates
+        ]
+        if not conditions:
+            return np.full(size, self._default_code, dtype=np.int8)
+        return np.select(conditions, range(len(conditions)), self._default_code).astype(np.int8)
+
+    def build(self, code: int):
+        """Build the result for an outcome code. Each call returns new objects."""
+        outcome = self.outcomes[code]
+        if outcome is None:
+            return None
+        available, notes, sections, explanation = outcome
+        if isinstance(sections, list):
+            sections = list(sections)
+        return self.output(available, notes, sections, explanation)
+
+    def evaluate(self, facts):
+        """Evaluate the table for one offence and build its result."""
+        return self.build(self.code(facts))
+
+
+def status_output(
+    result: bool,
+    result_notes: Optional[str],
+    section: str,
+    explanation: Optional[str],
+) -> dict:
+    """
+    The older output format still used by some rules, in which the status is
+    a one-element tuple and the section is a single string.
+    """
+    return {
+        "status": ({"available": result, "notes": result_notes},),
+        "section": section,
+        "notes": explanation,
+    }
@@ -0,0 +1,230 @@
+"""
+Compiled designation index for the offence lists in constants.py.
+
+The rules ask the same kind of question over and over: is this section listed
+in one of the designation lists? Rather than scanning the lists, they are
+compiled once, at import, into a single table mapping each section to a
+bitmask with one bit per list. A membership question is then one dict lookup
+and a bit test, and a section's whole designation profile is one integer.
+
+A list can name a section at any level of the hierarchy: "cc_163.1" covers
+every offence in s. 163.1, down to "cc_163.1(4.1)". A section's profile is
+the OR of the bits of every prefix of it, computed once per section.
+"""
+
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping
+
+from .constants import (
+    PRIMARY_DESIGNATED_DNA_OFFENCES,
+    SECONDARY_DESIGNATED_DNA_OFFENCES,
+    EXCLUDED_CSO_OFFENCES,
+    TERRORISM_OFFENCES,
+    CRIMINAL_ORGANIZATION_OFFENCES,
+    SECTION_469_OFFENCES,
+    PRIMARY_SOIRA_OFFENCES_CURRENT,
+    SECONDARY_SOIRA_OFFENCES,
+    SOIRA_OFFENCES_ATTEMPTS,
+    SOIRA_OFFENCES_CONSPIRACY,
+    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CRIMINAL_ORGANIZATION,
+    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA,
+    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CANNABIS,
+    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_HUMAN_TRAFFICKING,
+    ABSOLUTE_JURISDICITON_OFFENCES_FRAUD,
+    ABSOLUTE_JURISDICITON_OFFENCES_ATTEMPTS_CONSPIRACIES,
+    ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES,
+    ABSOLUTE_JURISDICITON_OFFENCES_FALSE_PRETENCES,
+    ABSOLUTE_JURISDICITON_OFFENCES_PPOBC,
+    ABSOLUTE_JURISDICITON_OFFENCES_THEFT,
+    ABSOLUTE_JURISDICTION_OFFENCES_MISCHIEF,
+    SECTION_161_FORFEITURE_ORDER_OFFENCES,
+)
+
+from .section_ids import (
+    canonical_section,
+)
+
+from .section_trie import (
+    SectionTrie,
+    section_components,
+)
+
+# Designation bits
+DNA_PRIMARY = 1 << 0
+DNA_SECONDARY = 1 << 1
+SOIRA_PRIMARY = 1 << 2
+SOIRA_SECONDARY = 1 << 3
+SOIRA_ATTEMPT = 1 << 4
+SOIRA_CONSPIRACY = 1 << 5
+CSO_EXCLUDED = 1 << 6
+TERRORISM = 1 << 7
+CRIMINAL_ORGANIZATION = 1 << 8
+SECTION_469 = 1 << 9
+ABSOLUTE_JURISDICTION_THEFT = 1 << 10
+ABSOLUTE_JURISDICTION_FALSE_PRETENCES = 1 << 11
+ABSOLUTE_JURISDICTION_PPOBC = 1 << 12
+ABSOLUTE_JURISDICTION_FRAUD = 1 << 13
+ABSOLUTE_JURISDICTION_MISCHIEF = 1 << 14
+ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES = 1 << 15
+ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES = 1 << 16
+PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION = 1 << 17
+PROCEEDS_OF_CRIME_CDSA = 1 << 18
+PROCEEDS_OF_CRIME_CANNABIS = 1 << 19
+PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING = 1 << 20
+SECTION_164_FORFEITURE = 1 << 21
+
+# Combined masks
+SOIRA_DESIGNATED = SOIRA_PRIMARY | SOIRA_SECONDARY | SOIRA_ATTEMPT | SOIRA_CONSPIRACY
+ABSOLUTE_JURISDICTION = (
+    ABSOLUTE_JURISDICTION_THEFT
+    | ABSOLUTE_JURISDICTION_FALSE_PRETENCES
+    | ABSOLUTE_JURISDICTION_PPOBC
+    | ABSOLUTE_JURISDICTION_FRAUD
+    | ABSOLUTE_JURISDICTION_MISCHIEF
+    | ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES
+    | ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES
+)
+
+# The list each bit is compiled from
+DESIGNATION_LISTS: Dict[int, List[str]] = {
+    DNA_PRIMARY: PRIMARY_DESIGNATED_DNA_OFFENCES,
+    DNA_SECONDARY: SECONDARY_DESIGNATED_DNA_OFFENCES,
+    SOIRA_PRIMARY: PRIMARY_SOIRA_OFFENCES_CURRENT,
+    SOIRA_SECONDARY: SECONDARY_SOIRA_OFFENCES,
+    SOIRA_ATTEMPT: SOIRA_OFFENCES_ATTEMPTS,
+    SOIRA_CONSPIRACY: SOIRA_OFFENCES_CONSPIRACY,
+    CSO_EXCLUDED: EXCLUDED_CSO_OFFENCES,
+    TERRORISM: TERRORISM_OFFENCES,
+    CRIMINAL_ORGANIZATION: CRIMINAL_ORGANIZATION_OFFENCES,
+    SECTION_469: SECTION_469_OFFENCES,
+    ABSOLUTE_JURISDICTION_THEFT: ABSOLUTE_JURISDICITON_OFFENCES_THEFT,
+    ABSOLUTE_JURISDICTION_FALSE_PRETENCES: ABSOLUTE_JURISDICITON_OFFENCES_FALSE_PRETENCES,
+    ABSOLUTE_JURISDICTION_PPOBC: ABSOLUTE_JURISDICITON_OFFENCES_PPOBC,
+    ABSOLUTE_JURISDICTION_FRAUD: ABSOLUTE_JURISDICITON_OFFENCES_FRAUD,
+    ABSOLUTE_JURISDICTION_MISCHIEF: ABSOLUTE_JURISDICTION_OFFENCES_MISCHIEF,
+    ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES: ABSOLUTE_JURISDICITON_OFFENCES_ATTEMPTS_CONSPIRACIES,
+    ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES: ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES,
+    PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION: PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CRIMINAL_ORGANIZATION,
+    PROCEEDS_OF_CRIME_CDSA: PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA,
+    PROCEEDS_OF_CRIME_CANNABIS: PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CANNABIS,
+    PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING: PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_HUMAN_TRAFFICKING,
+    SECTION_164_FORFEITURE: SECTION_161_FORFEITURE_ORDER_OFFENCES,
+}
+
+# The statute CSVs have about 600 sections
+PROFILE_CACHE_SIZE = 4096
+
+# Human-readable names for each bit, used to decode a profile
+DESIGNATION_NAMES: Dict[int, str] = {
+    DNA_PRIMARY: "dna_primary",
+    DNA_SECONDARY: "dna_secondary",
+    SOIRA_PRIMARY: "soira_primary",
+    SOIRA_SECONDARY: "soira_secondary",
+    SOIRA_ATTEMPT: "soira_attempt",
+    SOIRA_CONSPIRACY: "soira_conspiracy",
+    CSO_EXCLUDED: "cso_excluded",
+    TERRORISM: "terrorism",
+    CRIMINAL_ORGANIZATION: "criminal_organization",
+    SECTION_469: "section_469",
+    ABSOLUTE_JURISDICTION_THEFT: "absolute_jurisdiction_theft",
+    ABSOLUTE_JURISDICTION_FALSE_PRETENCES: "absolute_jurisdiction_false_pretences",
+    ABSOLUTE_JURISDICTION_PPOBC: "absolute_jurisdiction_ppobc",
+    ABSOLUTE_JURISDICTION_FRAUD: "absolute_jurisdiction_fraud",
+    ABSOLUTE_JURISDICTION_MISCHIEF: "absolute_jurisdiction_mischief",
+    ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES: "absolute_jurisdiction_attempts_conspiracies",
+    ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES: "absolute_jurisdiction_designated_offences",
+    PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION: "proceeds_of_crime_criminal_organization",
+    PROCEEDS_OF_CRIME_CDSA: "proceeds_of_crime_cdsa",
+    PROCEEDS_OF_CRIME_CANNABIS: "proceeds_of_crime_cannabis",
+    PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING: "proceeds_of_crime_human_trafficking",
+    SECTION_164_FORFEITURE: "section_164_forfeiture",
+}
+
+
+def compile_designations(
+    designation_lists: Mapping[int, Iterable[str]],
+) -> Dict[str, int]:
+    """
+    Compile designation lists into a section to bitmask table.
+
+    Args:
+        designation_lists (Mapping[int, Iterable[str]]): Maps each designation
+            bit to the sections that carry it
+
+    Returns:
+        Dict[str, int]: Maps the canonical spelling of each listed section to
+            the OR of its bits
+
+    Raises:
+        ValueError: If a listed section is not in section syntax
+    """
+    designations: Dict[str, int] = {}
+    for bit, sections in designation_lists.items():
+        for section in sections:
+            canonical = canonical_section(section)
+            if canonical is None:
+                raise ValueError(f"Invalid section in {DESIGNATION_NAMES.get(bit, bit)} list: {section!r}")
+            designations[canonical] = designations.get(canonical, 0) | bit
+    return designations
+
+
+DESIGNATIONS = compile_designations(DESIGNATION_LISTS)
+
+
+@lru_cache(maxsize=PROFILE_CACHE_SIZE)
+def designation_profile(section: str) -> int:
+    """
+    Return the designation bitmask for a section, or 0 if it is not listed.
+
+    The bits of a listed prefix of the section apply too, e.g. those of
+    "cc_271" to "cc_271#a".
+    """
+    parsed = section_components(section)
+    if parsed is None:
+        return DESIGNATIONS.get(section, 0)
+    profile = 0
+    for end in parsed[1][1:]:
+        profile |= DESIGNATIONS.get(canonical_section(section[:end]), 0)
+    return profile
+
+
+def unmatched_designations(sections: Iterable[str]) -> Dict[str, List[str]]:
+    """
+    Find the listed sections that cover none of the given sections, which
+    are most likely misspelled.
+
+    Args:
+        sections (Iterable[str]): The sections of the offence rows
+
+    Returns:
+        Dict[str, List[str]]: The unmatched sections of each list, by the
+            name of its bit. Lists without any are left out
+    """
+    trie = SectionTrie(sections)
+    unmatched: Dict[str, List[str]] = {}
+    for bit, listed in DESIGNATION_LISTS.items():
+        missing = [section for section in listed if not trie.descendants(section)]
+        if missing:
+            unmatched[DESIGNATION_NAMES[bit]] = missing
+    return unmatched
+
+
+def is_designated(section: str, designation: int) -> bool:
+    """
+    Check whether a section carries any of the given designation bits.
+
+    Args:
+        section (str): The section of the statute
+        designation (int): A designation bit, or a mask of several bits
+
+    Returns:
+        bool: True if the section carries at least one of the bits
+    """
+    return bool(designation_profile(section) & designation)
+
+
+def describe_profile(profile: int) -> List[str]:
+    """
+    Decode a designation bitmask into the names of its bits, in bit order.
+    """
+    return [name for bit, name in DESIGNATION_NAMES.items() if profile & bit]
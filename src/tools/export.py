@@ -0,0 +1,288 @@
+"""
+Export the evaluated offence grid.
+
+Every offence row of the chosen statutes is evaluated under one rule version
+and written as one flat record: the offence data, then four columns for each
+rule output (whether the option is available, the status notes, the
+sections cited and the explanation). The column set depends only on the rule
+version, so files exported under the same version line up.
+
+    offence-grid-export grid.csv
+    offence-grid-export grid.parquet --statutes cc,cdsa --rule-version 2024-09-01 --jobs 4
+
+The format is taken from the output file's extension unless --format is
+given. Records are evaluated and written in chunks; with --jobs, chunks are
+evaluated in parallel by a process pool and written in order. Parquet output
+requires pyarrow.
+"""
+
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .main import (
+    STATUTE_DIRS,
+    parse_rows,
+)
+
+from .parsed_offence import (
+    GROUPS,
+)
+
+from .registry import (
+    StatuteRegistry,
+)
+
+from .rule_versions import (
+    rule_versions,
+)
+
+from .utils import (
+    flatten_output,
+)
+
+EXPORT_FORMATS = ("csv", "jsonl", "parquet")
+DEFAULT_CHUNK_SIZE = 256
+
+# The columns of the offence data, before the rule outputs
+OFFENCE_COLUMNS = (
+    "section",
+    "description",
+    "mode",
+    "indictable_minimum",
+    "indictable_maximum",
+    "summary_minimum",
+    "summary_maximum",
+)
+
+# The columns each rule output is flattened to
+OUTPUT_FIELDS = ("available", "status_notes", "sections", "notes")
+
+def flatten_record(parsed_offence: dict) -> Dict[str, object]:
+    """Flatten a parse_row result to one record of scalar columns."""
+    offence_data = parsed_offence["offence_data"]
+    record = {
+        "section": offence_data["section"],
+        "description": offence_data["description"],
+        "mode": offence_data["mode"],
+    }
+    for column in OFFENCE_COLUMNS[3:]:
+        quantum = offence_data[column]
+        record[column] = getattr(quantum, "raw", None)
+
+    for group in GROUPS[1:]:
+        for rule, output in parsed_offence.get(group, {}).items():
+            for field, value in zip(OUTPUT_FIELDS, flatten_output(output)):
+                record[f"{group}.{rule}.{field}"] = value
+    return record
+
+
+def _evaluate_rows(task: Tuple[str, Sequence[List[str]]]) -> List[Dict[str, object]]:
+    """Evaluate and flatten one chunk of rows. Runs in a worker."""
+    version_name, rows = task
+    version = rule_versions.get(version_name)
+    return [flatten_record(parsed) for parsed in parse_rows(rows, True, True, True, True, version)]
+
+
+def _chunks(rows: Sequence[List[str]], size: int) -> Iterator[Sequence[List[str]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+class _CsvWriter:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.DictWriter(self._file, fieldnames=columns)
+        self._writer.writeheader()
+
+    def write(self, records: List[Dict[str, object]]) -> None:
+        self._writer.writerows(records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _JsonLinesWriter:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, records: List[Dict[str, object]]) -> None:
+        self._file.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path: Path, columns: Sequence[str]):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError(
+                "Parquet export requires pyarrow. Install it with: pip install pyarrow"
+            ) from None
+
+        self._pa = pa
+        self._schema = pa.schema([
+            (column, pa.bool_() if column.endswith(".available") else pa.string())
+            for column in columns
+        ])
+        self._writer = pq.ParquetWriter(str(path), self._schema)
+
+    def write(self, records: List[Dict[str, object]]) -> None:
+        self._writer.write_table(self._pa.Table.from_pylist(records, schema=self._schema))
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+WRITERS = {
+    "csv": _CsvWriter,
+    "jsonl": _JsonLinesWriter,
+    "parquet": _ParquetWriter,
+}
+
+
+def export_grid(
+    output: Path,
+    format: Optional[str] = None,
+    statutes: Optional[Sequence[str]] = None,
+    rule_version: str = "current",
+    jobs: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, object]:
+    """
+    Evaluate every offence of the chosen statutes and write the flat grid.
+
+    Args:
+        output (Path): The file to write
+        format (Optional[str]): "csv", "jsonl" or "parquet". Defaults to the
+            output file's extension
+        statutes (Optional[Sequence[str]]): Statute codes to export, e.g.
+            ["cc", "cdsa"]. Defaults to every statute
+        rule_version (str): The rule version, by name or by an offence date
+            it is in force on
+        jobs (Optional[int]): Worker processes. None or 1 evaluates in this
+            process
+        chunk_size (int): Rows evaluated and written at a time
+
+    Returns:
+        Dict[str, object]: The number of rows and columns written, the rule
+            version and the elapsed time
+
+    Raises:
+        ValueError: If the format, a statute or the rule version is unknown,
+            or the chunk size is not positive
+        RuntimeError: If the format is Parquet and pyarrow is not installed
+    """
+    started = time.perf_counter()
+    output = Path(output)
+
+    if chunk_size < 1:
+        raise ValueError(f"Invalid chunk size: {chunk_size}. Must be at least 1")
+
+    format = format or output.suffix.lstrip(".").lower()
+    if format not in WRITERS:
+        raise ValueError(f"Invalid format: {format}. Must be one of {list(EXPORT_FORMATS)}")
+
+    version = rule_versions.get(rule_version)
+
+    registry = StatuteRegistry(STATUTE_DIRS)
+    codes = list(registry) if statutes is None else list(statutes)
+    unknown = [code for code in codes if code not in registry.sources]
+    if unknown:
+        raise ValueError(f"Unknown statutes: {unknown}. Available: {list(registry)}")
+    rows = [row for code in codes for row in registry.statute(code).rows]
+
+    # The rule outputs, and so the columns, are the same for every row
+    columns = list(_evaluate_rows((version.name, rows[:1]))[0]) if rows else list(OFFENCE_COLUMNS)
+
+    tasks = ((version.name, chunk) for chunk in _chunks(rows, chunk_size))
+    executor = None
+    if jobs is not None and jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs)
+        chunks = executor.map(_evaluate_rows, tasks)
+    else:
+        chunks = map(_evaluate_rows, tasks)
+
+    writer = WRITERS[format](output, columns)
+    written = 0
+    try:
+        for records in chunks:
+            writer.write(records)
+            written += len(records)
+    finally:
+        writer.close()
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    return {
+        "rows": written,
+        "columns": len(columns),
+        "rule_version": version.name,
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Export every offence and its evaluated rule outputs as a flat table"
+    )
+    parser.add_argument("output", type=Path, help="the file to write")
+    parser.add_argument(
+        "--format",
+        choices=EXPORT_FORMATS,
+        default=None,
+        help="the output format (default: from the output file's extension)",
+    )
+    parser.add_argument(
+        "--statutes",
+        default=None,
+        help="comma-separated statute codes to export, e.g. cc,cdsa (default: all)",
+    )
+    parser.add_argument(
+        "--rule-version",
+        default="current",
+        help="the rule version, by name or offence date (default: current)",
+    )
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: 1)")
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help=f"rows evaluated and written at a time (default: {DEFAULT_CHUNK_SIZE})",
+    )
+    args = parser.parse_args(argv)
+
+    statutes = None
+    if args.statutes:
+        statutes = [code.strip().lower() for code in args.statutes.split(",") if code.strip()]
+
+    try:
+        summary = export_grid(
+            args.output,
+            format=args.format,
+            statutes=statutes,
+            rule_version=args.rule_version,
+            jobs=args.jobs,
+            chunk_size=args.chunk_size,
+        )
+    except (ValueError, RuntimeError) as e:
+        parser.exit(2, f"{parser.prog}: error: {e}\n")
+
+    print(
+        f"Wrote {summary['rows']} rows and {summary['columns']} columns under "
+        f"{summary['rule_version']} rules to {args.output} in {summary['seconds']}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Graduated offences.
+
+Some offences carry a heavier punishment on a second or subsequent
+conviction, and the data gives such an offence one row per tier: as variants
+of the section ("cc_320.14(1)#1", "cc_320.14(1)#2", "cc_320.14(1)#s"), or, in
+statutes without variants, as rows of the same section whose names end in
+"— first offence" or "— subsequent offence". A lookup returns every tier; the
+table below picks the one that applies given the offender's prior
+convictions:
+
+    table = GraduatedTable(registry.rows)
+    counts = table.prior_counts([["cc_253(1)(a)"], []])
+    table.select(table.base_ids(["cc_320.14(1)", "cc_320.14(1)"]), counts)
+    # the "#2" tier for the first offender, the "#1" tier for the second
+
+Which prior convictions count depends on the offence. Impaired operation
+offences count any prior impaired operation offence (s. 320.2), firearm
+offences any prior firearm offence (s. 84(5)), and every other graduated
+offence counts prior convictions under the same section. Each of these is a
+prior conviction category: a record is reduced to a count per category, and
+each base section reads the count of its own category.
+
+Some prior convictions count only in the circumstances they were committed
+in: manslaughter counts towards an impaired operation offence if it was
+committed by means of a conveyance, and towards a firearm offence if a
+firearm was used. The section does not say so, so a record gives these as a
+PriorConviction with the circumstance flagged:
+
+    table.prior_counts([[PriorConviction("cc_236(b)", by_conveyance=True)]])
+
+The table is built once, from the rows, and maps each base section and prior
+count to the rows of the applicable tier. Selecting tiers for a batch of
+charges is then a pair of array lookups, however many offenders there are.
+"""
+
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .constants import (
+    CONVEYANCE_PRIOR_OFFENCES,
+    FIREARM_PRIOR_OFFENCES,
+    FIREARM_USE_PRIOR_OFFENCES,
+    IMPAIRED_OPERATION_PRIOR_OFFENCES,
+)
+
+from .section_trie import (
+    section_components,
+)
+
+# Type definitions
+Row = List[str]
+Components = Tuple[str, ...]
+
+
+class PriorConviction(NamedTuple):
+    """
+    A prior conviction and the circumstances some categories depend on.
+
+    Attributes:
+        section (str): The section of the conviction
+        by_conveyance (bool): The offence was committed by means of a
+            conveyance
+        with_firearm (bool): A firearm was used in committing the offence
+    """
+    section: str
+    by_conveyance: bool = False
+    with_firearm: bool = False
+
+
+Prior = Union[str, PriorConviction]
+
+# The prior conviction categories that span several sections, in the order
+# their category numbers are assigned
+PRIOR_CONVICTION_CATEGORIES = {
+    "impaired_operation": IMPAIRED_OPERATION_PRIOR_OFFENCES,
+    "firearm": FIREARM_PRIOR_OFFENCES,
+}
+
+# The sections that fall in a category only if the PriorConviction flag is
+# set
+CONDITIONAL_PRIOR_CONVICTIONS = {
+    "impaired_operation": ("by_conveyance", CONVEYANCE_PRIOR_OFFENCES),
+    "firearm": ("with_firearm", FIREARM_USE_PRIOR_OFFENCES),
+}
+
+# No tier depends on more than two prior convictions, so higher counts are
+# treated as two
+MAX_PRIOR_COUNT = 2
+
+# Tiers. A subsequent offence starts at two prior convictions if the offence
+# has a second offence tier, and at one otherwise
+FIRST, SECOND, SUBSEQUENT, THIRD_OR_SUBSEQUENT = 1, 2, 3, 4
+
+TIER_VARIANTS = {"#1": FIRST, "#2": SECOND, "#s": SUBSEQUENT}
+
+_TIER_NAMES = re.compile(r"— (first|second|subsequent|third or subsequent) offence$")
+_NAMED_TIERS = {
+    "first": FIRST,
+    "second": SECOND,
+    "subsequent": SUBSEQUENT,
+    "third or subsequent": THIRD_OR_SUBSEQUENT,
+}
+
+
+def graduated_tier(row: Row) -> Optional[Tuple[str, int]]:
+    """
+    Return the base section and tier of a graduated offence row.
+
+    Args:
+        row (Row): An offence row
+
+    Returns:
+        Optional[Tuple[str, int]]: The base section (e.g. "cc_320.14(1)" for
+            "cc_320.14(1)#1#a") and the tier (FIRST, SECOND, SUBSEQUENT or
+            THIRD_OR_SUBSEQUENT), or None if the row is not a tier of a
+            graduated offence
+    """
+    section = row[0]
+    parsed = section_components(section)
+    if parsed is None:
+        return None
+    components, ends = parsed
+
+    for position, component in enumerate(components):
+        if component.startswith("#"):
+            tier = TIER_VARIANTS.get(component)
+            if tier is None:
+                return None
+            # The name can narrow a "#s" row to a third or subsequent offence
+            match = _TIER_NAMES.search(row[1] or "")
+            if tier == SUBSEQUENT and match is not None:
+                tier = _NAMED_TIERS[match.group(1)]
+            return section[:ends[position - 1]], tier
+
+    match = _TIER_NAMES.search(row[1] or "")
+    if match is None:
+        return None
+    return section, _NAMED_TIERS[match.group(1)]
+
+
+def _covers(prefix: Components, components: Components) -> bool:
+    return components[:len(prefix)] == prefix
+
+
+class GraduatedTable:
+    """
+    The tiers of every graduated offence in a set of rows.
+
+    Args:
+        rows (Sequence[Row]): The offence rows, e.g. an OffenceRegistry's
+
+    Attributes:
+        bases (List[str]): The base sections, by base ID
+        groups (List[Tuple[int, ...]]): The row numbers of each tier, by
+            group ID
+        table (np.ndarray): The group ID for each base ID and prior count,
+            from 0 to MAX_PRIOR_COUNT
+    """
+
+    def __init__(self, rows: Sequence[Row]):
+        tiers: Dict[str, Dict[int, List[int]]] = {}
+        for row_number, row in enumerate(rows):
+            tier = graduated_tier(row)
+            if tier is not None:
+                tiers.setdefault(tier[0], {}).setdefault(tier[1], []).append(row_number)
+        # A base with only one tier has nothing to choose between
+        tiers = {base: base_tiers for base, base_tiers in tiers.items() if len(base_tiers) > 1}
+
+        self.bases: List[str] = list(tiers)
+        self._base_ids: Dict[str, int] = {base: base_id for base_id, base in enumerate(self.bases)}
+        self._row_bases: Dict[int, int] = {
+            row_number: self._base_ids[base]
+            for base, base_tiers in tiers.items()
+            for tier_rows in base_tiers.values()
+            for row_number in tier_rows
+        }
+
+        # The prefixes of each category, with the flag a prior conviction
+        # needs to fall in it, or None if it always does
+        self._category_prefixes: List[Tuple[int, Components, Optional[str]]] = []
+        for category_id, (category, sections) in enumerate(PRIOR_CONVICTION_CATEGORIES.items()):
+            self._category_prefixes.extend(
+                (category_id, section_components(section)[0], None) for section in sections
+            )
+            flag, conditional = CONDITIONAL_PRIOR_CONVICTIONS.get(category, (None, ()))
+            self._category_prefixes.extend(
+                (category_id, section_components(section)[0], flag) for section in conditional
+            )
+        self._section_categories: Dict[Components, int] = {}
+        self._prior_categories: Dict[PriorConviction, Tuple[int, ...]] = {}
+
+        self.groups: List[Tuple[int, ...]] = []
+        self.table = np.zeros((len(self.bases), MAX_PRIOR_COUNT + 1), dtype=np.int32)
+        categories = []
+        for base_id, (base, base_tiers) in enumerate(tiers.items()):
+            categories.append(self._base_category(base))
+
+            thresholds = {
+                FIRST: 0,
+                SECOND: 1,
+                SUBSEQUENT: 2 if SECOND in base_tiers else 1,
+                THIRD_OR_SUBSEQUENT: 2,
+            }
+            ordered = sorted(base_tiers, key=thresholds.get)
+            group_ids = {}
+            for tier in ordered:
+                group_ids[tier] = len(self.groups)
+                self.groups.append(tuple(base_tiers[tier]))
+
+            for prior_count in range(MAX_PRIOR_COUNT + 1):
+                # The highest tier the prior count reaches, or the lowest tier
+                # if it reaches none
+                reached = [tier for tier in ordered if thresholds[tier] <= prior_count]
+                tier = reached[-1] if reached else ordered[0]
+                self.table[base_id, prior_count] = group_ids[tier]
+
+        # The prior conviction category each base section counts
+        self.categories = np.array(categories, dtype=np.int32)
+        self.category_count = len(PRIOR_CONVICTION_CATEGORIES) + len(self._section_categories)
+
+    def _base_category(self, base: str) -> int:
+        components = section_components(base)[0]
+        for category_id, prefix, _ in self._category_prefixes:
+            if _covers(prefix, components):
+                return category_id
+        # Otherwise prior convictions under the same section count
+        return self._section_categories.setdefault(
+            components[:2], len(PRIOR_CONVICTION_CATEGORIES) + len(self._section_categories)
+        )
+
+    def __len__(self) -> int:
+        return len(self.bases)
+
+    def base_id(self, row_number: int) -> Optional[int]:
+        """Return the base ID of a row, or None if it is not a graduated tier."""
+        return self._row_bases.get(row_number)
+
+    def base_ids(self, bases: Iterable[str]) -> np.ndarray:
+        """
+        Return the base IDs of base sections, e.g. "cc_320.14(1)".
+
+        Raises:
+            KeyError: If a section is not the base of a graduated offence
+        """
+        return np.array([self._base_ids[base.strip().lower()] for base in bases], dtype=np.int32)
+
+    def prior_categories(self, prior: Prior) -> Tuple[int, ...]:
+        """
+        Return the prior conviction categories a prior conviction falls in.
+
+        Args:
+            prior (Prior): The section of the prior conviction, at any level
+                of the hierarchy, e.g. "cc_253(1)(a)" or "cc_320.14", or a
+                PriorConviction flagging the circumstances of the offence
+
+        Returns:
+            Tuple[int, ...]: The category numbers, or an empty tuple if the
+                conviction does not count towards any graduated offence
+        """
+        if isinstance(prior, str):
+            prior = PriorConviction(prior)
+        prior = prior._replace(
+            section=prior.section.strip().lower(),
+            by_conveyance=bool(prior.by_conveyance),
+            with_firearm=bool(prior.with_firearm),
+        )
+        try:
+            return self._prior_categories[prior]
+        except KeyError:
+            pass
+
+        parsed = section_components(prior.section)
+        categories = ()
+        if parsed is not None:
+            components = parsed[0]
+            categories = tuple(sorted(
+                {
+                    category_id
+                    for category_id, prefix, flag in self._category_prefixes
+                    if (flag is None or getattr(prior, flag)) and _covers(prefix, components)
+                }
+                | {
+                    category_id
+                    for section_prefix, category_id in self._section_categories.items()
+                    if _covers(section_prefix, components)
+                }
+            ))
+        self._prior_categories[prior] = categories
+        return categories
+
+    def prior_counts(self, records: Sequence[Iterable[Prior]]) -> np.ndarray:
+        """
+        Count each offender's prior convictions in each category.
+
+        Args:
+            records (Sequence[Iterable[Prior]]): The prior convictions of each
+                offender, one conviction per entry, as a section or a
+                PriorConviction
+
+        Returns:
+            np.ndarray: An array of shape (offenders, categories)
+        """
+        counts = np.zeros((len(records), self.category_count), dtype=np.int32)
+        offenders = []
+        categories = []
+        for offender, record in enumerate(records):
+            for prior in record:
+                for category_id in self.prior_categories(prior):
+                    offenders.append(offender)
+                    categories.append(category_id)
+        np.add.at(counts, (np.array(offenders, dtype=np.int64), np.array(categories, dtype=np.int64)), 1)
+        return counts
+
+    def select(self, base_ids: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Select the applicable tier of each charge.
+
+        Args:
+            base_ids (np.ndarray): The base ID of each charge
+            counts (np.ndarray): The prior_counts row of the offender on each
+                charge, of shape (charges, categories)
+
+        Returns:
+            np.ndarray: The group ID of each charge's tier; self.groups holds
+                its row numbers
+        """
+        base_ids = np.asarray(base_ids, dtype=np.int64)
+        prior_counts = counts[np.arange(len(base_ids)), self.categories[base_ids]]
+        return self.table[base_ids, np.minimum(prior_counts, MAX_PRIOR_COUNT)]
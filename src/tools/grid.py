@@ -0,0 +1,153 @@
+"""
+Vectorized evaluation of the sentencing-options grid.
+
+The scalar rules in cc_rules_current.py evaluate one row at a time. For grid
+exports, the offence rows are instead loaded into NumPy columns (mode codes,
+designation bitmasks, and the jail and fine values of each quantum) and every
+sentencing rule is evaluated once over all rows, as a set of boolean masks.
+
+The rules are the same decision tables the scalar parser uses: the grid
+exposes its columns under the same names as an OffenceContext, so each
+table's conditions can be evaluated over whole columns. Each rule produces an
+array of outcome codes, one per row, which index into the table's outcomes.
+The outputs are only materialized into dictionaries when they are asked for,
+and they match the scalar engine exactly.
+
+main.parse_rows uses the grid to evaluate the sentencing options of a batch
+of rows, for the grid export, the grid query index and the database loader;
+parse_offence evaluates one row at a time with the scalar engine.
+"""
+
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+from .cc_rules_current import (
+    SENTENCING_TABLES,
+    check_offence_type,
+)
+
+from .decision_table import (
+    MODE_CODES,
+    DecisionTable,
+)
+
+from .designations import (
+    designation_profile,
+)
+
+from .utils import (
+    Quantum,
+    parse_quantum,
+)
+
+class QuantumColumns:
+    """
+    The values the rules read from one quantum field, as columns over all
+    rows. The attributes have the same names as those of a Quantum.
+
+    Attributes:
+        raw (np.ndarray[object]): The CSV string of each quantum
+        has_jail (np.ndarray[bool]): The jail amount is set
+        has_fine (np.ndarray[bool]): The fine amount is set
+        jail_unit (np.ndarray[object]): The unit of the jail amount
+        jail_amount (np.ndarray[int64]): The jail amount in its own unit
+        jail_days (np.ndarray[int64]): The jail amount in days
+        fine_dollars (np.ndarray[int64]): The fine in dollars
+    """
+
+    __slots__ = (
+        "raw",
+        "has_jail",
+        "has_fine",
+        "jail_unit",
+        "jail_amount",
+        "jail_days",
+        "fine_dollars",
+    )
+
+    def __init__(self, quanta: Sequence[Quantum]):
+        self.raw = np.array([quantum.raw for quantum in quanta], dtype=object)
+        self.has_jail = np.array([quantum.has_jail for quantum in quanta], dtype=bool)
+        self.has_fine = np.array([quantum.has_fine for quantum in quanta], dtype=bool)
+        self.jail_unit = np.array([quantum.jail_unit for quantum in quanta], dtype=object)
+        self.jail_amount = np.array([quantum.jail_amount for quantum in quanta], dtype=np.int64)
+        self.jail_days = np.array([quantum.jail_days for quantum in quanta], dtype=np.int64)
+        self.fine_dollars = np.array([quantum.fine_dollars for quantum in quanta], dtype=np.int64)
+
+
+class SentencingGrid:
+    """
+    Columnar sentencing-options grid over a set of offence rows.
+
+    Args:
+        rows (Iterable[List[str]]): Offence rows, in CSV column order
+        tables (Mapping[str, DecisionTable]): The rules to evaluate, keyed by
+            the name of their output. Defaults to the sentencing tables of
+            cc_rules_current.py
+
+    Attributes:
+        sections (np.ndarray[object]): The section of each row
+        mode_code (np.ndarray[int8]): Mode codes (MODE_SUMMARY, ...)
+        designations (np.ndarray[int64]): Designation bitmask of each row
+        indictable_minimum, indictable_maximum, summary_minimum,
+        summary_maximum (QuantumColumns): Columns for each quantum field
+        outcomes (Dict[str, np.ndarray[int8]]): Outcome code of each rule,
+            per row, indexing into the rule's table outcomes
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[List[str]],
+        tables: Mapping[str, DecisionTable] = SENTENCING_TABLES,
+    ):
+        self.rows = list(rows)
+        self.tables = dict(tables)
+
+        self.sections = np.array([row[0] for row in self.rows], dtype=object)
+        self.mode_code = np.array(
+            [MODE_CODES[check_offence_type(row)] for row in self.rows], dtype=np.int8
+        )
+        self.designations = np.array(
+            [designation_profile(row[0]) for row in self.rows], dtype=np.int64
+        )
+
+        self.indictable_minimum = QuantumColumns([parse_quantum(row[2]) for row in self.rows])
+        self.indictable_maximum = QuantumColumns([parse_quantum(row[3]) for row in self.rows])
+        self.summary_minimum = QuantumColumns([parse_quantum(row[4]) for row in self.rows])
+        self.summary_maximum = QuantumColumns([parse_quantum(row[5]) for row in self.rows])
+
+        self.outcomes: Dict[str, np.ndarray] = {
+            rule: table.codes(self) for rule, table in self.tables.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def available(self, rule: str) -> np.ndarray:
+        """
+        Return a boolean mask of the rows for which a sentencing option is
+        available.
+
+        Args:
+            rule (str): One of the grid's rules, e.g. "cso_available"
+
+        Returns:
+            np.ndarray[bool]: One entry per row
+        """
+        available = np.array(self.tables[rule].available, dtype=bool)
+        return available[self.outcomes[rule]]
+
+    def row_details(self, index: int) -> dict:
+        """
+        Materialize the sentencing details of one row, in the format returned
+        by main.generate_sentencing_details.
+        """
+        return {
+            rule: table.build(self.outcomes[rule][index])
+            for rule, table in self.tables.items()
+        }
+
+    def to_dicts(self) -> List[dict]:
+        """Materialize the sentencing details of every row."""
+        return [self.row_details(index) for index in range(len(self.rows))]
@@ -0,0 +1,408 @@
+"""
+Boolean queries over the evaluated offence grid.
+
+Questions such as "which hybrid offences allow a CSO and a discharge but
+attract a primary DNA order?" are written as expressions over the rule
+outputs, the mode and the quanta of each offence:
+
+    index.query('mode == hybrid and cso_available and discharge_available'
+                ' and dna_designation == "primary designated offence"')
+
+Every rule output of every row is evaluated once, when the index is built,
+and stored as a bitmap: an integer whose bit i is set if row i has the
+property. An expression is then answered with bitwise operations on those
+integers, without evaluating any rule.
+
+The terms of an expression are:
+
+    cso_available               the rule's option is available. A rule can
+                                also be named with its group, e.g.
+                                sentencing.cso_available
+    soira == "primary designated offence"
+                                the rule's notes or status notes include the
+                                text (!= for the rows where they do not)
+    mode == hybrid              the offence type: summary, indictable or
+                                hybrid
+    statute == cdsa             the statute
+    section == cc266            the section, in any spelling (see
+                                section_ids)
+    indictable_maximum >= 10y   a quantum compared with a term ("90d", "18m",
+                                "10y") or a fine ("5000$"), with ==, !=, <,
+                                <=, > or >=. Only offences whose quantum sets
+                                a term, or a fine, are compared
+
+Terms are combined with and, or, not and parentheses. Queries come from users,
+so their length and nesting are limited.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+from .parsed_offence import (
+    GROUPS,
+)
+
+from .registry import (
+    statute_code,
+)
+
+from .section_ids import (
+    NO_ID,
+    SectionIds,
+)
+
+from .section_trie import (
+    section_components,
+)
+
+from .utils import (
+    LIST_SEPARATOR,
+    flatten_output,
+    parse_quantum,
+)
+
+# Type definitions
+Row = List[str]
+
+QUANTUM_FIELDS = (
+    "indictable_minimum",
+    "indictable_maximum",
+    "summary_minimum",
+    "summary_maximum",
+)
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<paren>[()])
+        | (?P<operator>==|!=|<=|>=|<|>|=)
+        | (?P<string>"[^"]*"|'[^']*')
+        | (?P<word>[^\s()=!<>"']+)
+    )""",
+    re.VERBOSE,
+)
+_KEYWORDS = ("and", "or", "not")
+
+# Limits on a query: its length in characters, how deeply parentheses and
+# "not" can nest, and how many quantum comparisons are kept
+MAX_QUERY_LENGTH = 1000
+MAX_QUERY_DEPTH = 32
+COMPARISON_CACHE_SIZE = 256
+_QUANTUM_VALUE = re.compile(r"\d+[ymd$]?")
+
+_COMPARISONS = {
+    "==": np.equal,
+    "=": np.equal,
+    "!=": np.not_equal,
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+def to_bitmap(mask: np.ndarray) -> int:
+    """Pack a boolean mask over row IDs into a bitmap."""
+    return int.from_bytes(np.packbits(mask, bitorder="little").tobytes(), "little")
+
+
+def row_ids(rows: int) -> Iterator[int]:
+    """Return the row IDs set in a bitmap, in ascending order."""
+    while rows:
+        lowest = rows & -rows
+        yield lowest.bit_length() - 1
+        rows ^= lowest
+
+
+def tokenize(expression: str) -> List[Tuple[str, str]]:
+    """
+    Split a query expression into (kind, text) tokens.
+
+    Raises:
+        ValueError: If the expression is longer than MAX_QUERY_LENGTH, or
+            contains a character that cannot start a token
+    """
+    if len(expression) > MAX_QUERY_LENGTH:
+        raise ValueError(f"Query too long: {len(expression)} characters. The limit is {MAX_QUERY_LENGTH}")
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = _TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"Invalid query at position {position}: {expression[position:]!r}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == "string":
+            text = text[1:-1]
+        elif kind == "word" and text.lower() in _KEYWORDS:
+            kind, text = "keyword", text.lower()
+        tokens.append((kind, text))
+        position = match.end()
+    return tokens
+
+
+class GridIndex:
+    """
+    Bitmap indexes over the rule outputs of a set of offence rows.
+
+    Args:
+        rows (Sequence[Row]): The offence rows. Row IDs are positions in
+            this sequence
+        results (Iterable[Mapping[str, dict]]): The parse result of each
+            row, with every group of details (e.g. parse_row with every group
+            requested)
+    """
+
+    def __init__(self, rows: Sequence[Row], results: Iterable[Mapping[str, dict]]):
+        self.rows: List[Row] = list(rows)
+        self.all = (1 << len(self.rows)) - 1
+
+        available: Dict[str, int] = {}
+        notes: Dict[str, Dict[str, int]] = {}
+        modes: Dict[str, int] = {}
+        quanta: Dict[str, List] = {field: [] for field in QUANTUM_FIELDS}
+
+        for row_id, result in enumerate(results):
+            bit = 1 << row_id
+            offence_data = result["offence_data"]
+            modes[offence_data["mode"]] = modes.get(offence_data["mode"], 0) | bit
+            for field in QUANTUM_FIELDS:
+                quanta[field].append(offence_data[field])
+
+            for group in GROUPS[1:]:
+                for rule, output in result.get(group, {}).items():
+                    key = f"{group}.{rule}"
+                    is_available, status_notes, _, explanation = flatten_output(output)
+                    if is_available:
+                        available[key] = available.get(key, 0) | bit
+                    else:
+                        available.setdefault(key, 0)
+                    rule_notes = notes.setdefault(key, {})
+                    for text in (status_notes, explanation):
+                        for note in (text or "").split(LIST_SEPARATOR):
+                            if note:
+                                rule_notes[note] = rule_notes.get(note, 0) | bit
+
+        self._available = available
+        self._notes = notes
+        self._modes = modes
+
+        statutes: Dict[str, int] = {}
+        for row_id, row in enumerate(self.rows):
+            code = statute_code(row[0])
+            statutes[code] = statutes.get(code, 0) | (1 << row_id)
+        self._statutes = statutes
+
+        # Each row's section ID, so that a section term matches every
+        # spelling of the section
+        self._section_ids = SectionIds()
+        self._row_sections = np.array(
+            [
+                self._section_ids.intern(row[0]) if section_components(row[0]) is not None else NO_ID
+                for row in self.rows
+            ],
+            dtype=np.int32,
+        )
+
+        # Rules can be named without their group when the name is unique
+        short_names: Dict[str, List[str]] = {}
+        for key in available:
+            short_names.setdefault(key.split(".", 1)[1], []).append(key)
+        self._rules: Dict[str, str] = {key: key for key in available}
+        self._rules.update(
+            (name, keys[0]) for name, keys in short_names.items() if len(keys) == 1
+        )
+
+        # Quanta are compared as columns, in days for terms and in dollars
+        # for fines. A quantum without a term or fine reads as 0, so each
+        # comparison is masked to the rows that set one
+        self._has_jail = {
+            field: np.array([quantum.has_jail for quantum in values], dtype=bool)
+            for field, values in quanta.items()
+        }
+        self._has_fine = {
+            field: np.array([quantum.has_fine for quantum in values], dtype=bool)
+            for field, values in quanta.items()
+        }
+        self._jail_days = {
+            field: np.array([quantum.jail_days for quantum in values], dtype=np.int64)
+            for field, values in quanta.items()
+        }
+        self._fine_dollars = {
+            field: np.array([quantum.fine_dollars for quantum in values], dtype=np.int64)
+            for field, values in quanta.items()
+        }
+        self._comparisons: "OrderedDict[Tuple[str, str, str], int]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def rules(self) -> List[str]:
+        """Return the rule names a query can use, with their groups."""
+        return list(self._available)
+
+    def notes(self, rule: str) -> List[str]:
+        """Return the notes a rule's outputs can be compared with."""
+        return list(self._notes[self._rule(rule)])
+
+    def _rule(self, name: str) -> str:
+        try:
+            return self._rules[name.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown rule: {name}. Known rules: {', '.join(self._rules)}") from None
+
+    def _section(self, section: str) -> int:
+        section_id = self._section_ids.get(section)
+        if section_id == NO_ID:
+            return 0
+        return to_bitmap(self._row_sections == section_id)
+
+    def _quantum(self, field: str, operator: str, value: str) -> int:
+        key = (field, operator, value)
+        try:
+            rows = self._comparisons[key]
+        except KeyError:
+            pass
+        else:
+            self._comparisons.move_to_end(key)
+            return rows
+
+        if not _QUANTUM_VALUE.fullmatch(value):
+            raise ValueError(f"Invalid quantum: {value}. Expected e.g. 90d, 18m, 10y or 5000$")
+        quantum = parse_quantum(value if not value.isdigit() else value + "d")
+        if quantum.has_fine:
+            mask, column, threshold = self._has_fine[field], self._fine_dollars[field], quantum.fine_dollars
+        else:
+            mask, column, threshold = self._has_jail[field], self._jail_days[field], quantum.jail_days
+
+        rows = self._comparisons[key] = to_bitmap(mask & _COMPARISONS[operator](column, threshold))
+        if len(self._comparisons) > COMPARISON_CACHE_SIZE:
+            self._comparisons.popitem(last=False)
+        return rows
+
+    def bitmap(self, expression: str) -> int:
+        """
+        Evaluate a query expression to a bitmap of the matching row IDs.
+
+        Raises:
+            ValueError: If the expression is invalid, too long or too deeply
+                nested, or names an unknown rule
+        """
+        parser = _Parser(self, tokenize(expression))
+        rows = parser.expression()
+        if parser.position < len(parser.tokens):
+            raise ValueError(f"Unexpected {parser.tokens[parser.position][1]!r} in query")
+        return rows
+
+    def count(self, expression: str) -> int:
+        """Return the number of rows that match a query expression."""
+        return bin(self.bitmap(expression)).count("1")
+
+    def query(self, expression: str) -> List[dict]:
+        """
+        Find the offences that match a query expression.
+
+        Args:
+            expression (str): The query, e.g. 'mode == hybrid and
+                cso_available and not discharge_available'
+
+        Returns:
+            List[dict]: The section and description of each matching row,
+                in row order
+
+        Raises:
+            ValueError: If the expression is invalid, or names an unknown
+                rule
+        """
+        return [
+            {"section": self.rows[row_id][0], "description": self.rows[row_id][1]}
+            for row_id in row_ids(self.bitmap(expression))
+        ]
+
+
+class _Parser:
+    """Recursive descent over the tokens of one expression, evaluating as it goes."""
+
+    def __init__(self, index: GridIndex, tokens: List[Tuple[str, str]]):
+        self.index = index
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def _enter(self) -> None:
+        self.depth += 1
+        if self.depth > MAX_QUERY_DEPTH:
+            raise ValueError(f"Query nested too deeply. The limit is {MAX_QUERY_DEPTH} levels")
+
+    def _peek(self) -> Tuple[str, str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", "")
+
+    def _next(self, expected: str) -> str:
+        kind, text = self._peek()
+        if kind == "end":
+            raise ValueError(f"Incomplete query: expected {expected}")
+        self.position += 1
+        return text
+
+    def expression(self) -> int:
+        rows = self._conjunction()
+        while self._peek() == ("keyword", "or"):
+            self.position += 1
+            rows |= self._conjunction()
+        return rows
+
+    def _conjunction(self) -> int:
+        rows = self._negation()
+        while self._peek() == ("keyword", "and"):
+            self.position += 1
+            rows &= self._negation()
+        return rows
+
+    def _negation(self) -> int:
+        if self._peek() == ("keyword", "not"):
+            self.position += 1
+            self._enter()
+            rows = self.index.all & ~self._negation()
+            self.depth -= 1
+            return rows
+        return self._term()
+
+    def _term(self) -> int:
+        kind, text = self._peek()
+        if (kind, text) == ("paren", "("):
+            self.position += 1
+            self._enter()
+            rows = self.expression()
+            if self._next("')'") != ")":
+                raise ValueError(f"Expected ')' in query, found {self.tokens[self.position - 1][1]!r}")
+            self.depth -= 1
+            return rows
+        if kind != "word":
+            raise ValueError(f"Expected a rule, mode, statute, section or quantum, found {text or 'the end'!r}")
+        self.position += 1
+        name = text.lower()
+
+        if self._peek()[0] != "operator":
+            return self.index._available[self.index._rule(name)]
+        operator = self._next("an operator")
+        value = self._next("a value")
+
+        if name in QUANTUM_FIELDS:
+            return self.index._quantum(name, operator, value.lower())
+
+        if operator not in ("==", "=", "!="):
+            raise ValueError(f"Invalid operator for {name}: {operator}. Must be == or !=")
+        if name == "mode":
+            rows = self.index._modes.get(value.lower(), 0)
+        elif name == "statute":
+            rows = self.index._statutes.get(value.lower(), 0)
+        elif name == "section":
+            rows = self.index._section(value.strip().lower())
+        else:
+            rows = self.index._notes[self.index._rule(name)].get(value, 0)
+        return rows if operator != "!=" else self.index.all & ~rows
@@ -1,77 +1,223 @@
-import csv
-from cc_rules_current import (
-    check_offence_type,
-    check_prelim_available,
-    check_section_469_offence,
-    check_cso_availablity,
-    check_dna_designation,
-    check_discharge_available,
-    check_intermittent_available,
-    check_suspended_sentence_available,
-    check_soira,
-    check_proceeds_of_crime_forfeiture,
-    check_absolute_jurisdiction_offence,
-    check_section_164_forfeiture_order,
-    check_prison_and_probation,
-    check_fine_alone,
-    check_fine_and_probation,
+import argparse
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from threading import RLock
+from typing import Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from .collateral_consequences import (
+    ConsequenceTable,
 )
 
-from ca_collateral_consequences import (
-    check_inadmissibility,
+from .context import (
+    OffenceContext,
 )
 
-from utils import (
-    parse_quantum,
+from .graduated import (
+    Prior,
+    PriorConviction,
 )
 
-from map import (
-    CC_DISAMBIGUATION,
-    CC_GRADUATED_OFFENCES
+from .grid import (
+    SentencingGrid,
 )
 
-from constants import(
-    STATUTE_CODES
+from .grid_query import (
+    GridIndex,
+)
+
+from .offence_search import (
+    DEFAULT_LIMIT,
+    OffenceSearchIndex,
+)
+
+from .report import (
+    REPORT_FORMATS,
+    render_reports,
+)
+
+from .parsed_offence import (
+    GROUPS,
+    ParsedOffence,
+)
+
+from .registry import (
+    StatuteRegistry,
+)
+
+from .section_ids import (
+    NO_ID,
+)
+
+from .reloading import (
+    RegistryVersion,
+    ReloadingRegistry,
+)
+
+from .rule_versions import (
+    CURRENT_RULE_VERSION,
+    OffenceDate,
+    RuleVersion,
+    rule_versions,
+)
+
+from .snapshot import (
+    GridSnapshot,
+    StaleSnapshotError,
+    source_hash,
+    write_snapshot,
 )
 
 # Constants
-CSV_FILE_PATH = "data/cc-offences-2024-09-16.csv"
+# An installed package carries its data inside the tools package, and a
+# source checkout beside it
+DATA_DIR = Path(__file__).resolve().parent / "data"
+if not DATA_DIR.is_dir():
+    DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+OFFENCE_DIR = DATA_DIR / "offence"
+STATUTE_DIR = DATA_DIR / "statute"
+STATUTE_DIRS = (OFFENCE_DIR, STATUTE_DIR)
+CSV_FILE_PATH = OFFENCE_DIR / "cc-offences-2024-09-16.csv"
+SNAPSHOT_PATH = DATA_DIR / "snapshot" / "offence-grid.snapshot"
 VALID_MODES = ["summary", "indictable"]
+BATCH_WINDOW = 4096
 
 # Global variables
-data = None
+registry = None
+reloader = None
+snapshot = None
+# The search and grid indexes and the consequence table, each with the
+# registry it was built from
+search_index = None
+grid_index = None
+consequence_table = None
+# The hash of the offence data and rules, with the registry it was taken from
+_data_version = None
+
+# Serializes initialization, so concurrent first requests load the data once
+_initialize_lock = RLock()
+
+def snapshot_sources() -> list:
+    """Return the offence CSVs a snapshot is built from, one per statute."""
+    return sorted(StatuteRegistry(STATUTE_DIRS).sources.values())
+
+
+def load_snapshot(snapshot_path=SNAPSHOT_PATH):
+    """
+    Open the grid snapshot, if one exists and is current.
 
-def initialize():
-    """Initialize global data by reading the CSV file."""
-    global data
+    Returns:
+        Optional[GridSnapshot]: The snapshot, or None if there is no usable
+            snapshot
+    """
     try:
-        # Open the CSV file
-        with open(CSV_FILE_PATH) as csvfile:
-            csvreader = csv.reader(csvfile)
-            data = list(csvreader)
-        return True
+        return GridSnapshot(snapshot_path, expected_hash=source_hash(snapshot_sources()))
     except FileNotFoundError:
-        print(f"Error: Could not find CSV file at {CSV_FILE_PATH}")
-        return False
-    except csv.Error as e:
-        print(f"Error reading CSV file: {e}")
+        return None
+    except StaleSnapshotError as e:
+        print(f"Ignoring snapshot: {e}")
+        return None
+
+
+def initialize():
+    """
+    Initialize global data. The statute registry is set up, and a current grid
+    snapshot is used if there is one.
+    """
+    global snapshot
+    with _initialize_lock:
+        loaded = load_registry()
+        snapshot = load_snapshot()
+        return snapshot is not None or loaded
+
+
+def _ensure_initialized():
+    if registry is None and snapshot is None:
+        with _initialize_lock:
+            if registry is None and snapshot is None and not initialize():
+                raise RuntimeError("Failed to initialize data. Please check the CSV file.")
+
+
+def _swap_registry(version: RegistryVersion):
+    """Use a rebuilt registry, and drop the snapshot if it no longer matches the CSVs."""
+    global registry, snapshot
+    registry = version.statutes
+    if snapshot is not None:
+        snapshot = load_snapshot()
+
+
+def load_registry():
+    """
+    Find the statute CSVs. Each statute's CSV is read and indexed the first
+    time one of its offences is looked up. When a CSV changes, the registry is
+    rebuilt in the background and swapped in (see reloading.py).
+    """
+    global registry, reloader
+    try:
+        statutes = ReloadingRegistry(STATUTE_DIRS, on_swap=_swap_registry)
+    except OSError as e:
+        print(f"Error reading the statute directories: {e}")
         return False
-    except Exception as e:
-        print(f"Unexpected error: {e}")
+
+    if not statutes.statutes.sources:
+        print(f"Error: Could not find any statute CSV files in {OFFENCE_DIR} or {STATUTE_DIR}")
         return False
 
-def generate_basic_offence_details(row: list) -> dict:
+    reloader = statutes
+    registry = statutes.statutes
+    return True
+
+
+def get_registry() -> StatuteRegistry:
+    """
+    Return the current statute registry, loading it on first use. Callers
+    that build derived data from it can compare it by identity to tell when
+    the offence data has been reloaded.
+
+    Raises:
+        RuntimeError: If the statute CSVs cannot be found
+    """
+    _ensure_initialized()
+    if reloader is not None:
+        reloader.maybe_check()
+    if registry is None:
+        with _initialize_lock:
+            if registry is None and not load_registry():
+                raise RuntimeError("Failed to initialize data. Please check the CSV file.")
+    return registry
+
+
+def data_version() -> str:
+    """
+    Return a hash identifying the offence data and rules in use: the statute
+    CSVs of the current registry and the rule modules. It changes when the
+    offence data is reloaded.
+    """
+    global _data_version
+    statutes = get_registry()
+    cached = _data_version
+    if cached is None or cached[0] is not statutes:
+        cached = _data_version = (statutes, source_hash(sorted(statutes.sources.values())))
+    return cached[1]
+
+
+def reload_metrics() -> Optional[dict]:
+    """
+    Return the hot reload state of the offence data for monitoring: the
+    current version, the rebuild counts and the last reload latency. None
+    if the data has not been loaded.
+    """
+    return None if reloader is None else reloader.metrics()
+
+def generate_basic_offence_details(context: OffenceContext) -> dict:
     """
     Generates the basic offence details that every function call should include.
     
     Args:
-        row (list): A row from the CSV file containing offence data.
-            [0] = statutory code and section number
-            [1] = offence title
-            [2] = indictable minimum
-            [3] = indictable maximum
-            [4] = summary minimum
-            [5] = summary maximum
+        context (OffenceContext): The evaluation context for a row from the
+            CSV file, holding its section, title, mode and parsed quanta.
     
     Returns:
         dict: A dictionary containing basic offence details including:
@@ -83,123 +229,234 @@ def generate_basic_offence_details(row: list) -> dict:
     """
     offence_data = {}
 
-    # Create the offence variables
-    mode = check_offence_type(row)
-    indictable_minimum_quantum = parse_quantum(row[2])
-    indictable_maximum_quantum = parse_quantum(row[3])
-    summary_minimum_quantum = parse_quantum(row[4])
-    summary_maximum_quantum = parse_quantum(row[5])
-
     # Offence data
-    offence_data["section"] = row[0]
-    offence_data["description"] = row[1]
-    offence_data["mode"] = mode
-    offence_data["summary_minimum"] = summary_minimum_quantum
-    offence_data["summary_maximum"] = summary_maximum_quantum
-    offence_data["indictable_minimum"] = indictable_minimum_quantum
-    offence_data["indictable_maximum"] = indictable_maximum_quantum
+    offence_data["section"] = context.section
+    offence_data["description"] = context.description
+    offence_data["mode"] = context.mode
+    offence_data["summary_minimum"] = context.summary_minimum
+    offence_data["summary_maximum"] = context.summary_maximum
+    offence_data["indictable_minimum"] = context.indictable_minimum
+    offence_data["indictable_maximum"] = context.indictable_maximum
 
     return offence_data
 
 
-def generate_procedure_details(row):
+def generate_procedure_details(
+        context: OffenceContext,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+) -> dict:
     """
     Generates basic information about procedural rights or requirements for 
     certain offences.
     """
+    rules = rule_version.rules
     procedure_data = {}
 
     # Create the offence variables
-    prelim_available = check_prelim_available(row[3])
-    section_469_offence = check_section_469_offence(row[0])
+    prelim_available = rules.PRELIM_TABLE.evaluate(context)
+    section_469_offence = rules.SECTION_469_TABLE.evaluate(context)
 
     procedure_data["prelim_available"] = prelim_available
     procedure_data["absolute_jurisdiction"] = (
-        check_absolute_jurisdiction_offence(row[0])
+        rules.check_absolute_jurisdiction_offence(context.section)
     )
     procedure_data["release_by_superior_court_judge"] = section_469_offence
 
     return procedure_data
 
 
-def generate_sentencing_details(row):
+def generate_sentencing_details(
+        context: OffenceContext,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+) -> dict:
     """
     Generates basic information about sentencing options for certain offences.
     """
     sentencing_data = {}
 
-    # Create the offence variables
-    mode = check_offence_type(row)
-    indictable_minimum_quantum = parse_quantum(row[2])
-    indictable_maximum_quantum = parse_quantum(row[3])
-    summary_minimum_quantum = parse_quantum(row[4])
-
-    sentencing_data["cso_available"] = check_cso_availablity(
-        row[0],
-        summary_minimum_quantum,
-        indictable_minimum_quantum,
-        indictable_maximum_quantum,
-        mode,
-    )
-    sentencing_data["intermittent_available"] = check_intermittent_available(
-        summary_minimum_quantum, indictable_minimum_quantum
-    )
-    sentencing_data["suspended_sentence_available"] = check_suspended_sentence_available(
-        summary_minimum_quantum, indictable_minimum_quantum
-    )
-    sentencing_data["discharge_available"] = check_discharge_available(
-        summary_minimum_quantum, 
-        indictable_minimum_quantum, 
-        indictable_maximum_quantum
-    )
-    sentencing_data["prison_and_probation_available"] = check_prison_and_probation(
-        mode,
-        indictable_minimum_quantum,
-    )
-    sentencing_data["fine_alone"] = check_fine_alone(
-        indictable_minimum_quantum,
-        indictable_minimum_quantum,
-    )
-    sentencing_data["fine_and_probation"] = check_fine_and_probation(
-        indictable_minimum_quantum,
-    )
+    # Each option is a decision table evaluated against the row's context
+    for option, table in rule_version.rules.SENTENCING_TABLES.items():
+        sentencing_data[option] = table.evaluate(context)
 
     return sentencing_data
 
 
-def generate_ancillary_order_details(row):
+def generate_ancillary_order_details(
+        context: OffenceContext,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+) -> dict:
     """
     Generates basic information about ancillary orders for certain offences.
     """
+    rules = rule_version.rules
     ancillary_order_data = {}
 
-    mode = check_offence_type(row)
-    indictable_maximum_quantum = parse_quantum(row[3])
-
-    ancillary_order_data["dna_designation"] = check_dna_designation(row, mode, indictable_maximum_quantum)
-    ancillary_order_data["soira"] = check_soira(row[0], mode, indictable_maximum_quantum)
-    ancillary_order_data["proceeds_of_crime_forfeiture"] = check_proceeds_of_crime_forfeiture(row[0], mode)
-    ancillary_order_data["section_164.2_forfeiture_order"] = check_section_164_forfeiture_order(row[0])
+    ancillary_order_data["dna_designation"] = rules.DNA_DESIGNATION_TABLE.evaluate(context)
+    ancillary_order_data["soira"] = rules.check_soira(
+        context.section, context.mode, context.indictable_maximum
+    )
+    ancillary_order_data["proceeds_of_crime_forfeiture"] = (
+        rules.PROCEEDS_OF_CRIME_TABLE.evaluate(context)
+    )
+    ancillary_order_data["section_164.2_forfeiture_order"] = (
+        rules.SECTION_164_FORFEITURE_TABLE.evaluate(context)
+    )
 
     return ancillary_order_data
 
 
-def generate_collateral_consequence_details(row):
+def generate_collateral_consequence_details(
+        context: OffenceContext,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+) -> dict:
     """
     Generates basic information about collateral consequences for certain offences.
     """
     collateral_consequence_data = {}
 
-    mode = check_offence_type(row)
-    indictable_maximum_quantum = parse_quantum(row[3])
-
-    collateral_consequence_data["inadmissibility"] = check_inadmissibility(
-        row[0], mode, indictable_maximum_quantum["jail"]["amount"]
+    collateral_consequence_data["inadmissibility"] = (
+        rule_version.collateral_consequences.check_inadmissibility(
+            context.section, context.mode, context.indictable_maximum["jail"]["amount"]
+        )
     )
 
     return collateral_consequence_data
 
 
+# The function computing each group of details other than the offence data
+GROUP_GENERATORS = {
+    "procedure": generate_procedure_details,
+    "sentencing": generate_sentencing_details,
+    "ancillary_orders": generate_ancillary_order_details,
+    "collateral_consequences": generate_collateral_consequence_details,
+}
+
+
+def requested_groups(
+        procedure: bool = False,
+        sentencing: bool = False,
+        ancillary_orders: bool = False,
+        collateral_consequences: bool = False,
+) -> List[str]:
+    """Return the groups of details a result holds for the given flags."""
+    return ["offence_data"] + [
+        group
+        for group, requested in (
+            ("procedure", procedure),
+            ("sentencing", sentencing),
+            ("ancillary_orders", ancillary_orders),
+            ("collateral_consequences", collateral_consequences),
+        )
+        if requested
+    ]
+
+
+def lazy_row(
+        row: list,
+        groups: Sequence[str] = GROUPS,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+        values: Optional[dict] = None,
+) -> ParsedOffence:
+    """
+    Parse a single offence row lazily: each group of details is computed
+    when it is first read.
+
+    Args:
+        row (list): A row from the CSV file containing offence data
+        groups (Sequence[str]): The groups the result contains
+        rule_version (RuleVersion): The rules to apply
+        values (Optional[dict]): Groups that are already computed
+
+    Returns:
+        ParsedOffence: The result, with only the given groups computed
+    """
+    context = None
+
+    def compute(group: str) -> dict:
+        nonlocal context
+        # The mode and quanta are derived once per row and shared by every group
+        if context is None:
+            context = OffenceContext(row)
+        if group == "offence_data":
+            return generate_basic_offence_details(context)
+        return GROUP_GENERATORS[group](context, rule_version)
+
+    return ParsedOffence(groups, compute, values)
+
+
+def lazy_record(snapshot: GridSnapshot, record_id: int, groups: Sequence[str]) -> ParsedOffence:
+    """
+    Wrap a snapshot record in a lazy result. The record is decoded when the
+    first group is read.
+    """
+    record = None
+
+    def compute(group: str) -> dict:
+        nonlocal record
+        if record is None:
+            record = snapshot.record(record_id)
+        return record[group]
+
+    return ParsedOffence(groups, compute)
+
+
+def parse_row(
+        row: list,
+        procedure: bool = False,
+        sentencing: bool = False,
+        ancillary_orders: bool = False,
+        collateral_consequences: bool = False,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+) -> dict:
+    """
+    Parse a single offence row into the requested groups of details.
+
+    Args:
+        row (list): A row from the CSV file containing offence data
+        procedure, sentencing, ancillary_orders, collateral_consequences
+            (bool): Which groups of details to include
+        rule_version (RuleVersion): The rules to apply
+
+    Returns:
+        dict: The offence data, followed by the requested groups
+    """
+    groups = requested_groups(procedure, sentencing, ancillary_orders, collateral_consequences)
+    return lazy_row(row, groups, rule_version).to_dict()
+
+
+def parse_rows(
+        rows: Sequence[list],
+        procedure: bool = False,
+        sentencing: bool = False,
+        ancillary_orders: bool = False,
+        collateral_consequences: bool = False,
+        rule_version: RuleVersion = CURRENT_RULE_VERSION,
+) -> List[dict]:
+    """
+    Parse a batch of offence rows, with the same results as parse_row for
+    each. The sentencing options of the whole batch are evaluated at once
+    over NumPy columns (see grid.py); the other groups row by row.
+
+    Args:
+        rows (Sequence[list]): Rows from the CSV files
+        procedure, sentencing, ancillary_orders, collateral_consequences
+            (bool): Which groups of details to include
+        rule_version (RuleVersion): The rules to apply
+
+    Returns:
+        List[dict]: The result for each row, in row order
+    """
+    groups = requested_groups(procedure, sentencing, ancillary_orders, collateral_consequences)
+    if not sentencing or not rows:
+        return [lazy_row(row, groups, rule_version).to_dict() for row in rows]
+
+    grid = SentencingGrid(rows, rule_version.rules.SENTENCING_TABLES)
+    return [
+        lazy_row(row, groups, rule_version, {"sentencing": grid.row_details(index)}).to_dict()
+        for index, row in enumerate(rows)
+    ]
+
+
 def parse_offence(
         offence: str,
         mode: str = "summary",
@@ -208,6 +465,8 @@ def parse_offence(
         ancillary_orders: bool = False,
         sentencing: bool = False,
         collateral_consequences: bool = False,
+        as_of: Optional[OffenceDate] = None,
+        priors: Optional[Iterable[Prior]] = None,
 ) -> list:
     """
     Parse the offence data for a given offence.
@@ -220,313 +479,421 @@ def parse_offence(
         ancillary_orders (bool): If True, includes ancillary order details
         sentencing (bool): If True, includes sentencing details
         collateral_consequences (bool): If True, includes collateral consequence details
+        as_of (Optional[OffenceDate]): The offence date, as a date or as a
+            "YYYY-MM-DD" or "YYYY-MM-DD&YYYY-MM-DD" string. The rules in force
+            on that date are applied; by default, the current rules are
+        priors (Optional[Iterable[Prior]]): The offender's prior
+            convictions, as sections or as PriorConvictions flagging the
+            circumstances some of them count in. If given, only the tier of
+            each graduated offence that applies to them is returned (e.g.
+            "cc_320.14(1)#2" after one prior impaired driving conviction)
+            instead of every tier
 
     Returns:
-        list: A list of dictionaries containing the requested offence information
+        list: A ParsedOffence for each matching row. Each is a mapping of the
+            requested groups, computed when first read; to_dict() returns
+            the plain dictionary, which is what json.dumps accepts
 
     Raises:
-        ValueError: If mode is not "summary" or "indictable"
+        ValueError: If mode is not "summary" or "indictable", or no rule
+            version is in force on the offence date (UnsupportedOffenceDate
+            if it is before the earliest version)
         KeyError: If offence code is not found
         RuntimeError: If data hasn't been initialized
     """
-    global data
-    if data is None:
-        if not initialize():
-            raise RuntimeError("Failed to initialize data. Please check the CSV file.")
+    _ensure_initialized()
+    if reloader is not None:
+        reloader.maybe_check()
 
     # Input validation
     if mode not in VALID_MODES:
         raise ValueError(f"Invalid mode: {mode}. Must be one of {VALID_MODES}")
 
+    version = CURRENT_RULE_VERSION if as_of is None else rule_versions.resolve(as_of)
+
     # If full is True, set all detail flags to True
     if full:
         procedure = ancillary_orders = sentencing = collateral_consequences = True
 
-    def offence_parser(row):
-        parsed_offence = {
-            "offence_data": generate_basic_offence_details(row)
-        }
+    groups = requested_groups(procedure, sentencing, ancillary_orders, collateral_consequences)
+
+    # The snapshot holds results under the current rules only, for every tier
+    if snapshot is not None and version is CURRENT_RULE_VERSION and priors is None:
+        return [
+            lazy_record(snapshot, record_id, groups)
+            for record_id in snapshot.record_ids(offence)
+        ]
+
+    statutes = registry
+    if statutes is None:
+        with _initialize_lock:
+            if registry is None and not load_registry():
+                raise RuntimeError("Failed to initialize data. Please check the CSV file.")
+        statutes = registry
+
+    # The registry resolves exact sections as well as the disambiguation and
+    # graduated offence keys to their rows, and raises a KeyError otherwise
+    if priors is not None:
+        rows = statutes.resolve_graduated([offence], [list(priors)])[0]
+    else:
+        rows = statutes.lookup(offence)
+    return [lazy_row(row, groups, version) for row in rows]
+
+
+def _parse_requests(
+        requests: Sequence[Tuple[str, str]],
+        options: dict,
+) -> list:
+    """
+    Parse a batch of (offence, mode) requests. Runs in a worker process for
+    parse_offences; a failed request returns its exception instead.
+    """
+    results = []
+    for offence, mode in requests:
+        try:
+            results.append([result.to_dict() for result in parse_offence(offence, mode, **options)])
+        except (KeyError, ValueError) as e:
+            results.append(e)
+    return results
+
+
+def parse_offences(
+        offences: Iterable[Union[str, Tuple[str, str]]],
+        mode: str = "summary",
+        full: bool = False,
+        procedure: bool = False,
+        ancillary_orders: bool = False,
+        sentencing: bool = False,
+        collateral_consequences: bool = False,
+        as_of: Optional[OffenceDate] = None,
+        jobs: Optional[int] = None,
+        errors: str = "raise",
+        window: int = BATCH_WINDOW,
+) -> Iterator[Union[list, Exception]]:
+    """
+    Parse many offences, yielding the results in input order.
+
+    The input is read a window at a time, so a docket of any length can be
+    streamed through. Identical requests (the same offence code and mode) in
+    a window are parsed once, and every repeat yields the same result
+    objects. The results of the last window's worth of distinct requests are
+    kept for later windows, least recently used first out, so memory use
+    does not grow with the length of the input.
+
+    Args:
+        offences (Iterable[Union[str, Tuple[str, str]]]): Offence codes, or
+            (offence code, mode) pairs to override the mode for one charge
+        mode (str): The mode of proceeding for codes given without one
+        full, procedure, ancillary_orders, sentencing,
+            collateral_consequences, as_of: As for parse_offence
+        jobs (Optional[int]): Worker processes. With more than one, the
+            unique requests of each window are parsed in a process pool whose
+            workers load the offence data once. Their results are returned
+            with every group already computed
+        errors (str): "raise" to stop at the first offence that cannot be
+            parsed, or "return" to yield its exception in its place
+        window (int): How many input items are read ahead at a time, and
+            how many distinct results are kept
+
+    Yields:
+        Union[list, Exception]: What parse_offence returns for each item, or
+            the exception if errors is "return"
+
+    Raises:
+        ValueError: If errors is not "raise" or "return"
+        KeyError: If an offence code is not found and errors is "raise"
+    """
+    if errors not in ("raise", "return"):
+        raise ValueError(f"Invalid errors: {errors}. Must be 'raise' or 'return'")
+    if window < 1:
+        raise ValueError(f"Invalid window: {window}. Must be at least 1")
+
+    options = {
+        "full": full,
+        "procedure": procedure,
+        "ancillary_orders": ancillary_orders,
+        "sentencing": sentencing,
+        "collateral_consequences": collateral_consequences,
+        "as_of": as_of,
+    }
+
+    executor = None
+    if jobs is not None and jobs > 1:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=initialize)
+
+    results = OrderedDict()
+    offences = iter(offences)
+    try:
+        while True:
+            requests = [
+                (item, mode) if isinstance(item, str) else tuple(item)
+                for item in islice(offences, window)
+            ]
+            if not requests:
+                break
+            keys = [(offence.strip().lower(), request_mode) for offence, request_mode in requests]
+
+            pending = list(dict.fromkeys(key for key in keys if key not in results))
+            if executor is None:
+                for key in pending:
+                    try:
+                        results[key] = parse_offence(key[0], key[1], **options)
+                    except (KeyError, ValueError) as e:
+                        results[key] = e
+            elif pending:
+                batch_size = -(-len(pending) // jobs)
+                batches = [pending[start:start + batch_size] for start in range(0, len(pending), batch_size)]
+                for batch, batch_results in zip(
+                    batches,
+                    executor.map(_parse_requests, batches, [options] * len(batches)),
+                ):
+                    for key, result in zip(batch, batch_results):
+                        if not isinstance(result, Exception):
+                            result = [ParsedOffence.from_dict(parsed) for parsed in result]
+                        results[key] = result
+
+            # Keep the requests of this window, the most recently used, and
+            # drop the oldest beyond one window's worth
+            for key in dict.fromkeys(keys):
+                results.move_to_end(key)
+            while len(results) > window:
+                results.popitem(last=False)
+
+            for key in keys:
+                result = results[key]
+                if isinstance(result, Exception):
+                    if errors == "raise":
+                        raise result
+                yield result
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def search_offences(query: str, limit: int = DEFAULT_LIMIT) -> List[dict]:
+    """
+    Find offences in every statute by name, tolerating typos.
+
+    The search index is built from every statute CSV on the first search,
+    and again after the offence data is reloaded.
 
-        if procedure:
-            parsed_offence["procedure"] = generate_procedure_details(row)
+    Args:
+        query (str): Free text, e.g. "sexual asault"
+        limit (int): The maximum number of results
 
-        if sentencing:
-            parsed_offence["sentencing"] = generate_sentencing_details(row)
+    Returns:
+        List[dict]: The best matches first, each with the section, the
+            description and a score from 0 to 1
+    """
+    global search_index
+    if reloader is not None:
+        reloader.maybe_check()
+    cached = search_index
+    if cached is None or (registry is not None and cached[0] is not registry):
+        statutes = registry if registry is not None else StatuteRegistry(STATUTE_DIRS)
+        cached = search_index = (statutes, OffenceSearchIndex.from_registry(statutes))
+    return cached[1].search(query, limit)
 
-        if ancillary_orders:
-            parsed_offence["ancillary_orders"] = generate_ancillary_order_details(row)
 
-        if collateral_consequences:
-            parsed_offence["collateral_consequences"] = generate_collateral_consequence_details(row)
+def query_grid(expression: str) -> List[dict]:
+    """
+    Find the offences in every statute that match a boolean query over their
+    rule outputs, mode and quanta, e.g.
+    'mode == hybrid and cso_available and dna_designation == "primary designated offence"'.
 
-        return parsed_offence
+    The grid index is built on the first query, and again after the offence
+    data is reloaded, by evaluating every rule for every offence under the
+    current rules.
 
-    offence = offence.strip().lower()
-    parsed_offence_list = []
-    
-    # Check to see if the offence is in the data. If not, check if it is a key in the
-    # disambiguation or graduated offences dictionaries. Offences in these dictionaries
-    # will be in list format. The program will need to cycle through each offence in the
-    # list and add the results of the parser to the parsed_offence_list.
-
-    for row in data:
-        if row[0] == offence:
-            parsed_offence_list.append(offence_parser(row))
-            return parsed_offence_list
-        
-    if offence in CC_DISAMBIGUATION:
-        for disambiguated_offence in CC_DISAMBIGUATION[offence]:
-            for row in data:
-                if row[0] == disambiguated_offence:
-                    parsed_offence_list.append(offence_parser(row))
-        return parsed_offence_list
-    
-    if offence in CC_GRADUATED_OFFENCES:
-        for graduated_offence in CC_GRADUATED_OFFENCES[offence]:
-            for row in data:
-                if row[0] == graduated_offence:
-                    parsed_offence_list.append(offence_parser(row))
-        return parsed_offence_list
+    Args:
+        expression (str): The query. See grid_query for the syntax
+
+    Returns:
+        List[dict]: The section and description of each matching offence
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    global grid_index
+    if reloader is not None:
+        reloader.maybe_check()
+    cached = grid_index
+    if cached is None or (registry is not None and cached[0] is not registry):
+        statutes = registry if registry is not None else StatuteRegistry(STATUTE_DIRS)
+        rows = [row for code in statutes for row in statutes.statute(code).rows]
+        index = GridIndex(rows, parse_rows(rows, True, True, True, True))
+        cached = grid_index = (statutes, index)
+    return cached[1].query(expression)
+
+
+def lookup_consequences(section: str) -> Tuple[dict, ...]:
+    """
+    Find the collateral consequences of a section in every jurisdiction.
+
+    The consequence table is built on the first lookup, and again after the
+    offence data is reloaded, by evaluating every registered consequence for
+    every offence under the current rules.
+
+    Args:
+        section (str): The section, e.g. "cc_96"
+
+    Returns:
+        Tuple[dict, ...]: For each of the section's rows, the outputs of each
+            consequence by jurisdiction and name, e.g.
+            {"ca": {"inadmissibility": [...]}, "sk": {...}}
 
-    raise KeyError(f"Offence code '{offence}' not found")
+    Raises:
+        KeyError: If the section is not found
+    """
+    global consequence_table
+    if reloader is not None:
+        reloader.maybe_check()
+    cached = consequence_table
+    if cached is None or (registry is not None and cached[0] is not registry):
+        statutes = registry if registry is not None else StatuteRegistry(STATUTE_DIRS)
+        rows = [row for code in statutes for row in statutes.statute(code).rows]
+        cached = consequence_table = (statutes, ConsequenceTable(rows))
+    return cached[1].lookup(section)
+
+
+def build_snapshot(snapshot_path=SNAPSHOT_PATH) -> int:
+    """
+    Parse every offence in every statute CSV and write the results to a grid
+    snapshot.
+
+    Args:
+        snapshot_path: Where to write the snapshot
+
+    Returns:
+        int: The number of offence rows in the snapshot
+    """
+    statutes = StatuteRegistry(STATUTE_DIRS)
+    sources = sorted(statutes.sources.values())
+    section_ids = statutes.section_ids
+    records = []
+    index = {}
+    section_records = [[] for _ in range(len(section_ids))]
+
+    for code in statutes:
+        source_registry = statutes.statute(code)
+
+        record_ids = {
+            id(row): len(records) + position for position, row in enumerate(source_registry.rows)
+        }
+        records.extend(parse_rows(source_registry.rows, True, True, True, True))
+
+        # Sections are stored by section ID, and the other keys by name
+        sections = set(source_registry.sections())
+        for key in source_registry.keys():
+            section_id = section_ids.get(key) if key in sections else NO_ID
+            target = index.setdefault(key, []) if section_id == NO_ID else section_records[section_id]
+            target.extend(record_ids[id(row)] for row in source_registry.lookup(key))
+
+    write_snapshot(
+        snapshot_path,
+        records,
+        index,
+        source_hash(sources),
+        [source.name for source in sources],
+        list(section_ids),
+        section_records,
+    )
+    return len(records)
 
 
-def report(offence_code: str) -> None:
+def report(offence_code: str, sink: Optional[TextIO] = None, format: str = "text") -> int:
     """
     Generates a comprehensive human-readable report from the offence parser data.
     
     Args:
         offence_code (str): The offence code to generate a report for (e.g., "cc_266")
+        sink (Optional[TextIO]): Where to write the report. Defaults to stdout
+        format (str): "text", "markdown", "html" or "jsonl"
+
+    Returns:
+        int: The number of offences in the report
         
     Raises:
         RuntimeError: If the data hasn't been initialized
     """
-    global data
-    if data is None:
-        if not initialize():
-            raise RuntimeError("Failed to initialize data. Please check the CSV file.")
-    
-    offence_list = parse_offence(offence_code, full=True)
-
-    for offence in offence_list:
-        # Extract basic information
-        statute_code = offence["offence_data"]["section"].split("_")[0]
-        section_number = offence["offence_data"]["section"].split("_")[1]
-        statute_name = STATUTE_CODES[statute_code]["name"]
-        offence_name = offence["offence_data"]["description"]
-        mode = offence["offence_data"]["mode"]
-
-        # Print header
-        print("\n" + "=" * 80)
-        print(f"{statute_name} s. {section_number} — {offence_name.title()}")
-        print("=" * 80 + "\n")
-
-        # Basic Information
-        print("BASIC INFORMATION")
-        print("-" * 50)
-        print(f"Mode of Proceeding: {mode.title()}")
-
-        # Sentencing Ranges
-        print("\nSENTENCING RANGES")
-        print("-" * 50)
-        
-        def format_quantum(quantum):
-            if not quantum:
-                return "None"
-            fine = quantum.get("fine", {})
-            jail = quantum.get("jail", {})
-            parts = []
-            if fine.get("amount"):
-                parts.append(f"${fine['amount']} {fine['unit']}")
-            if jail.get("amount"):
-                if jail.get("unit") == "years" and int(jail["amount"]) == 255:
-                    parts.append("life")
-                else:
-                    parts.append(f"{jail['amount']} {jail['unit']}")
-            return " and ".join(parts) if parts else "None"
-
-        # Summary Proceedings
-        if mode in ["summary", "hybrid"]:
-            print("\nSummary Proceedings:")
-            print(f"  Minimum: {format_quantum(offence['offence_data']['summary_minimum'])}")
-            print(f"  Maximum: {format_quantum(offence['offence_data']['summary_maximum'])}")
-
-        # Indictable Proceedings
-        if mode in ["indictable", "hybrid"]:
-            print("\nIndictable Proceedings:")
-            print(f"  Minimum: {format_quantum(offence['offence_data']['indictable_minimum'])}")
-            print(f"  Maximum: {format_quantum(offence['offence_data']['indictable_maximum'])}")
-
-        # Procedure
-        if "procedure" in offence:
-            print("\nPROCEDURAL INFORMATION")
-            print("-" * 50)
-            
-            # Preliminary Inquiry
-            if "prelim_available" in offence["procedure"]:
-                prelim = offence["procedure"]["prelim_available"]
-                if isinstance(prelim, dict):
-                    status = prelim.get('status', {})
-                    if isinstance(status, tuple):
-                        status = status[0] if status else {}
-                    avail = status.get('available', False)
-                    print(f"Preliminary Inquiry Available: {avail}")
-                    if prelim.get('notes'):
-                        print(f"  Reason: {prelim['notes']}")
-
-            # Absolute Jurisdiction
-            if "absolute_jurisdiction" in offence["procedure"]:
-                abs_juris = offence["procedure"]["absolute_jurisdiction"]
-                if abs_juris and isinstance(abs_juris, list) and abs_juris[0]:
-                    status = abs_juris[0].get('status', {})
-                    if isinstance(status, tuple):
-                        status = status[0] if status else {}
-                    avail = status.get('absolute_jurisdiction', False)
-                    print(f"Absolute Jurisdiction: {avail}")
-                    if abs_juris[0].get('notes'):
-                        print(f"  Reason: {abs_juris[0]['notes']}")
-
-            # Superior Court Judge Release
-            if "release_by_superior_court_judge" in offence["procedure"]:
-                scj_release = offence["procedure"]["release_by_superior_court_judge"]
-                if isinstance(scj_release, dict):
-                    status_dict = scj_release.get('status', {})
-                    avail = status_dict.get('available', False)
-                    print(f"Superior Court Judge Release Required: {'Required' if avail else 'Not Required'}")
-                    if scj_release.get('notes'):
-                        print(f"  Reason: {scj_release['notes']}")
-                    if scj_release.get('sections'):
-                        print(f"  Sections: {', '.join(scj_release['sections'])}")
-
-        # Sentencing Options
-        if "sentencing" in offence:
-            print("\nSENTENCING OPTIONS")
-            print("-" * 50)
-            
-            sent = offence.get("sentencing", {})
-            options = [
-                ("Conditional Sentence", sent.get("cso_available")),
-                ("Intermittent Sentence", sent.get("intermittent_available")),
-                ("Suspended Sentence", sent.get("suspended_sentence_available")),
-                ("Discharge", sent.get("discharge_available")),
-                ("Prison and Probation", sent.get("prison_and_probation_available")),
-                ("Fine Alone", sent.get("fine_alone")),
-                ("Fine and Probation", sent.get("fine_and_probation"))
-            ]
-            
-            for option, status in options:
-                if status:
-                    # Handle tuple status
-                    if isinstance(status, tuple):
-                        status_dict = status[0] if status else {}
-                        if isinstance(status_dict, dict):
-                            avail = status_dict.get('available', False)
-                            print(f"{option}: {'Available' if avail else 'Not Available'}")
-                            if status_dict.get('notes'):
-                                print(f"  Reason: {status_dict['notes']}")
-                    # Handle dictionary status
-                    elif isinstance(status, dict):
-                        status_dict = status.get('status', {})
-                        if isinstance(status_dict, dict):
-                            avail = status_dict.get('available', False)
-                            print(f"{option}: {'Available' if avail else 'Not Available'}")
-                            if status.get('notes'):
-                                print(f"  Reason: {status['notes']}")
-
-        # Ancillary Orders
-        if "ancillary_orders" in offence:
-            print("\nANCILLARY ORDERS")
-            print("-" * 50)
-            
-            anc = offence.get("ancillary_orders", {})
-            
-            # DNA Orders
-            dna = anc.get("dna_designation", {})
-            if dna:
-                status = dna.get('status', {})
-                if isinstance(status, tuple):
-                    status = status[0] if status else {}
-                avail = status.get('available', False)
-                print(f"DNA Order: {'Available' if avail else 'Not Available'}")
-                if dna.get("notes"):
-                    print(f"  Reason: {dna['notes']}")
-
-            # SOIRA Orders
-            soira_list = anc.get("soira", [])
-            if soira_list and isinstance(soira_list, list):
-                soira = soira_list[0]
-                if isinstance(soira, dict):
-                    status = soira.get('status', {})
-                    avail = status.get('available', False) if isinstance(status, dict) else False
-                    print(f"SOIRA Registration: {'Available' if avail else 'Not Available'}")
-                    if avail:
-                        duration = soira.get("duration", {})
-                        if duration and duration.get('amount'):
-                            if duration.get('amount') == "life":
-                                print("  Duration: Life")
-                            else:
-                                print(f"  Duration: {duration.get('amount')} {duration.get('unit', '')}")
-                        if soira.get("sections"):
-                            print(f"  Sections: {', '.join(soira['sections'])}")
-                        if soira.get("notes"):
-                            print(f"  Reason: {soira['notes']}")
-
-            # Proceeds of Crime
-            poc = anc.get("proceeds_of_crime_forfeiture", {})
-            if poc:
-                if isinstance(poc, dict):
-                    avail = poc.get('available', False)
-                    print(f"Proceeds of Crime Forfeiture: {'Available' if avail else 'Not Available'}")
-                    if poc.get('notes'):
-                        print(f"  Reason: {poc['notes']}")
-
-            # Section 164.2 Forfeiture
-            s164_list = anc.get("section_164.2_forfeiture_order", [])
-            if s164_list and isinstance(s164_list, list):
-                s164 = s164_list[0]
-                if isinstance(s164, dict):
-                    print("Section 164.2 Forfeiture Order Available")
-                    if s164.get("notes"):
-                        print(f"  Reason: {s164['notes']}")
-
-        # Collateral Consequences
-        if "collateral_consequences" in offence:
-            print("\nCOLLATERAL CONSEQUENCES")
-            print("-" * 50)
-            
-            collateral = offence["collateral_consequences"]
-            
-            # Immigration Status
-            inadmissibility = collateral.get("inadmissibility", [])
-            if inadmissibility and isinstance(inadmissibility, list):
-                for item in inadmissibility:
-                    if isinstance(item, dict):
-                        # Extract status information
-                        if isinstance(item.get('status'), dict):
-                            avail = item['status'].get('available', False)
-                            status_notes = item['status'].get('notes')
-                            print(f"Immigration Status: {'Applicable' if avail else 'Not Applicable'}")
-                            if status_notes:
-                                print(f"  Status Reason: {status_notes}")
-                        else:
-                            print(f"Immigration Status: {item.get('status', 'Unknown')}")
-                        
-                        # Extract section information
-                        section = item.get('section', [])
-                        if isinstance(section, list):
-                            section = ', '.join(section)
-                        if section:
-                            print(f"  Section: {section}")
-                        
-                        # Extract notes
-                        if item.get('notes'):
-                            print(f"  Reason: {item['notes']}")
-
-        print("\n" + "=" * 80 + "\n")
+    _ensure_initialized()
+
+    return render_reports(
+        parse_offence(offence_code, full=True), sys.stdout if sink is None else sink, format
+    )
+
+
+def write_booklet(path, format: str = "text") -> int:
+    """
+    Write the full report for every offence in every statute to a file.
+
+    Offences are parsed and rendered one at a time and written as they are
+    rendered, so memory use does not grow with the number of offences.
+
+    Args:
+        path: The file to write
+        format (str): "text", "markdown", "html" or "jsonl"
+
+    Returns:
+        int: The number of offences written
+    """
+    statutes = StatuteRegistry(STATUTE_DIRS)
+    offences = (
+        lazy_row(row)
+        for code in statutes
+        for row in statutes.statute(code).rows
+    )
+    with open(path, "w", encoding="utf-8") as booklet:
+        return render_reports(offences, booklet, format)
 
 
 def main():
     """Main function to handle CSV processing and error handling."""
+    parser = argparse.ArgumentParser(description="Criminal Code offence parser")
+    parser.add_argument(
+        "--build-snapshot",
+        action="store_true",
+        help="parse every offence and write the grid snapshot",
+    )
+    parser.add_argument(
+        "--snapshot-path",
+        type=Path,
+        default=SNAPSHOT_PATH,
+        help=f"where to write the snapshot (default: {SNAPSHOT_PATH})",
+    )
+    parser.add_argument(
+        "--report",
+        metavar="OFFENCE",
+        help="write the report for an offence code",
+    )
+    parser.add_argument(
+        "--booklet",
+        type=Path,
+        metavar="PATH",
+        help="write the report for every offence to a file",
+    )
+    parser.add_argument(
+        "--format",
+        choices=REPORT_FORMATS,
+        default="text",
+        help="the report format (default: text)",
+    )
+    args = parser.parse_args()
+
+    if args.build_snapshot:
+        count = build_snapshot(args.snapshot_path)
+        print(f"Wrote {count} offences to {args.snapshot_path}")
+        return
+
+    if args.booklet:
+        count = write_booklet(args.booklet, args.format)
+        print(f"Wrote {count} offences to {args.booklet}")
+        return
+
+    if args.report:
+        report(args.report, format=args.format)
+        return
+
     initialize()
 
 if __name__ == "__main__":
@@ -95,45 +95,45 @@ CC_DISAMBIGUATION = {
     "cc_247": ["cc_247(1)", "cc_247(2)", "cc_247(3)", "cc_247(4)", "cc_247(5)"],
     "cc_263": ["cc_263(3)(c)"],
     "cc_263(3)": ["cc_263(3)(c)"],
-    "cc_264.1": ["cc_264.1(a)", "cc_264.1(b)", "cc_264.1(c)"],
+    "cc_264.1": ["cc_264.1(1)(a)", "cc_264.1(1)(b)", "cc_264.1(1)(c)"],
     "cc_265": ["cc_266"],
-    "cc_271": ["cc_271(a)", "cc_271(b)"],
+    "cc_271": ["cc_271-a", "cc_271-b"],
     "cc_272": [
         "cc_272(2)(a)",
-        "cc_272(2)(a.1), cc_272(2)(a.2)",
+        "cc_272(2)(a.1)", "cc_272(2)(a.2)",
         "cc_272(2)(b)",
     ],
     "cc_272(2)": [
         "cc_272(2)(a)-1", 
         "cc_272(2)(a)-s",
-        "cc_272(2)(a.1), cc_272(2)(a.2)",
+        "cc_272(2)(a.1)", "cc_272(2)(a.2)",
         "cc_272(2)(b)",
     ],
     "cc_273": [
         "cc_273(2)(a)-1", 
         "cc_273(2)(a)-s",
-        "cc_273(2)(a.1), cc_273(2)(a.2)",
+        "cc_273(2)(a.1)", "cc_273(2)(a.2)",
         "cc_273(2)(b)",
     ],
     "cc_273(2)": [
         "cc_273(2)(a)",
-        "cc_273(2)(a.1), cc_273(2)(a.2)",
+        "cc_273(2)(a.1)", "cc_273(2)(a.2)",
         "cc_273(2)(b)",
     ],
     "cc_279": [
         "cc_279(1.1)(a)",
-        "cc_279(1.1)(a.1), cc_279(1.1)(a.2)",
+        "cc_279(1.1)(a.1)", "cc_279(1.1)(a.2)",
         "cc_279(1.1)(b)",
         "cc_279(2)",
     ],
     "cc_279(1.1)": [
         "cc_279(1.1)(a)-1", 
         "cc_279(1.1)(a)-s",
-        "cc_279(1.1)(a.1), cc_279(1.1)(a.2)",
+        "cc_279(1.1)(a.1)", "cc_279(1.1)(a.2)",
         "cc_279(1.1)(b)",
     ],
-    "cc_279.01": ["cc_279.01(a)", "cc_279.01(b)"],
-    "cc_279.011": ["cc_279.011(a)", "cc_279.011(b)"],
+    "cc_279.01": ["cc_279.01(1)(a)", "cc_279.01(1)(b)"],
+    "cc_279.011": ["cc_279.011(1)(a)", "cc_279.011(1)(b)"],
     "cc_279.02": ["cc_279.02(1)", "cc_279.02(2)"],
     "cc_279.03": ["cc_279.03(1)", "cc_279.03(2)"],
     "cc_279.1": [
@@ -144,17 +144,17 @@ CC_DISAMBIGUATION = {
     ],
     "cc_279.1(2)": ["cc_279.1(2)(a)", "cc_279.1(2)(a.1)", "cc_279.1(2)(b)"],
     "cc_286.1": [
-        "cc_286(1)(a)(i)-1", 
-        "cc_286(1)(a)(i)-s"
-        "cc_286(1)(a)(ii)-1", 
-        "cc_286(1)(a)(ii)-s"
+        "cc_286.1(1)(a)(i)-1", 
+        "cc_286.1(1)(a)(i)-s",
+        "cc_286.1(1)(a)(ii)-1", 
+        "cc_286.1(1)(a)(ii)-s",
         "cc_286.1(2)",
     ],
     "cc_286.1(1)": [
-        "cc_286(1)(a)(i)-1", 
-        "cc_286(1)(a)(i)-s",
-        "cc_286(1)(a)(ii)-1", 
-        "cc_286(1)(a)(ii)-s"
+        "cc_286.1(1)(a)(i)-1", 
+        "cc_286.1(1)(a)(i)-s",
+        "cc_286.1(1)(a)(ii)-1", 
+        "cc_286.1(1)(a)(ii)-s"
     ],
     "cc_286.2": ["cc_286.2(1)", "cc_286.2(2)"],
     "cc_286.3": ["cc_286.3(1)", "cc_286.3(2)"],
@@ -180,21 +180,7 @@ CC_DISAMBIGUATION = {
         "cc_320.14(3)-1",
         "cc_320.14(3)-2",
         "cc_320.14(3)-s", 
-        "cc_420.14(4)"
-    ],
-    "cc_320.14(1)": [
-        "cc_320.14(1)-1-a",
-        "cc_320.14(1)-1-b",
-        "cc_320.14(1)-1-c",
-        "cc_320.14(1)-2",
-        "cc_320.14(1)-s",
-        "cc_320.14(2)-1", 
-        "cc_320.14(2)-2", 
-        "cc_320.14(2)-s",
-        "cc_320.14(3)-1",
-        "cc_320.14(3)-2",
-        "cc_320.14(3)-s", 
-        "cc_420.14(4)"
+        "cc_320.14(4)"
     ],
     "cc_320.14(1)-1": [
         "cc_320.14(1)-1-a",
@@ -235,8 +221,8 @@ CC_DISAMBIGUATION = {
     "cc_342": ["cc_342(1)", "cc_342(3)"],
     "cc_344": ["cc_344(1)(a)", "cc_344(1)(b)"],
     "cc_344(1)": [
-        "cc_334(1)(a)-1", 
-        "cc_334(1)(a)-s", 
+        "cc_344(1)(a)-1", 
+        "cc_344(1)(a)-s", 
         "cc_344(1)(b)"
     ],
     "cc_346": ["cc_346(1.1)(a)", "cc_346(1.1)(b)"],
@@ -349,13 +335,23 @@ CC_GRADUATED_OFFENCES = {
         "cc_279.1(2)(a)-1", 
         "cc_279.1(2)(a)-s"
     ],
+    "cc_286.1(1)(a)(i)": [
+        "cc_286.1(1)(a)(i)-1", 
+        "cc_286.1(1)(a)(i)-s",
+    ],
+    "cc_286.1(1)(a)(ii)": [
+        "cc_286.1(1)(a)(ii)-1", 
+        "cc_286.1(1)(a)(ii)-s"
+    ],
+    # Earlier versions of this map spelled s. 286.1 as s. 286; the old keys
+    # are kept so that callers using them still resolve
     "cc_286(1)(a)(i)": [
-        "cc_286(1)(a)(i)-1", 
-        "cc_286(1)(a)(i)-s"
+        "cc_286.1(1)(a)(i)-1", 
+        "cc_286.1(1)(a)(i)-s",
     ],
     "cc_286(1)(a)(ii)": [
-        "cc_286(1)(a)(ii)-1", 
-        "cc_286(1)(a)(ii)-s"
+        "cc_286.1(1)(a)(ii)-1", 
+        "cc_286.1(1)(a)(ii)-s"
     ],
     "cc_320.13(2)": [
         "cc_320.13(2)-1", 
@@ -418,9 +414,9 @@ CC_GRADUATED_OFFENCES = {
         "cc_333.1(1)-1", 
         "cc_333.1(1)-s"
     ],
-    "cc_334(1)(a)": [
-        "cc_334(1)(a)-1", 
-        "cc_334(1)(a)-s"
+    "cc_344(1)(a)": [
+        "cc_344(1)(a)-1", 
+        "cc_344(1)(a)-s"
     ],
     "cc_346(1.1)(a)": [
         "cc_346(1.1)(a)-1", 
@@ -0,0 +1,181 @@
+"""
+Offence name search.
+
+Finding an offence used to require its exact section key. The index below
+matches free text against offence names instead, tolerating typos: names and
+queries are broken into trigrams (runs of three characters, per word, as in
+PostgreSQL's pg_trgm), and offences are ranked by how many trigrams they share
+with the query, either over the whole name or over the start of the name, so
+that a partial query ranks the names it begins well:
+
+    index = OffenceSearchIndex.from_registry(registry)
+    index.search("sexual asault")
+    # [{"section": "cc_271#a", "description": "sexual assault", ...}, ...]
+
+The index maps each trigram to the offences whose names contain it, and the
+trigram counts of a query are taken over those posting lists with NumPy.
+"""
+
+import re
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+# Type definitions
+Entry = Tuple[str, str]
+
+_WORD_SEPARATORS = re.compile(r"[^0-9a-z]+")
+
+# The minimum similarity a result must have, from 0 to 1
+DEFAULT_THRESHOLD = 0.3
+DEFAULT_LIMIT = 10
+
+
+def normalize(text: str) -> str:
+    """Lowercase a text and reduce it to words separated by single spaces."""
+    return " ".join(word for word in _WORD_SEPARATORS.split(text.lower()) if word)
+
+
+def trigram_positions(text: str) -> Dict[str, int]:
+    """
+    Return each trigram in a text with the position in the normalized text
+    where it first occurs.
+
+    Each word is padded with two spaces in front and one behind, so short
+    words and the start of each word still produce trigrams.
+    """
+    positions: Dict[str, int] = {}
+    offset = 0
+    for word in normalize(text).split(" "):
+        if word:
+            padded = f"  {word} "
+            for i in range(len(padded) - 2):
+                positions.setdefault(padded[i:i + 3], offset + i)
+            offset += len(word) + 1
+    return positions
+
+
+def trigrams(text: str) -> frozenset:
+    """Return the set of trigrams in a text."""
+    return frozenset(trigram_positions(text))
+
+
+class OffenceSearchIndex:
+    """
+    A trigram index over offence names.
+
+    Args:
+        entries (Iterable[Entry]): (section, offence name) pairs. Repeated
+            pairs are indexed once
+    """
+
+    def __init__(self, entries: Iterable[Entry]):
+        self.entries: List[Entry] = list(dict.fromkeys(entries))
+        self._names: List[str] = [normalize(name) for _, name in self.entries]
+
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        all_positions = []
+        for entry_id, (_, name) in enumerate(self.entries):
+            positions = trigram_positions(name)
+            all_positions.append(list(positions.values()))
+            for trigram, position in positions.items():
+                trigram_entries, trigram_offsets = postings.setdefault(trigram, ([], []))
+                trigram_entries.append(entry_id)
+                trigram_offsets.append(position)
+
+        # Each trigram's posting list: the entries containing it, and where
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {
+            trigram: (np.array(entry_ids, dtype=np.int32), np.array(positions, dtype=np.int32))
+            for trigram, (entry_ids, positions) in postings.items()
+        }
+
+        # leading[i, n] is the number of entry i's trigrams that start before
+        # position n (capped at the longest name), so the size of any name
+        # prefix is a single column read
+        width = max((max(positions, default=0) for positions in all_positions), default=0) + 2
+        leading = np.zeros((len(self.entries), width), dtype=np.int32)
+        for entry_id, positions in enumerate(all_positions):
+            np.add.at(leading[entry_id], np.array(positions, dtype=np.int64) + 1, 1)
+        self._leading = np.cumsum(leading, axis=1, dtype=np.int32)
+        self._sizes = self._leading[:, -1]
+
+    @classmethod
+    def from_registry(cls, statutes) -> "OffenceSearchIndex":
+        """
+        Index the offence names of every statute in a StatuteRegistry. This
+        reads every statute's CSV.
+        """
+        return cls(
+            (row[0], row[1])
+            for code in statutes
+            for row in statutes.statute(code).rows
+        )
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(
+        self,
+        query: str,
+        limit: int = DEFAULT_LIMIT,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> List[dict]:
+        """
+        Find the offences whose names best match a query.
+
+        Offences are ranked by the Dice similarity of the query's trigrams
+        and those of the name, or of the start of the name as long as the
+        query, whichever is higher. Ties go to names that start with the
+        query, then to shorter names.
+
+        Args:
+            query (str): Free text, e.g. "sexual asault" or "break and ent"
+            limit (int): The maximum number of results
+            threshold (float): The minimum similarity of a result, from 0 to 1
+
+        Returns:
+            List[dict]: The matches, best first, each with the section, the
+                description (offence name) and the score
+        """
+        query_trigrams = trigrams(query)
+        postings = [self._postings[trigram] for trigram in query_trigrams if trigram in self._postings]
+        if not postings or limit <= 0:
+            return []
+
+        prefix = normalize(query)
+        # Trigrams of a word end one position past it, for its padding
+        prefix_end = len(prefix) + 1
+
+        entry_ids = np.concatenate([entry_ids for entry_ids, _ in postings])
+        positions = np.concatenate([positions for _, positions in postings])
+        shared = np.bincount(entry_ids, minlength=len(self.entries))
+        shared_prefix = np.bincount(
+            entry_ids[positions < prefix_end], minlength=len(self.entries)
+        )
+
+        query_size = len(query_trigrams)
+        prefix_sizes = self._leading[:, min(prefix_end, self._leading.shape[1] - 1)]
+        scores = np.maximum(
+            2 * shared / (query_size + self._sizes),
+            2 * shared_prefix / (query_size + prefix_sizes),
+        )
+
+        candidates = np.flatnonzero(scores >= threshold)
+        ranked = sorted(
+            (
+                -scores[entry_id],
+                not self._names[entry_id].startswith(prefix),
+                len(self._names[entry_id]),
+                entry_id,
+            )
+            for entry_id in candidates.tolist()
+        )
+
+        return [
+            {
+                "section": self.entries[entry_id][0],
+                "description": self.entries[entry_id][1],
+                "score": round(float(-negative_score), 3),
+            }
+            for negative_score, _, _, entry_id in ranked[:limit]
+        ]
@@ -0,0 +1,116 @@
+"""
+Lazy parse results.
+
+parse_offence used to build every requested group of details before
+returning, even when the caller only displayed the offence data. A
+ParsedOffence instead computes each group the first time it is read, and
+keeps the result for later reads:
+
+    offence = parse_offence("cc266", full=True)[0]
+    offence["offence_data"]     # computes the basic details only
+    offence.sentencing          # computes the sentencing group now
+
+A ParsedOffence is a read-only mapping of the requested groups, so code that
+indexes, iterates or compares the old result dictionaries keeps working.
+to_dict() returns the same plain dictionary parse_offence used to return.
+It is not a dict, so json.dumps raises TypeError on it; serialize to_dict()
+instead:
+
+    json.dumps([offence.to_dict() for offence in parse_offence("cc266")])
+"""
+
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator, Optional, Sequence
+
+# The groups of details, in the order they appear in a result
+GROUPS = (
+    "offence_data",
+    "procedure",
+    "sentencing",
+    "ancillary_orders",
+    "collateral_consequences",
+)
+
+
+class ParsedOffence(Mapping):
+    """
+    The parse result for one offence row, computed one group at a time.
+
+    Args:
+        groups (Sequence[str]): The groups the result contains, in order
+        compute (Optional[Callable[[str], dict]]): Computes a group's details.
+            It is called at most once per group
+        values (Optional[Dict[str, dict]]): Groups that are already computed
+
+    Any group in GROUPS can also be read as an attribute. Unlike indexing, an
+    attribute computes the group even if it was not requested.
+    """
+
+    __slots__ = ("_groups", "_compute", "_values")
+
+    def __init__(
+        self,
+        groups: Sequence[str],
+        compute: Optional[Callable[[str], dict]] = None,
+        values: Optional[Dict[str, dict]] = None,
+    ):
+        self._groups = tuple(groups)
+        self._compute = compute
+        self._values = {} if values is None else values
+
+    @classmethod
+    def from_dict(cls, parsed_offence: Dict[str, dict]) -> "ParsedOffence":
+        """Wrap a result whose groups are all computed."""
+        return cls(tuple(parsed_offence), values=dict(parsed_offence))
+
+    def _group(self, group: str) -> dict:
+        try:
+            return self._values[group]
+        except KeyError:
+            if self._compute is None:
+                raise
+        value = self._values[group] = self._compute(group)
+        return value
+
+    def __getitem__(self, group: str) -> dict:
+        if group not in self._groups:
+            raise KeyError(group)
+        return self._group(group)
+
+    def __getattr__(self, name: str) -> dict:
+        # Only called when normal lookup fails, so the slots are never routed
+        # here once they are set
+        if name in GROUPS:
+            try:
+                return self._group(name)
+            except KeyError:
+                pass
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._groups)
+
+    def __len__(self) -> int:
+        return len(self._groups)
+
+    def __contains__(self, group: object) -> bool:
+        return group in self._groups
+
+    def __repr__(self) -> str:
+        groups = ", ".join(
+            group if group in self._values else f"{group} (pending)" for group in self._groups
+        )
+        return f"ParsedOffence({groups})"
+
+    def __reduce__(self):
+        # The compute function may not be picklable, so a pickled result
+        # carries its computed groups instead
+        return (ParsedOffence.from_dict, (self.to_dict(),))
+
+    def computed(self, group: str) -> bool:
+        """Check whether a group has been computed yet."""
+        return group in self._values
+
+    def to_dict(self) -> Dict[str, dict]:
+        """Compute every requested group and return them as a plain dictionary."""
+        return {group: self._group(group) for group in self._groups}
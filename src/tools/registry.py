@@ -0,0 +1,459 @@
+"""
+Offence registry for the offence parser.
+
+The registry indexes the rows of an offence CSV by section once, when the data
+is loaded, so that parse_offence never has to scan the table. The tiers of
+graduated offences are tabulated at the same time, so that the tier that
+applies to an offender's prior convictions can be picked for a whole caseload
+at once. Any prefix of a
+section in the hierarchy (e.g. "cc_320.14" or "cc_320.14(1)") resolves to the
+offences below it through a section trie. Keys from the disambiguation and
+graduated offence maps override the trie, and are resolved ahead of time to
+the rows they expand to.
+
+Each statute has its own registry. The StatuteRegistry finds every statute
+CSV, routes each lookup to its statute by the section's prefix, and reads a
+statute's CSV only when one of its sections is first requested.
+"""
+
+import csv
+from functools import cached_property
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .constants import (
+    STATUTE_CODES,
+)
+
+from .graduated import (
+    GraduatedTable,
+    Prior,
+)
+
+from .map import (
+    CC_DISAMBIGUATION,
+    CC_GRADUATED_OFFENCES,
+)
+
+from .section_ids import (
+    NO_ID,
+    SectionIds,
+)
+
+from .section_trie import (
+    SectionTrie,
+    section_components,
+)
+
+# Type definitions
+Row = List[str]
+# What a charge resolves to: a row, or the base ID of a graduated offence
+# whose tier depends on the prior convictions
+_Plan = Tuple[Union[Row, int], ...]
+
+
+class OffenceRegistry:
+    """
+    Maps canonical section IDs to the CSV rows that describe them.
+
+    Exact sections and the keys of the expansion maps (disambiguation and
+    graduated offence keys) are stored in a single index that points to a
+    tuple of row references. A section spelled differently from the data
+    (e.g. "cc266" for "cc_266") is resolved through its section ID. Any other
+    prefix of a section is resolved through the section trie, one step per
+    level of the hierarchy. Either way, the cost of a lookup does not depend
+    on how many offences the key expands to.
+
+    Exact sections take precedence over the expansion maps, the disambiguation
+    map takes precedence over the graduated offences map, and both take
+    precedence over other spellings of a section and over the trie. The maps
+    are optional overrides: pass empty maps to rely on the trie alone.
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[Row],
+        disambiguation: Optional[Mapping[str, Sequence[str]]] = None,
+        graduated: Optional[Mapping[str, Sequence[str]]] = None,
+    ):
+        if disambiguation is None:
+            disambiguation = CC_DISAMBIGUATION
+        if graduated is None:
+            graduated = CC_GRADUATED_OFFENCES
+
+        self.rows: List[Row] = list(rows)
+
+        # Some statutes repeat a section (e.g. first and subsequent offences),
+        # so each section maps to every row that carries it
+        sections: Dict[str, List[Row]] = {}
+        for row in self.rows:
+            sections.setdefault(row[0], []).append(row)
+
+        self._sections: Dict[str, Tuple[Row, ...]] = {
+            section: tuple(section_rows) for section, section_rows in sections.items()
+        }
+
+        self._trie = SectionTrie(self._sections)
+
+        # Resolve the expansion maps to row references. A listed section that
+        # is not in the data expands through the trie, which also accepts the
+        # "-" variant suffixes the maps use; sections that match nothing are
+        # skipped, as they always have been.
+        index: Dict[str, Tuple[Row, ...]] = {}
+        for expansion_map in (graduated, disambiguation):
+            for key, expanded_sections in expansion_map.items():
+                index[key] = tuple(
+                    row
+                    for expanded_section in expanded_sections
+                    for row in self._expand(expanded_section)
+                )
+        index.update(self._sections)
+
+        self._index = index
+
+        self.graduated = GraduatedTable(self.rows)
+        self._row_numbers = {id(row): row_number for row_number, row in enumerate(self.rows)}
+        self._plans: Dict[str, _Plan] = {}
+
+    @classmethod
+    def from_csv(cls, csv_file_path, **kwargs) -> "OffenceRegistry":
+        """
+        Build a registry from an offence CSV file.
+
+        Args:
+            csv_file_path: Path to a CSV file whose first line is a header row
+            **kwargs: Passed through to the registry constructor
+
+        Returns:
+            OffenceRegistry: The populated registry
+
+        Raises:
+            FileNotFoundError: If the CSV file does not exist
+            csv.Error: If the CSV file cannot be parsed
+        """
+        with open(csv_file_path, newline="") as csvfile:
+            csvreader = csv.reader(csvfile)
+            header = next(csvreader, [])
+            # Trailing empty columns are sometimes left out; pad them back
+            return cls(
+                (row + [""] * (len(header) - len(row)) for row in csvreader if row),
+                **kwargs,
+            )
+
+    def _expand(self, prefix: str) -> Tuple[Row, ...]:
+        """Return the rows of an exact section, or of the sections below a prefix."""
+        rows = self._sections.get(prefix)
+        if rows is not None:
+            return rows
+        return tuple(
+            row for section in self._trie.descendants(prefix) for row in self._sections[section]
+        )
+
+    @cached_property
+    def section_ids(self) -> SectionIds:
+        """
+        The ID of every section, in CSV order. Sections that are not in
+        section syntax have none, and are only found by their exact spelling.
+        """
+        section_ids = SectionIds()
+        section_rows: List[Tuple[Row, ...]] = []
+        for section, rows in self._sections.items():
+            if section_components(section) is None:
+                continue
+            section_id = section_ids.intern(section)
+            if section_id < len(section_rows):
+                # Another spelling of a section already seen
+                section_rows[section_id] += rows
+            else:
+                section_rows.append(rows)
+        self._section_rows = section_rows
+        return section_ids
+
+    def __contains__(self, offence: str) -> bool:
+        offence = offence.strip().lower()
+        return offence in self._index or offence in self.section_ids or offence in self._trie
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def sections(self) -> List[str]:
+        """Return every section in the registry, in CSV order."""
+        return list(self._sections)
+
+    def keys(self) -> List[str]:
+        """
+        Return every key lookup accepts, as written in the data: the sections,
+        then the keys of the expansion maps that are not also sections, then
+        the other prefixes in the section trie.
+        """
+        keys = list(self._sections) + [key for key in self._index if key not in self._sections]
+        indexed = set(keys)
+        return keys + [prefix for prefix in self._trie.prefixes() if prefix not in indexed]
+
+    def get_rows(self, section: str) -> Tuple[Row, ...]:
+        """
+        Return the rows for an exact section, without expanding map keys.
+
+        Args:
+            section (str): The section to look up, e.g. "cc_266"
+
+        Returns:
+            Tuple[Row, ...]: The matching rows, or an empty tuple
+        """
+        return self._sections.get(section, ())
+
+    def lookup(self, offence: str) -> Tuple[Row, ...]:
+        """
+        Resolve an offence code to the rows it refers to.
+
+        Args:
+            offence (str): A section in any spelling, a disambiguation or
+                graduated offence key, or any prefix of a section in the
+                hierarchy
+
+        Returns:
+            Tuple[Row, ...]: The rows for the offence, in map order for map
+                keys and in CSV order otherwise
+
+        Raises:
+            KeyError: If the offence code is not found
+        """
+        offence = offence.strip().lower()
+        try:
+            return self._index[offence]
+        except KeyError:
+            pass
+        section_id = self.section_ids.get(offence)
+        if section_id != NO_ID:
+            return self._section_rows[section_id]
+        rows = self._expand(offence)
+        if not rows:
+            raise KeyError(f"Offence code '{offence}' not found")
+        return rows
+
+    def _plan(self, offence: str) -> _Plan:
+        """Resolve a charge, replacing the tiers of each graduated offence by its base ID."""
+        offence = offence.strip().lower()
+        try:
+            return self._plans[offence]
+        except KeyError:
+            pass
+
+        plan = []
+        for row in self.lookup(offence):
+            base_id = self.graduated.base_id(self._row_numbers[id(row)])
+            step = row if base_id is None else base_id
+            if base_id is None or base_id not in plan:
+                plan.append(step)
+        plan = self._plans[offence] = tuple(plan)
+        return plan
+
+    def resolve_graduated(
+        self,
+        charges: Sequence[str],
+        records: Union[Sequence[Iterable[Prior]], np.ndarray],
+    ) -> List[Tuple[Row, ...]]:
+        """
+        Resolve charges, keeping only the tier of each graduated offence that
+        applies to the offender's prior convictions.
+
+        Args:
+            charges (Sequence[str]): The offence code of each charge, as for
+                lookup
+            records (Union[Sequence[Iterable[Prior]], np.ndarray]): For each
+                charge, the offender's prior convictions, as sections or
+                PriorConvictions, or the offenders'
+                GraduatedTable.prior_counts
+
+        Returns:
+            List[Tuple[Row, ...]]: The rows of each charge, as lookup returns
+                them but with one tier per graduated offence
+
+        Raises:
+            KeyError: If an offence code is not found
+            ValueError: If there is not one record per charge
+        """
+        if len(records) != len(charges):
+            raise ValueError(f"Got {len(charges)} charges but {len(records)} prior conviction records")
+
+        plans = [self._plan(charge) for charge in charges]
+        steps = [
+            (charge, base_id)
+            for charge, plan in enumerate(plans)
+            for base_id in plan if isinstance(base_id, int)
+        ]
+        if not steps:
+            return [tuple(plan) for plan in plans]
+
+        counts = records if isinstance(records, np.ndarray) else self.graduated.prior_counts(records)
+        charge_ids = np.array([charge for charge, _ in steps], dtype=np.int64)
+        group_ids = self.graduated.select(
+            np.array([base_id for _, base_id in steps], dtype=np.int64),
+            counts[charge_ids],
+        ).tolist()
+
+        selected = iter(group_ids)
+        return [
+            tuple(
+                row
+                for step in plan
+                for row in (
+                    (step,) if not isinstance(step, int)
+                    else (self.rows[row_number] for row_number in self.graduated.groups[next(selected)])
+                )
+            )
+            for plan in plans
+        ]
+
+
+def statute_code(offence: str) -> Optional[str]:
+    """
+    Return the statute code an offence code refers to, e.g. "cc" for
+    "cc_266" or "cdsa" for "cdsa4(3)", or None if it has no statute prefix.
+    """
+    parsed = section_components(offence)
+    return None if parsed is None else parsed[0][0]
+
+
+class StatuteRegistry:
+    """
+    Resolves offence codes across every statute, loading each statute's CSV
+    on first use.
+
+    A statute's CSV is named after its code in STATUTE_CODES, followed by a
+    date (e.g. "cdsa-offences-2024-09-16.csv"). When a statute has several
+    CSVs, the last one in name order, i.e. the latest, is used. Only the
+    Criminal Code has disambiguation and graduated offence maps; the other
+    statutes are resolved by exact section and through the section trie.
+
+    Args:
+        directories (Iterable[Path]): The directories holding statute CSVs
+    """
+
+    def __init__(self, directories: Iterable[Path]):
+        sources: Dict[str, Path] = {}
+        for path in sorted(
+            path for directory in directories for path in Path(directory).glob("*.csv")
+        ):
+            code = path.name.split("-", 1)[0].lower()
+            if code in STATUTE_CODES:
+                sources[code] = path
+
+        self.sources: Dict[str, Path] = sources
+        self._registries: Dict[str, OffenceRegistry] = {}
+        self._lock = Lock()
+
+    def __contains__(self, offence: str) -> bool:
+        code = statute_code(offence)
+        return code in self.sources and offence in self.statute(code)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.sources)
+
+    def statute(self, code: str) -> OffenceRegistry:
+        """
+        Return the registry for one statute, reading its CSV on first use.
+
+        Args:
+            code (str): A statute code, e.g. "cdsa"
+
+        Returns:
+            OffenceRegistry: The statute's registry
+
+        Raises:
+            KeyError: If there is no CSV for the statute
+            FileNotFoundError, csv.Error: If the CSV cannot be read
+        """
+        try:
+            return self._registries[code]
+        except KeyError:
+            pass
+
+        source = self.sources[code]
+        with self._lock:
+            if code not in self._registries:
+                if code == "cc":
+                    registry = OffenceRegistry.from_csv(source)
+                else:
+                    registry = OffenceRegistry.from_csv(source, disambiguation={}, graduated={})
+                self._registries[code] = registry
+        return self._registries[code]
+
+    def loaded(self) -> List[str]:
+        """Return the codes of the statutes read so far."""
+        return list(self._registries)
+
+    @cached_property
+    def section_ids(self) -> SectionIds:
+        """
+        The integer ID of every section, assigned in statute and CSV order.
+        Reads every statute's CSV on first use.
+        """
+        return SectionIds(
+            section for code in self for section in self.statute(code).sections()
+        )
+
+    def lookup(self, offence: str) -> Tuple[Row, ...]:
+        """
+        Resolve an offence code in any statute to the rows it refers to.
+
+        Args:
+            offence (str): Any key the statute's OffenceRegistry accepts
+
+        Returns:
+            Tuple[Row, ...]: The rows for the offence
+
+        Raises:
+            KeyError: If the offence code is not found
+        """
+        offence = offence.strip().lower()
+        code = statute_code(offence)
+        if code not in self.sources:
+            raise KeyError(f"Offence code '{offence}' not found")
+        return self.statute(code).lookup(offence)
+
+    def resolve_graduated(
+        self,
+        charges: Sequence[str],
+        records: Sequence[Iterable[Prior]],
+    ) -> List[Tuple[Row, ...]]:
+        """
+        Resolve charges in any statute, keeping only the tier of each
+        graduated offence that applies to the offender's prior convictions.
+
+        Args:
+            charges (Sequence[str]): The offence code of each charge
+            records (Sequence[Iterable[Prior]]): For each charge, the
+                offender's prior convictions, as sections or
+                PriorConvictions. Only convictions under the charge's
+                statute count
+
+        Returns:
+            List[Tuple[Row, ...]]: The rows of each charge
+
+        Raises:
+            KeyError: If an offence code is not found
+            ValueError: If there is not one record per charge
+        """
+        if len(records) != len(charges):
+            raise ValueError(f"Got {len(charges)} charges but {len(records)} prior conviction records")
+
+        by_statute: Dict[str, List[int]] = {}
+        for position, charge in enumerate(charges):
+            code = statute_code(charge)
+            if code not in self.sources:
+                raise KeyError(f"Offence code '{charge.strip().lower()}' not found")
+            by_statute.setdefault(code, []).append(position)
+
+        resolved: List[Tuple[Row, ...]] = [()] * len(charges)
+        for code, positions in by_statute.items():
+            statute_rows = self.statute(code).resolve_graduated(
+                [charges[position] for position in positions],
+                [list(records[position]) for position in positions],
+            )
+            for position, rows in zip(positions, statute_rows):
+                resolved[position] = rows
+        return resolved
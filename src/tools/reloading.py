@@ -0,0 +1,267 @@
+"""
+Hot reloading of the offence data.
+
+A long-running worker used to read the statute CSVs once and keep them until
+it was restarted. A ReloadingRegistry instead watches the CSVs: when a file is
+added, removed or modified, a new StatuteRegistry is built in a background
+thread while readers keep using the current one, and the new registry is then
+swapped in with a single assignment. A reader that takes the current version
+once therefore sees either the old data or the new, never a mix:
+
+    reloader = ReloadingRegistry(STATUTE_DIRS)
+    reloader.start()                    # poll for changes in the background
+    reloader.statutes.lookup("cc_266")  # the current registry
+    reloader.metrics()                  # version, rebuilds, reload latency
+
+Changes are detected from each file's modification time and size, which
+costs a directory listing and a stat per file. A file whose contents hash
+the same as before (e.g. after touch) does not trigger a rebuild.
+"""
+
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+from .registry import (
+    StatuteRegistry,
+)
+
+from .snapshot import (
+    source_hash,
+)
+
+logger = logging.getLogger(__name__)
+
+# How often maybe_check and the polling thread look for changes, in seconds
+DEFAULT_CHECK_INTERVAL = 2.0
+
+# Type definitions
+Fingerprint = Tuple[Tuple[str, int, int], ...]
+
+
+def fingerprint(directories: Iterable[Path]) -> Fingerprint:
+    """
+    Return the path, modification time and size of every CSV in the
+    directories, in path order.
+    """
+    files = []
+    for path in sorted(
+        path for directory in directories for path in Path(directory).glob("*.csv")
+    ):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            # Removed since it was listed
+            continue
+        files.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(files)
+
+
+class RegistryVersion(NamedTuple):
+    """
+    One generation of the offence data.
+
+    Attributes:
+        number (int): The version number, starting at 1 and increased by each
+            rebuild
+        statutes (StatuteRegistry): The registry
+        fingerprint (Fingerprint): The CSV files it was built from
+        source_hash (str): A hash of the contents of those files
+        loaded_at (float): When it was swapped in, as a Unix timestamp
+    """
+
+    number: int
+    statutes: StatuteRegistry
+    fingerprint: Fingerprint
+    source_hash: str
+    loaded_at: float
+
+
+class ReloadingRegistry:
+    """
+    A StatuteRegistry that is rebuilt and swapped in when its CSVs change.
+
+    Args:
+        directories (Iterable[Path]): The directories holding statute CSVs
+        check_interval (float): The minimum time between checks made by
+            maybe_check, and the polling interval of start
+        on_swap (Optional[Callable[[RegistryVersion], None]]): Called with
+            each new version after it is swapped in
+
+    Raises:
+        OSError: If the directories cannot be read
+    """
+
+    def __init__(
+        self,
+        directories: Iterable[Path],
+        check_interval: float = DEFAULT_CHECK_INTERVAL,
+        on_swap: Optional[Callable[[RegistryVersion], None]] = None,
+    ):
+        self.directories = tuple(Path(directory) for directory in directories)
+        self.check_interval = check_interval
+        self.on_swap = on_swap
+
+        files = fingerprint(self.directories)
+        self._current = RegistryVersion(
+            1,
+            StatuteRegistry(self.directories),
+            files,
+            source_hash([path for path, _, _ in files], modules=()),
+            time.time(),
+        )
+
+        # Guards the rebuild state and the metrics, not the current version:
+        # readers never take it
+        self._lock = threading.Lock()
+        self._rebuilding: Optional[threading.Thread] = None
+        self._last_check = time.monotonic()
+        self._rebuilds = 0
+        self._failures = 0
+        self._last_reload_seconds: Optional[float] = None
+        self._last_error: Optional[str] = None
+        # The files of the last failed rebuild, not retried until they change
+        self._failed: Optional[Fingerprint] = None
+
+        self._stop = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+
+    @property
+    def current(self) -> RegistryVersion:
+        """The current version. Take it once per unit of work."""
+        return self._current
+
+    @property
+    def statutes(self) -> StatuteRegistry:
+        """The current registry."""
+        return self._current.statutes
+
+    def check(self, wait: bool = False) -> bool:
+        """
+        Look for changed CSVs, and start a rebuild in the background if any
+        changed and none is running. Files that failed to rebuild are not
+        retried until they change again.
+
+        Args:
+            wait (bool): If True, wait for the rebuild to finish
+
+        Returns:
+            bool: True if the CSVs changed since the current version
+        """
+        self._last_check = time.monotonic()
+        files = fingerprint(self.directories)
+        if files == self._current.fingerprint:
+            return False
+
+        with self._lock:
+            if files == self._failed:
+                return True
+            rebuild = self._rebuilding
+            if rebuild is None:
+                rebuild = self._rebuilding = threading.Thread(
+                    target=self._rebuild,
+                    args=(files, time.perf_counter()),
+                    name="offence-registry-reload",
+                    daemon=True,
+                )
+                rebuild.start()
+        if wait and rebuild is not None:
+            rebuild.join()
+        return True
+
+    def maybe_check(self) -> bool:
+        """
+        Check for changes if the check interval has passed since the last
+        check. Cheap enough to call on every request.
+        """
+        if time.monotonic() - self._last_check < self.check_interval:
+            return False
+        return self.check()
+
+    def _rebuild(self, files: Fingerprint, detected: float) -> None:
+        current = self._current
+        try:
+            digest = source_hash([path for path, _, _ in files], modules=())
+            if digest == current.source_hash:
+                # Only the modification times changed
+                self._current = current._replace(fingerprint=files)
+                return
+
+            # Read every statute before the swap, so a CSV that cannot be
+            # read fails here and the current version stays in use
+            statutes = StatuteRegistry(self.directories)
+            for code in statutes:
+                statutes.statute(code)
+
+            version = RegistryVersion(current.number + 1, statutes, files, digest, time.time())
+            self._current = version
+            with self._lock:
+                self._rebuilds += 1
+                self._last_reload_seconds = time.perf_counter() - detected
+                self._last_error = None
+            if self.on_swap is not None:
+                self.on_swap(version)
+        except Exception as e:
+            # Keep serving the current version
+            with self._lock:
+                self._failed = files
+                self._failures += 1
+                self._last_error = f"{type(e).__name__}: {e}"
+            logger.exception("Error reloading the offence data")
+        finally:
+            with self._lock:
+                self._rebuilding = None
+
+    def start(self) -> None:
+        """Poll for changes in a background thread, every check_interval seconds."""
+        if self._poller is not None:
+            return
+        self._stop.clear()
+
+        def poll():
+            while not self._stop.wait(self.check_interval):
+                self.check()
+
+        self._poller = threading.Thread(target=poll, name="offence-registry-poll", daemon=True)
+        self._poller.start()
+
+    def stop(self) -> None:
+        """Stop polling for changes."""
+        if self._poller is not None:
+            self._stop.set()
+            self._poller.join()
+            self._poller = None
+
+    def metrics(self) -> Dict[str, object]:
+        """
+        Return the reload state for monitoring.
+
+        Returns:
+            Dict[str, object]:
+                - version: The current version number
+                - source_hash: The hash of the current CSVs
+                - loaded_at: When the current version was swapped in
+                - sources: The CSV each statute is read from
+                - rebuilds: Rebuilds completed since the registry was created
+                - failed_rebuilds: Rebuilds that failed
+                - last_reload_seconds: The time from detecting the last change
+                  to swapping in its version, or None if there was none
+                - rebuilding: Whether a rebuild is running
+                - last_error: The error of the last failed rebuild, if it has
+                  not been followed by a successful one
+        """
+        current = self._current
+        with self._lock:
+            return {
+                "version": current.number,
+                "source_hash": current.source_hash,
+                "loaded_at": current.loaded_at,
+                "sources": {code: path.name for code, path in current.statutes.sources.items()},
+                "rebuilds": self._rebuilds,
+                "failed_rebuilds": self._failures,
+                "last_reload_seconds": self._last_reload_seconds,
+                "rebuilding": self._rebuilding is not None,
+                "last_error": self._last_error,
+            }
@@ -0,0 +1,426 @@
+"""
+Human-readable offence reports.
+
+A report is built in two steps. build_report walks a parsed offence and
+collects what the report says about it (sections of labelled items) without
+deciding how it looks. A renderer then writes that report in one of the
+output formats:
+
+    text        the plain text layout of the original report
+    markdown    Markdown, one heading per offence
+    html        an HTML document, one <article> per offence
+    jsonl       JSON Lines, one parsed offence per line
+
+Each format's layout is a set of templates compiled once, when this module is
+imported. render_reports writes each offence to the sink as soon as it is
+rendered, so any number of offences can be streamed to a file, a socket or an
+HTTP response with memory for one offence at a time.
+"""
+
+import html
+import json
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Optional, TextIO, Tuple
+
+from .constants import (
+    STATUTE_CODES,
+)
+
+from .registry import (
+    statute_code,
+)
+
+# Type definitions
+Detail = Tuple[str, str]
+
+
+class ReportItem(NamedTuple):
+    """
+    One line of a report, and any indented details below it. An item
+    without a value is a heading for its details.
+    """
+
+    label: str
+    value: Optional[str]
+    details: Tuple[Detail, ...] = ()
+
+
+class ReportSection(NamedTuple):
+    title: str
+    items: Tuple[ReportItem, ...]
+
+
+class OffenceReport(NamedTuple):
+    section: str
+    title: str
+    sections: Tuple[ReportSection, ...]
+
+
+def format_quantum(quantum: Optional[Mapping]) -> str:
+    """Describe a parsed quantum, e.g. "$5000 dollars and 2 years"."""
+    if not quantum:
+        return "None"
+    fine = quantum.get("fine", {})
+    jail = quantum.get("jail", {})
+    parts = []
+    if fine.get("amount"):
+        parts.append(f"${fine['amount']} {fine['unit']}")
+    if jail.get("amount"):
+        if jail.get("unit") == "years" and int(jail["amount"]) == 255:
+            parts.append("life")
+        else:
+            parts.append(f"{jail['amount']} {jail['unit']}")
+    return " and ".join(parts) if parts else "None"
+
+
+def _first(status):
+    """Unwrap the one-element status tuple of the older output format."""
+    if isinstance(status, tuple):
+        return status[0] if status else {}
+    return status
+
+
+def _available(available) -> str:
+    return "Available" if available else "Not Available"
+
+
+def _procedure_items(procedure: Mapping) -> List[ReportItem]:
+    items = []
+
+    prelim = procedure.get("prelim_available")
+    if isinstance(prelim, dict):
+        status = _first(prelim.get("status", {}))
+        details = (("Reason", prelim["notes"]),) if prelim.get("notes") else ()
+        items.append(
+            ReportItem("Preliminary Inquiry Available", str(status.get("available", False)), details)
+        )
+
+    absolute_jurisdiction = procedure.get("absolute_jurisdiction")
+    if absolute_jurisdiction and isinstance(absolute_jurisdiction, list) and absolute_jurisdiction[0]:
+        result = absolute_jurisdiction[0]
+        status = _first(result.get("status", {}))
+        details = (("Reason", result["notes"]),) if result.get("notes") else ()
+        items.append(
+            ReportItem("Absolute Jurisdiction", str(status.get("absolute_jurisdiction", False)), details)
+        )
+
+    release = procedure.get("release_by_superior_court_judge")
+    if isinstance(release, dict):
+        status = release.get("status", {})
+        details = []
+        if release.get("notes"):
+            details.append(("Reason", release["notes"]))
+        if release.get("sections"):
+            details.append(("Sections", ", ".join(release["sections"])))
+        items.append(
+            ReportItem(
+                "Superior Court Judge Release Required",
+                "Required" if status.get("available", False) else "Not Required",
+                tuple(details),
+            )
+        )
+
+    return items
+
+
+# Sentencing options, in report order
+SENTENCING_OPTIONS = (
+    ("Conditional Sentence", "cso_available"),
+    ("Intermittent Sentence", "intermittent_available"),
+    ("Suspended Sentence", "suspended_sentence_available"),
+    ("Discharge", "discharge_available"),
+    ("Prison and Probation", "prison_and_probation_available"),
+    ("Fine Alone", "fine_alone"),
+    ("Fine and Probation", "fine_and_probation"),
+)
+
+
+def _sentencing_items(sentencing: Mapping) -> List[ReportItem]:
+    items = []
+    for option, key in SENTENCING_OPTIONS:
+        result = sentencing.get(key)
+        if not result:
+            continue
+        if isinstance(result, tuple):
+            status = result[0] if result else {}
+            notes = status.get("notes") if isinstance(status, dict) else None
+        elif isinstance(result, dict):
+            status = result.get("status", {})
+            notes = result.get("notes")
+        else:
+            continue
+        if isinstance(status, dict):
+            details = (("Reason", notes),) if notes else ()
+            items.append(ReportItem(option, _available(status.get("available", False)), details))
+    return items
+
+
+def _ancillary_order_items(ancillary_orders: Mapping) -> List[ReportItem]:
+    items = []
+
+    dna = ancillary_orders.get("dna_designation", {})
+    if dna:
+        status = _first(dna.get("status", {}))
+        details = (("Reason", dna["notes"]),) if dna.get("notes") else ()
+        items.append(ReportItem("DNA Order", _available(status.get("available", False)), details))
+
+    soira_list = ancillary_orders.get("soira", [])
+    if soira_list and isinstance(soira_list, list) and isinstance(soira_list[0], dict):
+        soira = soira_list[0]
+        status = soira.get("status", {})
+        available = status.get("available", False) if isinstance(status, dict) else False
+        details = []
+        if available:
+            duration = soira.get("duration", {})
+            if duration and duration.get("amount"):
+                if duration.get("amount") == "life":
+                    details.append(("Duration", "Life"))
+                else:
+                    details.append(("Duration", f"{duration.get('amount')} {duration.get('unit', '')}"))
+            if soira.get("sections"):
+                details.append(("Sections", ", ".join(soira["sections"])))
+            if soira.get("notes"):
+                details.append(("Reason", soira["notes"]))
+        items.append(ReportItem("SOIRA Registration", _available(available), tuple(details)))
+
+    proceeds = ancillary_orders.get("proceeds_of_crime_forfeiture", {})
+    if proceeds and isinstance(proceeds, dict):
+        details = (("Reason", proceeds["notes"]),) if proceeds.get("notes") else ()
+        items.append(
+            ReportItem(
+                "Proceeds of Crime Forfeiture", _available(proceeds.get("available", False)), details
+            )
+        )
+
+    forfeiture_list = ancillary_orders.get("section_164.2_forfeiture_order", [])
+    if forfeiture_list and isinstance(forfeiture_list, list) and isinstance(forfeiture_list[0], dict):
+        forfeiture = forfeiture_list[0]
+        details = (("Reason", forfeiture["notes"]),) if forfeiture.get("notes") else ()
+        items.append(ReportItem("Section 164.2 Forfeiture Order", "Available", details))
+
+    return items
+
+
+def _collateral_consequence_items(collateral_consequences: Mapping) -> List[ReportItem]:
+    items = []
+    inadmissibility = collateral_consequences.get("inadmissibility", [])
+    if not (inadmissibility and isinstance(inadmissibility, list)):
+        return items
+
+    for result in inadmissibility:
+        if not isinstance(result, dict):
+            continue
+        details = []
+        if isinstance(result.get("status"), dict):
+            value = "Applicable" if result["status"].get("available", False) else "Not Applicable"
+            if result["status"].get("notes"):
+                details.append(("Status Reason", result["status"]["notes"]))
+        else:
+            value = str(result.get("status", "Unknown"))
+
+        section = result.get("section", [])
+        if isinstance(section, list):
+            section = ", ".join(section)
+        if section:
+            details.append(("Section", section))
+        if result.get("notes"):
+            details.append(("Reason", result["notes"]))
+        items.append(ReportItem("Immigration Status", value, tuple(details)))
+    return items
+
+
+def build_report(offence: Mapping) -> OffenceReport:
+    """
+    Collect the contents of the report for one parsed offence.
+
+    Args:
+        offence (Mapping): A parse_offence result
+
+    Returns:
+        OffenceReport: The report's title and sections, independent of the
+            output format
+    """
+    offence_data = offence["offence_data"]
+    section = offence_data["section"]
+    code = statute_code(section) or ""
+    section_number = section[len(code):].lstrip("_")
+    statute_name = STATUTE_CODES.get(code, {}).get("name", code.upper())
+    mode = offence_data["mode"]
+
+    sentencing_ranges = []
+    if mode in ("summary", "hybrid"):
+        sentencing_ranges.append(ReportItem("Summary Proceedings", None, (
+            ("Minimum", format_quantum(offence_data["summary_minimum"])),
+            ("Maximum", format_quantum(offence_data["summary_maximum"])),
+        )))
+    if mode in ("indictable", "hybrid"):
+        sentencing_ranges.append(ReportItem("Indictable Proceedings", None, (
+            ("Minimum", format_quantum(offence_data["indictable_minimum"])),
+            ("Maximum", format_quantum(offence_data["indictable_maximum"])),
+        )))
+
+    sections = [
+        ReportSection("BASIC INFORMATION", (ReportItem("Mode of Proceeding", mode.title()),)),
+        ReportSection("SENTENCING RANGES", tuple(sentencing_ranges)),
+    ]
+    for group, title, items in (
+        ("procedure", "PROCEDURAL INFORMATION", _procedure_items),
+        ("sentencing", "SENTENCING OPTIONS", _sentencing_items),
+        ("ancillary_orders", "ANCILLARY ORDERS", _ancillary_order_items),
+        ("collateral_consequences", "COLLATERAL CONSEQUENCES", _collateral_consequence_items),
+    ):
+        if group in offence:
+            sections.append(ReportSection(title, tuple(items(offence[group]))))
+
+    return OffenceReport(
+        section,
+        f"{statute_name} s. {section_number} — {offence_data['description'].title()}",
+        tuple(sections),
+    )
+
+
+class ReportTemplate(NamedTuple):
+    """
+    The layout of one output format. Each field is a compiled template
+    (str.format) for one part of the report.
+    """
+
+    document_start: str
+    document_end: str
+    offence_start: Callable[..., str]
+    offence_end: Callable[..., str]
+    first_section: Callable[..., str]
+    section: Callable[..., str]
+    item: Callable[..., str]
+    heading: Callable[..., str]
+    detail: Callable[..., str]
+    escape: Callable[[str], str]
+
+
+def _template(
+    offence_start: str,
+    offence_end: str,
+    section: str,
+    item: str,
+    heading: str,
+    detail: str,
+    first_section: Optional[str] = None,
+    document_start: str = "",
+    document_end: str = "",
+    escape: Callable[[str], str] = str,
+) -> ReportTemplate:
+    return ReportTemplate(
+        document_start,
+        document_end,
+        offence_start.format,
+        offence_end.format,
+        (section if first_section is None else first_section).format,
+        section.format,
+        item.format,
+        heading.format,
+        detail.format,
+        escape,
+    )
+
+
+_RULE = "=" * 80
+_SECTION_RULE = "-" * 50
+
+TEMPLATES: Dict[str, ReportTemplate] = {
+    "text": _template(
+        offence_start=f"\n{_RULE}\n{{title}}\n{_RULE}\n\n",
+        offence_end=f"\n{_RULE}\n\n",
+        first_section=f"{{title}}\n{_SECTION_RULE}\n",
+        section=f"\n{{title}}\n{_SECTION_RULE}\n",
+        item="{label}: {value}\n",
+        heading="\n{label}:\n",
+        detail="  {label}: {value}\n",
+    ),
+    "markdown": _template(
+        offence_start="## {title}\n",
+        offence_end="\n",
+        section="\n### {title}\n\n",
+        item="- **{label}:** {value}\n",
+        heading="- **{label}**\n",
+        detail="  - {label}: {value}\n",
+    ),
+    "html": _template(
+        document_start=(
+            '<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+            "<title>Offence Report</title>\n</head>\n<body>\n"
+        ),
+        document_end="</body>\n</html>\n",
+        offence_start='<article id="{section}">\n<h2>{title}</h2>\n',
+        offence_end="</article>\n",
+        section="<h3>{title}</h3>\n",
+        item="<p><strong>{label}:</strong> {value}</p>\n",
+        heading="<p><strong>{label}</strong></p>\n",
+        detail="<p class=\"detail\">{label}: {value}</p>\n",
+        escape=html.escape,
+    ),
+}
+
+REPORT_FORMATS = tuple(TEMPLATES) + ("jsonl",)
+
+
+def render_report(report: OffenceReport, template: ReportTemplate) -> str:
+    """Render one offence's report with a format's templates."""
+    escape = template.escape
+    parts = [template.offence_start(section=escape(report.section), title=escape(report.title))]
+
+    for position, section in enumerate(report.sections):
+        section_template = template.first_section if position == 0 else template.section
+        parts.append(section_template(title=escape(section.title)))
+        for item in section.items:
+            if item.value is None:
+                parts.append(template.heading(label=escape(item.label)))
+            else:
+                parts.append(template.item(label=escape(item.label), value=escape(item.value)))
+            for label, value in item.details:
+                parts.append(template.detail(label=escape(label), value=escape(str(value))))
+
+    parts.append(template.offence_end())
+    return "".join(parts)
+
+
+def _json_line(offence: Mapping) -> str:
+    if hasattr(offence, "to_dict"):
+        offence = offence.to_dict()
+    return json.dumps(offence, ensure_ascii=False) + "\n"
+
+
+def render_reports(offences: Iterable[Mapping], sink: TextIO, format: str = "text") -> int:
+    """
+    Render the reports for many parsed offences to a file-like sink, one
+    offence at a time.
+
+    Args:
+        offences (Iterable[Mapping]): parse_offence results. A generator is
+            consumed lazily
+        sink (TextIO): Anything with a write(str) method
+        format (str): One of REPORT_FORMATS
+
+    Returns:
+        int: The number of offences rendered
+
+    Raises:
+        ValueError: If the format is not supported
+    """
+    if format == "jsonl":
+        count = 0
+        for offence in offences:
+            sink.write(_json_line(offence))
+            count += 1
+        return count
+
+    try:
+        template = TEMPLATES[format]
+    except KeyError:
+        raise ValueError(f"Invalid format: {format}. Must be one of {list(REPORT_FORMATS)}") from None
+
+    sink.write(template.document_start)
+    count = 0
+    for offence in offences:
+        sink.write(render_report(build_report(offence), template))
+        count += 1
+    sink.write(template.document_end)
+    return count
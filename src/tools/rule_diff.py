@@ -0,0 +1,263 @@
+"""
+Compare the outcomes of two rule versions across every offence.
+
+When a rule version is added or amended, this shows which offences change
+outcome. Every row of every statute CSV is evaluated under both versions,
+and each rule output that differs is reported:
+
+    python -m tools.rule_diff 2024-09-01 current --jobs 4 --output diff.json
+
+Rule modules of different versions return their outputs in different shapes
+(e.g. a status string instead of a status dictionary), so both outputs are
+first flattened to the same fields as the grid export: whether the option is
+available, the status notes, the sections cited and the explanation. Only
+the fields that differ are reported, and by default only the availability
+and the status notes are compared; the cited sections and explanations vary
+in wording between versions without changing the outcome.
+
+The rows are split into chunks that are evaluated in parallel by a process
+pool. Each worker imports the rule modules once and reuses their decision
+tables for every row in its chunks.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .export import (
+    OUTPUT_FIELDS,
+)
+
+from .main import (
+    STATUTE_DIRS,
+    parse_rows,
+)
+
+from .registry import (
+    StatuteRegistry,
+)
+
+from .rule_versions import (
+    rule_versions,
+)
+
+from .utils import (
+    flatten_output,
+)
+
+# The groups of rule outputs that are compared, in report order
+DIFF_GROUPS = ("procedure", "sentencing", "ancillary_orders", "collateral_consequences")
+
+# The fields of a flattened output compared by default
+DEFAULT_DIFF_FIELDS = ("available", "status_notes")
+
+# Rows per task submitted to the pool, for each worker
+CHUNKS_PER_JOB = 4
+
+
+def normalize_output(output) -> Dict[str, object]:
+    """
+    Flatten a rule output of any version to the OUTPUT_FIELDS. A rule that
+    returns nothing, or does not apply, is not available.
+    """
+    normalized = dict(zip(OUTPUT_FIELDS, flatten_output(output)))
+    normalized["available"] = bool(normalized["available"])
+    return normalized
+
+
+def diff_outcomes(
+    old: dict,
+    new: dict,
+    fields: Sequence[str] = DEFAULT_DIFF_FIELDS,
+) -> Dict[str, Dict[str, list]]:
+    """
+    Compare two parse results rule by rule.
+
+    Args:
+        old (dict): A parse_row result under the old rules
+        new (dict): A parse_row result under the new rules
+        fields (Sequence[str]): The OUTPUT_FIELDS to compare
+
+    Returns:
+        Dict[str, Dict[str, list]]: Maps "group.rule" to the fields that
+            changed, each with its [old, new] values. A rule missing from one
+            version compares as not available.
+    """
+    changes = {}
+    for group in DIFF_GROUPS:
+        old_group = old.get(group, {})
+        new_group = new.get(group, {})
+        for rule in list(old_group) + [rule for rule in new_group if rule not in old_group]:
+            old_output = normalize_output(old_group.get(rule))
+            new_output = normalize_output(new_group.get(rule))
+            changed = {
+                field: [old_output[field], new_output[field]]
+                for field in fields if old_output[field] != new_output[field]
+            }
+            if changed:
+                changes[f"{group}.{rule}"] = changed
+    return changes
+
+
+def _diff_rows(task: Tuple[str, str, Sequence[str], Sequence[List[str]]]) -> List[dict]:
+    """Evaluate one chunk of rows under both versions. Runs in a worker."""
+    old_name, new_name, fields, rows = task
+    old_version = rule_versions.get(old_name)
+    new_version = rule_versions.get(new_name)
+
+    changed = []
+    for row, old, new in zip(
+        rows,
+        parse_rows(rows, True, True, True, True, old_version),
+        parse_rows(rows, True, True, True, True, new_version),
+    ):
+        changes = diff_outcomes(old, new, fields)
+        if changes:
+            changed.append({"section": row[0], "description": row[1], "changes": changes})
+    return changed
+
+
+def offence_rows(directories: Iterable = STATUTE_DIRS) -> List[List[str]]:
+    """Return every row of the statute CSVs, in file order."""
+    statutes = StatuteRegistry(directories)
+    return [row for code in statutes for row in statutes.statute(code).rows]
+
+
+def diff_rule_versions(
+    old: str,
+    new: str,
+    rows: Optional[Sequence[List[str]]] = None,
+    jobs: Optional[int] = None,
+    fields: Sequence[str] = DEFAULT_DIFF_FIELDS,
+) -> dict:
+    """
+    Evaluate every offence under two rule versions and report the changes.
+
+    Args:
+        old (str): The old version, by name or by a date it is in force on
+        new (str): The new version, by name or by a date it is in force on
+        rows (Optional[Sequence[List[str]]]): The offence rows to compare.
+            Defaults to every row of every statute CSV
+        jobs (Optional[int]): Worker processes. Defaults to the CPU count;
+            1 evaluates in this process
+        fields (Sequence[str]): The OUTPUT_FIELDS to compare
+
+    Returns:
+        dict: The versions and fields compared, the number of rows and of
+            changed rows, the changed rows with their changed fields, and the
+            timing
+
+    Raises:
+        ValueError: If either version cannot be found, or a field is not one
+            of the OUTPUT_FIELDS
+    """
+    started = time.perf_counter()
+
+    unknown = [field for field in fields if field not in OUTPUT_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields: {unknown}. Must be among {list(OUTPUT_FIELDS)}")
+    fields = tuple(fields)
+
+    # Resolve both versions up front, so a bad name fails before any work
+    old_name = rule_versions.get(old).name
+    new_name = rule_versions.get(new).name
+
+    if rows is None:
+        rows = offence_rows()
+    rows = list(rows)
+    jobs = jobs or os.cpu_count() or 1
+
+    chunk_size = max(1, -(-len(rows) // (jobs * CHUNKS_PER_JOB)))
+    tasks = [
+        (old_name, new_name, fields, rows[start:start + chunk_size])
+        for start in range(0, len(rows), chunk_size)
+    ]
+
+    if jobs == 1:
+        results = map(_diff_rows, tasks)
+        changed = [entry for result in results for entry in result]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            changed = [entry for result in executor.map(_diff_rows, tasks) for entry in result]
+
+    return {
+        "old": old_name,
+        "new": new_name,
+        "fields": list(fields),
+        "rows": len(rows),
+        "changed_rows": len(changed),
+        "changed": changed,
+        "timing": {
+            "seconds": round(time.perf_counter() - started, 3),
+            "jobs": jobs,
+            "tasks": len(tasks),
+        },
+    }
+
+
+def write_diff(diff: dict, output_file, indent: Optional[int] = None) -> None:
+    """
+    Write a diff as JSON. Without an indent, the summary is written first and
+    each changed row on a line of its own.
+    """
+    if indent is not None:
+        json.dump(diff, output_file, indent=indent, ensure_ascii=False)
+        output_file.write("\n")
+        return
+
+    summary = json.dumps({key: value for key, value in diff.items() if key != "changed"}, ensure_ascii=False)
+    rows = ",\n".join(json.dumps(entry, ensure_ascii=False) for entry in diff["changed"])
+    output_file.write(summary[:-1] + (f', "changed": [\n{rows}\n]}}\n' if rows else ', "changed": []}\n'))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Command-line entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compare the outcomes of two rule versions across every offence"
+    )
+    parser.add_argument("old", help="the old rule version, by name or offence date")
+    parser.add_argument("new", help="the new rule version, by name or offence date")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", default=None, help="write the diff to this file instead of stdout")
+    parser.add_argument(
+        "--fields",
+        default=",".join(DEFAULT_DIFF_FIELDS),
+        help=(
+            f"comma-separated fields to compare, among {', '.join(OUTPUT_FIELDS)} "
+            f"(default: {','.join(DEFAULT_DIFF_FIELDS)})"
+        ),
+    )
+    parser.add_argument(
+        "--indent",
+        type=int,
+        default=None,
+        help="indent the JSON output by this many spaces (default: one changed row per line)",
+    )
+    args = parser.parse_args(argv)
+
+    fields = [field.strip() for field in args.fields.split(",") if field.strip()]
+    try:
+        diff = diff_rule_versions(args.old, args.new, jobs=args.jobs, fields=fields)
+    except ValueError as e:
+        parser.exit(2, f"{parser.prog}: error: {e}\n")
+
+    output_file = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        write_diff(diff, output_file, args.indent)
+    finally:
+        if args.output:
+            output_file.close()
+
+    print(
+        f"{diff['changed_rows']} of {diff['rows']} rows changed between "
+        f"{diff['old']} and {diff['new']} in {diff['timing']['seconds']}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
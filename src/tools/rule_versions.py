@@ -0,0 +1,233 @@
+"""
+Rule versions and the dates they are in force.
+
+The rules change as the Criminal Code is amended, so an offence has to be
+assessed against the rules in force on the date it was committed. Each rule
+version is a rule module (cc_rules_current.py, or a dated copy in rules/)
+together with the range of offence dates it applies to. The registry below
+picks the version for a date; modules are imported on first use, and every
+later lookup reuses them and their compiled decision tables.
+
+Offence dates are written as in the sentencing data: a single date
+("2021-10-27"), or a range when the exact date is not known
+("2015-01-01&2018-07-03").
+
+The rules are only modelled from the first version's start date. An offence
+committed earlier is rejected with UnsupportedOffenceDate rather than assessed
+against rules that were not in force at the time.
+"""
+
+import bisect
+import importlib
+from datetime import date, datetime
+from functools import cached_property, lru_cache
+from types import ModuleType
+from typing import Optional, Sequence, Tuple, Union
+
+# Type definitions
+OffenceDate = Union[date, datetime, str]
+
+
+class RuleVersion:
+    """
+    A rule module and the offence dates it applies to.
+
+    Args:
+        name (str): The name of the version
+        rules (str): The rule module, relative to the tools package
+        start (Optional[date]): The first offence date the version applies to,
+            or None if it has no start
+        end (Optional[date]): The last offence date the version applies to,
+            inclusive, or None if it is still in force
+        collateral_consequences (Optional[str]): The module providing
+            check_inadmissibility, if the rule module does not
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rules: str,
+        start: Optional[date],
+        end: Optional[date] = None,
+        collateral_consequences: Optional[str] = None,
+    ):
+        self.name = name
+        self.start = start
+        self.end = end
+        self._rules_module = rules
+        self._collateral_consequences_module = collateral_consequences or rules
+
+    def __repr__(self) -> str:
+        return f"RuleVersion({self.name!r}, {self.start} to {self.end or 'present'})"
+
+    def covers(self, day: date) -> bool:
+        """Check whether the version applies to an offence committed on day."""
+        return (self.start is None or self.start <= day) and (
+            self.end is None or day <= self.end
+        )
+
+    @cached_property
+    def rules(self) -> ModuleType:
+        """The rule module, imported on first use."""
+        return importlib.import_module(f".{self._rules_module}", __package__)
+
+    @cached_property
+    def collateral_consequences(self) -> ModuleType:
+        """The collateral consequences module, imported on first use."""
+        return importlib.import_module(
+            f".{self._collateral_consequences_module}", __package__
+        )
+
+
+# Rule versions, oldest first. The ranges must not overlap.
+RULE_VERSIONS: Tuple[RuleVersion, ...] = (
+    RuleVersion(
+        "2024-09-01",
+        "rules.cc_rules_2024_09_01-2024_09_17",
+        date(2024, 9, 1),
+        date(2024, 9, 17),
+    ),
+    RuleVersion(
+        "current",
+        "cc_rules_current",
+        date(2024, 9, 18),
+        collateral_consequences="ca_collateral_consequences",
+    ),
+)
+
+CURRENT_RULE_VERSION = RULE_VERSIONS[-1]
+
+
+class UnsupportedOffenceDate(ValueError):
+    """The offence date is before the earliest rule version."""
+
+
+def parse_offence_date(offence_date: OffenceDate) -> Tuple[date, date]:
+    """
+    Parse an offence date into the first and last days it may refer to.
+
+    Args:
+        offence_date (OffenceDate): A date, or a string in the format used by
+            the sentencing data: "YYYY-MM-DD" or "YYYY-MM-DD&YYYY-MM-DD"
+
+    Returns:
+        Tuple[date, date]: The first and last day of the offence date
+
+    Raises:
+        ValueError: If the date cannot be parsed, or the range ends before it
+            starts
+    """
+    if isinstance(offence_date, datetime):
+        return offence_date.date(), offence_date.date()
+    if isinstance(offence_date, date):
+        return offence_date, offence_date
+
+    parts = offence_date.strip().split("&")
+    if len(parts) > 2:
+        raise ValueError(f"Invalid offence date: {offence_date}")
+
+    try:
+        days = [datetime.strptime(part.strip(), "%Y-%m-%d").date() for part in parts]
+    except ValueError:
+        raise ValueError(
+            f"Invalid offence date: {offence_date}. Expected YYYY-MM-DD or YYYY-MM-DD&YYYY-MM-DD"
+        ) from None
+
+    if days[-1] < days[0]:
+        raise ValueError(f"Offence date range ends before it starts: {offence_date}")
+    return days[0], days[-1]
+
+
+class RuleVersionRegistry:
+    """
+    Selects the rule version in force on an offence date.
+
+    Args:
+        versions (Sequence[RuleVersion]): The rule versions, in any order.
+            Their date ranges must not overlap.
+
+    Raises:
+        ValueError: If two versions apply to the same date
+    """
+
+    def __init__(self, versions: Sequence[RuleVersion] = RULE_VERSIONS):
+        self.versions: Tuple[RuleVersion, ...] = tuple(
+            sorted(versions, key=lambda version: version.start or date.min)
+        )
+        for earlier, later in zip(self.versions, self.versions[1:]):
+            if earlier.end is None or (later.start or date.min) <= earlier.end:
+                raise ValueError(f"Rule versions {earlier.name} and {later.name} overlap")
+
+        self._starts = [version.start or date.min for version in self.versions]
+        self._cached_resolve = lru_cache(maxsize=4096)(self._resolve)
+
+    def __iter__(self):
+        return iter(self.versions)
+
+    def get(self, version: Union[str, OffenceDate]) -> RuleVersion:
+        """
+        Return a rule version by name, or else the version in force on a date.
+
+        Args:
+            version (Union[str, OffenceDate]): A version name (e.g. "current")
+                or an offence date
+
+        Returns:
+            RuleVersion: The matching version
+
+        Raises:
+            UnsupportedOffenceDate: If the date is before the earliest version
+            ValueError: If no version has the name or covers the date
+        """
+        for candidate in self.versions:
+            if candidate.name == version:
+                return candidate
+        try:
+            return self.resolve(version)
+        except ValueError as error:
+            names = ", ".join(candidate.name for candidate in self.versions)
+            raise type(error)(f"{error}. Known rule versions: {names}") from None
+
+    def _resolve(self, day: date) -> RuleVersion:
+        if day < self._starts[0]:
+            raise UnsupportedOffenceDate(
+                f"Offence dates before {self._starts[0].isoformat()} are not supported: "
+                f"no rule version is in force on {day.isoformat()}"
+            )
+        position = bisect.bisect_right(self._starts, day) - 1
+        if position >= 0 and self.versions[position].covers(day):
+            return self.versions[position]
+        raise ValueError(f"No rule version is in force on {day.isoformat()}")
+
+    def resolve(self, offence_date: OffenceDate) -> RuleVersion:
+        """
+        Return the rule version in force on an offence date.
+
+        A date range resolves to the version in force on its first day, the
+        earliest date on which the offence may have been committed.
+
+        Args:
+            offence_date (OffenceDate): A date, or a date string or range
+
+        Returns:
+            RuleVersion: The version in force
+
+        Raises:
+            UnsupportedOffenceDate: If the date is before the earliest version
+            ValueError: If the date is invalid, or no version covers it
+        """
+        start, _ = parse_offence_date(offence_date)
+        return self._cached_resolve(start)
+
+
+rule_versions = RuleVersionRegistry()
+
+
+def rule_version(offence_date: Optional[OffenceDate] = None) -> RuleVersion:
+    """
+    Return the rule version in force on an offence date, or the current
+    version if no date is given.
+    """
+    if offence_date is None:
+        return CURRENT_RULE_VERSION
+    return rule_versions.resolve(offence_date)
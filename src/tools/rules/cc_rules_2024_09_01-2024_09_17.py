@@ -7,31 +7,54 @@ file.
 
 NOTE: There should be no substantive changes between this rule file and the one 
 immediately following it.
+
+As in cc_rules_current.py, the rules that choose one result from an ordered
+list of conditions are decision tables, in this file's older output format.
+Quanta are passed in as parsed by utils.parse_quantum.
 """
 
-from constants import (
-    PRIMARY_DESIGNATED_DNA_OFFENCES,
-    SECONDARY_DESIGNATED_DNA_OFFENCES,
-    EXCLUDED_CSO_OFFENCES,
-    TERRORISM_OFFENCES,
-    CRIMINAL_ORGANIZATION_OFFENCES,
-    SECTION_469_OFFENCES,
-    PRIMARY_SOIRA_OFFENCES_CURRENT,
-    SECONDARY_SOIRA_OFFENCES,
-    SOIRA_OFFENCES_ATTEMPTS,
-    SOIRA_OFFENCES_CONSPIRACY,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CRIMINAL_ORGANIZATION,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CANNABIS,
-    PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_HUMAN_TRAFFICKING,
-    ABSOLUTE_JURISDICITON_OFFENCES_FRAUD,
-    ABSOLUTE_JURISDICITON_OFFENCES_ATTEMPTS_CONSPIRACIES,
-    ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES,
-    ABSOLUTE_JURISDICITON_OFFENCES_FALSE_PRETENCES,
-    ABSOLUTE_JURISDICITON_OFFENCES_PPOBC,
-    ABSOLUTE_JURISDICITON_OFFENCES_THEFT,
-    ABSOLUTE_JURISDICTION_OFFENCES_MISCHIEF,
-    SECTION_161_FORFEITURE_ORDER_OFFENCES,
+from ..decision_table import (
+    MODE_SUMMARY,
+    MODE_INDICTABLE,
+    MODE_HYBRID,
+    TIME_UNITS,
+    DecisionTable,
+    RuleFacts,
+    flag,
+    invert,
+    one_of,
+    status_output,
+)
+
+from ..designations import (
+    DNA_PRIMARY,
+    DNA_SECONDARY,
+    SOIRA_PRIMARY,
+    SOIRA_SECONDARY,
+    SOIRA_ATTEMPT,
+    SOIRA_CONSPIRACY,
+    CSO_EXCLUDED,
+    TERRORISM,
+    CRIMINAL_ORGANIZATION,
+    SECTION_469,
+    ABSOLUTE_JURISDICTION_THEFT,
+    ABSOLUTE_JURISDICTION_FALSE_PRETENCES,
+    ABSOLUTE_JURISDICTION_PPOBC,
+    ABSOLUTE_JURISDICTION_FRAUD,
+    ABSOLUTE_JURISDICTION_MISCHIEF,
+    ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES,
+    ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES,
+    PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION,
+    PROCEEDS_OF_CRIME_CDSA,
+    PROCEEDS_OF_CRIME_CANNABIS,
+    PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING,
+    SECTION_164_FORFEITURE,
+    designation_profile,
+    is_designated,
+)
+
+from ..utils import (
+    parse_quantum,
 )
 
 # Basic metadata
@@ -48,199 +71,132 @@ def check_offence_type(offence):
         return "hybrid"
 
 
-def parse_quantum(quantum):
-    """
-    Parse the quantum of the offence.
-    """
-    parsed_quantum = {}
-
-    if quantum == "":
-        parsed_quantum["amount"] = None
-        parsed_quantum["unit"] = None
-        return parsed_quantum
-
-    # 
-    # Update to reflect the maximum fine amount
-    if quantum == "sc":
-        quantum = "729d"
+# Conditions shared by the tables below. The rules in this file were written
+# against a quantum with a single amount, which was set when the CSV value
+# held either a jail term or a fine.
+def _set(quantum):
+    """The quantum has an amount of any kind."""
+    return quantum.has_jail | quantum.has_fine
 
-    unit_mappings = {"y": "years", "m": "months", "d": "days", "$": "dollars"}
-    unit = unit_mappings.get(quantum[-1], quantum[-1])
 
-    # Assign all but the last character of the quantum string to the value variable
-    value = quantum[:-1]
-    parsed_quantum["amount"] = value
-    parsed_quantum["unit"] = unit
+def _jail_term(quantum):
+    """The quantum has a jail amount in days, months or years."""
+    return quantum.has_jail & one_of(quantum.jail_unit, TIME_UNITS)
 
-    return parsed_quantum
 
+def _prosecutable_by_indictment(facts):
+    return one_of(facts.mode_code, (MODE_INDICTABLE, MODE_HYBRID))
 
-def convert_quantum_to_days(quantum):
-    """
-    Convert the quantum of the offence to days.
-    """
-    try:
-        quantum_int = int(quantum["amount"])
-    except:
-        quantum_int = 0
 
-    if quantum["unit"] == "years":
-        quantum["amount"] = quantum_int * 365
-        quantum["unit"] = "days"
-        return quantum
-    
-    elif quantum["unit"] == "months":
-        quantum["amount"] = quantum_int * 30
-        quantum["unit"] = "days"
-        return quantum
-    elif quantum["unit"] == "days":
-        return quantum
-    else:
-        return None
+# Procedure
+PRELIM_TABLE = DecisionTable(
+    "prelim_available",
+    [
+        (
+            lambda f: one_of(f.indictable_maximum.raw, ("14y", "255y")),
+            (True, None, "cc535", "maximum prison term of 14y or greater"),
+        ),
+    ],
+    default=(False, None, "cc535", "maximum term of less than 14y"),
+    output=status_output,
+)
 
 
-# Procedure
 def check_prelim_available(indictable_maximum):
     """
     Check if the preliminary inquiry is available for a given offence.
     """
 
-    prelim_available = {}
-
-    if indictable_maximum == "14y" or indictable_maximum == "255y":
-        prelim_available["status"] = {
-            "available": True,
-            "notes": None,
-            },
-        prelim_available["section"] = "cc535"
-        prelim_available["notes"] = "maximum prison term of 14y or greater"
-        
-        return prelim_available
-    else:
-        prelim_available["status"] = {
-            "available": False,
-            "notes": None,
-            },
-        prelim_available["section"] = "cc535"
-        prelim_available["notes"] = "maximum term of less than 14y"
-        
-        return prelim_available
+    return PRELIM_TABLE.evaluate(
+        RuleFacts(indictable_maximum=parse_quantum(indictable_maximum))
+    )
 
 
 def reverse_onus():
     pass
 
 
+SECTION_469_TABLE = DecisionTable(
+    "section_469_offence",
+    [
+        (lambda f: flag(f.designations, SECTION_469), (True, None, "cc469", None)),
+    ],
+    default=(False, None, "cc469", None),
+    output=lambda available, notes, section, explanation: available,
+)
+
+
 def check_section_469_offence(section):
     """
     Quick check to determine whether an offence exists in the 469 list. Has 
     implication on which court can adjudicate a show-cause hearing.
     """
 
-    if section in SECTION_469_OFFENCES:
-        return True
-    else:
-        return False
+    return SECTION_469_TABLE.evaluate(RuleFacts(section))
+
+
+def _absolute_jurisdiction_output(absolute_jurisdiction, section, notes):
+    return {
+        "status": {
+            "absolute_jurisdiction": absolute_jurisdiction,
+            "notes": None,
+        },
+        "section": section,
+        "notes": notes,
+    }
 
 
 def check_absolute_jurisdiction_offence(section):
     
     absolute_jurisdiction_list = []
+    designations = designation_profile(section)
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_THEFT:
+    if designations & ABSOLUTE_JURISDICTION_THEFT:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(a)(i)",
-                "notes": "theft (other than cattle theft)",
-            }
+            _absolute_jurisdiction_output(
+                True, "cc553(a)(i)", "theft (other than cattle theft)"
+            )
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_FALSE_PRETENCES:
+    if designations & ABSOLUTE_JURISDICTION_FALSE_PRETENCES:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(a)(ii)",
-                "notes": "false pretences",
-            }
+            _absolute_jurisdiction_output(True, "cc553(a)(ii)", "false pretences")
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_PPOBC:
+    if designations & ABSOLUTE_JURISDICTION_PPOBC:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(a)(iii)",
-                "notes": "possession of property obtained by crime",
-            }
+            _absolute_jurisdiction_output(
+                True, "cc553(a)(iii)", "possession of property obtained by crime"
+            )
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_FRAUD:
+    if designations & ABSOLUTE_JURISDICTION_FRAUD:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(a)(iv)",
-                "notes": "fraud",
-            }
+            _absolute_jurisdiction_output(True, "cc553(a)(iv)", "fraud")
         )
 
-    if section in ABSOLUTE_JURISDICTION_OFFENCES_MISCHIEF:
+    if designations & ABSOLUTE_JURISDICTION_MISCHIEF:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(a)(v)",
-                "notes": "mischief",
-            }
+            _absolute_jurisdiction_output(True, "cc553(a)(v)", "mischief")
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_ATTEMPTS_CONSPIRACIES:
+    if designations & ABSOLUTE_JURISDICTION_ATTEMPTS_CONSPIRACIES:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(b)",
-                "notes": "attempt or conspiracies in relation to cc554(a) or (c)",
-            }
+            _absolute_jurisdiction_output(
+                True,
+                "cc553(b)",
+                "attempt or conspiracies in relation to cc554(a) or (c)",
+            )
         )
 
-    if section in ABSOLUTE_JURISDICITON_OFFENCES_DESIGNATED_OFFENCES:
+    if designations & ABSOLUTE_JURISDICTION_DESIGNATED_OFFENCES:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": True,
-                    "notes": None,
-            },
-                "section": "cc553(c)",
-                "notes": "designated offences",
-            }
+            _absolute_jurisdiction_output(True, "cc553(c)", "designated offences")
         )
 
     if absolute_jurisdiction_list == []:
         absolute_jurisdiction_list.append(
-            {
-                "status": {
-                    "absolute_jurisdiction": False,
-                    "notes": None,
-            },
-                "section": "cc553",
-                "notes": None,
-            }
+            _absolute_jurisdiction_output(False, "cc553", None)
         )
 
     return absolute_jurisdiction_list
@@ -251,6 +207,23 @@ def check_absolute_jurisdiction_offence(section):
 ##                    ##
 ########################
 
+DISCHARGE_TABLE = DecisionTable(
+    "discharge_available",
+    [
+        (
+            lambda f: _set(f.summary_minimum) | _set(f.indictable_minimum),
+            (False, None, "cc730(1)", "mandatory minimum sentence"),
+        ),
+        (
+            lambda f: f.indictable_maximum.jail_amount >= 14,
+            (False, None, "cc730(1)", "maximum term of 14y or greater"),
+        ),
+    ],
+    default=(True, None, "cc730(1)", ""),
+    output=status_output,
+)
+
+
 def check_discharge_available(summary_minimum, indictable_minimum, indictable_maximum):
     """
     Discharges are available when the following conditions obtain:
@@ -258,37 +231,63 @@ def check_discharge_available(summary_minimum, indictable_minimum, indictable_ma
     - The offence is not punishable by 14y or greater
     """
 
-    discharge_available = {}
-
-    if summary_minimum["amount"] or indictable_minimum["amount"]:
-        discharge_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        discharge_available["section"] = "cc730(1)"
-        discharge_available["notes"] = "mandatory minimum sentence"
-
-        return discharge_available
-
-    elif indictable_maximum["amount"] >= 14:
-        discharge_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        discharge_available["section"] = "cc730(1)"
-        discharge_available["notes"] = "maximum term of 14y or greater"
+    return DISCHARGE_TABLE.evaluate(
+        RuleFacts(
+            summary_minimum=summary_minimum,
+            indictable_minimum=indictable_minimum,
+            indictable_maximum=indictable_maximum,
+        )
+    )
 
-        return discharge_available
-    
-    else:
-        discharge_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        discharge_available["section"] = "cc730(1)"
-        discharge_available["notes"] = ""
 
-        return discharge_available
+def _serious(f):
+    """Punishable by 10y or more on indictment."""
+    return f.indictable_maximum.jail_amount >= 10
+
+
+CSO_TABLE = DecisionTable(
+    "cso_available",
+    [
+        (
+            lambda f: _set(f.summary_minimum) & _jail_term(f.summary_minimum),
+            (False, None, "cc742.1(b)", "mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: _set(f.summary_minimum),
+            (True, None, "cc742.1", None),
+        ),
+        (
+            lambda f: _set(f.indictable_minimum) & _jail_term(f.indictable_minimum),
+            (False, None, "cc742.1(b)", "mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: _set(f.indictable_minimum),
+            (True, None, "cc742.1", None),
+        ),
+        (
+            lambda f: flag(f.designations, CSO_EXCLUDED),
+            (False, None, "cc742.1(c)", "enumerated excluded offence"),
+        ),
+        (
+            lambda f: flag(f.designations, TERRORISM) & _serious(f) & (f.mode_code == MODE_INDICTABLE),
+            (False, None, "cc742.1(d)", "serious indictable terrorism offence"),
+        ),
+        (
+            lambda f: flag(f.designations, TERRORISM) & _serious(f) & (f.mode_code == MODE_HYBRID),
+            (True, "summary conviction only", "cc742.1(d)", "serious indictable terrorism offence"),
+        ),
+        (
+            lambda f: flag(f.designations, CRIMINAL_ORGANIZATION) & _serious(f) & (f.mode_code == MODE_INDICTABLE),
+            (False, None, "cc742.1(d)", "serious indictable criminal organization offence"),
+        ),
+        (
+            lambda f: flag(f.designations, CRIMINAL_ORGANIZATION) & _serious(f) & (f.mode_code == MODE_HYBRID),
+            (True, "summary conviction only", "cc742.1(d)", "serious indictable criminal organization offence"),
+        ),
+    ],
+    default=(True, None, "cc742.1", None),
+    output=status_output,
+)
 
 
 def check_cso_availablity(
@@ -306,130 +305,36 @@ def check_cso_availablity(
       - Prosecuted by indictment
     """
 
-    # Convert None values to a comparable integer
-    try:
-        indictable_maximum["amount"] = int(indictable_maximum["amount"])
-    except:
-        indictable_maximum["amount"] = 0
-
-    cso_available = {}
-
-    if summary_minimum["amount"]:
-
-        if summary_minimum["unit"] == "days" or summary_minimum["unit"] == "months" or summary_minimum["unit"] == "years":  
-            cso_available["status"] = {
-                "available": False,
-                "notes": None,
-            },
-            cso_available["section"] = "cc742.1(b)"
-            cso_available["notes"] = "mandatory minimum term of imprisonment"
-
-            return cso_available
-        
-        else:
-            cso_available["status"] = {
-                "available": True,
-                "notes": None,
-            },
-            cso_available["section"] = "cc742.1"
-            cso_available["notes"] = None
-
-            return cso_available
-
-
-    elif indictable_minimum["amount"]:
-
-        if indictable_minimum["unit"] == "days" or indictable_minimum["unit"] == "months" or indictable_minimum["unit"] == "years":
-            cso_available["status"] = {
-                "available": False,
-                "notes": None,
-            },
-            cso_available["section"] = "cc742.1(b)"
-            cso_available["notes"] = "mandatory minimum term of imprisonment"
-
-            return cso_available
-        
-        else:
-            cso_available["status"] = {
-                "available": True,
-                "notes": None,
-            },
-            cso_available["section"] = "cc742.1"
-            cso_available["notes"] = None
-
-    elif section in EXCLUDED_CSO_OFFENCES:
-        cso_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        cso_available["section"] = "cc742.1(c)"
-        cso_available["notes"] = "enumerated excluded offence"
-
-        return cso_available
-
-    elif (
-        section in TERRORISM_OFFENCES
-        and indictable_maximum["amount"] >= 10
-        and mode == "indictable"
-    ):
-        cso_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        cso_available["section"] = "cc742.1(d)"
-        cso_available["notes"] = "serious indictable terrorism offence"
-
-        return cso_available
-
-    elif (
-        section in TERRORISM_OFFENCES and indictable_maximum >= 10 and mode == "hybrid"
-    ):
-        cso_available["status"] = {
-                "available": True,
-                "notes": "summary conviction only",
-        },
-        cso_available["section"] = "cc742.1(d)"
-        cso_available["notes"] = "serious indictable terrorism offence"
-
-        return cso_available
-    
-    elif (
-        section in CRIMINAL_ORGANIZATION_OFFENCES
-        and indictable_maximum["amount"] >= 10
-        and mode == "indictable"
-    ):
-        cso_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        cso_available["section"] = "cc742.1(d)"
-        cso_available["notes"] = "serious indictable criminal organization offence"
-
-        return cso_available
-    
-    elif (
-        section in CRIMINAL_ORGANIZATION_OFFENCES
-        and indictable_maximum["amount"] >= 10
-        and mode == "hybrid"
-    ):
-        cso_available["status"] = {
-            "available": True,
-            "notes": "summary conviction only",
-        },
-        cso_available["section"] = "cc742.1(d)"
-        cso_available["notes"] = "serious indictable criminal organization offence"
+    return CSO_TABLE.evaluate(
+        RuleFacts(
+            section,
+            mode,
+            summary_minimum=summary_minimum,
+            indictable_minimum=indictable_minimum,
+            indictable_maximum=indictable_maximum,
+        )
+    )
 
-        return cso_available
-    
-    else:
-        cso_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        cso_available["section"] = "cc742.1"
-        cso_available["notes"] = None
 
-        return cso_available
+INTERMITTENT_TABLE = DecisionTable(
+    "intermittent_available",
+    [
+        (
+            lambda f: invert(_jail_term(f.summary_minimum)) & invert(_jail_term(f.indictable_minimum)),
+            (True, None, "cc732(1)", "no minimum term of imprisonment"),
+        ),
+        (
+            lambda f: _jail_term(f.summary_minimum) & (f.summary_minimum.jail_days <= 90),
+            (True, None, "cc732(1)", "minimum does not exceed 90 days"),
+        ),
+        (
+            lambda f: _jail_term(f.indictable_minimum) & (f.indictable_minimum.jail_days <= 90),
+            (True, None, "cc732(1)", "minimum does not exceed 90 days"),
+        ),
+    ],
+    default=(False, None, "cc732(1)", "mandatory minimum term of imprisonment exceeds 90 days"),
+    output=status_output,
+)
 
 
 def check_intermittent_available(summary_minimum, indictable_minimum):
@@ -440,49 +345,26 @@ def check_intermittent_available(summary_minimum, indictable_minimum):
     than 90 days.
     """
 
-    intermittent_available = {}
-    summary_minimum = convert_quantum_to_days(summary_minimum)
-    indictable_minimum = convert_quantum_to_days(indictable_minimum)
-
-    if summary_minimum == None and indictable_minimum == None:
-        intermittent_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        intermittent_available["section"] = "cc732(1)"
-        intermittent_available["notes"] = "no minimum term of imprisonment"
-
-        return intermittent_available
-
-    elif summary_minimum["amount"] and int(summary_minimum["amount"]) <= 90:
-        intermittent_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        intermittent_available["section"] = "cc732(1)"
-        intermittent_available["notes"] = "minimum does not exceed 90 days"
-
-        return intermittent_available
-    
-    elif indictable_minimum["amount"] and int(indictable_minimum["amount"]) <= 90:
-        intermittent_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        intermittent_available["section"] = "cc732(1)"
-        intermittent_available["notes"] = "minimum does not exceed 90 days"
+    return INTERMITTENT_TABLE.evaluate(
+        RuleFacts(summary_minimum=summary_minimum, indictable_minimum=indictable_minimum)
+    )
 
-        return intermittent_available
-    
-    else:
-        intermittent_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        intermittent_available["section"] = "cc732(1)"
-        intermittent_available["notes"] = "mandatory minimum term of imprisonment exceeds 90 days"
 
-        return intermittent_available
+SUSPENDED_SENTENCE_TABLE = DecisionTable(
+    "suspended_sentence_available",
+    [
+        (
+            lambda f: _set(f.summary_minimum),
+            (False, None, "cc731(1)", "mandatory minimum sentence"),
+        ),
+        (
+            lambda f: _set(f.indictable_minimum),
+            (False, None, "cc731(1)", "mandatory minimum sentence"),
+        ),
+    ],
+    default=(True, None, "cc731(1)", None),
+    output=status_output,
+)
 
 
 def check_suspended_sentence_available(summary_minimum, indictable_minimum):
@@ -493,38 +375,34 @@ def check_suspended_sentence_available(summary_minimum, indictable_minimum):
     to parse imposed sentences, rather than simply creating an offence grid.
     """
 
-    suspended_sentence_available = {}
-
-    if summary_minimum["amount"]:
-        suspended_sentence_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        suspended_sentence_available["section"] = "cc731(1)"
-        suspended_sentence_available["notes"] = "mandatory minimum sentence"
-
-        return suspended_sentence_available
+    return SUSPENDED_SENTENCE_TABLE.evaluate(
+        RuleFacts(summary_minimum=summary_minimum, indictable_minimum=indictable_minimum)
+    )
     
-    elif indictable_minimum["amount"]:
-        suspended_sentence_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        suspended_sentence_available["section"] = "cc731(1)"
-        suspended_sentence_available["notes"] = "mandatory minimum sentence"
 
-        return suspended_sentence_available
-        
-    else:
-        suspended_sentence_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        suspended_sentence_available["section"] = "cc731(1)"
-        suspended_sentence_available["notes"] = None
+PRISON_AND_PROBATION_TABLE = DecisionTable(
+    "prison_and_probation_available",
+    [
+        (
+            lambda f: invert(_set(f.indictable_minimum)),
+            (True, None, "cc732(1)", "no minimum term of imprisonment"),
+        ),
+        (
+            lambda f: f.mode_code == MODE_SUMMARY,
+            (True, None, "cc732(1)(b)", None),
+        ),
+        (
+            lambda f: _prosecutable_by_indictment(f) & (f.indictable_minimum.jail_days < 730),
+            (True, None, "cc732(1)", None),
+        ),
+        (
+            lambda f: _prosecutable_by_indictment(f),
+            (False, None, "cc732(1)", "mandatory minimum term of imprisonment exceeds two years"),
+        ),
+    ],
+    output=status_output,
+)
 
-        return suspended_sentence_available
-    
 
 def check_prison_and_probation(mode, indictable_minimum):
     """
@@ -535,72 +413,29 @@ def check_prison_and_probation(mode, indictable_minimum):
     imprisonment is less than two years.
     """
 
-    prison_and_probation_available = {}
-
-    # Convert the quantum of the offence to days if it is not already in that
-    # format
-    
-    if indictable_minimum["amount"] == None:
-        prison_and_probation_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        prison_and_probation_available["section"] = "cc732(1)"
-        prison_and_probation_available["notes"] = "no minimum term of imprisonment"
+    return PRISON_AND_PROBATION_TABLE.evaluate(
+        RuleFacts(mode=mode, indictable_minimum=indictable_minimum)
+    )
 
-        return prison_and_probation_available
-    else:
-        indictable_minimum = convert_quantum_to_days(indictable_minimum)
 
-    if mode == "summary":
-        prison_and_probation_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        prison_and_probation_available["section"] = "cc732(1)(b)"
-        prison_and_probation_available["notes"] = None
-
-        return prison_and_probation_available
-
-    elif mode == "hybrid":
-        if indictable_minimum["amount"] < 730:
-            prison_and_probation_available["status"] = {
-                "available": True,
-                "notes": None,
-            },
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = None
-
-            return prison_and_probation_available
-        else:
-            prison_and_probation_available["status"] = {
-                "available": False,
-                "notes": None,
-            },
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = "mandatory minimum term of imprisonment exceeds two years"
-
-            return prison_and_probation_available
-
-    elif mode == "indictable":
-        if indictable_minimum["amount"] < 730:
-            prison_and_probation_available["status"] = {
-                "available": True,
-                "notes": None,
-            },
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = None
-
-            return prison_and_probation_available
-        else:
-            prison_and_probation_available["status"] = {
-                "available": False,
-                "notes": None,
-            },
-            prison_and_probation_available["section"] = "cc732(1)"
-            prison_and_probation_available["notes"] = "mandatory minimum term of imprisonment exceeds two years"
-
-            return prison_and_probation_available
+FINE_ALONE_TABLE = DecisionTable(
+    "fine_alone",
+    [
+        (
+            lambda f: invert(_set(f.summary_minimum)) | invert(_set(f.indictable_minimum)),
+            (True, None, "cc734(1)", "no mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: _set(f.summary_minimum),
+            (False, None, "cc734(1)", "mandatory minimum term of imprisonment"),
+        ),
+        (
+            lambda f: _set(f.indictable_minimum),
+            (False, None, "cc734(1)", "mandatory minimum term of imprisonment"),
+        ),
+    ],
+    output=status_output,
+)
 
 
 def check_fine_alone(summary_minimum, indictable_minimum):
@@ -609,82 +444,39 @@ def check_fine_alone(summary_minimum, indictable_minimum):
     so, a fine alone is not available. Otherwise, it is.
     """
 
-    fine_alone_available = {}
-
-    if summary_minimum["amount"] == None or indictable_minimum["amount"] == None:
-        fine_alone_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        fine_alone_available["section"] = "cc734(1)"
-        fine_alone_available["notes"] = "no mandatory minimum term of imprisonment"
-
-        return fine_alone_available
+    return FINE_ALONE_TABLE.evaluate(
+        RuleFacts(summary_minimum=summary_minimum, indictable_minimum=indictable_minimum)
+    )
 
-    if summary_minimum["amount"]:
-        fine_alone_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        fine_alone_available["section"] = "cc734(1)"
-        fine_alone_available["notes"] = "mandatory minimum term of imprisonment"
 
-        return fine_alone_available
-    
-    elif indictable_minimum["amount"]:
-        fine_alone_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        fine_alone_available["section"] = "cc734(1)"
-        fine_alone_available["notes"] = "mandatory minimum term of imprisonment"
-
-        return fine_alone_available
+FINE_AND_PROBATION_TABLE = DecisionTable(
+    "fine_and_probation",
+    [
+        (
+            lambda f: invert(_set(f.indictable_minimum)),
+            (True, None, "cc732(1)", "no minimum term of imprisonment"),
+        ),
+        (
+            lambda f: f.indictable_minimum.jail_days < 730,
+            (True, None, "cc732(1)", None),
+        ),
+    ],
+    default=(False, None, "cc732(1)", "mandatory minimum term of imprisonment exceeds two years"),
+    output=status_output,
+)
 
 
 def check_fine_and_probation(indictable_minimum):
     """
     The same rules apply to this check as to the check for prison and 
-    probation. If the offence has a mandatory minimum term of imprisonment that
+    probation. If the offence has a mandatory minimum term of imprisonment that 
     exceeds two years, probation is not available. Otherwise, it is.
 
     The function only checks for indictable offences, as summary maximums are
     all below two years.
     """
 
-    fine_and_probation_available = {}
-
-    if indictable_minimum["amount"] == None:
-        fine_and_probation_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        fine_and_probation_available["section"] = "cc732(1)"
-        fine_and_probation_available["notes"] = "no minimum term of imprisonment"
-
-        return fine_and_probation_available
-    
-    else:
-        indictable_minimum = convert_quantum_to_days(indictable_minimum)
-
-    if indictable_minimum["amount"] < 730:
-        fine_and_probation_available["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        fine_and_probation_available["section"] = "cc732(1)"
-        fine_and_probation_available["notes"] = None
-
-        return fine_and_probation_available
-    else:
-        fine_and_probation_available["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        fine_and_probation_available["section"] = "cc732(1)"
-        fine_and_probation_available["notes"] = "mandatory minimum term of imprisonment exceeds two years"
-
-        return fine_and_probation_available
+    return FINE_AND_PROBATION_TABLE.evaluate(RuleFacts(indictable_minimum=indictable_minimum))
 
 
 def check_fine_probation_intermittent(summary_minimum, indictable_minimum):
@@ -724,7 +516,7 @@ def check_inadmissibility(section, mode, indictable_maximum):
     except:
         indictable_maximum = 0
 
-    if section in TERRORISM_OFFENCES:
+    if is_designated(section, TERRORISM):
         inadmissibilty_list.append(
             {
                 "section": "irpa34(1)",
@@ -778,57 +570,37 @@ def check_inadmissibility(section, mode, indictable_maximum):
 
 
 # Ancillary orders
+DNA_DESIGNATION_TABLE = DecisionTable(
+    "dna_designation",
+    [
+        (
+            lambda f: flag(f.designations, DNA_PRIMARY),
+            (True, None, "cc487.04", "primary designated offence"),
+        ),
+        (
+            lambda f: flag(f.designations, DNA_SECONDARY),
+            (True, None, "cc487.04", "secondary designated offence"),
+        ),
+        (
+            lambda f: _prosecutable_by_indictment(f)
+            & (f.indictable_maximum.jail_unit == "years")
+            & (f.indictable_maximum.jail_amount >= 5),
+            (True, None, "cc487.04", "secondary designated offence"),
+        ),
+    ],
+    default=(False, None, "cc487.04", "not a designated offence"),
+    output=status_output,
+)
+
+
 def check_dna_designation(offence, mode, quantum):
     """
     Check if the offence is a designated DNA offence.
     """
 
-    try:
-        quantum_int = int(quantum["amount"])
-    except:
-        quantum_int = 0
-
-    dna_designation = {}
-
-    if offence[0] in PRIMARY_DESIGNATED_DNA_OFFENCES:
-        dna_designation["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        dna_designation["section"] = "cc487.04"
-        dna_designation["notes"] = "primary designated offence"
-
-        return dna_designation
-
-    elif offence[0] in SECONDARY_DESIGNATED_DNA_OFFENCES:
-        dna_designation["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        dna_designation["section"] = "cc487.04"
-        dna_designation["notes"] = "secondary designated offence"
-
-        return dna_designation
-    elif (
-        (mode == "indictable" or mode == "hybrid")
-        and quantum["unit"] == "years"
-        and quantum_int >= 5
-    ):
-        dna_designation["status"] = {
-            "available": True,
-            "notes": None,
-        },
-        dna_designation["section"] = "cc487.04"
-        dna_designation["notes"] = "secondary designated offence"
-    else:
-        dna_designation["status"] = {
-            "available": False,
-            "notes": None,
-        },
-        dna_designation["section"] = "cc487.04"
-        dna_designation["notes"] = "not a designated offence"
-
-        return dna_designation
+    return DNA_DESIGNATION_TABLE.evaluate(
+        RuleFacts(offence[0], mode, indictable_maximum=quantum)
+    )
     
 
 def check_soira(section, mode, indictable_maximum):
@@ -846,9 +618,10 @@ def check_soira(section, mode, indictable_maximum):
     """
 
     soira_list = []
+    designations = designation_profile(section)
     
     # Check to see whether the offence is a designated SOIRA offence
-    if section in PRIMARY_SOIRA_OFFENCES_CURRENT:
+    if designations & SOIRA_PRIMARY:
         soira_list.append(
             {
                 "section": [
@@ -859,7 +632,7 @@ def check_soira(section, mode, indictable_maximum):
             }
         )
 
-    elif section in SECONDARY_SOIRA_OFFENCES:
+    elif designations & SOIRA_SECONDARY:
         soira_list.append(
             {
                 "section": [
@@ -869,7 +642,7 @@ def check_soira(section, mode, indictable_maximum):
                 "notes": "secondary designated offence",
             }
         )
-    elif section in SOIRA_OFFENCES_ATTEMPTS:
+    elif designations & SOIRA_ATTEMPT:
         soira_list.append(
             {
                 "section": [
@@ -880,7 +653,7 @@ def check_soira(section, mode, indictable_maximum):
                 "notes": "attempted designated offence",
             }
         )
-    elif section in SOIRA_OFFENCES_CONSPIRACY:
+    elif designations & SOIRA_CONSPIRACY:
         soira_list.append(
             {
                 "section": [
@@ -896,6 +669,8 @@ def check_soira(section, mode, indictable_maximum):
     
     # Determine the duration of the SOIRA order
     # cc490.011(2)
+    maximum = RuleFacts._quantum(indictable_maximum).jail_amount
+
     if mode == "summary":
         soira_list[0]["section"].append("cc490.011(2)(a)")
         soira_list[0]["duration"] = {
@@ -903,21 +678,21 @@ def check_soira(section, mode, indictable_maximum):
             "unit": "years",
         }
 
-    elif int(indictable_maximum["amount"] == 2 or int(indictable_maximum["amount"]) == 5):
+    elif maximum == 2 or maximum == 5:
         soira_list[0]["section"].append("cc490.011(2)(a)")
         soira_list[0]["duration"] = {
             "amount": 10,
             "unit": "years",
         }
 
-    elif int(indictable_maximum["amount"]) == 10 or int(indictable_maximum["amount"]) == 14:
+    elif maximum == 10 or maximum == 14:
         soira_list[0]["section"].append("cc490.011(2)(b)")
         soira_list[0]["duration"] = {
             "amount": 20,
             "unit": "years",
         }
 
-    elif int(indictable_maximum["amount"]) == 255:
+    elif maximum == 255:
         soira_list[0]["section"].append("cc490.011(2)(c)")
         soira_list[0]["duration"] = {
             "amount": 255,
@@ -930,80 +705,87 @@ def check_soira(section, mode, indictable_maximum):
     return soira_list
 
 
-def check_proceeds_of_crime_forfeiture(section, mode):
+def _proceeds_output(available, notes, sections, explanation):
+    return [
+        {
+            "section": sections,
+            "status": "available" if available else "unavailable",
+            "notes": explanation,
+        }
+    ]
+
+
+PROCEEDS_OF_CRIME_TABLE = DecisionTable(
+    "proceeds_of_crime_forfeiture",
+    [
+        (
+            lambda f: f.mode_code == MODE_SUMMARY,
+            (
+                False,
+                None,
+                ["cc462.3[designated offence]", "cc462.37(1)"],
+                "strictly summary conviction offence",
+            ),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_CRIMINAL_ORGANIZATION),
+            (
+                True,
+                None,
+                ["cc462.37(2.02)(a)"],
+                "particular circumstances — criminal organization offence",
+            ),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_CDSA),
+            (True, None, ["cc462.37(2.02)(b)"], "particular circumstances — CDSA offence"),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_CANNABIS),
+            (True, None, ["cc462.37(2.02)(c)"], "particular circumstances — cannabis offence"),
+        ),
+        (
+            lambda f: flag(f.designations, PROCEEDS_OF_CRIME_HUMAN_TRAFFICKING),
+            (
+                True,
+                None,
+                ["cc462.37(2.02)(d)"],
+                "particular circumstances — human trafficking offence",
+            ),
+        ),
+    ],
+    default=(
+        True,
+        None,
+        ["cc462.3[designated offence]", "cc462.37(1)"],
+        "offence prosecutable by indictment",
+    ),
+    output=_proceeds_output,
+)
 
-    proceeds_list = []
 
-    if mode == "summary":
-        proceeds_list.append(
-            {
-                "section": [
-                    "cc462.3[designated offence]",
-                    "cc462.37(1)",
-                    ],
-                "status": "unavailable",
-                "notes": "strictly summary conviction offence",
-            }
-        )
-
-        return proceeds_list
-    
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CRIMINAL_ORGANIZATION:
-        proceeds_list.append(
-            {
-                "section": [
-                    "cc462.37(2.02)(a)"
-                    ],
-                "status": "available",
-                "notes": "particular circumstances — criminal organization offence",
-            }
-        )
+def check_proceeds_of_crime_forfeiture(section, mode):
 
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CDSA:
-        proceeds_list.append(
-            {
-                "section": [
-                    "cc462.37(2.02)(b)"
-                    ],
-                "status": "available",
-                "notes": "particular circumstances — CDSA offence",
-            }
-        )
+    return PROCEEDS_OF_CRIME_TABLE.evaluate(RuleFacts(section, mode))
 
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_CANNABIS:
-        proceeds_list.append(
-            {
-                "section": [
-                    "cc462.37(2.02)(c)"
-                    ],
-                "status": "available",
-                "notes": "particular circumstances — cannabis offence",
-            }
-        )
 
-    elif section in PROCEEDS_OF_CRIME_PARTICULAR_CIRCUMSTANCES_HUMAN_TRAFFICKING:
-        proceeds_list.append(
-            {
-                "section": [
-                    "cc462.37(2.02)(d)"
-                    ],
-                "status": "available",
-                "notes": "particular circumstances — human trafficking offence",
-            }
-        )
+def _section_164_output(available, notes, section, explanation):
+    if not available:
+        return []
+    return [{"section": section, "notes": explanation}]
 
-    else:
-        proceeds_list.append(
-            {
-                "section": [
-                    "cc462.3[designated offence]",
-                    "cc462.37(1)",],
-                "status": "available",
-                "notes": "offence prosecutable by indictment",
-            }   
-        )
 
-    return proceeds_list
+SECTION_164_FORFEITURE_TABLE = DecisionTable(
+    "section_164.2_forfeiture_order",
+    [
+        (
+            lambda f: flag(f.designations, SECTION_164_FORFEITURE),
+            (True, None, "cc164.2", "enumerated offence"),
+        ),
+    ],
+    default=(False, None, "cc164.2", None),
+    output=_section_164_output,
+)
 
 
 def check_section_164_forfeiture_order(section):
@@ -1012,18 +794,21 @@ def check_section_164_forfeiture_order(section):
     cc164.2 forfeiture order is required.
     """
 
-    section_164_forfeiture_list = []
-
-    if section in SECTION_161_FORFEITURE_ORDER_OFFENCES:
-        section_164_forfeiture_list.append(
-            {
-                "section": "cc164.2",
-                "notes": "enumerated offence",
-            }
-        )
-    
-    return section_164_forfeiture_list
+    return SECTION_164_FORFEITURE_TABLE.evaluate(RuleFacts(section))
 
 
 def check_section_515_mandatory_weapons_prohibition(section):
     pass
+
+
+# Tables evaluated for each offence, keyed by the name of their output, in the
+# same order as in cc_rules_current.py
+SENTENCING_TABLES = {
+    "cso_available": CSO_TABLE,
+    "intermittent_available": INTERMITTENT_TABLE,
+    "suspended_sentence_available": SUSPENDED_SENTENCE_TABLE,
+    "discharge_available": DISCHARGE_TABLE,
+    "prison_and_probation_available": PRISON_AND_PROBATION_TABLE,
+    "fine_alone": FINE_ALONE_TABLE,
+    "fine_and_probation": FINE_AND_PROBATION_TABLE,
+}
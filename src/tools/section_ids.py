@@ -0,0 +1,246 @@
+"""
+Canonical section spellings and integer section IDs.
+
+The same section is spelled several ways across the data: the CSVs write
+graduated variants with "#" ("cc_239(1)(a)#1") and the disambiguation maps
+with "-" ("cc_99(2)-1"); the CDSA, Cannabis Act and YCJA CSVs leave out the
+underscore after the statute code ("cdsa4(3)") while the reported sentences
+put it in ("cdsa_5(2)"); and the sections cited by the rules leave it out for
+the Criminal Code too ("cc742.1"). canonical_section maps every spelling of a
+section to the one its statute's CSV uses:
+
+    canonical_section("cc_99(2)-1")    # "cc_99(2)#1"
+    canonical_section("cc742.1")       # "cc_742.1"
+    canonical_section("cdsa_5(2)")     # "cdsa5(2)"
+
+A SectionIds table interns canonical sections as dense integer IDs, from 0,
+so that arrays and bitmaps over sections can be indexed by ID. The
+StatuteRegistry assigns every section of its CSVs an ID, in statute and CSV
+order, so the IDs are the same in every process that reads the same CSVs.
+
+The reported sentences also hold keys that are not sections at all: a
+section without its statute ("145(5)"), a youth sentence for an adult
+offence ("cc_266_ycja"), or a stray bracket ("cc_320.15(1)#1)").
+SectionIds.normalize cleans up such keys in bulk, normalizing each distinct
+spelling once however often it repeats.
+
+Lookups take user input, so the spellings a table remembers are bounded:
+the most recently used are kept, and keys that are not sections in the
+table are not remembered at all.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .section_trie import (
+    section_components,
+)
+
+# A key without a statute code is a Criminal Code section
+DEFAULT_STATUTE = "cc"
+
+# The suffix the reported sentences add to an offence sentenced under the YCJA
+YOUTH_SUFFIX = "_ycja"
+
+# Statutes whose CSVs write sections without an underscore after the code
+UNSEPARATED_STATUTES = ("cdsa", "cannabis", "ycja")
+
+# The ID of a key that is not a section, or not in the table
+NO_ID = -1
+
+# How many spellings, and how many free-form keys, a table remembers. The
+# statute CSVs have about 600 sections
+SPELLING_CACHE_SIZE = 8192
+
+
+def _remember(cache: OrderedDict, key: str, value) -> None:
+    cache[key] = value
+    if len(cache) > SPELLING_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def canonical_section(section: str) -> Optional[str]:
+    """
+    Return the canonical spelling of a section.
+
+    Args:
+        section (str): A section in any spelling, e.g. "cc_99(2)-1",
+            "cc742.1" or "cdsa_5(2)"
+
+    Returns:
+        Optional[str]: The section as its statute's CSV writes it, or None if
+            section is not in section syntax
+    """
+    parsed = section_components(section)
+    if parsed is None:
+        return None
+    components = parsed[0]
+    separator = "" if components[0] in UNSEPARATED_STATUTES else "_"
+    return components[0] + separator + "".join(components[1:])
+
+
+def normalize_key(key: str) -> Optional[Tuple[str, bool]]:
+    """
+    Normalize a free-form offence key, as found in the reported sentences.
+
+    Args:
+        key (str): The key, e.g. "cc_266_ycja", "145(5)" or "cdsa_5(2)"
+
+    Returns:
+        Optional[Tuple[str, bool]]: The canonical section, and whether the key
+            marks a youth sentence, or None if the key is not a section
+    """
+    key = key.strip().lower()
+    youth = key.endswith(YOUTH_SUFFIX)
+    if youth:
+        key = key[:-len(YOUTH_SUFFIX)]
+    while key.endswith(")") and key.count(")") > key.count("("):
+        key = key[:-1]
+    if key[:1].isdigit():
+        key = DEFAULT_STATUTE + "_" + key
+
+    section = canonical_section(key)
+    return None if section is None else (section, youth)
+
+
+class NormalizedSections(NamedTuple):
+    """
+    The result of normalizing a batch of keys.
+
+    Attributes:
+        sections (List[Optional[str]]): The canonical section of each key, or
+            None if it is not a section
+        ids (np.ndarray): The section ID of each key, or NO_ID if it is not a
+            section or not in the table
+        youth (np.ndarray): Whether each key marks a youth sentence
+    """
+
+    sections: List[Optional[str]]
+    ids: np.ndarray
+    youth: np.ndarray
+
+
+class SectionIds:
+    """
+    An interning table of canonical sections and their integer IDs.
+
+    Args:
+        sections (Iterable[str]): Sections to intern, in ID order
+
+    Raises:
+        ValueError: If a section is not in section syntax
+    """
+
+    def __init__(self, sections: Iterable[str] = ()):
+        self._ids: Dict[str, int] = {}
+        self._sections: List[str] = []
+        # The spellings of sections in the table, and the normalized
+        # sections of free-form keys, most recently used last, so that a
+        # spelling is not canonicalized again each time it is seen
+        self._spellings: "OrderedDict[str, int]" = OrderedDict()
+        self._keys: "OrderedDict[str, Tuple[str, bool]]" = OrderedDict()
+        for section in sections:
+            self.intern(section)
+
+    def __len__(self) -> int:
+        return len(self._sections)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._sections)
+
+    def __contains__(self, section: str) -> bool:
+        return self.get(section) != NO_ID
+
+    def intern(self, section: str) -> int:
+        """
+        Return the ID of a section, assigning the next ID if it is new.
+
+        Raises:
+            ValueError: If the section is not in section syntax
+        """
+        section_id = self._spellings.get(section, NO_ID)
+        if section_id != NO_ID:
+            self._spellings.move_to_end(section)
+            return section_id
+
+        canonical = canonical_section(section)
+        if canonical is None:
+            raise ValueError(f"Invalid section: {section!r}")
+        section_id = self._ids.get(canonical)
+        if section_id is None:
+            section_id = self._ids[canonical] = len(self._sections)
+            self._sections.append(canonical)
+        _remember(self._spellings, section, section_id)
+        return section_id
+
+    def get(self, section: str) -> int:
+        """Return the ID of a section in any spelling, or NO_ID if it is not in the table."""
+        try:
+            section_id = self._spellings[section]
+        except KeyError:
+            pass
+        else:
+            self._spellings.move_to_end(section)
+            return section_id
+        canonical = canonical_section(section)
+        section_id = NO_ID if canonical is None else self._ids.get(canonical, NO_ID)
+        # A miss is not remembered: it may be interned later, and user input
+        # would otherwise fill the cache
+        if section_id != NO_ID:
+            _remember(self._spellings, section, section_id)
+        return section_id
+
+    def section(self, section_id: int) -> str:
+        """
+        Return the canonical section of an ID.
+
+        Raises:
+            IndexError: If there is no such ID
+        """
+        if section_id < 0:
+            raise IndexError(f"Invalid section ID: {section_id}")
+        return self._sections[section_id]
+
+    def ids(self, sections: Iterable[str]) -> np.ndarray:
+        """Return the ID of each section, or NO_ID for those not in the table."""
+        return np.array([self.get(section) for section in sections], dtype=np.int32)
+
+    def normalize(self, keys: Iterable[str]) -> NormalizedSections:
+        """
+        Normalize free-form offence keys in bulk (see normalize_key).
+
+        Args:
+            keys (Iterable[str]): The keys, e.g. the offences of the reported
+                sentences
+
+        Returns:
+            NormalizedSections: The canonical section, ID and youth flag of
+                each key
+        """
+        sections = []
+        ids = []
+        youth = []
+        for key in keys:
+            try:
+                normalized = self._keys[key]
+            except KeyError:
+                normalized = normalize_key(key)
+                if normalized is not None:
+                    _remember(self._keys, key, normalized)
+            else:
+                self._keys.move_to_end(key)
+            if normalized is None:
+                sections.append(None)
+                ids.append(NO_ID)
+                youth.append(False)
+            else:
+                sections.append(normalized[0])
+                ids.append(self._ids.get(normalized[0], NO_ID))
+                youth.append(normalized[1])
+        return NormalizedSections(
+            sections,
+            np.array(ids, dtype=np.int32),
+            np.array(youth, dtype=bool),
+        )
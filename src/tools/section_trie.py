@@ -0,0 +1,180 @@
+"""
+Section hierarchy for the offence registry.
+
+A section such as "cc_320.14(1)#1#a" is a path through the statute's
+hierarchy: the statute ("cc"), the section number ("320.14"), its
+subsections and paragraphs ("(1)"), and finally the graduated variants of
+the offence ("#1" for a first offence, "#2" for a second, "#s" for a
+subsequent one, or a letter for further variants). The trie stores every
+section of the loaded CSVs along that path, so a reference to any level of
+the hierarchy resolves to every offence below it:
+
+    cc_320.14        every offence in s. 320.14
+    cc_320.14(1)     every offence in s. 320.14(1)
+    cc_320.14(1)#1   the first offence variants of s. 320.14(1)
+
+Variants are written with "#" in the data and with "-" in the disambiguation
+maps; both are accepted.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Section syntax: a statute code, an optional underscore, the section number,
+# then any number of bracketed subdivisions and variant suffixes
+_STATUTE = re.compile(r"([a-z]+)_?")
+_NUMBER = re.compile(r"\d+[a-z]?(?:\.\d+)*")
+_SUBDIVISION = re.compile(r"\([0-9a-z.]+\)")
+_VARIANT = re.compile(r"[#-]([0-9a-z]+)")
+
+
+def section_components(section: str) -> Optional[Tuple[Tuple[str, ...], Tuple[int, ...]]]:
+    """
+    Split a section into its hierarchy components.
+
+    Args:
+        section (str): A section, e.g. "cc_320.14(1)#1#a" or "cc_99(2)-s"
+
+    Returns:
+        Optional[Tuple[Tuple[str, ...], Tuple[int, ...]]]: The components
+            (e.g. ("cc", "320.14", "(1)", "#1", "#a")) and the position in
+            section where each ends, or None if section is not in section
+            syntax
+    """
+    section = section.strip().lower()
+    components = []
+    ends = []
+
+    match = _STATUTE.match(section)
+    if match is None:
+        return None
+    components.append(match.group(1))
+    ends.append(len(match.group(1)))
+    position = match.end()
+
+    match = _NUMBER.match(section, position)
+    if match is None:
+        return None
+    components.append(match.group())
+    ends.append(match.end())
+    position = match.end()
+
+    while position < len(section):
+        match = _SUBDIVISION.match(section, position)
+        if match is not None and not components[-1].startswith("#"):
+            components.append(match.group())
+        else:
+            match = _VARIANT.match(section, position)
+            if match is None:
+                return None
+            # Variants are keyed by their suffix alone, so "#s" and "-s"
+            # are the same node
+            components.append("#" + match.group(1))
+        ends.append(match.end())
+        position = match.end()
+
+    return tuple(components), tuple(ends)
+
+
+class _Node:
+    __slots__ = ("children", "prefix", "sections")
+
+    def __init__(self, prefix: str):
+        self.children: Dict[str, "_Node"] = {}
+        # The prefix as first written in the data, e.g. "cc_320.14(1)"
+        self.prefix = prefix
+        # Every section at or below this node, in insertion order
+        self.sections: List[str] = []
+
+
+class SectionTrie:
+    """
+    A trie of sections keyed by their hierarchy components.
+
+    Each node keeps the list of sections at or below it, so resolving a
+    prefix is a walk of one step per component, however many offences it
+    covers.
+
+    Args:
+        sections (Iterable[str]): The sections to insert, in order
+    """
+
+    def __init__(self, sections: Iterable[str] = ()):
+        self._root = _Node("")
+        for section in sections:
+            self.insert(section)
+
+    def insert(self, section: str) -> bool:
+        """
+        Add a section, as written in the data. Sections already in the trie
+        are ignored.
+
+        Returns:
+            bool: False if the section is not in section syntax, and so was
+                not added
+        """
+        parsed = section_components(section)
+        if parsed is None:
+            return False
+        components, ends = parsed
+
+        node = self._root
+        path = [node]
+        for component, end in zip(components, ends):
+            child = node.children.get(component)
+            if child is None:
+                child = node.children[component] = _Node(section[:end])
+            node = child
+            path.append(node)
+
+        if section in node.sections:
+            return True
+        for visited in path[1:]:
+            visited.sections.append(section)
+        return True
+
+    def _find(self, prefix: str) -> Optional[_Node]:
+        parsed = section_components(prefix)
+        if parsed is None:
+            return None
+        node = self._root
+        for component in parsed[0]:
+            node = node.children.get(component)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, prefix: str) -> bool:
+        return self._find(prefix) is not None
+
+    def descendants(self, prefix: str) -> List[str]:
+        """
+        Return every section at or below a prefix.
+
+        Args:
+            prefix (str): A section or a prefix of one, e.g. "cc_320.14(1)"
+
+        Returns:
+            List[str]: The sections, in insertion order, or an empty list if
+                the prefix matches nothing
+        """
+        node = self._find(prefix)
+        return [] if node is None else list(node.sections)
+
+    def prefixes(self) -> List[str]:
+        """
+        Return every prefix that covers at least one section, below the
+        statute level, in the order they were first seen.
+        """
+        prefixes = []
+        # Statute nodes only group the statute's sections, so start below them
+        stack = [
+            node
+            for statute in reversed(self._root.children.values())
+            for node in reversed(statute.children.values())
+        ]
+        while stack:
+            node = stack.pop()
+            prefixes.append(node.prefix)
+            stack.extend(reversed(node.children.values()))
+        return prefixes
@@ -1,13 +1,18 @@
 # Saskatchewan Firearms Act, SS 2023, c 8
 
-from utils import (
-    standard_output,
+from .collateral_consequences import (
+    collateral_consequence,
 )
 
-from constants import(
+from .constants import (
     SK_FIREARMS_ACT_SUSPENSION_OFFENCES,
 )
 
+from .utils import (
+    standard_output,
+)
+
+
 def check_firearms_act(section):
     """
     Check if the offence is a firearms act suspension offence.
@@ -54,4 +59,11 @@ def commercial_vehicle_drivers_record_keeping_regulations(section):
             - explanation (str): Explanation of the determination
     """
 
-    pass
\ No newline at end of file
+    pass
+
+
+# The record keeping regulations are not implemented yet, so they are not
+# registered
+@collateral_consequence("sk", "firearms_act_suspension")
+def _firearms_act_suspension(context):
+    return check_firearms_act(context.section)
@@ -0,0 +1,317 @@
+"""
+Precomputed offence grid snapshots.
+
+Evaluating the rules for every offence is cheap, but not free, and every
+process that imports the parser used to read and parse the offence CSVs
+before it could answer a single lookup. A snapshot stores the fully parsed
+result of every offence row in one binary file, which is opened with mmap:
+nothing is parsed at startup, records are decoded only when they are looked
+up, and the file's pages are shared by every process that maps it (e.g. the
+workers of a web server).
+
+File layout (integers are little-endian):
+
+    preamble    magic (8 bytes), format version (u32), header length (u64)
+    header      UTF-8 JSON: source hash, source files, record count, the
+                canonical sections in section ID order with the record
+                numbers of each, and an index mapping every other lookup key
+                (the map keys and section prefixes) to its record numbers
+    offsets     (record count + 1) u64 offsets into the payload, so record i
+                spans offsets[i]:offsets[i + 1]
+    payload     one pickled parse result per record
+
+A section is looked up by its section ID (see section_ids), so any spelling
+of it (e.g. "cc266" or "cdsa_4(3)") finds its records. A key that is neither
+in the index nor a section is resolved through a trie of the snapshot's
+sections, as the offence registry resolves it, so a lookup gives the same
+rows with or without a snapshot.
+
+Each snapshot records a hash of the CSVs it was built from and of the rule
+modules that produced it. A snapshot whose hash does not match the current
+sources is rejected with StaleSnapshotError.
+
+Records are pickled, so only load snapshots built by this module.
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from functools import cached_property
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .section_ids import (
+    NO_ID,
+    SectionIds,
+)
+from .section_trie import (
+    SectionTrie,
+)
+
+SNAPSHOT_MAGIC = b"OFFGRID\x00"
+SNAPSHOT_FORMAT_VERSION = 3
+
+_PREAMBLE = struct.Struct("<8sIQ")
+_OFFSET = struct.Struct("<Q")
+
+TOOLS_DIR = Path(__file__).resolve().parent
+
+# The modules whose source determines what a snapshot contains. Editing any of
+# them invalidates existing snapshots.
+RULE_MODULES = (
+    "main.py",
+    "context.py",
+    "registry.py",
+    "section_trie.py",
+    "section_ids.py",
+    "rule_versions.py",
+    "cc_rules_current.py",
+    "ca_collateral_consequences.py",
+    "decision_table.py",
+    "grid.py",
+    "designations.py",
+    "constants.py",
+    "map.py",
+    "utils.py",
+)
+
+PathLike = Union[str, Path]
+
+
+class StaleSnapshotError(ValueError):
+    """The snapshot was built from different sources, or by another format version."""
+
+
+def source_hash(
+    sources: Iterable[PathLike],
+    modules: Iterable[str] = RULE_MODULES,
+) -> str:
+    """
+    Hash the source CSVs and rule modules a snapshot is built from.
+
+    Args:
+        sources (Iterable[PathLike]): The offence CSV files
+        modules (Iterable[str]): Rule module file names, relative to the tools
+            package
+
+    Returns:
+        str: A hex SHA-256 digest
+    """
+    digest = hashlib.sha256(f"snapshot-v{SNAPSHOT_FORMAT_VERSION}".encode())
+    for path in [Path(source) for source in sources] + [TOOLS_DIR / module for module in modules]:
+        contents = path.read_bytes()
+        digest.update(path.name.encode())
+        digest.update(_OFFSET.pack(len(contents)))
+        digest.update(contents)
+    return digest.hexdigest()
+
+
+def write_snapshot(
+    snapshot_path: PathLike,
+    records: Sequence[dict],
+    index: Mapping[str, Sequence[int]],
+    snapshot_hash: str,
+    sources: Sequence[str] = (),
+    sections: Sequence[str] = (),
+    section_records: Sequence[Sequence[int]] = (),
+) -> None:
+    """
+    Write a snapshot file. The file is written beside its destination and
+    moved into place, so processes never map a partially written snapshot.
+
+    Args:
+        snapshot_path (PathLike): Where to write the snapshot
+        records (Sequence[dict]): The parse result of each offence row
+        index (Mapping[str, Sequence[int]]): Maps each lookup key that is
+            not a section to the numbers of its records, in lookup order
+        snapshot_hash (str): The source_hash of the snapshot's sources
+        sources (Sequence[str]): Names of the source files, for reference
+        sections (Sequence[str]): The canonical sections of the source rows,
+            in section ID order
+        section_records (Sequence[Sequence[int]]): The numbers of each
+            section's records, in the same order as sections
+
+    Raises:
+        ValueError: If sections and section_records differ in length
+    """
+    if len(sections) != len(section_records):
+        raise ValueError("Every section needs its record numbers")
+
+    payloads = [pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL) for record in records]
+
+    header = json.dumps(
+        {
+            "source_hash": snapshot_hash,
+            "sources": list(sources),
+            "records": len(payloads),
+            "sections": list(sections),
+            "section_records": [list(record_ids) for record_ids in section_records],
+            "index": {key: list(record_ids) for key, record_ids in index.items()},
+        },
+        ensure_ascii=False,
+    ).encode()
+    # Pad the header so the offsets table is 8-byte aligned
+    header += b" " * (-(_PREAMBLE.size + len(header)) % 8)
+
+    offsets = [0]
+    for payload in payloads:
+        offsets.append(offsets[-1] + len(payload))
+
+    snapshot_path = Path(snapshot_path)
+    snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary_path = tempfile.mkstemp(
+        dir=snapshot_path.parent, prefix=snapshot_path.name, suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as snapshot_file:
+            snapshot_file.write(_PREAMBLE.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(header)))
+            snapshot_file.write(header)
+            snapshot_file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+            for payload in payloads:
+                snapshot_file.write(payload)
+        # mkstemp creates the file readable by its owner only
+        os.chmod(temporary_path, 0o644)
+        os.replace(temporary_path, snapshot_path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+class GridSnapshot:
+    """
+    A read-only, memory-mapped view of a snapshot file.
+
+    Args:
+        snapshot_path (PathLike): The snapshot file
+        expected_hash (Optional[str]): If given, the snapshot must have been
+            built from sources with this source_hash
+
+    Raises:
+        FileNotFoundError: If the snapshot file does not exist
+        StaleSnapshotError: If the file is not a snapshot of this format
+            version, or was built from other sources
+    """
+
+    def __init__(self, snapshot_path: PathLike, expected_hash: Optional[str] = None):
+        self.path = Path(snapshot_path)
+
+        with open(self.path, "rb") as snapshot_file:
+            self._map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            if len(self._map) < _PREAMBLE.size:
+                raise StaleSnapshotError(f"{self.path} is not an offence grid snapshot")
+            magic, version, header_length = _PREAMBLE.unpack_from(self._map, 0)
+            if magic != SNAPSHOT_MAGIC:
+                raise StaleSnapshotError(f"{self.path} is not an offence grid snapshot")
+            if version != SNAPSHOT_FORMAT_VERSION:
+                raise StaleSnapshotError(
+                    f"{self.path} has format version {version}, expected {SNAPSHOT_FORMAT_VERSION}"
+                )
+
+            header = json.loads(self._map[_PREAMBLE.size:_PREAMBLE.size + header_length])
+            if expected_hash is not None and header["source_hash"] != expected_hash:
+                raise StaleSnapshotError(
+                    f"{self.path} was built from different sources; rebuild it"
+                )
+        except BaseException:
+            self._map.close()
+            raise
+
+        self.source_hash: str = header["source_hash"]
+        self.sources: List[str] = header["sources"]
+        self._index: Dict[str, List[int]] = header["index"]
+        self._sections: List[str] = header["sections"]
+        self._section_records: List[List[int]] = header["section_records"]
+        self._records: int = header["records"]
+        self._offsets_start = _PREAMBLE.size + header_length
+        self._payload_start = self._offsets_start + _OFFSET.size * (self._records + 1)
+
+    def __enter__(self) -> "GridSnapshot":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __contains__(self, offence: str) -> bool:
+        offence = offence.strip().lower()
+        return offence in self._index or offence in self._section_ids or offence in self._trie
+
+    def __len__(self) -> int:
+        return self._records
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._map.close()
+
+    @cached_property
+    def _section_ids(self) -> SectionIds:
+        # The sections are stored canonical and in ID order, so interning
+        # them again gives back the same IDs
+        return SectionIds(self._sections)
+
+    @cached_property
+    def _trie(self) -> SectionTrie:
+        # Built on the first lookup of a key that is neither in the index
+        # nor a section
+        return SectionTrie(self._sections)
+
+    def keys(self) -> List[str]:
+        """Return every lookup key in the snapshot: the sections, then the other keys."""
+        return self._sections + list(self._index)
+
+    def record(self, record_id: int) -> dict:
+        """
+        Decode one record. Every call returns new objects, so callers may
+        modify the result.
+        """
+        start, end = struct.unpack_from(
+            "<2Q", self._map, self._offsets_start + _OFFSET.size * record_id
+        )
+        return pickle.loads(self._map[self._payload_start + start:self._payload_start + end])
+
+    def record_ids(self, offence: str) -> List[int]:
+        """
+        Return the numbers of an offence code's records, in lookup order.
+        A section in any spelling resolves through its section ID, and any
+        other key that is not in the index to the records of every section
+        at or below it in the section trie.
+
+        Raises:
+            KeyError: If the offence code is not found
+        """
+        offence = offence.strip().lower()
+        try:
+            return self._index[offence]
+        except KeyError:
+            pass
+        section_id = self._section_ids.get(offence)
+        if section_id != NO_ID:
+            return self._section_records[section_id]
+        record_ids = [
+            record_id
+            for section in self._trie.descendants(offence)
+            for record_id in self._section_records[self._section_ids.get(section)]
+        ]
+        if not record_ids:
+            raise KeyError(f"Offence code '{offence}' not found")
+        return record_ids
+
+    def lookup(self, offence: str) -> Tuple[dict, ...]:
+        """
+        Return the parse results for an offence code.
+
+        Args:
+            offence (str): Any key the offence registry accepts
+
+        Returns:
+            Tuple[dict, ...]: The parse result of each row, in lookup order
+
+        Raises:
+            KeyError: If the offence code is not found
+        """
+        return tuple(self.record(record_id) for record_id in self.record_ids(offence))
@@ -3,7 +3,7 @@ Test cases for the Criminal Code Offence Parser.
 This script runs through various offence types to verify correct parsing and reporting.
 """
 
-from main import report, parse_offence
+from .main import report, parse_offence
 
 def run_test_cases():
     """Run through all test cases and generate reports."""
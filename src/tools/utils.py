@@ -5,7 +5,8 @@ This module provides utility functions for parsing and converting quantum values
 in the context of criminal code offences, as well as standardizing output formats.
 """
 
-from typing import Dict, Union, List, Optional, TypedDict, Literal
+from functools import lru_cache
+from typing import Dict, Iterable, Union, List, Optional, Tuple, TypedDict, Literal
 
 # Type definitions
 class QuantumDict(TypedDict):
@@ -39,20 +40,169 @@ DEFAULT_UNITS = {
     "jail": "days"
 }
 
-def parse_quantum(quantum: str) -> ParsedQuantum:
+JAIL_UNIT_DAYS = {
+    "days": 1,
+    "months": DAYS_PER_MONTH,
+    "years": DAYS_PER_YEAR,
+}
+
+# Only a few dozen distinct quantum strings exist across the offence CSVs, but
+# the sentencing data holds many more
+QUANTUM_CACHE_SIZE = 1024
+
+
+class FrozenDict(dict):
+    """
+    A dict that cannot be modified after it is created. It is still a real
+    dict, so it compares equal to plain dicts and serializes to JSON as one.
+    """
+
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+    __setitem__ = _immutable
+    __delitem__ = _immutable
+    __ior__ = _immutable
+    clear = _immutable
+    pop = _immutable
+    popitem = _immutable
+    setdefault = _immutable
+    update = _immutable
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+def _to_int(amount: Union[int, str, None]) -> int:
+    """Convert a parsed amount to an integer, treating unusable amounts as 0."""
+    try:
+        return int(amount) if amount is not None else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+class Quantum(FrozenDict):
+    """
+    An immutable parsed quantum. Quanta are interned by parse_quantum, so the
+    same instance is shared by every row and rule that uses the same CSV
+    string.
+
+    The quantum reads like the ParsedQuantum dictionary existing callers
+    expect (quantum["jail"]["amount"], quantum.get("fine"), ...), and also
+    carries the values the rules test, precomputed.
+
+    Attributes:
+        raw (str): The CSV string the quantum was parsed from
+        has_jail (bool): The quantum sets a jail amount
+        has_fine (bool): The quantum sets a fine amount
+        jail_unit (str): The unit of the jail amount
+        jail_amount (int): The jail amount in its own unit, or 0 if it cannot
+            be interpreted
+        jail_days (int): The jail term in days, or 0 if there is none or it
+            cannot be interpreted. As in the rules, an amount in an
+            unrecognized unit is read as days
+        fine_dollars (int): The fine in dollars, or 0 if there is none or it
+            cannot be interpreted
+    """
+
+    __slots__ = (
+        "raw",
+        "has_jail",
+        "has_fine",
+        "jail_unit",
+        "jail_amount",
+        "jail_days",
+        "fine_dollars",
+    )
+
+    def __init__(
+        self,
+        raw: str,
+        fine: Tuple[Union[int, str, None], str],
+        jail: Tuple[Union[int, str, None], str],
+    ):
+        fine_amount, fine_unit = fine
+        jail_amount, jail_unit = jail
+        super().__init__(
+            fine=FrozenDict(amount=fine_amount, unit=fine_unit),
+            jail=FrozenDict(amount=jail_amount, unit=jail_unit),
+        )
+
+        jail_amount_int = _to_int(jail_amount)
+
+        object.__setattr__(self, "raw", raw)
+        object.__setattr__(self, "has_jail", bool(jail_amount))
+        object.__setattr__(self, "has_fine", bool(fine_amount))
+        object.__setattr__(self, "jail_unit", jail_unit)
+        object.__setattr__(self, "jail_amount", jail_amount_int)
+        object.__setattr__(self, "jail_days", jail_amount_int * JAIL_UNIT_DAYS.get(jail_unit, 1))
+        object.__setattr__(self, "fine_dollars", _to_int(fine_amount))
+
+    @classmethod
+    def from_parsed(cls, quantum: ParsedQuantum) -> "Quantum":
+        """
+        Build a Quantum from a ParsedQuantum dictionary, for callers that
+        construct their own. Quanta are returned unchanged.
+        """
+        if isinstance(quantum, cls):
+            return quantum
+        return cls(
+            "",
+            (quantum["fine"]["amount"], quantum["fine"]["unit"]),
+            (quantum["jail"]["amount"], quantum["jail"]["unit"]),
+        )
+
+    def __setattr__(self, name, value):
+        self._immutable()
+
+    __delattr__ = __setattr__
+
+    def __reduce__(self):
+        # A parsed quantum is unpickled through the cache, so quanta stay
+        # interned across processes. One built by from_parsed has no string
+        # to parse again, so it is rebuilt from its fields
+        if self.raw:
+            return (parse_quantum, (self.raw,))
+        return (
+            type(self),
+            (
+                self.raw,
+                (self["fine"]["amount"], self["fine"]["unit"]),
+                (self["jail"]["amount"], self["jail"]["unit"]),
+            ),
+        )
+
+    def __repr__(self) -> str:
+        return f"Quantum({self.raw!r}, {dict(self)!r})"
+
+    def as_dict(self) -> ParsedQuantum:
+        """Return a mutable copy of the quantum as a plain ParsedQuantum."""
+        return {
+            "fine": dict(self["fine"]),
+            "jail": dict(self["jail"]),
+        }
+
+
+@lru_cache(maxsize=QUANTUM_CACHE_SIZE)
+def parse_quantum(quantum: str) -> Quantum:
     """
     Parse the quantum (amount and unit) of an offence.
 
+    Results are cached on the raw string and are immutable, so every call
+    with the same string returns the same Quantum instance.
+
     Args:
         quantum (str): The quantum string to parse. Can be:
-            - Empty string: Returns default values
+            - Empty string or "None": Returns default values
             - "sc": Returns summary conviction defaults
             - Format "amount[unit]": e.g., "5y" for 5 years
             - Format "fine&jail": e.g., "5000$&90d" for $5000 fine and 90 days
 
     Returns:
-        ParsedQuantum: Dictionary containing parsed fine and jail amounts and units.
-            Format:
+        Quantum: Immutable mapping containing parsed fine and jail amounts and
+            units, in the ParsedQuantum format:
             {
                 "fine": {"amount": int|str, "unit": str},
                 "jail": {"amount": int|str, "unit": str}
@@ -63,52 +213,57 @@ def parse_quantum(quantum: str) -> ParsedQuantum:
         {"fine": {"amount": 0, "unit": "dollars"}, "jail": {"amount": "5", "unit": "years"}}
         >>> parse_quantum("5000$&90d")
         {"fine": {"amount": "5000", "unit": "dollars"}, "jail": {"amount": "90", "unit": "days"}}
+        >>> parse_quantum("5y").jail_days
+        1825
     """
-    parsed_quantum: ParsedQuantum = {
-        "fine": {"amount": 0, "unit": DEFAULT_UNITS["fine"]},
-        "jail": {"amount": 0, "unit": DEFAULT_UNITS["jail"]}
-    }
+    fine_amount = 0
+    jail_amount = 0
+    jail_unit = DEFAULT_UNITS["jail"]
 
-    if not quantum:
-        return parsed_quantum
+    # Some statute CSVs write "None" for an empty quantum
+    if not quantum or quantum == "None":
+        pass
 
     # Handle summary conviction case
-    if quantum.lower() == "sc":
-        parsed_quantum["fine"]["amount"] = SUMMARY_CONVICTION_MAX_FINE
-        parsed_quantum["jail"]["amount"] = SUMMARY_CONVICTION_MAX_DAYS
-        return parsed_quantum
+    elif quantum.lower() == "sc":
+        fine_amount = SUMMARY_CONVICTION_MAX_FINE
+        jail_amount = SUMMARY_CONVICTION_MAX_DAYS
 
     # Handle combined fine and jail case
-    if "&" in quantum:
+    elif "&" in quantum:
         try:
             fine_part, jail_part = quantum.split("&")
-            parsed_quantum["fine"]["amount"] = fine_part.rstrip("$")
-            parsed_quantum["jail"]["amount"] = jail_part[:-1]
-            parsed_quantum["jail"]["unit"] = UNIT_MAPPINGS.get(jail_part[-1], jail_part[-1])
-            return parsed_quantum
-        except ValueError:
+            fine_amount = fine_part.rstrip("$")
+            jail_amount = jail_part[:-1]
+            jail_unit = UNIT_MAPPINGS.get(jail_part[-1], jail_part[-1])
+        except (ValueError, IndexError):
             raise ValueError(f"Invalid combined quantum format: {quantum}. Expected format: 'fine&jail'")
 
     # Handle single quantum case
-    try:
+    else:
         unit = UNIT_MAPPINGS.get(quantum[-1], quantum[-1])
         value = quantum[:-1]
 
         if unit == "dollars":
-            parsed_quantum["fine"]["amount"] = value
+            fine_amount = value
         else:
-            parsed_quantum["jail"]["amount"] = value
-            parsed_quantum["jail"]["unit"] = unit
+            jail_amount = value
+            jail_unit = unit
 
-        return parsed_quantum
-    except IndexError:
-        raise ValueError(f"Invalid quantum format: {quantum}")
+    return Quantum(
+        quantum,
+        (fine_amount, DEFAULT_UNITS["fine"]),
+        (jail_amount, jail_unit),
+    )
 
 
 def convert_quantum_to_days(quantum: ParsedQuantum) -> Optional[ParsedQuantum]:
     """
     Convert a time-based quantum to days.
 
+    The quantum passed in is not modified; parsed quanta are immutable and
+    shared, so the converted quantum is returned as a new dictionary.
+
     Args:
         quantum (ParsedQuantum): The quantum dictionary to convert, containing jail time information.
 
@@ -124,16 +279,18 @@ def convert_quantum_to_days(quantum: ParsedQuantum) -> Optional[ParsedQuantum]:
         amount_int = int(amount) if amount is not None else 0
         unit = quantum["jail"]["unit"]
 
+        converted = {key: dict(value) for key, value in quantum.items()}
+
         if unit == "years":
-            quantum["jail"]["amount"] = amount_int * DAYS_PER_YEAR
-            quantum["jail"]["unit"] = "days"
+            converted["jail"]["amount"] = amount_int * DAYS_PER_YEAR
+            converted["jail"]["unit"] = "days"
         elif unit == "months":
-            quantum["jail"]["amount"] = amount_int * DAYS_PER_MONTH
-            quantum["jail"]["unit"] = "days"
+            converted["jail"]["amount"] = amount_int * DAYS_PER_MONTH
+            converted["jail"]["unit"] = "days"
         elif unit != "days":
             return None
 
-        return quantum
+        return converted
     except (ValueError, KeyError, TypeError) as e:
         raise ValueError(f"Error converting quantum to days: {str(e)}")
 
@@ -170,3 +327,68 @@ def standard_output(
         "sections": sections,
         "notes": explanation
     }
+
+
+# Joins the values of rules that return several results, and lists of sections
+LIST_SEPARATOR = "; "
+
+
+def _join(values: Iterable) -> Optional[str]:
+    values = [str(value) for value in dict.fromkeys(values) if value not in (None, "")]
+    return LIST_SEPARATOR.join(values) if values else None
+
+
+def flatten_output(output) -> Tuple[Optional[bool], Optional[str], Optional[str], Optional[str]]:
+    """
+    Flatten a rule output to (available, status notes, sections, notes).
+
+    Rules return a standard_output dictionary, the older format with a status
+    tuple and a single section, a bool, a list of results, or None. A list is
+    available if any of its results is, and its other fields are joined. The
+    rules of earlier versions also write the status as a string: "available"
+    or "unavailable", or the category that applies (e.g. "primary" for a
+    SOIRA order), which is flattened to an available option with the category
+    as its status notes.
+    """
+    if output is None:
+        return None, None, None, None
+    if isinstance(output, bool):
+        return output, None, None, None
+    if isinstance(output, (list, tuple)):
+        results = [flatten_output(result) for result in output]
+        if not results:
+            return None, None, None, None
+        available = [result[0] for result in results if result[0] is not None]
+        return (
+            any(available) if available else None,
+            _join(result[1] for result in results),
+            _join(
+                section
+                for result in results if result[2]
+                for section in result[2].split(LIST_SEPARATOR)
+            ),
+            _join(result[3] for result in results),
+        )
+
+    status = output.get("status")
+    if isinstance(status, (list, tuple)):
+        status = status[0] if status else {}
+    if isinstance(status, str):
+        if status in ("available", "unavailable"):
+            status = {"available": status == "available"}
+        else:
+            status = {"available": True, "notes": status}
+    if not isinstance(status, dict):
+        status = {}
+    available = status.get("available", status.get("absolute_jurisdiction"))
+
+    sections = output.get("sections", output.get("section"))
+    if isinstance(sections, str):
+        sections = [sections]
+
+    return (
+        None if available is None else bool(available),
+        status.get("notes"),
+        _join(sections or ()),
+        output.get("notes"),
+    )